@@ -3,5 +3,6 @@
 #
 
 from .destination import Destination
+from .input_messages import MessageParser, RecordBatch, batch_records
 
-__all__ = ["Destination"]
+__all__ = ["Destination", "MessageParser", "RecordBatch", "batch_records"]
@@ -10,17 +10,20 @@ from abc import ABC, abstractmethod
 from typing import Any, Iterable, List, Mapping
 
 from airbyte_cdk.connector import Connector
+from airbyte_cdk.destinations.input_messages import MessageParser
 from airbyte_cdk.exception_handler import init_uncaught_exception_handler
 from airbyte_cdk.models import AirbyteMessage, ConfiguredAirbyteCatalog, Type
 from airbyte_cdk.sources.utils.schema_helpers import check_config_against_spec_or_exit
+from airbyte_cdk.utils.message_writer import BufferedMessageWriter
 from airbyte_cdk.utils.traced_exception import AirbyteTracedException
-from pydantic import ValidationError
 
 logger = logging.getLogger("airbyte")
 
 
 class Destination(Connector, ABC):
     VALID_CMDS = {"spec", "check", "write"}
+    # Number of worker processes decoding the input messages. If 0, they are decoded in the main process
+    input_parsing_workers: int = 0
 
     @abstractmethod
     def write(
@@ -34,11 +37,7 @@ class Destination(Connector, ABC):
 
     def _parse_input_stream(self, input_stream: io.TextIOWrapper) -> Iterable[AirbyteMessage]:
         """Reads from stdin, converting to Airbyte messages"""
-        for line in input_stream:
-            try:
-                yield AirbyteMessage.parse_raw(line)
-            except ValidationError:
-                logger.info(f"ignoring input which can't be deserialized as Airbyte Message: {line}")
+        yield from MessageParser(workers=self.input_parsing_workers).parse(input_stream)
 
     def _run_write(
         self, config: Mapping[str, Any], configured_catalog_path: str, input_stream: io.TextIOWrapper
@@ -116,5 +115,6 @@ class Destination(Connector, ABC):
         init_uncaught_exception_handler(logger)
         parsed_args = self.parse_args(args)
         output_messages = self.run_cmd(parsed_args)
-        for message in output_messages:
-            print(message.json(exclude_unset=True))
+        with BufferedMessageWriter() as writer:
+            for message in output_messages:
+                writer.write(message.json(exclude_unset=True), flush=message.type != Type.RECORD)
@@ -0,0 +1,168 @@
+#
+# Copyright (c) 2022 Airbyte, Inc., all rights reserved.
+#
+
+import json
+import logging
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Deque, Dict, Iterable, Iterator, List, Optional, TextIO, Tuple, Union
+
+from airbyte_cdk.models import AirbyteMessage, AirbyteRecordMessage, Type
+from airbyte_cdk.sources.utils.record_helper import RECORD_MESSAGE_PREFIXES
+from pydantic import ValidationError
+
+logger = logging.getLogger("airbyte")
+
+# Number of characters of input read at once
+INPUT_CHUNK_SIZE = 1024 * 1024
+# Fields of a RECORD message which are materialized without pydantic validation
+_RECORD_FIELDS = {"namespace", "stream", "data", "emitted_at"}
+# Result of decoding a line: whether it is valid json, and either the decoded value or the line itself
+_DecodedLine = Tuple[bool, Any]
+
+
+class MessageParser:
+    """
+    Parses the serialized Airbyte messages a destination receives, one message per line.
+
+    The input is read and decoded in chunks of lines. A chunk ends after chunk_size characters, or right after any line which is not a
+    RECORD message, e.g: a STATE message, so that such a message is handled as soon as it is received, even if the input is not
+    closed and no more lines arrive. RECORD messages are built straight from the decoded json without pydantic
+    validation, so their data is the plain dict produced by the decoder. Other messages, and records which do not have the expected
+    shape, are validated by pydantic. Lines which are not Airbyte messages are logged and skipped.
+
+    Decoding can be offloaded to a pool of worker processes, which is worth it when the destination spends as much time consuming
+    messages as the decoding takes.
+    """
+
+    def __init__(self, workers: int = 0, chunk_size: int = INPUT_CHUNK_SIZE):
+        """
+        :param workers: number of worker processes decoding the input. If 0, the input is decoded in the calling process
+        :param chunk_size: maximum number of characters of the lines decoded at once
+        """
+        self._workers = workers
+        self._chunk_size = chunk_size
+
+    def parse(self, input_stream: TextIO) -> Iterator[AirbyteMessage]:
+        chunks = self._read_chunks(input_stream)
+        decoded_chunks = self._decode_in_workers(chunks) if self._workers > 0 else map(_decode_lines, chunks)
+        for decoded_chunk in decoded_chunks:
+            for is_json, value in decoded_chunk:
+                message = _to_message(value) if is_json else None
+                if message is None:
+                    logger.info(f"ignoring input which can't be deserialized as Airbyte Message: {value}")
+                else:
+                    yield message
+
+    def _read_chunks(self, input_stream: TextIO) -> Iterator[List[str]]:
+        # Lines are yielded by the input as soon as they are received, unlike readlines(), which waits for the size hint to be read
+        chunk: List[str] = []
+        chunk_characters = 0
+        for line in input_stream:
+            chunk.append(line)
+            chunk_characters += len(line)
+            if chunk_characters >= self._chunk_size or not _is_record_line(line):
+                yield chunk
+                chunk = []
+                chunk_characters = 0
+        if chunk:
+            yield chunk
+
+    def _decode_in_workers(self, chunks: Iterable[List[str]]) -> Iterator[List[_DecodedLine]]:
+        # Only a few chunks per worker are in flight, so that the input is not read faster than the destination consumes it
+        in_flight: Deque[Future] = deque()
+        with ProcessPoolExecutor(max_workers=self._workers) as executor:
+            for chunk in chunks:
+                in_flight.append(executor.submit(_decode_lines, chunk))
+                # A chunk ending with a message which is not a record is handed over right away along with the chunks before it
+                while in_flight and (len(in_flight) >= 2 * self._workers or not _is_record_line(chunk[-1])):
+                    yield in_flight.popleft().result()
+            while in_flight:
+                yield in_flight.popleft().result()
+
+
+def _is_record_line(line: str) -> bool:
+    # A record serialized with another layout is taken for another message, which only makes its chunk smaller
+    return line.startswith(RECORD_MESSAGE_PREFIXES)
+
+
+def _decode_lines(lines: List[str]) -> List[_DecodedLine]:
+    decoded = []
+    for line in lines:
+        try:
+            # The standard library is used rather than orjson, which parses integers that do not fit in 64 bits as floats
+            decoded.append((True, json.loads(line)))
+        except ValueError:
+            decoded.append((False, line))
+    return decoded
+
+
+def _to_message(value: Any) -> Optional[AirbyteMessage]:
+    if isinstance(value, dict) and value.get("type") == "RECORD" and value.keys() == {"type", "record"}:
+        record = value["record"]
+        if (
+            isinstance(record, dict)
+            and record.keys() <= _RECORD_FIELDS
+            and isinstance(record.get("stream"), str)
+            and isinstance(record.get("data"), dict)
+            and type(record.get("emitted_at")) is int
+            and isinstance(record.get("namespace", ""), (str, type(None)))
+        ):
+            return AirbyteMessage.construct(type=Type.RECORD, record=AirbyteRecordMessage.construct(**record))
+    try:
+        return AirbyteMessage.parse_obj(value)
+    except ValidationError:
+        return None
+
+
+@dataclass
+class RecordBatch:
+    """
+    Records of a stream, in the order they were received
+    """
+
+    stream: str
+    records: List[AirbyteRecordMessage]
+    namespace: Optional[str] = None
+
+
+def batch_records(input_messages: Iterable[AirbyteMessage], batch_size: int = 1000) -> Iterator[Union[RecordBatch, AirbyteMessage]]:
+    """
+    Groups the RECORD messages a destination receives into batches per stream and namespace, so that they can be written in bulk.
+
+    A batch is yielded once it holds batch_size records. Every other message, e.g: STATE, is yielded as is after the batches of all the
+    records received before it, so that a destination which writes each batch as it comes has persisted those records when it gets the
+    state.
+    ```
+    def write(self, config, configured_catalog, input_messages):
+        for item in batch_records(input_messages):
+            if isinstance(item, RecordBatch):
+                insert_many(item.namespace, item.stream, [record.data for record in item.records])
+            elif item.type == Type.STATE:
+                yield item
+    ```
+
+    :param input_messages: the messages received by the destination
+    :param batch_size: maximum number of records in a batch
+    """
+    # Records by (namespace, stream), as streams of the same name may be in different namespaces
+    batches: Dict[Tuple[Optional[str], str], List[AirbyteRecordMessage]] = {}
+    for message in input_messages:
+        if message.type == Type.RECORD:
+            key = (message.record.namespace, message.record.stream)
+            records = batches.setdefault(key, [])
+            records.append(message.record)
+            if len(records) >= batch_size:
+                yield RecordBatch(stream=message.record.stream, records=batches.pop(key), namespace=message.record.namespace)
+        else:
+            yield from _flush_batches(batches)
+            yield message
+    yield from _flush_batches(batches)
+
+
+def _flush_batches(batches: Dict[Tuple[Optional[str], str], List[AirbyteRecordMessage]]) -> Iterator[RecordBatch]:
+    for (namespace, stream), records in batches.items():
+        yield RecordBatch(stream=stream, records=records, namespace=namespace)
+    batches.clear()
@@ -16,8 +16,10 @@ from airbyte_cdk.logger import init_logger
 from airbyte_cdk.models import AirbyteMessage, Status, Type
 from airbyte_cdk.models.airbyte_protocol import ConnectorSpecification
 from airbyte_cdk.sources import Source
+from airbyte_cdk.sources.utils.record_helper import RECORD_MESSAGE_PREFIXES, airbyte_message_to_string
 from airbyte_cdk.sources.utils.schema_helpers import check_config_against_spec_or_exit, split_config
 from airbyte_cdk.utils.airbyte_secrets_utils import get_secrets, update_secrets
+from airbyte_cdk.utils.message_writer import BufferedMessageWriter
 from airbyte_cdk.utils.traced_exception import AirbyteTracedException
 
 logger = init_logger("airbyte")
@@ -120,7 +122,7 @@ class AirbyteEntrypoint(object):
                     state = self.source.read_state(parsed_args.state)
                     generator = self.source.read(self.logger, config, config_catalog, state)
                     for message in generator:
-                        yield message.json(exclude_unset=True)
+                        yield airbyte_message_to_string(message)
                 else:
                     raise Exception("Unexpected command " + cmd)
 
@@ -128,8 +130,10 @@ class AirbyteEntrypoint(object):
 def launch(source: Source, args: List[str]):
     source_entrypoint = AirbyteEntrypoint(source)
     parsed_args = source_entrypoint.parse_args(args)
-    for message in source_entrypoint.run(parsed_args):
-        print(message)
+    with BufferedMessageWriter() as writer:
+        for message in source_entrypoint.run(parsed_args):
+            # Only records are buffered, any other message is written out right away along with the records preceding it
+            writer.write(message, flush=not message.startswith(RECORD_MESSAGE_PREFIXES))
 
 
 def main():
@@ -3,8 +3,10 @@
 #
 
 import logging
+import threading
 from abc import ABC, abstractmethod
-from typing import Any, Dict, Iterator, List, Mapping, MutableMapping, Optional, Tuple, Union
+from queue import Empty, Full, Queue
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Mapping, MutableMapping, Optional, Tuple, Union
 
 from airbyte_cdk.models import (
     AirbyteCatalog,
@@ -22,11 +24,22 @@ from airbyte_cdk.sources.source import Source
 from airbyte_cdk.sources.streams import Stream
 from airbyte_cdk.sources.streams.core import StreamData
 from airbyte_cdk.sources.streams.http.http import HttpStream
+from airbyte_cdk.sources.utils.cursor_watermark import CursorWatermark
+from airbyte_cdk.sources.utils.parent_record_cache import current_parent_record_cache, parent_record_cache_scope
 from airbyte_cdk.sources.utils.record_helper import stream_data_to_airbyte_message
 from airbyte_cdk.sources.utils.schema_helpers import InternalConfig, split_config
-from airbyte_cdk.utils.event_timing import create_timer
+from airbyte_cdk.sources.utils.slice_reader import ConcurrentSliceReader
+from airbyte_cdk.sources.utils.throttling import ReaderPool, ReadScheduler, ReadStopped, StreamThrottle
+from airbyte_cdk.utils.event_timing import EventTimer, create_timer
 from airbyte_cdk.utils.traced_exception import AirbyteTracedException
 
+# Upper bound of messages buffered between the stream reader threads and the consumer when streams are read concurrently
+CONCURRENT_READ_QUEUE_SIZE = 10_000
+# Marker put on the message queue by a stream reader thread once its stream has been fully read
+_STREAM_COMPLETE = object()
+# Number of records between checkpoints of the streams setting max_records_out_of_order but not state_checkpoint_interval
+WATERMARK_CHECKPOINT_INTERVAL = 1000
+
 
 class AbstractSource(Source, ABC):
     """
@@ -98,35 +111,27 @@ class AbstractSource(Source, ABC):
         stream_instances = {s.name: s for s in self.streams(config)}
         state_manager = ConnectorStateManager(stream_instance_map=stream_instances, state=state)
         self._stream_to_instance_map = stream_instances
-        with create_timer(self.name) as timer:
-            for configured_stream in catalog.streams:
-                stream_instance = stream_instances.get(configured_stream.stream.name)
-                if not stream_instance:
-                    raise KeyError(
-                        f"The requested stream {configured_stream.stream.name} was not found in the source."
-                        f" Available streams: {stream_instances.keys()}"
-                    )
-                try:
-                    timer.start_event(f"Syncing stream {configured_stream.stream.name}")
-                    yield from self._read_stream(
-                        logger=logger,
-                        stream_instance=stream_instance,
-                        configured_stream=configured_stream,
-                        state_manager=state_manager,
-                        internal_config=internal_config,
-                    )
-                except AirbyteTracedException as e:
-                    raise e
-                except Exception as e:
-                    logger.exception(f"Encountered an exception while reading stream {configured_stream.stream.name}")
-                    display_message = stream_instance.get_error_display_message(e)
-                    if display_message:
-                        raise AirbyteTracedException.from_exception(e, message=display_message) from e
-                    raise e
-                finally:
-                    timer.finish_event()
-                    logger.info(f"Finished syncing {configured_stream.stream.name}")
-                    logger.info(timer.report())
+        with create_timer(self.name) as timer, parent_record_cache_scope():
+            if self.max_concurrent_streams > 1:
+                yield from self._read_streams_concurrently(logger, catalog, stream_instances, state_manager, internal_config, timer)
+            else:
+                for configured_stream in catalog.streams:
+                    stream_instance = self._get_stream_instance(configured_stream, stream_instances)
+                    try:
+                        timer.start_event(f"Syncing stream {configured_stream.stream.name}")
+                        yield from self._read_stream(
+                            logger=logger,
+                            stream_instance=stream_instance,
+                            configured_stream=configured_stream,
+                            state_manager=state_manager,
+                            internal_config=internal_config,
+                        )
+                    except Exception as e:
+                        self._raise_stream_exception(logger, stream_instance, configured_stream, e)
+                    finally:
+                        timer.finish_event()
+                        logger.info(f"Finished syncing {configured_stream.stream.name}")
+                        logger.info(timer.report())
 
         logger.info(f"Finished syncing {self.name}")
 
@@ -134,6 +139,126 @@ class AbstractSource(Source, ABC):
     def per_stream_state_enabled(self) -> bool:
         return True
 
+    @property
+    def max_concurrent_streams(self) -> int:
+        """
+        Override to read several streams of the catalog at once, each on its own worker thread. This is mostly useful for sources
+        with many independent I/O bound streams. Messages of a given stream keep their order (so every STATE message still follows
+        the records it checkpoints), but messages of different streams are interleaved in the output.
+
+        Streams and their authenticators must be safe to use from a thread other than the main one when this is greater than 1. A stream
+        waiting for a rate limit does not count towards the maximum, so that other streams keep reading until its wait is over.
+        :return: The maximum number of streams read at the same time. Defaults to 1, i.e: streams are read one after another.
+        """
+        return 1
+
+    @staticmethod
+    def _get_stream_instance(configured_stream: ConfiguredAirbyteStream, stream_instances: Mapping[str, Stream]) -> Stream:
+        stream_instance = stream_instances.get(configured_stream.stream.name)
+        if not stream_instance:
+            raise KeyError(
+                f"The requested stream {configured_stream.stream.name} was not found in the source."
+                f" Available streams: {stream_instances.keys()}"
+            )
+        return stream_instance
+
+    @staticmethod
+    def _raise_stream_exception(
+        logger: logging.Logger, stream_instance: Stream, configured_stream: ConfiguredAirbyteStream, exception: Exception
+    ):
+        if isinstance(exception, AirbyteTracedException):
+            raise exception
+        logger.exception(f"Encountered an exception while reading stream {configured_stream.stream.name}", exc_info=exception)
+        display_message = stream_instance.get_error_display_message(exception)
+        if display_message:
+            raise AirbyteTracedException.from_exception(exception, message=display_message) from exception
+        raise exception
+
+    def _read_streams_concurrently(
+        self,
+        logger: logging.Logger,
+        catalog: ConfiguredAirbyteCatalog,
+        stream_instances: Mapping[str, Stream],
+        state_manager: ConnectorStateManager,
+        internal_config: InternalConfig,
+        timer: EventTimer,
+    ) -> Iterator[AirbyteMessage]:
+        """
+        Reads up to max_concurrent_streams streams at a time. Each stream is read by a worker thread which puts its messages on a bounded
+        queue, so a slow consumer applies backpressure on the readers. The first error raised by a stream stops every other reader.
+
+        max_concurrent_streams worker threads take the streams one after another, see ReaderPool. A stream waiting for a rate limit hands
+        its turn of the scheduler over, and an extra worker thread reads the next stream in the meantime.
+        """
+        configured_streams = [
+            (configured_stream, self._get_stream_instance(configured_stream, stream_instances)) for configured_stream in catalog.streams
+        ]
+        messages: Queue = Queue(maxsize=CONCURRENT_READ_QUEUE_SIZE)
+        stop_reading = threading.Event()
+        timer_lock = threading.Lock()
+
+        def put(item) -> bool:
+            while not stop_reading.is_set():
+                try:
+                    messages.put(item, timeout=0.1)
+                    return True
+                except Full:
+                    continue
+            return False
+
+        def read_stream(stream: Tuple[ConfiguredAirbyteStream, Stream]):
+            configured_stream, stream_instance = stream
+            with timer_lock:
+                timer.start_event(f"Syncing stream {configured_stream.stream.name}")
+            try:
+                for message in self._read_stream(
+                    logger=logger,
+                    stream_instance=stream_instance,
+                    configured_stream=configured_stream,
+                    state_manager=state_manager,
+                    internal_config=internal_config,
+                    scheduler=scheduler,
+                ):
+                    if not put((configured_stream, stream_instance, message)):
+                        return
+            except ReadStopped:
+                return
+            except Exception as e:
+                # Streams waiting for a turn give up right away, without waiting for the error to be consumed
+                scheduler.stop()
+                put((configured_stream, stream_instance, e))
+            else:
+                put((configured_stream, stream_instance, _STREAM_COMPLETE))
+
+        readers = ReaderPool(f"{self.name}_stream_reader", configured_streams, read_stream, self.max_concurrent_streams)
+        # A stream waiting for a rate limit lets another stream be read in the meantime
+        scheduler = ReadScheduler(self.max_concurrent_streams, on_turn_handed_over=readers.start_extra_worker)
+        try:
+            readers.start()
+
+            remaining_streams = len(configured_streams)
+            while remaining_streams:
+                try:
+                    configured_stream, stream_instance, item = messages.get(timeout=0.1)
+                except Empty:
+                    continue
+                if isinstance(item, AirbyteMessage):
+                    yield item
+                    continue
+
+                remaining_streams -= 1
+                with timer_lock:
+                    timer.finish_event(f"Syncing stream {configured_stream.stream.name}")
+                logger.info(f"Finished syncing {configured_stream.stream.name}")
+                if isinstance(item, Exception):
+                    self._raise_stream_exception(logger, stream_instance, configured_stream, item)
+            logger.info(timer.report())
+        finally:
+            # Streams waiting for a turn give up before they send any request
+            scheduler.stop()
+            stop_reading.set()
+            readers.stop()
+
     def _read_stream(
         self,
         logger: logging.Logger,
@@ -141,6 +266,7 @@ class AbstractSource(Source, ABC):
         configured_stream: ConfiguredAirbyteStream,
         state_manager: ConnectorStateManager,
         internal_config: InternalConfig,
+        scheduler: Optional[ReadScheduler] = None,
     ) -> Iterator[AirbyteMessage]:
         self._apply_log_level_to_stream_logger(logger, stream_instance)
         if internal_config.page_size and isinstance(stream_instance, HttpStream):
@@ -176,13 +302,18 @@ class AbstractSource(Source, ABC):
 
         record_counter = 0
         stream_name = configured_stream.stream.name
-        logger.info(f"Syncing stream: {stream_name} ")
-        for record in record_iterator:
-            if record.type == MessageType.RECORD:
-                record_counter += 1
-            yield record
+        throttle = StreamThrottle(stream_name, scheduler)
+        with throttle.turn(), throttle.activate():
+            logger.info(f"Syncing stream: {stream_name} ")
+            for record in record_iterator:
+                if record.type == MessageType.RECORD:
+                    record_counter += 1
+                yield record
 
         logger.info(f"Read {record_counter} records from {stream_name} stream")
+        throttle_metrics = throttle.metrics
+        if throttle_metrics.waits:
+            logger.info(f"The {stream_name} stream waited for rate limits: {throttle_metrics}")
 
     @staticmethod
     def _limit_reached(internal_config: InternalConfig, records_counter: int) -> bool:
@@ -230,26 +361,53 @@ class AbstractSource(Source, ABC):
 
         total_records_counter = 0
         has_slices = False
-        for _slice in slices:
-            has_slices = True
-            logger.debug("Processing stream slice", extra={"slice": _slice})
-            records = stream_instance.read_records(
+        concurrent_slices = stream_instance.max_concurrent_slices > 1
+        checkpoint_interval = None if concurrent_slices else stream_instance.state_checkpoint_interval
+        # Streams exposing a state property update it from read_records, so it can't be held back to the watermark
+        max_records_out_of_order = (
+            None if concurrent_slices or "state" in dir(stream_instance) else stream_instance.max_records_out_of_order
+        )
+        if max_records_out_of_order is not None:
+            checkpoint_interval = checkpoint_interval or WATERMARK_CHECKPOINT_INTERVAL
+        cursor_field = configured_stream.cursor_field or stream_instance.cursor_field
+        if max_records_out_of_order is not None and not cursor_field:
+            raise ValueError(
+                f"The {stream_name} stream sets max_records_out_of_order but has no cursor field to order its records by. "
+                "Set the cursor_field of the stream or leave max_records_out_of_order unset."
+            )
+        for _slice, records, can_checkpoint in self._read_slices(
+            stream_instance,
+            slices,
+            lambda stream_slice: stream_instance.read_records(
                 sync_mode=SyncMode.incremental,
-                stream_slice=_slice,
+                stream_slice=stream_slice,
                 stream_state=stream_state,
                 cursor_field=configured_stream.cursor_field or None,
-            )
+            ),
+            window_barrier="state" in dir(stream_instance),
+        ):
+            has_slices = True
+            logger.debug("Processing stream slice", extra={"slice": _slice})
             record_counter = 0
+            watermark = (
+                CursorWatermark(max_records_out_of_order, cursor_field, stream_instance.get_updated_state, stream_state)
+                if max_records_out_of_order is not None
+                else None
+            )
             for message_counter, record_data_or_message in enumerate(records, start=1):
                 message = self._get_message(record_data_or_message, stream_instance)
                 yield message
                 if message.type == MessageType.RECORD:
                     record = message.record
                     stream_state = stream_instance.get_updated_state(stream_state, record.data)
-                    checkpoint_interval = stream_instance.state_checkpoint_interval
+                    if watermark is not None:
+                        watermark.add(record.data)
                     record_counter += 1
                     if checkpoint_interval and record_counter % checkpoint_interval == 0:
-                        yield self._checkpoint_state(stream_instance, stream_state, state_manager)
+                        # Records are out of order, so the state can only move up to the watermark until the slice is fully read
+                        yield self._checkpoint_state(
+                            stream_instance, watermark.state if watermark is not None else stream_state, state_manager
+                        )
 
                     total_records_counter += 1
                     # This functionality should ideally live outside of this method
@@ -259,7 +417,8 @@ class AbstractSource(Source, ABC):
                         # Break from slice loop to save state and exit from _read_incremental function.
                         break
 
-            yield self._checkpoint_state(stream_instance, stream_state, state_manager)
+            if can_checkpoint:
+                yield self._checkpoint_state(stream_instance, stream_state, state_manager)
             if self._limit_reached(internal_config, total_records_counter):
                 return
 
@@ -280,20 +439,47 @@ class AbstractSource(Source, ABC):
             f"Processing stream slices for {configured_stream.stream.name} (sync_mode: full_refresh)", extra={"stream_slices": slices}
         )
         total_records_counter = 0
-        for _slice in slices:
-            logger.debug("Processing stream slice", extra={"slice": _slice})
-            record_data_or_messages = stream_instance.read_records(
-                stream_slice=_slice,
+        parent_record_cache = current_parent_record_cache()
+        # Child streams of this stream read its records from the cache rather than reading it again
+        parent_sync_recorder = parent_record_cache.record_parent_sync(stream_instance) if parent_record_cache else None
+        for _slice, record_data_or_messages, _ in self._read_slices(
+            stream_instance,
+            slices,
+            lambda stream_slice: stream_instance.read_records(
+                stream_slice=stream_slice,
                 sync_mode=SyncMode.full_refresh,
                 cursor_field=configured_stream.cursor_field,
-            )
+            ),
+        ):
+            logger.debug("Processing stream slice", extra={"slice": _slice})
             for record_data_or_message in record_data_or_messages:
+                if parent_sync_recorder:
+                    parent_sync_recorder.add(_slice, record_data_or_message)
                 message = self._get_message(record_data_or_message, stream_instance)
                 yield message
                 if message.type == MessageType.RECORD:
                     total_records_counter += 1
                     if self._limit_reached(internal_config, total_records_counter):
                         return
+        if parent_sync_recorder:
+            parent_sync_recorder.commit()
+
+    @staticmethod
+    def _read_slices(
+        stream_instance: Stream,
+        slices: Iterable[Optional[Mapping[str, Any]]],
+        read_slice: Callable[[Optional[Mapping[str, Any]]], Iterable[StreamData]],
+        window_barrier: bool = False,
+    ) -> Iterator[Tuple[Optional[Mapping[str, Any]], Iterable[StreamData], bool]]:
+        """
+        Reads the slices of a stream in order, concurrently if the stream allows it.
+        :return: an iterator of (slice, records of the slice, whether state can be checkpointed once the records have been emitted)
+        """
+        if stream_instance.max_concurrent_slices > 1:
+            yield from ConcurrentSliceReader(stream_instance.max_concurrent_slices, read_slice, window_barrier=window_barrier).read(slices)
+        else:
+            for _slice in slices:
+                yield _slice, read_slice(_slice), True
 
     def _checkpoint_state(self, stream: Stream, stream_state, state_manager: ConnectorStateManager):
         # First attempt to retrieve the current state using the stream's state property. We receive an AttributeError if the state
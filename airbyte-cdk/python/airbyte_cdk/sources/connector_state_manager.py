@@ -3,6 +3,7 @@
 #
 
 import copy
+import threading
 from typing import Any, List, Mapping, MutableMapping, Optional, Tuple, Union
 
 from airbyte_cdk.models import AirbyteMessage, AirbyteStateBlob, AirbyteStateMessage, AirbyteStateType, AirbyteStreamState, StreamDescriptor
@@ -25,7 +26,8 @@ class HashableStreamDescriptor(StreamDescriptor):
 class ConnectorStateManager:
     """
     ConnectorStateManager consolidates the various forms of a stream's incoming state message (STREAM / GLOBAL / LEGACY) under a common
-    interface. It also provides methods to extract and update state
+    interface. It also provides methods to extract and update state. Updates and state message creation are guarded by a lock so that
+    streams read concurrently can checkpoint through the same manager.
     """
 
     def __init__(self, stream_instance_map: Mapping[str, Stream], state: Union[List[AirbyteStateMessage], MutableMapping[str, Any]] = None):
@@ -42,6 +44,7 @@ class ConnectorStateManager:
                 "state messages with shared_state will not be processed correctly. "
             )
         self.per_stream_states = per_stream_states
+        self._lock = threading.RLock()
 
     def get_stream_state(self, stream_name: str, namespace: Optional[str]) -> Mapping[str, Any]:
         """
@@ -63,7 +66,8 @@ class ConnectorStateManager:
         :param value: A stream state mapping that is being updated for a stream
         """
         stream_descriptor = HashableStreamDescriptor(name=stream_name, namespace=namespace)
-        self.per_stream_states[stream_descriptor] = AirbyteStateBlob.parse_obj(value)
+        with self._lock:
+            self.per_stream_states[stream_descriptor] = AirbyteStateBlob.parse_obj(value)
 
     def create_state_message(self, stream_name: str, namespace: Optional[str], send_per_stream_state: bool) -> AirbyteMessage:
         """
@@ -167,7 +171,8 @@ class ConnectorStateManager:
         Using the current per-stream state, creates a mapping of all the stream states for the connector being synced
         :return: A deep copy of the mapping of stream name to stream state value
         """
-        return {descriptor.name: state.dict() if state else {} for descriptor, state in self.per_stream_states.items()}
+        with self._lock:
+            return {descriptor.name: state.dict() if state else {} for descriptor, state in self.per_stream_states.items()}
 
     @staticmethod
     def _is_legacy_dict_state(state: Union[List[AirbyteStateMessage], MutableMapping[str, Any]]):
@@ -7,7 +7,9 @@ from typing import Any, Iterable, List, Mapping, MutableMapping, Optional, Union
 
 from airbyte_cdk.models import SyncMode
 from airbyte_cdk.sources.declarative.retrievers.retriever import Retriever
+from airbyte_cdk.sources.declarative.retrievers.simple_retriever import SimpleRetriever
 from airbyte_cdk.sources.declarative.schema import DefaultSchemaLoader
+from airbyte_cdk.sources.declarative.schema.caching_schema_loader import CachingSchemaLoader, SchemaCacheInfo
 from airbyte_cdk.sources.declarative.schema.schema_loader import SchemaLoader
 from airbyte_cdk.sources.declarative.transformations import RecordTransformation
 from airbyte_cdk.sources.declarative.types import Config, StreamSlice
@@ -28,7 +30,8 @@ class DeclarativeStream(Stream, JsonSchemaMixin):
         config (Config): The user-provided configuration as specified by the source's spec
         stream_cursor_field (Optional[List[str]]): The cursor field
         transformations (List[RecordTransformation]): A list of transformations to be applied to each output record in the
-        stream. Transformations are applied in the order in which they are defined.
+        stream. Transformations are applied in the order in which they are defined. With a SimpleRetriever, they are applied by the
+        retriever to whole pages of records.
         checkpoint_interval (Optional[int]): How often the stream will checkpoint state (i.e: emit a STATE message)
     """
 
@@ -40,7 +43,7 @@ class DeclarativeStream(Stream, JsonSchemaMixin):
     schema_loader: Optional[SchemaLoader] = None
     _name: str = field(init=False, repr=False, default="")
     _primary_key: str = field(init=False, repr=False, default="")
-    _schema_loader: SchemaLoader = field(init=False, repr=False, default=None)
+    _schema_loader: CachingSchemaLoader = field(init=False, repr=False, default=None)
     stream_cursor_field: Optional[Union[List[str], str]] = None
     transformations: List[RecordTransformation] = None
     checkpoint_interval: Optional[int] = None
@@ -48,7 +51,13 @@ class DeclarativeStream(Stream, JsonSchemaMixin):
     def __post_init__(self, options: Mapping[str, Any]):
         self.stream_cursor_field = self.stream_cursor_field or []
         self.transformations = self.transformations or []
-        self._schema_loader = self.schema_loader if self.schema_loader else DefaultSchemaLoader(config=self.config, options=options)
+        # A SimpleRetriever transforms a copy of each page of records at once, the cursor is updated with the records as read
+        self._transform_records = not isinstance(self.retriever, SimpleRetriever)
+        if not self._transform_records:
+            self.retriever.transformations = self.transformations
+        schema_loader = self.schema_loader if self.schema_loader else DefaultSchemaLoader(config=self.config, options=options)
+        # The schema is requested for every record, it is only loaded and resolved once
+        self._schema_loader = CachingSchemaLoader(schema_loader)
 
     @property
     def primary_key(self) -> Optional[Union[str, List[str], List[List[str]]]]:
@@ -112,7 +121,11 @@ class DeclarativeStream(Stream, JsonSchemaMixin):
         stream_slice: Mapping[str, Any] = None,
         stream_state: Mapping[str, Any] = None,
     ) -> Iterable[Mapping[str, Any]]:
-        for record in self.retriever.read_records(sync_mode, cursor_field, stream_slice, stream_state):
+        records = self.retriever.read_records(sync_mode, cursor_field, stream_slice, stream_state)
+        if not self._transform_records:
+            yield from records
+            return
+        for record in records:
             yield self._apply_transformations(record, self.config, stream_slice)
 
     def _apply_transformations(self, record: Mapping[str, Any], config: Config, stream_slice: StreamSlice):
@@ -128,9 +141,17 @@ class DeclarativeStream(Stream, JsonSchemaMixin):
 
         The default implementation of this method looks for a JSONSchema file with the same name as this stream's "name" property.
         Override as needed.
+
+        The schema is loaded on the first call and the same object is returned afterwards. It must not be modified.
         """
         return self._schema_loader.get_json_schema()
 
+    def schema_cache_info(self) -> SchemaCacheInfo:
+        """
+        :return: the number of get_json_schema calls served from the cache, and the number of calls which loaded the schema
+        """
+        return self._schema_loader.cache_info()
+
     def stream_slices(
         self, *, sync_mode: SyncMode, cursor_field: List[str] = None, stream_state: Mapping[str, Any] = None
     ) -> Iterable[Optional[Mapping[str, Any]]]:
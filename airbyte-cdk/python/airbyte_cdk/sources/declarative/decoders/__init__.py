@@ -3,6 +3,6 @@
 #
 
 from airbyte_cdk.sources.declarative.decoders.decoder import Decoder
-from airbyte_cdk.sources.declarative.decoders.json_decoder import JsonDecoder
+from airbyte_cdk.sources.declarative.decoders.json_decoder import JsonDecoder, JsonlDecoder
 
-__all__ = ["Decoder", "JsonDecoder"]
+__all__ = ["Decoder", "JsonDecoder", "JsonlDecoder"]
@@ -4,7 +4,7 @@
 
 from abc import abstractmethod
 from dataclasses import dataclass
-from typing import Any, List, Mapping, Union
+from typing import Any, Iterable, List, Mapping, Sequence, Union
 
 import requests
 from dataclasses_jsonschema import JsonSchemaMixin
@@ -24,3 +24,21 @@ class Decoder(JsonSchemaMixin):
         :return: Mapping or array describing the response
         """
         pass
+
+    def is_stream_response(self) -> bool:
+        """
+        :return: whether the records are decoded while the response body downloads, in which case the request is sent with stream=True
+        and the records are read with decode_records
+        """
+        return False
+
+    def decode_records(self, response: requests.Response, field_pointer: Sequence[str]) -> Iterable[Mapping[str, Any]]:
+        """
+        Decodes the records at the given path of the response body while it is read, like DpathExtractor extracts them from the decoded
+        response. Only supported by decoders streaming the response.
+
+        :param response: the response to decode
+        :param field_pointer: the path of the records, without wildcards
+        :return: an iterable of the records
+        """
+        raise NotImplementedError(f"{type(self).__name__} does not stream responses")
@@ -2,24 +2,88 @@
 # Copyright (c) 2022 Airbyte, Inc., all rights reserved.
 #
 
+import json
+import weakref
 from dataclasses import InitVar, dataclass
-from typing import Any, List, Mapping, Union
+from typing import Any, Iterable, List, Mapping, Sequence, Union
 
 import requests
 from airbyte_cdk.sources.declarative.decoders.decoder import Decoder
+from airbyte_cdk.sources.streams.http.json_stream import JsonDocumentStream, extract_path, iter_ndjson_records, iter_text_chunks
 from dataclasses_jsonschema import JsonSchemaMixin
 
+# Decoded bodies of the responses whose content was consumed while their records were streamed, so that they can still be decoded
+# afterwards, e.g: by a paginator reading the next page token from the body
+_streamed_bodies: "weakref.WeakKeyDictionary[requests.Response, Union[Mapping[str, Any], List]]" = weakref.WeakKeyDictionary()
+
 
 @dataclass
 class JsonDecoder(Decoder, JsonSchemaMixin):
     """
     Decoder strategy that returns the json-encoded content of a response, if any.
+
+    With stream_response, the requests are sent with stream=True and the records are decoded while the response body downloads, so that
+    the raw body, its text and its decoded form are never all held in memory at once.
+
+    Attributes:
+        stream_response (bool): whether to decode the records while the response body downloads
     """
 
     options: InitVar[Mapping[str, Any]]
+    stream_response: bool = False
 
     def decode(self, response: requests.Response) -> Union[Mapping[str, Any], List]:
+        if response in _streamed_bodies:
+            return _streamed_bodies[response]
         try:
             return response.json()
         except requests.exceptions.JSONDecodeError:
             return {}
+
+    def is_stream_response(self) -> bool:
+        return self.stream_response
+
+    def decode_records(self, response: requests.Response, field_pointer: Sequence[str]) -> Iterable[Mapping[str, Any]]:
+        if response in _streamed_bodies:
+            yield from extract_path(_streamed_bodies[response], field_pointer)
+            return
+        document_stream = JsonDocumentStream(iter_text_chunks(response), field_pointer, keep_records=True)
+        try:
+            yield from document_stream
+        except json.JSONDecodeError:
+            # Like decode, a body which is not valid json is decoded as an empty object
+            _streamed_bodies[response] = {}
+            raise
+        _streamed_bodies[response] = document_stream.document if document_stream.document is not None else {}
+
+
+@dataclass
+class JsonlDecoder(Decoder, JsonSchemaMixin):
+    """
+    Decoder strategy for newline-delimited json responses, e.g: bulk exports. A response is decoded as the list of the json values of its
+    lines, and its records are decoded line by line while the response body downloads.
+    """
+
+    options: InitVar[Mapping[str, Any]]
+
+    def decode(self, response: requests.Response) -> Union[Mapping[str, Any], List]:
+        if response not in _streamed_bodies:
+            _streamed_bodies[response] = list(iter_ndjson_records(response))
+        return _streamed_bodies[response]
+
+    def is_stream_response(self) -> bool:
+        return True
+
+    def decode_records(self, response: requests.Response, field_pointer: Sequence[str]) -> Iterable[Mapping[str, Any]]:
+        if response in _streamed_bodies:
+            for line in _streamed_bodies[response]:
+                yield from extract_path(line, field_pointer)
+            return
+        lines = []
+        try:
+            for line in iter_ndjson_records(response):
+                lines.append(line)
+                yield from extract_path(line, field_pointer)
+        finally:
+            # The lines read before an invalid one are kept, like the records already returned
+            _streamed_bodies[response] = lines
@@ -2,6 +2,7 @@
 # Copyright (c) 2022 Airbyte, Inc., all rights reserved.
 #
 
+import json
 from dataclasses import InitVar, dataclass
 from typing import Any, List, Mapping, Union
 
@@ -14,6 +15,9 @@ from airbyte_cdk.sources.declarative.interpolation.interpolated_string import In
 from airbyte_cdk.sources.declarative.types import Config, Record
 from dataclasses_jsonschema import JsonSchemaMixin
 
+# Characters making a segment of the field pointer a glob matching several fields
+_GLOB_CHARACTERS = frozenset("*?[")
+
 
 @dataclass
 class DpathExtractor(RecordExtractor, JsonSchemaMixin):
@@ -25,6 +29,9 @@ class DpathExtractor(RecordExtractor, JsonSchemaMixin):
     If the field pointer points to an empty object, an empty array is returned.
     If the field pointer points to a non-existing path, an empty array is returned.
 
+    If the decoder streams the response, the records are decoded while the response body downloads, unless the field pointer contains
+    wildcards.
+
     Examples of instantiating this transform:
     ```
       extractor:
@@ -64,12 +71,20 @@ class DpathExtractor(RecordExtractor, JsonSchemaMixin):
             if isinstance(self.field_pointer[pointer_index], str):
                 self.field_pointer[pointer_index] = InterpolatedString.create(self.field_pointer[pointer_index], options=options)
 
+    def is_stream_response(self) -> bool:
+        return self.decoder.is_stream_response()
+
     def extract_records(self, response: requests.Response) -> List[Record]:
+        pointer = [pointer.eval(self.config) for pointer in self.field_pointer]
+        if self.decoder.is_stream_response() and not any(_GLOB_CHARACTERS.intersection(str(segment)) for segment in pointer):
+            try:
+                return list(self.decoder.decode_records(response, pointer))
+            except json.JSONDecodeError:
+                return []
         response_body = self.decoder.decode(response)
         if len(self.field_pointer) == 0:
             extracted = response_body
         else:
-            pointer = [pointer.eval(self.config) for pointer in self.field_pointer]
             extracted = dpath.util.get(response_body, pointer, default=[])
         if isinstance(extracted, list):
             return extracted
@@ -35,3 +35,9 @@ class HttpSelector(JsonSchemaMixin):
         :return: List of Records selected from the response
         """
         pass
+
+    def is_stream_response(self) -> bool:
+        """
+        :return: whether the records are selected while the response body downloads, in which case the request is sent with stream=True
+        """
+        return False
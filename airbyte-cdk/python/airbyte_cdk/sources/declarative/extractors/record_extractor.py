@@ -28,3 +28,9 @@ class RecordExtractor(JsonSchemaMixin):
         :return: List of Records extracted from the response
         """
         pass
+
+    def is_stream_response(self) -> bool:
+        """
+        :return: whether the records are extracted while the response body downloads, in which case the request is sent with stream=True
+        """
+        return False
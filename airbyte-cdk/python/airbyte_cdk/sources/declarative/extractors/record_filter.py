@@ -15,6 +15,9 @@ class RecordFilter(JsonSchemaMixin):
     """
     Filter applied on a list of Records
 
+    The condition is evaluated over the whole list at once. Common comparison and membership conditions are compiled to native python
+    instead of rendering the template for every record.
+
     config (Config): The user-provided configuration as specified by the source's spec
     condition (str): The string representing the predicate to filter a record. Records will be removed if evaluated to False
     """
@@ -34,4 +37,5 @@ class RecordFilter(JsonSchemaMixin):
         next_page_token: Optional[Mapping[str, Any]] = None,
     ) -> List[Record]:
         kwargs = {"stream_state": stream_state, "stream_slice": stream_slice, "next_page_token": next_page_token}
-        return [record for record in records if self._filter_interpolator.eval(self.config, record=record, **kwargs)]
+        keep = self._filter_interpolator.eval_batch(self.config, "record", records, **kwargs)
+        return [record for record, keep_record in zip(records, keep) if keep_record]
@@ -31,6 +31,9 @@ class RecordSelector(HttpSelector, JsonSchemaMixin):
     def __post_init__(self, options: Mapping[str, Any]):
         self._options = options
 
+    def is_stream_response(self) -> bool:
+        return self.extractor.is_stream_response()
+
     def select_records(
         self,
         response: requests.Response,
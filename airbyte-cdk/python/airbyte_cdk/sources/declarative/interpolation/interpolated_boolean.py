@@ -3,7 +3,7 @@
 #
 
 from dataclasses import InitVar, dataclass
-from typing import Any, Final, List, Mapping
+from typing import Any, Final, Iterable, List, Mapping
 
 from airbyte_cdk.sources.declarative.interpolation.jinja import JinjaInterpolation
 from airbyte_cdk.sources.declarative.types import Config
@@ -45,3 +45,28 @@ class InterpolatedBoolean(JsonSchemaMixin):
                 return False
             # The presence of a value is generally regarded as truthy, so we treat it as such
             return True
+
+    def eval_batch(self, config: Config, name: str, values: Iterable[Any], **additional_options) -> List[bool]:
+        """
+        Evaluates the predicate condition once for each value, the value being passed to the interpolation as the `name` argument.
+
+        Conditions made of comparisons and membership tests are compiled once to a native python callable. Other conditions are
+        evaluated through eval.
+
+        :param config: The user-provided configuration as specified by the source's spec
+        :param name: The name under which each value is available to the interpolation, e.g: "record"
+        :param values: The values to evaluate the condition for
+        :param additional_options: Optional parameters used for interpolation, shared by every evaluation
+        :return: The evaluated condition for each value
+        """
+        if isinstance(self.condition, bool):
+            return [self.condition for _ in values]
+        predicate = self._interpolation.compile_predicate(self.condition)
+        if predicate is None:
+            return [self.eval(config, **{name: value}, **additional_options) for value in values]
+        context = {"config": config, "options": self._options, **additional_options}
+        results = []
+        for value in values:
+            context[name] = value
+            results.append(predicate(context))
+        return results
@@ -40,6 +40,22 @@ class InterpolatedString(JsonSchemaMixin):
         """
         return self._interpolation.eval(self.string, config, self.default, options=self._options, **kwargs)
 
+    def references(self, name: str) -> bool:
+        """
+        Tells whether the value depends on the context variable `name`. Values which don't depend on the record can for instance be
+        evaluated once for many records.
+
+        :param name: the name of the variable, e.g: record
+        :return: False if neither the string nor its default use the variable
+        """
+        for string in (self.string, self.default):
+            if not isinstance(string, str):
+                continue
+            variables = self._interpolation.referenced_variables(string)
+            if variables is None or name in variables:
+                return True
+        return False
+
     def __eq__(self, other):
         if not isinstance(other, InterpolatedString):
             return False
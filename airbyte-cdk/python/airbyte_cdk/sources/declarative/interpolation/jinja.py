@@ -3,14 +3,53 @@
 #
 
 import ast
-from typing import Optional
+import copy
+import threading
+from typing import Any, FrozenSet, Optional, Union
 
 from airbyte_cdk.sources.declarative.interpolation.filters import filters
 from airbyte_cdk.sources.declarative.interpolation.interpolation import Interpolation
 from airbyte_cdk.sources.declarative.interpolation.macros import macros
+from airbyte_cdk.sources.declarative.interpolation.native_predicate import Predicate, compile_predicate
 from airbyte_cdk.sources.declarative.types import Config
-from jinja2 import Environment
-from jinja2.exceptions import UndefinedError
+from cachetools import LRUCache
+from jinja2 import Environment, Template, meta
+from jinja2.exceptions import TemplateSyntaxError, UndefinedError
+
+# Maximum number of compiled templates kept in memory. Manifests rarely define more than a few hundred distinct templates
+TEMPLATE_CACHE_SIZE = 1024
+# Jinja delimiters. A string which contains none of them renders to itself and does not need to be compiled
+_JINJA_DELIMITERS = ("{{", "{%", "{#")
+
+
+class _StaticValue:
+    """
+    A string without any jinja syntax. It does not depend on the interpolation context, so it is rendered and literal-evaluated once.
+    """
+
+    def __init__(self, rendered: str, evaluated: Any):
+        self.rendered = rendered
+        self._evaluated = evaluated
+        self._is_mutable = isinstance(evaluated, (dict, list, set))
+
+    def __bool__(self):
+        return bool(self.rendered)
+
+    @property
+    def evaluated(self) -> Any:
+        # Callers must not be able to alter the cached value
+        return copy.deepcopy(self._evaluated) if self._is_mutable else self._evaluated
+
+
+# Compiled templates are shared by every JinjaInterpolation since they all use the same environment
+_environment = Environment()
+_environment.filters.update(**filters)
+_environment.globals.update(**macros)
+_compiled_templates: LRUCache = LRUCache(maxsize=TEMPLATE_CACHE_SIZE)
+_compiled_templates_lock = threading.Lock()
+# Conditions which cannot be compiled to native predicates are cached as well, to only parse them once
+_compiled_predicates: LRUCache = LRUCache(maxsize=TEMPLATE_CACHE_SIZE)
+_compiled_predicates_lock = threading.Lock()
 
 
 class JinjaInterpolation(Interpolation):
@@ -29,12 +68,13 @@ class JinjaInterpolation(Interpolation):
     "{{ max(2, 3) }}" will return 3
 
     Additional information on jinja templating can be found at https://jinja.palletsprojects.com/en/3.1.x/templates/#
+
+    Templates are compiled once and kept in a bounded LRU cache shared by every instance. Strings without any jinja syntax are rendered
+    and literal-evaluated once, then returned as constants.
     """
 
     def __init__(self):
-        self._environment = Environment()
-        self._environment.filters.update(**filters)
-        self._environment.globals.update(**macros)
+        self._environment = _environment
 
     def eval(self, input_str: str, config: Config, default: Optional[str] = None, **additional_options):
         context = {"config": config, **additional_options}
@@ -51,7 +91,35 @@ class JinjaInterpolation(Interpolation):
         # If result is empty or resulted in an undefined error, evaluate and return the default string
         return self._literal_eval(self._eval(default, context))
 
+    def compile_predicate(self, condition: str) -> Optional[Predicate]:
+        """
+        Compiles a boolean condition to a native python callable taking the interpolation context, so that it can be evaluated for many
+        contexts without rendering the template. See native_predicate.compile_predicate for the supported conditions.
+
+        :param condition: the condition to compile
+        :return: the compiled predicate, or None if the condition must be evaluated through eval
+        """
+        with _compiled_predicates_lock:
+            if condition in _compiled_predicates:
+                return _compiled_predicates[condition]
+        predicate = compile_predicate(self._environment, condition)
+        with _compiled_predicates_lock:
+            _compiled_predicates[condition] = predicate
+        return predicate
+
+    def referenced_variables(self, input_str: str) -> Optional[FrozenSet[str]]:
+        """
+        :param input_str: the string to interpolate
+        :return: the names of the context variables the string uses, e.g: {"config", "record"}, or None if the string cannot be parsed
+        """
+        try:
+            return frozenset(meta.find_undeclared_variables(self._environment.parse(input_str))) - self._environment.globals.keys()
+        except TemplateSyntaxError:
+            return None
+
     def _literal_eval(self, result):
+        if isinstance(result, _StaticValue):
+            return result.evaluated
         try:
             return ast.literal_eval(result)
         except (ValueError, SyntaxError):
@@ -59,8 +127,25 @@ class JinjaInterpolation(Interpolation):
 
     def _eval(self, s: str, context):
         try:
-            return self._environment.from_string(s).render(context)
+            template = self._compile(s)
         except TypeError:
             # The string is a static value, not a jinja template
             # It can be returned as is
             return s
+        if isinstance(template, _StaticValue):
+            return template
+        return template.render(context)
+
+    def _compile(self, s: str) -> Union[Template, _StaticValue]:
+        with _compiled_templates_lock:
+            template = _compiled_templates.get(s)
+        if template is None:
+            if any(delimiter in s for delimiter in _JINJA_DELIMITERS):
+                template = self._environment.from_string(s)
+            else:
+                # Render through jinja anyway so that static values go through the same processing, e.g: trailing new line removal
+                rendered = self._environment.from_string(s).render()
+                template = _StaticValue(rendered, self._literal_eval(rendered))
+            with _compiled_templates_lock:
+                _compiled_templates[s] = template
+        return template
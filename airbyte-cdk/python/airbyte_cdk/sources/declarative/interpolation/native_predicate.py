@@ -0,0 +1,137 @@
+#
+# Copyright (c) 2022 Airbyte, Inc., all rights reserved.
+#
+
+import operator
+from typing import Any, Callable, Mapping, Optional
+
+from jinja2 import Environment, nodes
+from jinja2.exceptions import TemplateSyntaxError, UndefinedError
+
+# A compiled predicate takes the interpolation context and returns whether the condition holds
+Predicate = Callable[[Mapping[str, Any]], bool]
+_Operand = Callable[[Mapping[str, Any]], Any]
+
+_COMPARISONS = {
+    "eq": operator.eq,
+    "ne": operator.ne,
+    "gt": operator.gt,
+    "gteq": operator.ge,
+    "lt": operator.lt,
+    "lteq": operator.le,
+    "in": lambda a, b: a in b,
+    "notin": lambda a, b: a not in b,
+}
+
+
+class _UnsupportedExpression(Exception):
+    """The expression uses syntax which is not compiled to native python"""
+
+
+def compile_predicate(environment: Environment, condition: str) -> Optional[Predicate]:
+    """
+    Compiles a jinja condition into a native python callable, skipping the rendering and literal evaluation of the template.
+
+    Only conditions made of a single expression whose result is a boolean are supported: comparisons and membership tests between
+    context variables, item or attribute lookups and literals, possibly combined with `and`, `or` and `not`.
+    `{{ record['updated_at'] > stream_state['updated_at'] and record['status'] in ['active', 'pending'] }}`
+
+    Lookups are resolved by the environment the same way the template would resolve them, so the predicate returns the same result as
+    the rendered template. A lookup which is undefined and used in a comparison makes the predicate False.
+
+    :param environment: the environment the condition would be rendered with
+    :param condition: the jinja condition
+    :return: the compiled predicate, or None if the condition is not supported
+    """
+    try:
+        template = environment.parse(condition)
+    except TemplateSyntaxError:
+        return None
+    if len(template.body) != 1 or not isinstance(template.body[0], nodes.Output) or len(template.body[0].nodes) != 1:
+        return None
+    try:
+        predicate = _compile_predicate(environment, template.body[0].nodes[0])
+    except _UnsupportedExpression:
+        return None
+
+    def evaluate(context: Mapping[str, Any]) -> bool:
+        try:
+            return predicate(context)
+        except UndefinedError:
+            return False
+
+    return evaluate
+
+
+def _compile_predicate(environment: Environment, node: nodes.Node) -> _Operand:
+    # Only nodes which evaluate to a boolean are predicates. Jinja's `and` and `or` return one of their operands, so they are only
+    # supported between predicates
+    if isinstance(node, nodes.Compare):
+        return _compile_compare(environment, node)
+    if isinstance(node, nodes.Not):
+        operand = _compile_operand(environment, node.node)
+        return lambda context: not operand(context)
+    if isinstance(node, nodes.And):
+        left, right = _compile_predicate(environment, node.left), _compile_predicate(environment, node.right)
+        return lambda context: left(context) and right(context)
+    if isinstance(node, nodes.Or):
+        left, right = _compile_predicate(environment, node.left), _compile_predicate(environment, node.right)
+        return lambda context: left(context) or right(context)
+    raise _UnsupportedExpression(node)
+
+
+def _compile_compare(environment: Environment, node: nodes.Compare) -> _Operand:
+    first = _compile_operand(environment, node.expr)
+    comparisons = []
+    for operand in node.ops:
+        if operand.op not in _COMPARISONS:
+            raise _UnsupportedExpression(node)
+        comparisons.append((_COMPARISONS[operand.op], _compile_operand(environment, operand.expr)))
+
+    if len(comparisons) == 1:
+        compare, second = comparisons[0]
+        return lambda context: compare(first(context), second(context))
+
+    def chained_compare(context: Mapping[str, Any]) -> bool:
+        left = first(context)
+        for compare, get_right in comparisons:
+            right = get_right(context)
+            if not compare(left, right):
+                return False
+            left = right
+        return True
+
+    return chained_compare
+
+
+def _compile_operand(environment: Environment, node: nodes.Node) -> _Operand:
+    if isinstance(node, nodes.Const):
+        value = node.value
+        return lambda context: value
+    if isinstance(node, (nodes.List, nodes.Tuple)):
+        items = [_compile_operand(environment, item) for item in node.items]
+        container = list if isinstance(node, nodes.List) else tuple
+        if all(isinstance(item, nodes.Const) for item in node.items):
+            constant = container(item.value for item in node.items)
+            return lambda context: constant
+        return lambda context: container(item(context) for item in items)
+    if isinstance(node, nodes.Name):
+        return _compile_name(environment, node.name)
+    if isinstance(node, nodes.Getitem) and isinstance(node.arg, nodes.Const):
+        obj, key = _compile_operand(environment, node.node), node.arg.value
+        return lambda context: environment.getitem(obj(context), key)
+    if isinstance(node, nodes.Getattr):
+        obj, attribute = _compile_operand(environment, node.node), node.attr
+        return lambda context: environment.getattr(obj(context), attribute)
+    return _compile_predicate(environment, node)
+
+
+def _compile_name(environment: Environment, name: str) -> _Operand:
+    def resolve(context: Mapping[str, Any]) -> Any:
+        if name in context:
+            return context[name]
+        if name in environment.globals:
+            return environment.globals[name]
+        return environment.undefined(name=name)
+
+    return resolve
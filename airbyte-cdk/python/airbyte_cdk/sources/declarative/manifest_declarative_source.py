@@ -8,7 +8,7 @@ import logging
 import typing
 from dataclasses import dataclass, fields
 from enum import Enum, EnumMeta
-from typing import Any, Iterator, List, Mapping, MutableMapping, Union
+from typing import Any, Iterator, List, Mapping, MutableMapping, Optional, Union
 
 from airbyte_cdk.models import (
     AirbyteConnectionStatus,
@@ -23,6 +23,7 @@ from airbyte_cdk.sources.declarative.declarative_source import DeclarativeSource
 from airbyte_cdk.sources.declarative.declarative_stream import DeclarativeStream
 from airbyte_cdk.sources.declarative.exceptions import InvalidConnectorDefinitionException
 from airbyte_cdk.sources.declarative.parsers.factory import DeclarativeComponentFactory
+from airbyte_cdk.sources.declarative.parsers.manifest_cache import ManifestCache
 from airbyte_cdk.sources.declarative.parsers.manifest_reference_resolver import ManifestReferenceResolver
 from airbyte_cdk.sources.declarative.types import ConnectionDefinition
 from airbyte_cdk.sources.streams.core import Stream
@@ -38,22 +39,40 @@ class ConcreteDeclarativeSource(JsonSchemaMixin):
 
 
 class ManifestDeclarativeSource(DeclarativeSource):
-    """Declarative source defined by a manifest of low-code components that define source connector behavior"""
+    """
+    Declarative source defined by a manifest of low-code components that define source connector behavior
+
+    Resolving the references of the manifest and validating it are done every time the source is created. When a manifest cache is
+    configured, e.g: with the AIRBYTE_MANIFEST_CACHE_DIR environment variable, the resolved and validated manifest is stored on disk so
+    that the next processes running the connector with the same manifest skip both steps.
+    """
 
     VALID_TOP_LEVEL_FIELDS = {"check", "definitions", "schemas", "spec", "streams", "version"}
 
-    def __init__(self, source_config: ConnectionDefinition, debug: bool = False):
+    def __init__(self, source_config: ConnectionDefinition, debug: bool = False, manifest_cache: Optional[ManifestCache] = None):
         """
         :param source_config(Mapping[str, Any]): The manifest of low-code components that describe the source connector
         :param debug(bool): True if debug mode is enabled
+        :param manifest_cache(Optional[ManifestCache]): cache of resolved manifests. Defaults to the cache configured through the
+        environment, if any
         """
         self.logger = logging.getLogger(f"airbyte.{self.name}")
+        self._debug = debug
+        self._factory = DeclarativeComponentFactory()
+        manifest_cache = manifest_cache or ManifestCache.from_environment()
+        # The key is computed before resolving references, which can modify the manifest
+        cache_key = manifest_cache.key(source_config) if manifest_cache else None
+
+        cached_source_config = manifest_cache.get(cache_key) if cache_key else None
+        self.loaded_from_manifest_cache = cached_source_config is not None
+        if self.loaded_from_manifest_cache:
+            self.logger.debug("Loaded the resolved manifest from the manifest cache")
+            self._source_config = cached_source_config
+            return
 
         evaluated_manifest = {}
         resolved_source_config = ManifestReferenceResolver().preprocess_manifest(source_config, evaluated_manifest, "")
         self._source_config = resolved_source_config
-        self._debug = debug
-        self._factory = DeclarativeComponentFactory()
 
         self._validate_source()
 
@@ -62,6 +81,9 @@ class ManifestDeclarativeSource(DeclarativeSource):
         if unknown_fields:
             raise InvalidConnectorDefinitionException(f"Found unknown top-level fields: {unknown_fields}")
 
+        if cache_key:
+            manifest_cache.put(cache_key, self._source_config)
+
     @property
     def connection_checker(self) -> ConnectionChecker:
         check = self._source_config["check"]
@@ -0,0 +1,106 @@
+#
+# Copyright (c) 2022 Airbyte, Inc., all rights reserved.
+#
+
+import hashlib
+import json
+import logging
+import os
+import tempfile
+from importlib import metadata
+from typing import Optional
+
+from airbyte_cdk.sources.declarative.types import ConnectionDefinition
+
+logger = logging.getLogger("airbyte")
+
+# Environment variable pointing to the directory of the manifest cache. The cache is disabled when it is not set
+MANIFEST_CACHE_DIR_ENV_VAR = "AIRBYTE_MANIFEST_CACHE_DIR"
+# Bumped whenever the content of the cache entries changes, so that entries written by another version of this module are ignored
+_CACHE_FORMAT_VERSION = 1
+
+
+def _cdk_version() -> str:
+    try:
+        return metadata.version("airbyte-cdk")
+    except metadata.PackageNotFoundError:
+        return "unknown"
+
+
+class ManifestCache:
+    """
+    Caches the resolved and validated form of low-code manifests on local disk, so that a connector process does not resolve references
+    and validate the manifest again when another process already did it for the same manifest.
+
+    Entries are keyed by a hash of the manifest content and of the CDK version, so a modified manifest or an upgraded CDK misses the cache.
+    Each entry is a json file written atomically. Entries which can't be read are ignored, and failing to write an entry only skips
+    caching.
+    """
+
+    def __init__(self, cache_dir: str):
+        """
+        :param cache_dir: directory where the cache entries are stored. It is created if it does not exist
+        """
+        self._cache_dir = cache_dir
+
+    @classmethod
+    def from_environment(cls) -> Optional["ManifestCache"]:
+        """
+        :return: a cache stored in the directory set by the AIRBYTE_MANIFEST_CACHE_DIR environment variable, or None if it is not set
+        """
+        cache_dir = os.environ.get(MANIFEST_CACHE_DIR_ENV_VAR)
+        return cls(cache_dir) if cache_dir else None
+
+    def key(self, manifest: ConnectionDefinition) -> Optional[str]:
+        """
+        :param manifest: the manifest as written by the connector developer, before its references are resolved
+        :return: the key of the manifest in the cache, or None if the manifest can't be cached, e.g: it contains dates parsed from yaml
+        """
+        try:
+            serialized_manifest = json.dumps(manifest, sort_keys=True)
+        except (TypeError, ValueError):
+            return None
+        return hashlib.sha256(f"{_CACHE_FORMAT_VERSION}\n{_cdk_version()}\n{serialized_manifest}".encode()).hexdigest()
+
+    def get(self, key: str) -> Optional[ConnectionDefinition]:
+        """
+        :param key: the key of the manifest
+        :return: the resolved and validated manifest, or None if it is not cached
+        """
+        path = self._entry_path(key)
+        if not os.path.exists(path):
+            return None
+        try:
+            with open(path) as entry:
+                return json.load(entry)["resolved_manifest"]
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            logger.debug(f"Ignoring unreadable manifest cache entry {path}: {e}")
+            return None
+
+    def put(self, key: str, resolved_manifest: ConnectionDefinition):
+        """
+        :param key: the key of the manifest
+        :param resolved_manifest: the manifest once its references have been resolved and it has been validated
+        """
+        path = self._entry_path(key)
+        try:
+            content = json.dumps({"resolved_manifest": resolved_manifest})
+            if json.loads(content)["resolved_manifest"] != resolved_manifest:
+                # e.g: keys which are not strings. The manifest read back from the cache would differ from the resolved one
+                logger.debug("Not caching a manifest which does not round trip through json")
+                return
+            os.makedirs(self._cache_dir, exist_ok=True)
+            # Written to a temporary file first, so that a process reading the entry never sees it partially written
+            file_descriptor, temporary_path = tempfile.mkstemp(dir=self._cache_dir, suffix=".tmp")
+            try:
+                with os.fdopen(file_descriptor, "w") as entry:
+                    entry.write(content)
+                os.replace(temporary_path, path)
+            except BaseException:
+                os.remove(temporary_path)
+                raise
+        except (OSError, TypeError, ValueError) as e:
+            logger.debug(f"Could not write the manifest cache entry {path}: {e}")
+
+    def _entry_path(self, key: str) -> str:
+        return os.path.join(self._cache_dir, f"{key}.json")
@@ -3,7 +3,8 @@
 #
 
 from airbyte_cdk.sources.declarative.requesters.http_requester import HttpRequester
+from airbyte_cdk.sources.declarative.requesters.rate_limit import RateLimit
 from airbyte_cdk.sources.declarative.requesters.request_option import RequestOption
 from airbyte_cdk.sources.declarative.requesters.requester import Requester
 
-__all__ = ["HttpRequester", "RequestOption", "Requester"]
+__all__ = ["HttpRequester", "RateLimit", "RequestOption", "Requester"]
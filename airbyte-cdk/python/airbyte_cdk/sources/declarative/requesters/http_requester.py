@@ -13,11 +13,13 @@ from airbyte_cdk.sources.declarative.interpolation.interpolated_string import In
 from airbyte_cdk.sources.declarative.requesters.error_handlers.default_error_handler import DefaultErrorHandler
 from airbyte_cdk.sources.declarative.requesters.error_handlers.error_handler import ErrorHandler
 from airbyte_cdk.sources.declarative.requesters.error_handlers.response_status import ResponseStatus
+from airbyte_cdk.sources.declarative.requesters.rate_limit import RateLimit
 from airbyte_cdk.sources.declarative.requesters.request_options.interpolated_request_options_provider import (
     InterpolatedRequestOptionsProvider,
 )
 from airbyte_cdk.sources.declarative.requesters.requester import HttpMethod, Requester
 from airbyte_cdk.sources.declarative.types import Config, StreamSlice, StreamState
+from airbyte_cdk.sources.streams.http.rate_limiter import TokenBucketRateLimiter
 from dataclasses_jsonschema import JsonSchemaMixin
 
 
@@ -34,6 +36,7 @@ class HttpRequester(Requester, JsonSchemaMixin):
         request_options_provider (Optional[InterpolatedRequestOptionsProvider]): request option provider defining the options to set on outgoing requests
         authenticator (DeclarativeAuthenticator): Authenticator defining how to authenticate to the source
         error_handler (Optional[ErrorHandler]): Error handler defining how to detect and handle errors
+        rate_limit (Optional[RateLimit]): Rate limit of the requests, shared with the requesters of the same group
         config (Config): The user-provided configuration as specified by the source's spec
     """
 
@@ -46,6 +49,7 @@ class HttpRequester(Requester, JsonSchemaMixin):
     request_options_provider: Optional[InterpolatedRequestOptionsProvider] = None
     authenticator: DeclarativeAuthenticator = None
     error_handler: Optional[ErrorHandler] = None
+    rate_limit: Optional[RateLimit] = None
 
     def __post_init__(self, options: Mapping[str, Any]):
         self.url_base = InterpolatedString.create(self.url_base, options=options)
@@ -62,6 +66,7 @@ class HttpRequester(Requester, JsonSchemaMixin):
         self._method = self.http_method
         self.error_handler = self.error_handler or DefaultErrorHandler(options=options, config=self.config)
         self._options = options
+        self._rate_limiter: Optional[TokenBucketRateLimiter] = None
 
     # We are using an LRU cache in should_retry() method which requires all incoming arguments (including self) to be hashable.
     # Dataclasses by default are not hashable, so we need to define __hash__(). Alternatively, we can set @dataclass(frozen=True),
@@ -75,6 +80,12 @@ class HttpRequester(Requester, JsonSchemaMixin):
     def get_url_base(self):
         return os.path.join(self.url_base.eval(self.config), "")
 
+    def get_rate_limiter(self) -> Optional[TokenBucketRateLimiter]:
+        if self.rate_limit is not None and self._rate_limiter is None:
+            # Built lazily because the url base, which is the default group, may depend on the config
+            self._rate_limiter = self.rate_limit.get_rate_limiter(default_group=self.get_url_base())
+        return self._rate_limiter
+
     def get_path(
         self, *, stream_state: Optional[StreamState], stream_slice: Optional[StreamSlice], next_page_token: Optional[Mapping[str, Any]]
     ) -> str:
@@ -0,0 +1,44 @@
+#
+# Copyright (c) 2022 Airbyte, Inc., all rights reserved.
+#
+
+from dataclasses import InitVar, dataclass
+from typing import Any, Mapping, Optional, Union
+
+from airbyte_cdk.sources.declarative.interpolation.interpolated_string import InterpolatedString
+from airbyte_cdk.sources.declarative.types import Config
+from airbyte_cdk.sources.streams.http.rate_limiter import TokenBucketRateLimiter, shared_rate_limiter
+from dataclasses_jsonschema import JsonSchemaMixin
+
+
+@dataclass
+class RateLimit(JsonSchemaMixin):
+    """
+    Limits the rate of the requests sent by a requester. Requesters using the same group share the same request budget, so that the
+    streams of a source calling the same API don't exceed its rate limit together. The limit adapts to the Retry-After and
+    X-RateLimit-* headers of the responses.
+
+    Attributes:
+        requests_per_second (Union[float, InterpolatedString, str]): maximum sustained rate of requests
+        burst (int): maximum number of requests sent at once after the requester has been idle
+        group (Optional[str]): name of the group of requests sharing the limit. Defaults to the url base of the requester
+    """
+
+    requests_per_second: Union[float, InterpolatedString, str]
+    options: InitVar[Mapping[str, Any]]
+    config: Config
+    burst: int = 1
+    group: Optional[str] = None
+
+    def __post_init__(self, options: Mapping[str, Any]):
+        if not isinstance(self.requests_per_second, InterpolatedString):
+            self.requests_per_second = str(self.requests_per_second)
+        self.requests_per_second = InterpolatedString.create(self.requests_per_second, options=options)
+
+    def get_rate_limiter(self, default_group: str) -> TokenBucketRateLimiter:
+        """
+        :param default_group: group of the requests if none is set
+        :return: the rate limiter shared by the requesters of the group
+        """
+        requests_per_second = float(self.requests_per_second.eval(self.config))
+        return shared_rate_limiter(self.group or default_group, requests_per_second, self.burst)
@@ -10,6 +10,7 @@ import requests
 from airbyte_cdk.sources.declarative.requesters.error_handlers.response_status import ResponseStatus
 from airbyte_cdk.sources.declarative.requesters.request_options.request_options_provider import RequestOptionsProvider
 from airbyte_cdk.sources.declarative.types import StreamSlice, StreamState
+from airbyte_cdk.sources.streams.http.rate_limiter import TokenBucketRateLimiter
 from dataclasses_jsonschema import JsonSchemaMixin
 from requests.auth import AuthBase
 
@@ -37,6 +38,12 @@ class Requester(RequestOptionsProvider, JsonSchemaMixin):
         :return: URL base for the  API endpoint e.g: if you wanted to hit https://myapi.com/v1/some_entity then this should return "https://myapi.com/v1/"
         """
 
+    def get_rate_limiter(self) -> Optional[TokenBucketRateLimiter]:
+        """
+        :return: the rate limiter the requests wait for before being sent, or None if they are not rate limited
+        """
+        return None
+
     @abstractmethod
     def get_path(
         self,
@@ -2,10 +2,12 @@
 # Copyright (c) 2022 Airbyte, Inc., all rights reserved.
 #
 
+import copy
 import json
 import logging
 from dataclasses import InitVar, dataclass, field
-from typing import Any, Iterable, List, Mapping, MutableMapping, Optional, Union
+from functools import partial
+from typing import Any, Iterable, List, Mapping, MutableMapping, NamedTuple, Optional, Union
 
 import requests
 from airbyte_cdk.models import AirbyteLogMessage, AirbyteMessage, Level, SyncMode
@@ -20,13 +22,23 @@ from airbyte_cdk.sources.declarative.requesters.requester import Requester
 from airbyte_cdk.sources.declarative.retrievers.retriever import Retriever
 from airbyte_cdk.sources.declarative.stream_slicers.single_slice import SingleSlice
 from airbyte_cdk.sources.declarative.stream_slicers.stream_slicer import StreamSlicer
+from airbyte_cdk.sources.declarative.transformations import RecordTransformation
 from airbyte_cdk.sources.declarative.types import Config, Record, StreamSlice, StreamState
 from airbyte_cdk.sources.streams.core import StreamData
-from airbyte_cdk.sources.streams.http import HttpStream
+from airbyte_cdk.sources.streams.http import HttpStream, TokenBucketRateLimiter
 from airbyte_cdk.utils.airbyte_secrets_utils import filter_secrets
 from dataclasses_jsonschema import JsonSchemaMixin
 
 
+class _TransformedRecord(NamedTuple):
+    """
+    A record as read, given to the cursor, along with its transformed copy, which is emitted
+    """
+
+    record: Record
+    transformed_record: Record
+
+
 @dataclass
 class SimpleRetriever(Retriever, HttpStream, JsonSchemaMixin):
     """
@@ -40,6 +52,9 @@ class SimpleRetriever(Retriever, HttpStream, JsonSchemaMixin):
     As a result, some of the parameters passed to some methods are unused.
     The two will be decoupled in a future release.
 
+    The transformations of the stream are handed to the retriever, which applies them to a copy of each page of records once it has
+    been selected. The stream slicer and the paginator are given the records as read, only the transformed copies are emitted.
+
     Attributes:
         stream_name (str): The stream's name
         stream_primary_key (Optional[Union[str, List[str], List[List[str]]]]): The stream's primary key
@@ -48,6 +63,7 @@ class SimpleRetriever(Retriever, HttpStream, JsonSchemaMixin):
         paginator (Optional[Paginator]): The paginator
         stream_slicer (Optional[StreamSlicer]): The stream slicer
         options (Mapping[str, Any]): Additional runtime parameters to be used for string interpolation
+        max_prefetched_pages (int): The number of pages fetched on a background thread ahead of the page whose records are emitted
     """
 
     requester: Requester
@@ -60,9 +76,11 @@ class SimpleRetriever(Retriever, HttpStream, JsonSchemaMixin):
     _primary_key: str = field(init=False, repr=False, default="")
     paginator: Optional[Paginator] = None
     stream_slicer: Optional[StreamSlicer] = SingleSlice(options={})
+    max_prefetched_pages: int = 0
 
     def __post_init__(self, options: Mapping[str, Any]):
         self.paginator = self.paginator or NoPagination(options=options)
+        self.transformations: List[RecordTransformation] = []
         HttpStream.__init__(self, self.requester.get_authenticator())
         self._last_response = None
         self._last_records = None
@@ -85,6 +103,10 @@ class SimpleRetriever(Retriever, HttpStream, JsonSchemaMixin):
     def url_base(self) -> str:
         return self.requester.get_url_base()
 
+    @property
+    def rate_limiter(self) -> Optional[TokenBucketRateLimiter]:
+        return self.requester.get_rate_limiter()
+
     @property
     def http_method(self) -> str:
         return str(self.requester.get_method().value)
@@ -268,7 +290,11 @@ class SimpleRetriever(Retriever, HttpStream, JsonSchemaMixin):
         this method. Note that these options do not conflict with request-level options such as headers, request params, etc..
         """
         # Warning: use self.state instead of the stream_state passed as argument!
-        return self.requester.request_kwargs(stream_state=self.state, stream_slice=stream_slice, next_page_token=next_page_token)
+        request_kwargs = self.requester.request_kwargs(stream_state=self.state, stream_slice=stream_slice, next_page_token=next_page_token)
+        if self.record_selector.is_stream_response():
+            # The records are decoded while the response body downloads
+            return {**request_kwargs, "stream": True}
+        return request_kwargs
 
     def path(
         self,
@@ -367,15 +393,18 @@ class SimpleRetriever(Retriever, HttpStream, JsonSchemaMixin):
         stream_slice = stream_slice or {}  # None-check
         self.paginator.reset()
         records_generator = self._read_pages(
-            self.parse_records_and_emit_request_and_responses,
+            partial(self._parse_and_transform_records, stream_slice),
             stream_slice,
             stream_state,
         )
         for record in records_generator:
+            emitted_record = record
+            if isinstance(record, _TransformedRecord):
+                record, emitted_record = record
             # Only record messages should be parsed to update the cursor which is indicated by the Mapping type
             if isinstance(record, Mapping):
                 self.stream_slicer.update_cursor(stream_slice, last_record=record)
-            yield record
+            yield emitted_record
         else:
             last_record = self._last_records[-1] if self._last_records else None
             if last_record and isinstance(last_record, Mapping):
@@ -414,6 +443,24 @@ class SimpleRetriever(Retriever, HttpStream, JsonSchemaMixin):
         # A better approach would be to extract the HTTP client from the HttpStream and call it directly from the HttpRequester
         yield from self.parse_response(response, stream_slice=stream_slice, stream_state=stream_state)
 
+    def _parse_and_transform_records(self, stream_slice: StreamSlice, request, response, *args) -> Iterable[StreamData]:
+        """
+        Same as parse_records_and_emit_request_and_responses, except that records are paired with a copy transformed for stream_slice
+        """
+        page = self.parse_records_and_emit_request_and_responses(request, response, *args)
+        if not self.transformations:
+            return page
+        page = list(page)
+        # Transformations modify the records in place, the records as read are kept for the cursor and the paginator
+        transformed_records = [copy.deepcopy(record) for record in page if isinstance(record, Mapping)]
+        state = self.state
+        for transformation in self.transformations:
+            transformed_records = transformation.transform_records(
+                transformed_records, config=self.config, stream_state=state, stream_slice=stream_slice
+            )
+        transformed_records = iter(transformed_records)
+        return [_TransformedRecord(record, next(transformed_records)) if isinstance(record, Mapping) else record for record in page]
+
     def _create_trace_message_from_request(self, request: requests.PreparedRequest):
         # FIXME: this should return some sort of trace message
         request_dict = {"url": request.url, "http_method": request.method, "headers": dict(request.headers), "body": request.body}
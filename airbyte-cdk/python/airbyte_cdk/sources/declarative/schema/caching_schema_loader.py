@@ -0,0 +1,48 @@
+#
+# Copyright (c) 2022 Airbyte, Inc., all rights reserved.
+#
+
+import threading
+from typing import Any, Mapping, NamedTuple, Optional
+
+from airbyte_cdk.sources.declarative.schema.schema_loader import SchemaLoader
+
+
+class SchemaCacheInfo(NamedTuple):
+    hits: int
+    misses: int
+
+
+class CachingSchemaLoader(SchemaLoader):
+    """
+    Wraps a schema loader so that the schema is loaded and its references are resolved once.
+
+    The same schema object is returned on every call. It must not be modified, and since it is always the same object, the stream's
+    TypeTransformer finds its compiled normalization plan right away.
+    """
+
+    def __init__(self, schema_loader: SchemaLoader):
+        self._schema_loader = schema_loader
+        self._schema: Optional[Mapping[str, Any]] = None
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+
+    def get_json_schema(self) -> Mapping[str, Any]:
+        schema = self._schema
+        if schema is not None:
+            self._hits += 1
+            return schema
+        with self._lock:
+            if self._schema is None:
+                self._misses += 1
+                self._schema = self._schema_loader.get_json_schema()
+            else:
+                self._hits += 1
+            return self._schema
+
+    def cache_info(self) -> SchemaCacheInfo:
+        """
+        :return: the number of calls which returned the cached schema, and the number of calls which loaded it
+        """
+        return SchemaCacheInfo(hits=self._hits, misses=self._misses)
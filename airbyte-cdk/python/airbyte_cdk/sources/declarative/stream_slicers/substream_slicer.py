@@ -3,13 +3,15 @@
 #
 
 from dataclasses import InitVar, dataclass
-from typing import Any, Iterable, List, Mapping, Optional
+from functools import partial
+from typing import Any, Iterable, List, Mapping, Optional, Tuple
 
 from airbyte_cdk.models import AirbyteMessage, SyncMode, Type
 from airbyte_cdk.sources.declarative.requesters.request_option import RequestOption, RequestOptionType
 from airbyte_cdk.sources.declarative.stream_slicers.stream_slicer import StreamSlicer
 from airbyte_cdk.sources.declarative.types import Record, StreamSlice, StreamState
 from airbyte_cdk.sources.streams.core import Stream
+from airbyte_cdk.sources.utils.parent_record_cache import current_parent_record_cache, expect_parent_records
 from dataclasses_jsonschema import JsonSchemaMixin
 
 
@@ -49,6 +51,8 @@ class SubstreamSlicer(StreamSlicer, JsonSchemaMixin):
             raise ValueError("SubstreamSlicer needs at least 1 parent stream")
         self._cursor = None
         self._options = options
+        for parent_stream_config in self.parent_stream_configs:
+            expect_parent_records(parent_stream_config.stream, (parent_stream_config.parent_key,))
 
     def update_cursor(self, stream_slice: StreamSlice, last_record: Optional[Record] = None):
         # This method is called after the records are processed.
@@ -128,25 +132,34 @@ class SubstreamSlicer(StreamSlicer, JsonSchemaMixin):
             yield from []
         else:
             for parent_stream_config in self.parent_stream_configs:
-                parent_stream = parent_stream_config.stream
-                parent_field = parent_stream_config.parent_key
                 stream_state_field = parent_stream_config.stream_slice_field
-                for parent_stream_slice in parent_stream.stream_slices(sync_mode=sync_mode, cursor_field=None, stream_state=stream_state):
-                    empty_parent_slice = True
-                    parent_slice = parent_stream_slice
-
-                    for parent_record in parent_stream.read_records(
-                        sync_mode=SyncMode.full_refresh, cursor_field=None, stream_slice=parent_stream_slice, stream_state=None
-                    ):
-                        # Skip non-records (eg AirbyteLogMessage)
-                        if isinstance(parent_record, AirbyteMessage):
-                            if parent_record.type == Type.RECORD:
-                                parent_record = parent_record.record.data
-                            else:
-                                continue
-                        empty_parent_slice = False
-                        stream_state_value = parent_record.get(parent_field)
-                        yield {stream_state_field: stream_state_value, "parent_slice": parent_slice}
-                    # If the parent slice contains no records,
-                    if empty_parent_slice:
-                        yield from []
+                for parent_slice, (stream_state_value,) in self._read_parent_keys(parent_stream_config, sync_mode, stream_state):
+                    yield {stream_state_field: stream_state_value, "parent_slice": parent_slice}
+
+    def _read_parent_keys(
+        self, parent_stream_config: ParentStreamConfig, sync_mode: SyncMode, stream_state: StreamState
+    ) -> Iterable[Tuple[StreamSlice, Tuple[Any]]]:
+        # Only the parent keys are needed, so the parent records are shared with the other substreams of the sync through the cache
+        parent_record_cache = current_parent_record_cache()
+        parent_stream = parent_stream_config.stream
+        projection = (parent_stream_config.parent_key,)
+        parent_records = partial(self._read_parent_records, parent_stream, sync_mode, stream_state)
+        if parent_record_cache:
+            yield from parent_record_cache.read(parent_stream, projection, stream_state, parent_records)
+        else:
+            for parent_slice, parent_record in parent_records():
+                yield parent_slice, (parent_record.get(parent_stream_config.parent_key),)
+
+    @staticmethod
+    def _read_parent_records(parent_stream: Stream, sync_mode: SyncMode, stream_state: StreamState) -> Iterable[Tuple[StreamSlice, Record]]:
+        for parent_stream_slice in parent_stream.stream_slices(sync_mode=sync_mode, cursor_field=None, stream_state=stream_state):
+            for parent_record in parent_stream.read_records(
+                sync_mode=SyncMode.full_refresh, cursor_field=None, stream_slice=parent_stream_slice, stream_state=None
+            ):
+                # Skip non-records (eg AirbyteLogMessage)
+                if isinstance(parent_record, AirbyteMessage):
+                    if parent_record.type == Type.RECORD:
+                        parent_record = parent_record.record.data
+                    else:
+                        continue
+                yield parent_stream_slice, parent_record
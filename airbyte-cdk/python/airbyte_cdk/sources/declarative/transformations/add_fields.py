@@ -2,12 +2,13 @@
 # Copyright (c) 2022 Airbyte, Inc., all rights reserved.
 #
 
+import copy
 from dataclasses import InitVar, dataclass, field
 from typing import Any, List, Mapping, Optional, Union
 
-import dpath.util
 from airbyte_cdk.sources.declarative.interpolation.interpolated_string import InterpolatedString
 from airbyte_cdk.sources.declarative.transformations import RecordTransformation
+from airbyte_cdk.sources.declarative.transformations.field_path import CompiledFieldPath
 from airbyte_cdk.sources.declarative.types import Config, FieldPointer, Record, StreamSlice, StreamState
 from dataclasses_jsonschema import JsonSchemaMixin
 
@@ -45,6 +46,7 @@ class AddFields(RecordTransformation, JsonSchemaMixin):
         stream_state: the current state of the stream
         stream_slice: the current stream slice being read
 
+    When a batch of records is transformed, the values which don't depend on the record are evaluated once for the whole batch.
 
 
     Examples of instantiating this transformation via YAML:
@@ -102,6 +104,8 @@ class AddFields(RecordTransformation, JsonSchemaMixin):
                     )
             else:
                 self._parsed_fields.append(ParsedAddFieldDefinition(add_field.path, add_field.value, options={}))
+        self._field_paths = [CompiledFieldPath(parsed_field.path) for parsed_field in self._parsed_fields]
+        self._depends_on_record = [parsed_field.value.references("record") for parsed_field in self._parsed_fields]
 
     def transform(
         self,
@@ -111,11 +115,37 @@ class AddFields(RecordTransformation, JsonSchemaMixin):
         stream_slice: Optional[StreamSlice] = None,
     ) -> Record:
         kwargs = {"record": record, "stream_state": stream_state, "stream_slice": stream_slice}
-        for parsed_field in self._parsed_fields:
+        for parsed_field, field_path in zip(self._parsed_fields, self._field_paths):
             value = parsed_field.value.eval(config, **kwargs)
-            dpath.util.new(record, parsed_field.path, value)
+            field_path.set(record, value)
 
         return record
 
+    def transform_records(
+        self,
+        records: List[Record],
+        config: Optional[Config] = None,
+        stream_state: Optional[StreamState] = None,
+        stream_slice: Optional[StreamSlice] = None,
+    ) -> List[Record]:
+        kwargs = {"stream_state": stream_state, "stream_slice": stream_slice}
+        # Values which don't depend on the record are evaluated once for the batch, the other ones for every record
+        shared_values = [
+            None if depends_on_record else parsed_field.value.eval(config, record=None, **kwargs)
+            for parsed_field, depends_on_record in zip(self._parsed_fields, self._depends_on_record)
+        ]
+        fields = list(zip(self._parsed_fields, self._field_paths, self._depends_on_record, shared_values))
+        for record in records:
+            for parsed_field, field_path, depends_on_record, shared_value in fields:
+                if depends_on_record:
+                    value = parsed_field.value.eval(config, record=record, **kwargs)
+                elif isinstance(shared_value, (dict, list)):
+                    # Records must not share mutable values, which later transformations could alter
+                    value = copy.deepcopy(shared_value)
+                else:
+                    value = shared_value
+                field_path.set(record, value)
+        return records
+
     def __eq__(self, other):
         return self.__dict__ == other.__dict__
@@ -0,0 +1,163 @@
+#
+# Copyright (c) 2022 Airbyte, Inc., all rights reserved.
+#
+
+import fnmatch
+import re
+from typing import Any, Callable, List, Optional, Tuple
+
+import dpath.exceptions
+import dpath.segments
+import dpath.util
+from airbyte_cdk.sources.declarative.types import FieldPointer, Record
+
+# Characters which make a segment of a field pointer a glob, as interpreted by fnmatch
+_GLOB_CHARACTERS = ("*", "?", "[")
+_MISSING = object()
+# A segment of a glob pointer: either a literal key, or a pattern the keys are matched against
+_GlobSegment = Tuple[Optional[str], Optional[Callable[[str], Any]]]
+
+
+class CompiledFieldPath:
+    """
+    A field pointer compiled once into the lookups needed to set or delete the field it points to, so that records can be updated
+    without going through dpath for every record.
+
+    `set` behaves like dpath.util.new: missing parent objects are created, and lists are extended with None up to the index being set.
+    `delete` behaves like dpath.util.delete, except that a field which does not exist is silently skipped: removing an element which is
+    not the last of its list sets it to None. Pointers which contain glob characters are matched against the keys of the record the way
+    dpath matches them.
+    """
+
+    def __init__(self, pointer: FieldPointer):
+        self.pointer = list(pointer)
+        self.set: Callable[[Record, Any], None] = _compile_setter(self.pointer)
+        self.delete: Callable[[Record], None] = _compile_deleter(self.pointer)
+
+    def __eq__(self, other):
+        return isinstance(other, CompiledFieldPath) and self.pointer == other.pointer
+
+    def __repr__(self):
+        return f"CompiledFieldPath({self.pointer})"
+
+
+def _compile_setter(path: List[Any]) -> Callable[[Record, Any], None]:
+    def set_with_dpath(record: Record, value: Any):
+        dpath.segments.set(record, path, value)
+
+    # dpath creates lists for integer segments and extends them, which is left to dpath itself
+    if not all(isinstance(segment, str) for segment in path):
+        return set_with_dpath
+
+    *parents, key = path
+
+    def set_field(record: Record, value: Any):
+        current = record
+        for parent in parents:
+            if not isinstance(current, dict):
+                # Only reachable on an existing value, e.g: a list or a string, for which dpath defines the behavior
+                return set_with_dpath(record, value)
+            child = current.get(parent, _MISSING)
+            if child is _MISSING:
+                child = current[parent] = {}
+            current = child
+        if not isinstance(current, dict):
+            return set_with_dpath(record, value)
+        current[key] = value
+
+    return set_field
+
+
+def _compile_deleter(pointer: List[Any]) -> Callable[[Record], None]:
+    # dpath compares segments and keys as strings, so the list index 0 is matched by both 0 and "0"
+    keys = [str(segment) for segment in pointer]
+    if "**" in keys:
+
+        def delete_with_dpath(record: Record):
+            try:
+                dpath.util.delete(record, pointer)
+            except dpath.exceptions.PathNotFound:
+                pass
+
+        return delete_with_dpath
+
+    if any(character in key for key in keys for character in _GLOB_CHARACTERS):
+        return _compile_glob_deleter(keys)
+
+    *parents, key = keys
+
+    def delete_field(record: Record):
+        current = record
+        for parent in parents:
+            current = _get_child(current, parent)
+            if current is _MISSING:
+                return
+        _delete_child(current, key)
+
+    return delete_field
+
+
+def _compile_glob_deleter(keys: List[str]) -> Callable[[Record], None]:
+    segments: List[_GlobSegment] = []
+    for key in keys:
+        if any(character in key for character in _GLOB_CHARACTERS):
+            segments.append((None, re.compile(fnmatch.translate(key)).match))
+        else:
+            segments.append((key, None))
+    *parent_segments, (last_key, last_pattern) = segments
+
+    def delete_fields(record: Record):
+        nodes = [record]
+        for literal, pattern in parent_segments:
+            if pattern is None:
+                nodes = [child for child in (_get_child(node, literal) for node in nodes) if child is not _MISSING]
+            else:
+                nodes = [node[child_key] for node in nodes for child_key in _matching_keys(node, pattern)]
+        for node in nodes:
+            if last_pattern is None:
+                _delete_child(node, last_key)
+            else:
+                # Keys are matched before deleting, in ascending order for lists like dpath does: the elements matched before the last
+                # one are set to None and the last one is removed
+                for child_key in _matching_keys(node, last_pattern):
+                    _delete_child(node, str(child_key))
+
+    return delete_fields
+
+
+def _matching_keys(node: Any, pattern: Callable[[str], Any]) -> List[Any]:
+    if isinstance(node, dict):
+        return [key for key in node if pattern(str(key))]
+    if isinstance(node, list):
+        return [index for index in range(len(node)) if pattern(str(index))]
+    return []
+
+
+def _list_index(node: List[Any], key: str) -> Optional[int]:
+    # Only the canonical representation of an existing index matches it, e.g: "01" and "-1" don't
+    if key.isdecimal() and str(int(key)) == key and int(key) < len(node):
+        return int(key)
+    return None
+
+
+def _get_child(node: Any, key: str) -> Any:
+    if isinstance(node, dict):
+        return node.get(key, _MISSING)
+    if isinstance(node, list):
+        index = _list_index(node, key)
+        return _MISSING if index is None else node[index]
+    return _MISSING
+
+
+def _delete_child(node: Any, key: str):
+    if isinstance(node, dict):
+        node.pop(key, None)
+    elif isinstance(node, list):
+        index = _list_index(node, key)
+        if index is None:
+            return
+        if index == len(node) - 1:
+            # Removing the last element does not shift the other ones
+            del node[index]
+        else:
+            node[index] = None
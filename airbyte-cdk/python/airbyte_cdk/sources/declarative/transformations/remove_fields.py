@@ -5,9 +5,8 @@
 from dataclasses import InitVar, dataclass
 from typing import Any, List, Mapping
 
-import dpath.exceptions
-import dpath.util
 from airbyte_cdk.sources.declarative.transformations import RecordTransformation
+from airbyte_cdk.sources.declarative.transformations.field_path import CompiledFieldPath
 from airbyte_cdk.sources.declarative.types import FieldPointer, Record
 from dataclasses_jsonschema import JsonSchemaMixin
 
@@ -23,6 +22,9 @@ class RemoveFields(RecordTransformation, JsonSchemaMixin):
 
     It's possible to remove objects nested in lists e.g: removing [".", 0, "k"] from {".": [{"k": "V"}]} results in {".": [{}]}
 
+    Segments of a field pointer can be globs e.g: ["k", "*", "id"] removes the id of every object in the list under "k", and ["**", "id"]
+    removes every id field at any depth. Field pointers are compiled once, so removing a field costs a few lookups in the record.
+
     Usage syntax:
 
     ```yaml
@@ -42,17 +44,23 @@ class RemoveFields(RecordTransformation, JsonSchemaMixin):
     field_pointers: List[FieldPointer]
     options: InitVar[Mapping[str, Any]]
 
+    def __post_init__(self, options: Mapping[str, Any]):
+        self._field_paths = [CompiledFieldPath(pointer) for pointer in self.field_pointers]
+
     def transform(self, record: Record, **kwargs) -> Record:
         """
         :param record: The record to be transformed
         :return: the input record with the requested fields removed
         """
-        for pointer in self.field_pointers:
-            # the dpath library by default doesn't delete fields from arrays
-            try:
-                dpath.util.delete(record, pointer)
-            except dpath.exceptions.PathNotFound:
-                # if the (potentially nested) property does not exist, silently skip
-                pass
+        for field_path in self._field_paths:
+            # if the (potentially nested) property does not exist, it is silently skipped
+            field_path.delete(record)
 
         return record
+
+    def transform_records(self, records: List[Record], **kwargs) -> List[Record]:
+        for field_path in self._field_paths:
+            delete = field_path.delete
+            for record in records:
+                delete(record)
+        return records
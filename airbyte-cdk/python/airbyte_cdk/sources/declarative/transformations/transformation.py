@@ -4,7 +4,7 @@
 
 from abc import abstractmethod
 from dataclasses import dataclass
-from typing import Optional
+from typing import List, Optional
 
 from airbyte_cdk.sources.declarative.types import Config, Record, StreamSlice, StreamState
 from dataclasses_jsonschema import JsonSchemaMixin
@@ -34,5 +34,24 @@ class RecordTransformation(JsonSchemaMixin):
         :return: The transformed record
         """
 
+    def transform_records(
+        self,
+        records: List[Record],
+        config: Optional[Config] = None,
+        stream_state: Optional[StreamState] = None,
+        stream_slice: Optional[StreamSlice] = None,
+    ) -> List[Record]:
+        """
+        Transform a batch of records, e.g: a page of records read from an API. Override it to share the work which does not depend on
+        the record across the batch.
+
+        :param records: The input records to be transformed
+        :param config: The user-provided configuration as specified by the source's spec
+        :param stream_state: The stream state
+        :param stream_slice: The stream slice
+        :return: The transformed records, in the same order
+        """
+        return [self.transform(record, config=config, stream_state=stream_state, stream_slice=stream_slice) for record in records]
+
     def __eq__(self, other):
         return other.__dict__ == self.__dict__
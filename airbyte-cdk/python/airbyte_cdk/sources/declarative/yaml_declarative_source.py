@@ -3,22 +3,25 @@
 #
 
 import pkgutil
+from typing import Optional
 
 import yaml
 from airbyte_cdk.sources.declarative.manifest_declarative_source import ManifestDeclarativeSource
+from airbyte_cdk.sources.declarative.parsers.manifest_cache import ManifestCache
 from airbyte_cdk.sources.declarative.types import ConnectionDefinition
 
 
 class YamlDeclarativeSource(ManifestDeclarativeSource):
     """Declarative source defined by a yaml file"""
 
-    def __init__(self, path_to_yaml, debug: bool = False):
+    def __init__(self, path_to_yaml, debug: bool = False, manifest_cache: Optional[ManifestCache] = None):
         """
         :param path_to_yaml: Path to the yaml file describing the source
+        :param manifest_cache: cache of resolved manifests. Defaults to the cache configured through the environment, if any
         """
         self._path_to_yaml = path_to_yaml
         source_config = self._read_and_parse_yaml_file(path_to_yaml)
-        super().__init__(source_config, debug)
+        super().__init__(source_config, debug, manifest_cache)
 
     def _read_and_parse_yaml_file(self, path_to_yaml_file) -> ConnectionDefinition:
         package = self.__class__.__module__.split(".")[0]
@@ -205,6 +205,39 @@ class Stream(ABC):
         """
         return None
 
+    @property
+    def max_records_out_of_order(self) -> Optional[int]:
+        """
+        Override to checkpoint state while reading a slice although records are not returned in ascending order of cursor, as long as a
+        record is returned at most this many records away from its position in cursor order. E.g: an API sorting records by id while the
+        cursor is updated_at, where ids are assigned in creation order and records are rarely updated long after their creation.
+
+        State is then checkpointed every state_checkpoint_interval records, or every WATERMARK_CHECKPOINT_INTERVAL records if it is None,
+        up to the highest cursor value which no record left to read can precede. Up to this many records are kept in memory to compute
+        it, see CursorWatermark. Records with the cursor value of the state are read again after a failure, so the source must request
+        records with a cursor value greater than or equal to the state.
+
+        Only streams updating their state with get_updated_state support it, and it is ignored when slices are read concurrently.
+
+        return None if records can be returned in any order, in which case state is only checkpointed once a slice has been read.
+        """
+        return None
+
+    @property
+    def max_concurrent_slices(self) -> int:
+        """
+        Decides how many slices of this stream can be read at the same time. E.g: if this returns 4, up to 4 slices are read by worker
+        threads while the records of the oldest one are emitted. Records are still emitted in slice order.
+
+        State is only checkpointed over a contiguous prefix of fully emitted slices so that a failed sync never skips data. Streams
+        exposing a state property are checkpointed once every window of max_concurrent_slices slices has been emitted, since read_records
+        may have already advanced that state for the slices still in flight. Checkpointing every state_checkpoint_interval records is
+        disabled when slices are read concurrently.
+
+        read_records must be safe to call concurrently for different slices when this returns more than 1.
+        """
+        return 1
+
     @deprecated(version="0.1.49", reason="You should use explicit state property instead, see IncrementalMixin docs.")
     def get_updated_state(self, current_stream_state: MutableMapping[str, Any], latest_record: Mapping[str, Any]):
         """Override to extract state from the latest record. Needed to implement incremental sync.
@@ -3,7 +3,26 @@
 #
 
 # Initialize Streams Package
+from .connection_pool import ConnectionPoolMetrics, HttpConnectionPool, shared_connection_pool
 from .exceptions import UserDefinedBackoffException
 from .http import HttpStream, HttpSubStream
+from .json_stream import JsonDocumentStream, iter_json_records, iter_ndjson_records
+from .rate_limiter import TokenBucketRateLimiter, shared_rate_limiter
+from .transport import AiohttpTransport, HttpTransport, RequestsTransport
 
-__all__ = ["HttpStream", "HttpSubStream", "UserDefinedBackoffException"]
+__all__ = [
+    "AiohttpTransport",
+    "ConnectionPoolMetrics",
+    "HttpConnectionPool",
+    "HttpStream",
+    "HttpSubStream",
+    "HttpTransport",
+    "JsonDocumentStream",
+    "RequestsTransport",
+    "TokenBucketRateLimiter",
+    "UserDefinedBackoffException",
+    "iter_json_records",
+    "iter_ndjson_records",
+    "shared_connection_pool",
+    "shared_rate_limiter",
+]
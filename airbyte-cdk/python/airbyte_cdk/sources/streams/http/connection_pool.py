@@ -0,0 +1,164 @@
+#
+# Copyright (c) 2022 Airbyte, Inc., all rights reserved.
+#
+
+import socket
+import threading
+from dataclasses import dataclass
+from typing import Any, Dict
+
+import requests
+from requests.adapters import DEFAULT_POOLSIZE, HTTPAdapter
+from urllib3 import PoolManager
+from urllib3.connection import HTTPConnection
+
+
+@dataclass(frozen=True)
+class ConnectionPoolMetrics:
+    """
+    Counts of the requests sent through a connection pool
+
+    Attributes:
+        requests (int): number of requests sent, including retries
+        new_connections (int): number of connections opened, each of them requiring a TCP and, for https, a TLS handshake
+    """
+
+    requests: int = 0
+    new_connections: int = 0
+
+    @property
+    def reused_connections(self) -> int:
+        """
+        :return: number of requests sent on a connection opened by a previous request
+        """
+        return max(0, self.requests - self.new_connections)
+
+    def __str__(self):
+        return f"{self.requests} requests, {self.new_connections} new connections, {self.reused_connections} reused connections"
+
+
+class HttpConnectionPool:
+    """
+    Pool of keep-alive connections shared by the requests.Session of several streams, so that streams calling the same host reuse the
+    connections opened by one another instead of each going through new TCP and TLS handshakes.
+
+    Only the connections are shared: each stream keeps its own session, and therefore its own authentication, headers and cookies.
+    Closing the session of a stream leaves the connections of the pool open for the other streams, they are closed by close().
+    """
+
+    def __init__(self, pool_connections: int = DEFAULT_POOLSIZE, pool_maxsize: int = DEFAULT_POOLSIZE, tcp_keepalive: bool = True):
+        """
+        :param pool_connections: number of hosts for which connections are kept open
+        :param pool_maxsize: maximum number of idle connections kept open to the same host. More connections are opened when the
+        streams send more concurrent requests, but they are closed once their request is done
+        :param tcp_keepalive: whether to enable TCP keep-alive on the connections, so that idle connections are not silently dropped by
+        firewalls or load balancers
+        """
+        self._lock = threading.Lock()
+        self._requests = 0
+        self._new_connections = 0
+        self._adapter = _CountingHTTPAdapter(self, tcp_keepalive, pool_connections=pool_connections, pool_maxsize=pool_maxsize)
+
+    def __deepcopy__(self, memo):
+        # Copies of a stream keep sharing the pool
+        return self
+
+    @property
+    def metrics(self) -> ConnectionPoolMetrics:
+        """
+        :return: the counts of the requests sent through the pool so far
+        """
+        with self._lock:
+            return ConnectionPoolMetrics(requests=self._requests, new_connections=self._new_connections)
+
+    def mount(self, session: requests.Session):
+        """
+        Sends the http and https requests of the session through the pool
+
+        :param session: the session of a stream
+        """
+        session.mount("https://", self._adapter)
+        session.mount("http://", self._adapter)
+
+    def close(self):
+        """
+        Closes the connections of the pool. Requests sent through the pool afterwards open new connections
+        """
+        self._adapter.close_connections()
+
+    def _record_request(self):
+        with self._lock:
+            self._requests += 1
+
+    def _record_new_connection(self):
+        with self._lock:
+            self._new_connections += 1
+
+
+class _CountingHTTPAdapter(HTTPAdapter):
+    def __init__(self, pool: HttpConnectionPool, tcp_keepalive: bool, **kwargs):
+        self._pool = pool
+        self._tcp_keepalive = tcp_keepalive
+        super().__init__(**kwargs)
+
+    def __deepcopy__(self, memo):
+        # Copies of a session keep sharing the pool
+        return self
+
+    def init_poolmanager(self, connections, maxsize, block=False, **pool_kwargs):
+        if self._tcp_keepalive:
+            pool_kwargs.setdefault("socket_options", HTTPConnection.default_socket_options + [(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)])
+        super().init_poolmanager(connections, maxsize, block=block, **pool_kwargs)
+        self._count_new_connections(self.poolmanager)
+
+    def proxy_manager_for(self, proxy, **proxy_kwargs):
+        manager = super().proxy_manager_for(proxy, **proxy_kwargs)
+        self._count_new_connections(manager)
+        return manager
+
+    def close(self):
+        # Called when a session the pool is mounted on is closed, while other sessions may still use the connections
+        pass
+
+    def close_connections(self):
+        super().close()
+
+    def send(self, request, *args, **kwargs):
+        self._pool._record_request()
+        return super().send(request, *args, **kwargs)
+
+    def _count_new_connections(self, manager: PoolManager):
+        manager.pool_classes_by_scheme = {
+            scheme: pool_class if getattr(pool_class, "_counts_new_connections", False) else _counting_pool_class(pool_class, self._pool)
+            for scheme, pool_class in manager.pool_classes_by_scheme.items()
+        }
+
+
+def _counting_pool_class(pool_class: type, pool: HttpConnectionPool) -> type:
+    class CountingConnectionPool(pool_class):
+        _counts_new_connections = True
+
+        def _new_conn(self, *args, **kwargs):
+            pool._record_new_connection()
+            return super()._new_conn(*args, **kwargs)
+
+    return CountingConnectionPool
+
+
+_shared_connection_pools: Dict[str, HttpConnectionPool] = {}
+_shared_connection_pools_lock = threading.Lock()
+
+
+def shared_connection_pool(name: str = "default", **kwargs: Any) -> HttpConnectionPool:
+    """
+    Returns the connection pool of the given name, shared by every stream using the name. The pool is created by the first call for the
+    name, the options of later calls are ignored.
+
+    :param name: the name of the pool
+    :param kwargs: the options of HttpConnectionPool
+    :return: the connection pool shared by every caller using the same name
+    """
+    with _shared_connection_pools_lock:
+        if name not in _shared_connection_pools:
+            _shared_connection_pools[name] = HttpConnectionPool(**kwargs)
+        return _shared_connection_pools[name]
@@ -5,25 +5,38 @@
 
 import logging
 import os
+import queue
+import threading
 from abc import ABC, abstractmethod
-from contextlib import suppress
-from typing import Any, Callable, Iterable, List, Mapping, MutableMapping, Optional, Tuple, Union
+from collections import deque
+from concurrent.futures import Future
+from contextlib import nullcontext, suppress
+from typing import Any, Callable, Deque, Dict, Iterable, List, Mapping, MutableMapping, Optional, Tuple, Union
 from urllib.parse import urljoin
 
 import requests
 import requests_cache
-from airbyte_cdk.models import SyncMode
+from airbyte_cdk.models import AirbyteMessage, SyncMode
+from airbyte_cdk.models import Type as MessageType
 from airbyte_cdk.sources.streams.core import Stream, StreamData
+from airbyte_cdk.sources.utils.parent_record_cache import current_parent_record_cache, expect_parent_records
+from airbyte_cdk.sources.utils.throttling import current_throttle
 from requests.auth import AuthBase
 from requests_cache.session import CachedSession
 
 from .auth.core import HttpAuthenticator, NoAuth
+from .connection_pool import HttpConnectionPool
 from .exceptions import DefaultBackoffException, RequestBodyException, UserDefinedBackoffException
+from .rate_limiter import TokenBucketRateLimiter
 from .rate_limiting import default_backoff_handler, user_defined_backoff_handler
+from .transport import HttpTransport, RequestsTransport
 
 # list of all possible HTTP methods which can be used for sending of request bodies
 BODY_REQUEST_METHODS = ("GET", "POST", "PUT", "PATCH")
 
+# how long reading waits for the page prefetching thread to stop, e.g: for its request in flight to complete
+PREFETCH_THREAD_JOIN_TIMEOUT_SECONDS = 10.0
+
 
 class HttpStream(Stream, ABC):
     """
@@ -40,12 +53,87 @@ class HttpStream(Stream, ABC):
         else:
             self._session = requests.Session()
 
+        self._connection_pool = self.connection_pool
+        if self._connection_pool:
+            self._connection_pool.mount(self._session)
+
         self._authenticator: HttpAuthenticator = NoAuth()
         if isinstance(authenticator, AuthBase):
             self._session.auth = authenticator
         elif authenticator:
             self._authenticator = authenticator
 
+        self._transport: Optional[HttpTransport] = None
+        # Responses of the requests sent ahead of time by _read_pages, until _send picks them up
+        self._pipelined_responses: Dict[requests.PreparedRequest, Future] = {}
+
+    @property
+    def transport(self) -> HttpTransport:
+        if self._transport is None:
+            self._transport = self.create_transport()
+        return self._transport
+
+    def create_transport(self) -> HttpTransport:
+        """
+        Override to send requests with another transport, e.g: AiohttpTransport to pipeline page requests.
+        Requests are still prepared by the stream's requests.Session, so that authentication applies the same way.
+        """
+        return RequestsTransport(self._session)
+
+    @property
+    def max_pipelined_requests(self) -> int:
+        """
+        Override to request pages ahead of time when the transport supports concurrent requests and predict_next_page_token can tell
+        the next page token before the response of the current page is received.
+        :return: maximum number of page requests in flight
+        """
+        return 1
+
+    def predict_next_page_token(self, next_page_token: Optional[Mapping[str, Any]]) -> Optional[Mapping[str, Any]]:
+        """
+        Override to enable request pipelining with pagination strategies where the token of the next page does not depend on the
+        response, e.g: offset or page increment. The page is requested speculatively: if next_page_token later returns another token or
+        None, its response is discarded.
+
+        :param next_page_token: the token of the current page, None for the first page
+        :return: the token of the page following the current one, or None if it can't be predicted
+        """
+        return None
+
+    @property
+    def max_prefetched_pages(self) -> int:
+        """
+        Override to fetch the next page on a background thread while the records of the current page are emitted. Pages are fetched,
+        parsed and their next page token computed on the background thread, then handed over to the reading thread in order. The
+        background thread stops fetching when this many pages are waiting to be emitted.
+
+        Only override it for streams whose requests don't depend on state updated while the records are emitted. The request of the next
+        page is prepared before the records of the previous pages are emitted, with the stream_state the read started with, and
+        parse_response and next_page_token are called from the background thread. For example, request_params must not read a cursor
+        or a state which is updated from the emitted records, like the state of an IncrementalMixin.
+        :return: maximum number of pages fetched ahead of the page being emitted, 0 to fetch pages only once the previous one is emitted
+        """
+        return 0
+
+    @property
+    def connection_pool(self) -> Optional[HttpConnectionPool]:
+        """
+        Override to send the requests of the stream through a pool of connections shared with other streams, e.g: the one returned by
+        shared_connection_pool, so that connections to a host are opened once and reused by the requests of every stream using the pool.
+        :return: the connection pool, or None for the stream's session to keep connections to itself
+        """
+        return None
+
+    @property
+    def rate_limiter(self) -> Optional[TokenBucketRateLimiter]:
+        """
+        Override to limit the rate of the requests sent by the stream. Every request waits for the limiter before being sent, and the
+        limiter adapts to the rate limit headers of the responses. Streams returning the same instance, e.g: from shared_rate_limiter,
+        share the same request budget.
+        :return: the limiter, or None to send requests as soon as possible
+        """
+        return None
+
     @property
     def cache_filename(self):
         """
@@ -295,7 +383,17 @@ class HttpStream(Stream, ABC):
         self.logger.debug(
             "Making outbound API request", extra={"headers": request.headers, "url": request.url, "request_body": request.body}
         )
-        response: requests.Response = self._session.send(request, **request_kwargs)
+        rate_limiter = self.rate_limiter
+        pipelined_response = self._pipelined_responses.pop(request, None)
+        if pipelined_response is not None:
+            # The request was sent ahead of time, after waiting for the rate limiter. Retries send it again
+            response: requests.Response = pipelined_response.result()
+        else:
+            if rate_limiter:
+                rate_limiter.acquire()
+            response = self.transport.send(request, request_kwargs)
+        if rate_limiter:
+            rate_limiter.update_from_response(response)
 
         # Evaluation of response.text can be heavy, for example, if streaming a large response
         # Do it only in debug mode
@@ -423,22 +521,151 @@ class HttpStream(Stream, ABC):
         stream_state: Mapping[str, Any] = None,
     ) -> Iterable[StreamData]:
         stream_state = stream_state or {}
-        pagination_complete = False
-        next_page_token = None
-        while not pagination_complete:
-            request, response = self._fetch_next_page(stream_slice, stream_state, next_page_token)
-            yield from records_generator_fn(request, response, stream_state, stream_slice)
-
-            next_page_token = self.next_page_token(response)
-            if not next_page_token:
-                pagination_complete = True
-
+        if self.max_pipelined_requests > 1 and self.transport.supports_concurrent_requests:
+            yield from self._read_pipelined_pages(records_generator_fn, stream_slice, stream_state)
+        elif self.max_prefetched_pages > 0:
+            yield from self._read_prefetched_pages(records_generator_fn, stream_slice, stream_state)
+        else:
+            pagination_complete = False
+            next_page_token = None
+            while not pagination_complete:
+                request, response = self._fetch_next_page(stream_slice, stream_state, next_page_token)
+                yield from records_generator_fn(request, response, stream_state, stream_slice)
+
+                next_page_token = self.next_page_token(response)
+                if not next_page_token:
+                    pagination_complete = True
+
+        if self._connection_pool:
+            self.logger.debug(f"Connection pool used by the {self.name} stream: {self._connection_pool.metrics}")
         # Always return an empty generator just in case no records were ever yielded
         yield from []
 
+    def _read_pipelined_pages(
+        self,
+        records_generator_fn: Callable[
+            [requests.PreparedRequest, requests.Response, Mapping[str, Any], Mapping[str, Any]], Iterable[StreamData]
+        ],
+        stream_slice: Mapping[str, Any],
+        stream_state: Mapping[str, Any],
+    ) -> Iterable[StreamData]:
+        """
+        Same as _read_pages, except that up to max_pipelined_requests pages whose token is predicted are requested ahead of time.
+        Pages are still processed in order, and their responses go through _send_request so that errors and backoff are handled the
+        same way.
+        """
+        # (next_page_token, request, request_kwargs) of the pages requested ahead of time, in page order
+        pipeline: Deque[Tuple[Optional[Mapping[str, Any]], requests.PreparedRequest, Mapping[str, Any]]] = deque()
+
+        def request_page(next_page_token: Optional[Mapping[str, Any]]):
+            request, request_kwargs = self._prepare_request(stream_slice, stream_state, next_page_token)
+            if self.rate_limiter:
+                self.rate_limiter.acquire()
+            self._pipelined_responses[request] = self.transport.submit(request, request_kwargs)
+            pipeline.append((next_page_token, request, request_kwargs))
+
+        def discard_pipeline():
+            while pipeline:
+                _, request, _ = pipeline.popleft()
+                response = self._pipelined_responses.pop(request, None)
+                if response:
+                    response.cancel()
+
+        try:
+            request_page(None)
+            while pipeline:
+                while len(pipeline) < self.max_pipelined_requests:
+                    predicted_token = self.predict_next_page_token(pipeline[-1][0])
+                    if not predicted_token:
+                        break
+                    request_page(predicted_token)
+
+                _, request, request_kwargs = pipeline.popleft()
+                response = self._send_request(request, request_kwargs)
+                yield from records_generator_fn(request, response, stream_state, stream_slice)
+
+                next_page_token = self.next_page_token(response)
+                if pipeline and pipeline[0][0] == next_page_token:
+                    continue
+                # The prediction was wrong, or there are no more pages
+                discard_pipeline()
+                if next_page_token:
+                    request_page(next_page_token)
+        finally:
+            discard_pipeline()
+
+    def _read_prefetched_pages(
+        self,
+        records_generator_fn: Callable[
+            [requests.PreparedRequest, requests.Response, Mapping[str, Any], Mapping[str, Any]], Iterable[StreamData]
+        ],
+        stream_slice: Mapping[str, Any],
+        stream_state: Mapping[str, Any],
+    ) -> Iterable[StreamData]:
+        """
+        Same as _read_pages, except that pages are fetched and parsed on a background thread, up to max_prefetched_pages ahead of the page
+        whose records are being emitted
+        """
+        # Records of each page, followed by None once every page was read, or by the exception which stopped the background thread
+        pages: "queue.Queue[Union[List[StreamData], BaseException, None]]" = queue.Queue(maxsize=self.max_prefetched_pages)
+        stopped = threading.Event()
+        # The rate limits hit while prefetching are accounted to the stream
+        throttle = current_throttle()
+
+        def put(item: Union[List[StreamData], BaseException, None]) -> bool:
+            # Waits for room in the queue, unless reading stops in the meantime
+            while not stopped.is_set():
+                try:
+                    pages.put(item, timeout=0.1)
+                    return True
+                except queue.Full:
+                    pass
+            return False
+
+        def fetch_pages():
+            try:
+                with throttle.activate() if throttle else nullcontext():
+                    next_page_token = None
+                    while not stopped.is_set():
+                        request, response = self._fetch_next_page(stream_slice, stream_state, next_page_token)
+                        records = list(records_generator_fn(request, response, stream_state, stream_slice))
+                        next_page_token = self.next_page_token(response)
+                        if not put(records) or not next_page_token:
+                            break
+                put(None)
+            except BaseException as e:
+                put(e)
+
+        thread = threading.Thread(target=fetch_pages, name=f"{self.name}_page_prefetch", daemon=True)
+        thread.start()
+        try:
+            while True:
+                page = pages.get()
+                if page is None:
+                    thread.join()
+                    break
+                if isinstance(page, BaseException):
+                    raise page
+                yield from page
+        finally:
+            # Lets the background thread go if reading stops before the last page, once its request in flight completes
+            stopped.set()
+            thread.join(timeout=PREFETCH_THREAD_JOIN_TIMEOUT_SECONDS)
+            if thread.is_alive():
+                self.logger.warning(
+                    f"The page prefetching thread of {self.name} is still running {PREFETCH_THREAD_JOIN_TIMEOUT_SECONDS}s after reading stopped"
+                )
+
     def _fetch_next_page(
         self, stream_slice: Mapping[str, Any] = None, stream_state: Mapping[str, Any] = None, next_page_token: Mapping[str, Any] = None
     ) -> Tuple[requests.PreparedRequest, requests.Response]:
+        request, request_kwargs = self._prepare_request(stream_slice, stream_state, next_page_token)
+        response = self._send_request(request, request_kwargs)
+        return request, response
+
+    def _prepare_request(
+        self, stream_slice: Mapping[str, Any] = None, stream_state: Mapping[str, Any] = None, next_page_token: Mapping[str, Any] = None
+    ) -> Tuple[requests.PreparedRequest, Mapping[str, Any]]:
         request_headers = self.request_headers(stream_state=stream_state, stream_slice=stream_slice, next_page_token=next_page_token)
         request = self._create_prepared_request(
             path=self.path(stream_state=stream_state, stream_slice=stream_slice, next_page_token=next_page_token),
@@ -448,22 +675,49 @@ class HttpStream(Stream, ABC):
             data=self.request_body_data(stream_state=stream_state, stream_slice=stream_slice, next_page_token=next_page_token),
         )
         request_kwargs = self.request_kwargs(stream_state=stream_state, stream_slice=stream_slice, next_page_token=next_page_token)
-
-        response = self._send_request(request, request_kwargs)
-        return request, response
+        return request, request_kwargs
 
 
 class HttpSubStream(HttpStream, ABC):
+    # Override with the fields of the parent records the stream slices need, to only keep these fields in the slices. The parent records
+    # are then read once per sync by the child streams whose parents are configured alike: they are cached by the first child stream
+    # reading them, or while the parent is synced if the synced stream is configured alike, see parent_stream_key()
+    parent_record_fields: Optional[List[str]] = None
+
     def __init__(self, parent: HttpStream, **kwargs):
         """
         :param parent: should be the instance of HttpStream class
         """
         super().__init__(**kwargs)
         self.parent = parent
+        if self.parent_record_fields is not None:
+            expect_parent_records(self.parent, tuple(self.parent_record_fields))
 
     def stream_slices(
         self, sync_mode: SyncMode, cursor_field: List[str] = None, stream_state: Mapping[str, Any] = None
     ) -> Iterable[Optional[Mapping[str, Any]]]:
+        parent_record_cache = current_parent_record_cache()
+        if self.parent_record_fields is not None and parent_record_cache:
+            fields = tuple(self.parent_record_fields)
+            for _, record in parent_record_cache.read(
+                self.parent, fields, stream_state, lambda: self._read_parent_records(cursor_field, stream_state)
+            ):
+                yield {"parent": dict(zip(fields, record))}
+            return
+
+        for _, record in self._read_parent_records(cursor_field, stream_state):
+            if self.parent_record_fields is not None:
+                # Only the data of the records is projected, like the cache does
+                if isinstance(record, AirbyteMessage):
+                    if record.type != MessageType.RECORD:
+                        continue
+                    record = record.record.data
+                record = {field: record.get(field) for field in self.parent_record_fields}
+            yield {"parent": record}
+
+    def _read_parent_records(
+        self, cursor_field: Optional[List[str]], stream_state: Optional[Mapping[str, Any]]
+    ) -> Iterable[Tuple[Optional[Mapping[str, Any]], StreamData]]:
         parent_stream_slices = self.parent.stream_slices(
             sync_mode=SyncMode.full_refresh, cursor_field=cursor_field, stream_state=stream_state
         )
@@ -476,4 +730,4 @@ class HttpSubStream(HttpStream, ABC):
 
             # iterate over all parent records with current stream_slice
             for record in parent_records:
-                yield {"parent": record}
+                yield stream_slice, record
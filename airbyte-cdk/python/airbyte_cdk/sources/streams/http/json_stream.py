@@ -0,0 +1,304 @@
+#
+# Copyright (c) 2022 Airbyte, Inc., all rights reserved.
+#
+
+import codecs
+import json
+import re
+from json.decoder import WHITESPACE
+from typing import Any, Generator, Iterable, Iterator, List, Optional, Sequence, Union
+
+import requests
+
+# Size of the chunks read from the response body
+DEFAULT_CHUNK_SIZE = 64 * 1024
+# Consumed characters are dropped from the buffer once there are more of them than this
+_COMPACTION_THRESHOLD = 1024 * 1024
+_DECODER = json.JSONDecoder()
+_NUMBER_CONTINUATION = re.compile(r"[0-9.eE+-]*")
+
+PathSegment = Union[str, int]
+
+
+class _JsonReader:
+    """
+    Reads json values from a stream of text chunks, only keeping in memory the part of the text which has not been decoded yet
+    """
+
+    def __init__(self, chunks: Iterable[str]):
+        self._chunks = iter(chunks)
+        self._buffer = ""
+        self._position = 0
+        self._eof = False
+
+    def peek(self) -> str:
+        """
+        :return: the next character which is not a whitespace, or an empty string at the end of the text
+        """
+        while True:
+            self._position = WHITESPACE.match(self._buffer, self._position).end()
+            if self._position < len(self._buffer) or not self._read_more(1):
+                return self._buffer[self._position : self._position + 1]
+
+    def next(self) -> str:
+        """
+        :return: the next character which is not a whitespace, consuming it
+        """
+        character = self.peek()
+        self._position += len(character)
+        return character
+
+    def expect(self, expected: str):
+        character = self.next()
+        if character != expected:
+            raise json.JSONDecodeError(f"Expecting '{expected}'", self._buffer, self._position - len(character))
+
+    def value(self) -> Any:
+        """
+        :return: the next json value, consuming it
+        """
+        self.peek()
+        while True:
+            try:
+                value, end = _DECODER.raw_decode(self._buffer, self._position)
+            except json.JSONDecodeError:
+                if not self._read_more(len(self._buffer) - self._position):
+                    raise
+                continue
+            # A value ending at the end of the buffer, or a number followed by what could be the start of its fraction or exponent, may
+            # continue in the next chunk
+            if _NUMBER_CONTINUATION.match(self._buffer, end).end() == len(self._buffer) and self._read_more(1):
+                continue
+            self._position = end
+            return value
+
+    def _read_more(self, size: int) -> bool:
+        """
+        Reads at least size more characters, so that the text which has not been decoded yet doubles when a value spanning many chunks
+        fails to decode, and decoding it takes linear time
+
+        :return: whether anything was read
+        """
+        chunks = []
+        read = 0
+        while read < max(size, 1) and not self._eof:
+            chunk = next(self._chunks, None)
+            if chunk is None:
+                self._eof = True
+            elif chunk:
+                chunks.append(chunk)
+                read += len(chunk)
+        if not chunks:
+            return False
+        if self._position > _COMPACTION_THRESHOLD:
+            self._buffer = self._buffer[self._position :]
+            self._position = 0
+        self._buffer += "".join(chunks)
+        return True
+
+
+def _parse(reader: _JsonReader, path: Sequence[PathSegment], keep_items: bool) -> Generator[Any, None, Any]:
+    """
+    Parses the next json value, yielding the elements of the array at the given path as soon as they are decoded
+
+    :return: the value parsed. The array at the path only contains its elements if keep_items is set
+    """
+    if not path:
+        if reader.peek() != "[":
+            return reader.value()
+        return (yield from _parse_items(reader, keep_items))
+
+    segment, *remaining_path = path
+    opening = reader.peek()
+    if opening == "{":
+        return (yield from _parse_object(reader, str(segment), remaining_path, keep_items))
+    if opening == "[":
+        return (yield from _parse_array(reader, int(segment) if str(segment).isdecimal() else None, remaining_path, keep_items))
+    # The path does not exist in the document
+    return reader.value()
+
+
+def _parse_items(reader: _JsonReader, keep_items: bool) -> Generator[Any, None, List[Any]]:
+    """
+    Parses the array at the path, yielding its elements
+    """
+    reader.next()
+    items: List[Any] = []
+    if reader.peek() == "]":
+        reader.next()
+        return items
+    while True:
+        item = reader.value()
+        yield item
+        if keep_items:
+            items.append(item)
+        if _next_separator(reader, "]"):
+            return items
+
+
+def _parse_object(reader: _JsonReader, key: str, remaining_path: Sequence[PathSegment], keep_items: bool) -> Generator[Any, None, dict]:
+    """
+    Parses an object on the path, following its first member with the given key
+    """
+    reader.next()
+    document = {}
+    if reader.peek() == "}":
+        reader.next()
+        return document
+    found = False
+    while True:
+        member_key = reader.value()
+        if not isinstance(member_key, str):
+            raise json.JSONDecodeError("Expecting property name enclosed in double quotes", "", 0)
+        reader.expect(":")
+        if not found and member_key == key:
+            found = True
+            document[member_key] = yield from _parse(reader, remaining_path, keep_items)
+        else:
+            document[member_key] = reader.value()
+        if _next_separator(reader, "}"):
+            return document
+
+
+def _parse_array(
+    reader: _JsonReader, index: Optional[int], remaining_path: Sequence[PathSegment], keep_items: bool
+) -> Generator[Any, None, List[Any]]:
+    """
+    Parses an array on the path, following its element at the given index
+    """
+    reader.next()
+    elements: List[Any] = []
+    if reader.peek() == "]":
+        reader.next()
+        return elements
+    while True:
+        if len(elements) == index:
+            element = yield from _parse(reader, remaining_path, keep_items)
+        else:
+            element = reader.value()
+        elements.append(element)
+        if _next_separator(reader, "]"):
+            return elements
+
+
+def _next_separator(reader: _JsonReader, closing: str) -> bool:
+    """
+    Consumes the separator following a member or an element
+
+    :return: whether it closes the object or array
+    """
+    separator = reader.next()
+    if separator == closing:
+        return True
+    if separator != ",":
+        raise json.JSONDecodeError("Expecting ',' delimiter", "", 0)
+    return False
+
+
+class JsonDocumentStream:
+    """
+    Streams the records of a json document out of the array at the given path while the document is read, e.g: the records of a large
+    response body while it downloads, rather than decoding the whole body at once.
+
+    Records are extracted like DpathExtractor extracts them: the elements of the value at the path if it is an array, the value itself
+    if it is any other non-empty value, and nothing otherwise. The path is made of object keys and array indexes; it can't contain
+    wildcards. If an object has the same key several times, the first occurrence is followed.
+
+    Once the records have been iterated over, `document` holds the whole decoded document, with the records at the path if keep_records
+    is set, or without them otherwise.
+    """
+
+    def __init__(self, chunks: Iterable[str], path: Sequence[PathSegment] = (), keep_records: bool = False):
+        """
+        :param chunks: the text of the document, in chunks
+        :param path: the path of the records in the document
+        :param keep_records: whether the decoded document keeps the records
+        """
+        self._reader = _JsonReader(chunks)
+        self._path = list(path)
+        self._keep_records = keep_records
+        self.document: Any = None
+
+    def __iter__(self) -> Iterator[Any]:
+        if not self._reader.peek():
+            # An empty body does not contain any record
+            return
+        self.document = yield from _parse(self._reader, self._path, self._keep_records)
+        if self._reader.peek():
+            raise json.JSONDecodeError("Extra data", "", 0)
+        extracted = _get_path(self.document, self._path)
+        if not isinstance(extracted, list) and extracted:
+            # The value at the path is not an array, and is therefore returned as the only record
+            yield extracted
+
+
+def _get_path(document: Any, path: Sequence[PathSegment]) -> Any:
+    value = document
+    for segment in path:
+        if isinstance(value, dict) and str(segment) in value:
+            value = value[str(segment)]
+        elif isinstance(value, list) and str(segment).isdecimal() and int(segment) < len(value):
+            value = value[int(segment)]
+        else:
+            return None
+    return value
+
+
+def extract_path(document: Any, path: Sequence[PathSegment]) -> List[Any]:
+    """
+    Extracts the records at the given path of a decoded json document, like JsonDocumentStream does while the document is read
+
+    :param document: the decoded document
+    :param path: the path of the records in the document
+    :return: the records
+    """
+    extracted = _get_path(document, path)
+    if isinstance(extracted, list):
+        return extracted
+    return [extracted] if extracted else []
+
+
+def iter_text_chunks(response: requests.Response, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[str]:
+    """
+    Reads the body of a response as text, in chunks. When the response was sent with stream=True, the body is downloaded while the
+    chunks are read.
+
+    :param response: the response to read
+    :param chunk_size: the number of bytes read at once
+    :return: an iterator of chunks of the decoded body
+    """
+    decoder = codecs.getincrementaldecoder(response.encoding or "utf-8")()
+    for chunk in response.iter_content(chunk_size=chunk_size):
+        yield decoder.decode(chunk)
+    yield decoder.decode(b"", final=True)
+
+
+def iter_json_records(response: requests.Response, path: Sequence[PathSegment] = (), chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[Any]:
+    """
+    Streams the records out of the array at the given path of a json response body, without decoding the whole body at once. Use it in
+    HttpStream.parse_response with `stream=True` in request_kwargs to yield records while the body downloads.
+
+    :param response: the response to read
+    :param path: the path of the records in the body, see JsonDocumentStream
+    :param chunk_size: the number of bytes read at once
+    :return: an iterator of the records
+    """
+    yield from JsonDocumentStream(iter_text_chunks(response, chunk_size), path)
+
+
+def iter_ndjson_records(response: requests.Response, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[Any]:
+    """
+    Streams the records of a newline-delimited json response body, e.g: a bulk export, while it is read
+
+    :param response: the response to read
+    :param chunk_size: the number of bytes read at once
+    :return: an iterator of the json value of every non-empty line
+    """
+    pending = ""
+    for chunk in iter_text_chunks(response, chunk_size):
+        *lines, pending = (pending + chunk).split("\n")
+        for line in lines:
+            if line.strip():
+                yield json.loads(line)
+    if pending.strip():
+        yield json.loads(pending)
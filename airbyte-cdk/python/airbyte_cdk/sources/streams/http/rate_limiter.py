@@ -0,0 +1,178 @@
+#
+# Copyright (c) 2022 Airbyte, Inc., all rights reserved.
+#
+
+import logging
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Callable, Dict, Optional
+
+import requests
+from airbyte_cdk.sources.utils.throttling import throttled_sleep
+
+logger = logging.getLogger("airbyte")
+
+# X-RateLimit-Reset values above this are epoch timestamps rather than a number of seconds until the reset
+_EPOCH_THRESHOLD = 1_000_000_000
+
+
+class TokenBucketRateLimiter:
+    """
+    Limits the rate of requests sent to an API, across every stream and thread using the limiter.
+
+    Tokens are added to a bucket at requests_per_second, up to burst tokens, and every request takes one. A request which finds the bucket
+    empty reserves the next token and waits for it, so concurrent requests are spaced evenly rather than woken up all at once.
+
+    The limiter also adapts to the rate limit headers of the responses it is given:
+        - Retry-After pauses every request until the given time.
+        - X-RateLimit-Remaining and X-RateLimit-Reset (or RateLimit-Remaining and RateLimit-Reset) spread the remaining requests over the
+          time left until the reset, without exceeding requests_per_second, and pause until the reset once no request remains.
+
+    Streams of a source share a limiter by returning the same instance from HttpStream.rate_limiter, e.g: one obtained from
+    shared_rate_limiter.
+    """
+
+    def __init__(
+        self,
+        requests_per_second: float,
+        burst: int = 1,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = throttled_sleep,
+    ):
+        """
+        :param requests_per_second: maximum sustained rate of requests
+        :param burst: maximum number of requests sent at once after the limiter has been idle
+        :param clock: monotonic clock, in seconds
+        :param sleep: function waiting for a number of seconds. By default, the waits are accounted to the stream being read
+        """
+        if requests_per_second <= 0:
+            raise ValueError(f"requests_per_second must be positive, got {requests_per_second}")
+        self._max_rate = requests_per_second
+        self._rate = requests_per_second
+        self._burst = max(1, burst)
+        self._clock = clock
+        self._sleep = sleep
+        self._lock = threading.Lock()
+        self._tokens = float(self._burst)
+        # Tokens are added from this point in time. It is in the future while the limiter is paused
+        self._updated_at = clock()
+
+    @property
+    def requests_per_second(self) -> float:
+        """
+        :return: the current rate, which is lower than the maximum one when the rate limit headers of the API require it
+        """
+        return self._rate
+
+    def acquire(self) -> float:
+        """
+        Waits until a request can be sent
+
+        :return: the number of seconds waited
+        """
+        with self._lock:
+            now = self._clock()
+            self._refill(now)
+            self._tokens -= 1
+            wait = max(0.0, self._updated_at - now) + max(0.0, -self._tokens) / self._rate
+        if wait > 0:
+            self._sleep(wait)
+        return wait
+
+    def pause(self, seconds: float):
+        """
+        Holds every request which has not reserved a token yet for the given number of seconds
+
+        :param seconds: the number of seconds to pause for
+        """
+        with self._lock:
+            now = self._clock()
+            self._refill(now)
+            resume_at = now + seconds
+            if resume_at > self._updated_at:
+                self._updated_at = resume_at
+                # One request can go as soon as the pause is over, the following ones are spaced at the current rate
+                self._tokens = 1.0
+
+    def update_from_response(self, response: requests.Response):
+        """
+        Adapts the limiter to the rate limit headers of the response
+
+        :param response: a response of the API the limiter applies to
+        """
+        retry_after = _parse_retry_after(response.headers.get("Retry-After"))
+        if retry_after is not None and retry_after > 0:
+            logger.info(f"Pausing requests for {retry_after} seconds as requested by the Retry-After header")
+            self.pause(retry_after)
+
+        remaining = _parse_float(_get_header(response, "RateLimit-Remaining"))
+        reset = _parse_reset(_get_header(response, "RateLimit-Reset"))
+        if remaining is None or reset is None:
+            return
+        if remaining < 1:
+            if reset > 0:
+                logger.info(f"Rate limit exhausted, pausing requests for {reset} seconds until it resets")
+                self.pause(reset)
+            return
+        with self._lock:
+            self._refill(self._clock())
+            # Spreads the remaining requests until the reset. The rate goes back up when the next window starts
+            self._rate = min(self._max_rate, remaining / reset) if reset > 0 else self._max_rate
+            self._tokens = min(self._tokens, remaining)
+
+    def _refill(self, now: float):
+        elapsed = now - self._updated_at
+        if elapsed > 0:
+            self._tokens = min(float(self._burst), self._tokens + elapsed * self._rate)
+            self._updated_at = now
+
+
+_shared_rate_limiters: Dict[str, TokenBucketRateLimiter] = {}
+_shared_rate_limiters_lock = threading.Lock()
+
+
+def shared_rate_limiter(group: str, requests_per_second: float, burst: int = 1) -> TokenBucketRateLimiter:
+    """
+    Returns the rate limiter of a group of requests, e.g: every request sent to an API or to a family of its endpoints. The limiter is
+    created by the first call for the group, the rate and burst of later calls are ignored.
+
+    :param group: the name of the group
+    :param requests_per_second: maximum sustained rate of requests of the group
+    :param burst: maximum number of requests of the group sent at once after the limiter has been idle
+    :return: the limiter shared by every caller using the same group
+    """
+    with _shared_rate_limiters_lock:
+        if group not in _shared_rate_limiters:
+            _shared_rate_limiters[group] = TokenBucketRateLimiter(requests_per_second, burst)
+        return _shared_rate_limiters[group]
+
+
+def _get_header(response: requests.Response, name: str) -> Optional[str]:
+    value = response.headers.get(f"X-{name}")
+    return value if value is not None else response.headers.get(name)
+
+
+def _parse_float(value: Optional[str]) -> Optional[float]:
+    try:
+        return float(value) if value is not None else None
+    except ValueError:
+        return None
+
+
+def _parse_retry_after(value: Optional[str]) -> Optional[float]:
+    # Retry-After is either a number of seconds or an HTTP date
+    seconds = _parse_float(value)
+    if seconds is not None or value is None:
+        return seconds
+    try:
+        return parsedate_to_datetime(value).timestamp() - time.time()
+    except (TypeError, ValueError):
+        return None
+
+
+def _parse_reset(value: Optional[str]) -> Optional[float]:
+    reset = _parse_float(value)
+    if reset is not None and reset > _EPOCH_THRESHOLD:
+        return reset - time.time()
+    return reset
@@ -4,10 +4,10 @@
 
 import logging
 import sys
-import time
 from typing import Optional
 
 import backoff
+from airbyte_cdk.sources.utils.throttling import throttled_sleep
 from requests import codes, exceptions
 
 from .exceptions import DefaultBackoffException, UserDefinedBackoffException
@@ -59,7 +59,8 @@ def user_defined_backoff_handler(max_tries: Optional[int], **kwargs):
                 logger.info(f"Status code: {exc.response.status_code}, Response Content: {exc.response.content}")
             retry_after = exc.backoff
             logger.info(f"Retrying. Sleeping for {retry_after} seconds")
-            time.sleep(retry_after + 1)  # extra second to cover any fractions of second
+            # extra second to cover any fractions of second. Other streams keep reading in the meantime
+            throttled_sleep(retry_after + 1)
 
     def log_give_up(details):
         _, exc, _ = sys.exc_info()
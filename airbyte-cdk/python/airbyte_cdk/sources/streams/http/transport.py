@@ -0,0 +1,171 @@
+#
+# Copyright (c) 2022 Airbyte, Inc., all rights reserved.
+#
+
+import asyncio
+import datetime
+import threading
+from abc import ABC, abstractmethod
+from concurrent.futures import Future
+from typing import Any, Mapping, Optional
+
+import requests
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+try:
+    import aiohttp
+except ImportError:  # aiohttp is an optional dependency installed with the `async-http` extra
+    aiohttp = None
+
+
+class HttpTransport(ABC):
+    """
+    Sends the prepared requests of an HttpStream. Whatever the underlying client, responses are returned as requests.Response and
+    errors are raised as requests exceptions, so that HttpStream's error handling and backoff apply the same way.
+    """
+
+    @abstractmethod
+    def submit(self, request: requests.PreparedRequest, request_kwargs: Mapping[str, Any]) -> "Future[requests.Response]":
+        """
+        Starts sending the request
+
+        :param request: the request to send
+        :param request_kwargs: the options of requests.Session.send to send the request with
+        :return: a future resolving to the response
+        """
+
+    def send(self, request: requests.PreparedRequest, request_kwargs: Mapping[str, Any]) -> requests.Response:
+        return self.submit(request, request_kwargs).result()
+
+    @property
+    def supports_concurrent_requests(self) -> bool:
+        """
+        Whether submitting a request returns before the response is received, so that several requests can be in flight at once
+        """
+        return False
+
+    def close(self):
+        pass
+
+
+class RequestsTransport(HttpTransport):
+    """
+    Sends requests one at a time with a requests.Session. This is the default transport of HttpStream
+    """
+
+    def __init__(self, session: requests.Session):
+        self._session = session
+
+    def submit(self, request: requests.PreparedRequest, request_kwargs: Mapping[str, Any]) -> "Future[requests.Response]":
+        future: Future = Future()
+        try:
+            future.set_result(self.send(request, request_kwargs))
+        except Exception as e:
+            future.set_exception(e)
+        return future
+
+    def send(self, request: requests.PreparedRequest, request_kwargs: Mapping[str, Any]) -> requests.Response:
+        return self._session.send(request, **request_kwargs)
+
+
+class AiohttpTransport(HttpTransport):
+    """
+    Sends requests with aiohttp on an event loop running in a background thread, so that a stream can have several requests in
+    flight. Connections are pooled and kept alive across requests.
+
+    The supported options of requests.Session.send are timeout, verify and allow_redirects. Responses are read completely before
+    being returned.
+    """
+
+    def __init__(self, limit: int = 100, limit_per_host: int = 10, keepalive_timeout: float = 15.0):
+        """
+        :param limit: maximum number of open connections
+        :param limit_per_host: maximum number of open connections to the same host
+        :param keepalive_timeout: number of seconds an idle connection is kept open
+        """
+        if aiohttp is None:
+            raise ImportError("AiohttpTransport requires aiohttp. Install airbyte-cdk with the `async-http` extra")
+        self._limit = limit
+        self._limit_per_host = limit_per_host
+        self._keepalive_timeout = keepalive_timeout
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._session: Optional["aiohttp.ClientSession"] = None
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    @property
+    def supports_concurrent_requests(self) -> bool:
+        return True
+
+    def submit(self, request: requests.PreparedRequest, request_kwargs: Mapping[str, Any]) -> "Future[requests.Response]":
+        return asyncio.run_coroutine_threadsafe(self._send(request, request_kwargs), self._get_loop())
+
+    def close(self):
+        with self._lock:
+            if self._loop is None:
+                return
+            if self._session is not None:
+                asyncio.run_coroutine_threadsafe(self._session.close(), self._loop).result()
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join()
+            self._loop.close()
+            self._loop, self._session, self._thread = None, None, None
+
+    def _get_loop(self) -> asyncio.AbstractEventLoop:
+        with self._lock:
+            if self._loop is None:
+                self._loop = asyncio.new_event_loop()
+                self._thread = threading.Thread(target=self._loop.run_forever, name="aiohttp_transport", daemon=True)
+                self._thread.start()
+            return self._loop
+
+    def _get_session(self) -> "aiohttp.ClientSession":
+        # Only called from the event loop, so that the session is bound to it
+        if self._session is None:
+            connector = aiohttp.TCPConnector(
+                limit=self._limit, limit_per_host=self._limit_per_host, keepalive_timeout=self._keepalive_timeout
+            )
+            # Cookies are set by requests when preparing the request
+            self._session = aiohttp.ClientSession(connector=connector, cookie_jar=aiohttp.DummyCookieJar(), auto_decompress=True)
+        return self._session
+
+    async def _send(self, request: requests.PreparedRequest, request_kwargs: Mapping[str, Any]) -> requests.Response:
+        started_at = datetime.datetime.now()
+        try:
+            async with self._get_session().request(
+                request.method,
+                request.url,
+                headers=request.headers,
+                data=request.body,
+                allow_redirects=request_kwargs.get("allow_redirects", True),
+                ssl=None if request_kwargs.get("verify", True) else False,
+                timeout=self._timeout(request_kwargs.get("timeout")),
+            ) as client_response:
+                content = await client_response.read()
+        except asyncio.TimeoutError as e:
+            raise requests.exceptions.ReadTimeout(e, request=request)
+        except aiohttp.ClientPayloadError as e:
+            raise requests.exceptions.ChunkedEncodingError(e, request=request)
+        except aiohttp.ClientConnectionError as e:
+            raise requests.exceptions.ConnectionError(e, request=request)
+
+        response = requests.Response()
+        response.status_code = client_response.status
+        response.reason = client_response.reason
+        response.headers = CaseInsensitiveDict(client_response.headers)
+        response.encoding = get_encoding_from_headers(response.headers)
+        response.url = str(client_response.url)
+        response.request = request
+        response.elapsed = datetime.datetime.now() - started_at
+        response._content = content
+        response._content_consumed = True
+        return response
+
+    @staticmethod
+    def _timeout(timeout: Any) -> "aiohttp.ClientTimeout":
+        # requests accepts either a single timeout or a (connect, read) tuple
+        if isinstance(timeout, tuple):
+            connect, read = timeout
+            return aiohttp.ClientTimeout(sock_connect=connect, sock_read=read)
+        return aiohttp.ClientTimeout(total=timeout)
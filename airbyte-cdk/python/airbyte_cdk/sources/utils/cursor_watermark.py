@@ -0,0 +1,67 @@
+#
+# Copyright (c) 2022 Airbyte, Inc., all rights reserved.
+#
+
+import copy
+import heapq
+import itertools
+from typing import Any, Callable, List, Mapping, MutableMapping, Optional, Tuple, Union
+
+
+class CursorWatermark:
+    """
+    Tracks a state which is safe to checkpoint while reading records which are not sorted by cursor, as long as every record arrives at
+    most max_records_out_of_order records away from its position in cursor order.
+
+    Once n records have been read, every record among the n - max_records_out_of_order first ones in cursor order has necessarily been
+    read, so the remaining records can't have a lower cursor value than the highest of them: this is the watermark. The latest
+    max_records_out_of_order records are kept in a heap, and the lowest one settles below the watermark whenever another record is read.
+    Only settled records update the state, so memory is bounded by max_records_out_of_order records.
+
+    Records are read again from the watermark value included after a failure, so the source must request records with a cursor value
+    greater than or equal to the state.
+    """
+
+    def __init__(
+        self,
+        max_records_out_of_order: int,
+        cursor_field: Union[str, List[str]],
+        get_updated_state: Callable[[MutableMapping[str, Any], Mapping[str, Any]], MutableMapping[str, Any]],
+        stream_state: MutableMapping[str, Any],
+    ):
+        """
+        :param max_records_out_of_order: maximum distance between the position a record is read at and its position in cursor order
+        :param cursor_field: the cursor field of the records, as a path if the cursor is nested
+        :param get_updated_state: updates the state of the stream with a record, see Stream.get_updated_state
+        :param stream_state: the state before the first record is read
+        """
+        self._max_records_out_of_order = max(0, max_records_out_of_order)
+        self._cursor_path = [cursor_field] if isinstance(cursor_field, str) else list(cursor_field)
+        self._get_updated_state = get_updated_state
+        # The records are applied to a copy since get_updated_state may update the state it is given in place
+        self.state = copy.deepcopy(stream_state)
+        # (cursor value, read order, record) of the records which are not settled yet
+        self._unsettled: List[Tuple[Any, int, Mapping[str, Any]]] = []
+        self._read_order = itertools.count()
+
+    def add(self, record: Mapping[str, Any]):
+        """
+        :param record: the data of the latest record read
+        """
+        cursor_value = self._cursor_value(record)
+        if cursor_value is None:
+            # Records without a cursor value can't move the state backwards
+            self.state = self._get_updated_state(self.state, record)
+            return
+        heapq.heappush(self._unsettled, (cursor_value, next(self._read_order), record))
+        if len(self._unsettled) > self._max_records_out_of_order:
+            _, _, settled_record = heapq.heappop(self._unsettled)
+            self.state = self._get_updated_state(self.state, settled_record)
+
+    def _cursor_value(self, record: Mapping[str, Any]) -> Optional[Any]:
+        value: Any = record
+        for field in self._cursor_path:
+            if not isinstance(value, Mapping):
+                return None
+            value = value.get(field)
+        return value
@@ -0,0 +1,261 @@
+#
+# Copyright (c) 2022 Airbyte, Inc., all rights reserved.
+#
+
+import datetime
+import enum
+import hashlib
+import json
+import threading
+import weakref
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Mapping, Optional, Set, Tuple
+
+from airbyte_cdk.models import AirbyteMessage
+from airbyte_cdk.models import Type as MessageType
+from airbyte_cdk.sources.streams.core import Stream, StreamData
+
+# Fields of the parent records a child stream needs
+Projection = Tuple[str, ...]
+# Values of the projected fields of a parent record, in the order of the projection
+ProjectedRecord = Tuple[Any, ...]
+# Records of a parent stream projected on the fields a child needs, grouped by parent stream slice
+_Entry = List[Tuple[Optional[Mapping[str, Any]], List[ProjectedRecord]]]
+# Identifies the configuration of a parent stream, see parent_stream_key()
+ParentStreamKey = str
+_EntryKey = Tuple[ParentStreamKey, Projection, str]
+
+# The projections expected by child streams, by id of the parent stream, along with a weak reference to the parent stream
+_expected_projections: Dict[int, Tuple["weakref.ref[Stream]", Set[Projection]]] = {}
+_expected_projections_lock = threading.Lock()
+_current_cache: Optional["ParentRecordCache"] = None
+
+
+def expect_parent_records(parent_stream: Stream, projection: Projection):
+    """
+    Declares that a child stream reads the records of a parent stream, so that they are cached when a parent stream configured alike is
+    synced itself
+
+    :param parent_stream: the parent stream instance the child stream reads
+    :param projection: the fields of the parent records the child stream needs
+    """
+    with _expected_projections_lock:
+        # Forgets the parent streams which were garbage collected, whose ids may be reused
+        for key in [key for key, (parent_stream_ref, _) in _expected_projections.items() if parent_stream_ref() is None]:
+            del _expected_projections[key]
+        expected = _expected_projections.get(id(parent_stream))
+        if expected is None:
+            expected = (weakref.ref(parent_stream), set())
+            _expected_projections[id(parent_stream)] = expected
+        expected[1].add(tuple(projection))
+
+
+def parent_stream_key(parent_stream: Stream) -> ParentStreamKey:
+    """
+    Identifies the configuration of a parent stream, so that the records of distinct instances configured alike are shared, e.g: the parent
+    stream built for each child stream of a declarative source, or passed to each HttpSubStream. The key is made of the class and name of
+    the stream, its attributes holding plain data, e.g: config, start date or authenticator credentials, and for HTTP streams, the URL,
+    parameters and headers of their first request. Streams whose first request can't be built without a stream slice, e.g: substreams,
+    are only identified by their instance.
+
+    The key depends on attributes which may change while the stream is read, it must be computed before reading the stream.
+
+    :param parent_stream: the parent stream instance
+    :return: a fingerprint equal for instances configured alike
+    """
+    identity = {
+        "class": f"{type(parent_stream).__module__}.{type(parent_stream).__qualname__}",
+        "name": parent_stream.name,
+        "attributes": _plain_data(vars(parent_stream)),
+    }
+    # Declarative streams delegate their requests to their retriever
+    http_stream = getattr(parent_stream, "retriever", parent_stream)
+    if hasattr(http_stream, "url_base"):
+        authenticator = getattr(http_stream, "authenticator", None)
+        try:
+            identity["request"] = {
+                "url_base": http_stream.url_base,
+                "path": http_stream.path(stream_state={}, stream_slice=None, next_page_token=None),
+                "params": http_stream.request_params(stream_state={}, stream_slice=None, next_page_token=None),
+                "headers": http_stream.request_headers(stream_state={}, stream_slice=None, next_page_token=None),
+                "authenticator": _plain_data(vars(authenticator)) if hasattr(authenticator, "__dict__") else None,
+            }
+        except Exception:
+            return f"instance:{id(parent_stream)}"
+    return hashlib.sha256(json.dumps(identity, sort_keys=True, default=str).encode()).hexdigest()
+
+
+def _plain_data(value: Any) -> Any:
+    """
+    :return: the plain data held by the value, leaving out the items of mappings which aren't plain data, or None if it isn't plain data
+    """
+    if value is None or isinstance(value, (str, int, float, bool)):
+        return value
+    if isinstance(value, enum.Enum):
+        return _plain_data(value.value)
+    if isinstance(value, (datetime.date, datetime.time, datetime.timedelta)):
+        return str(value)
+    if isinstance(value, Mapping):
+        items = {str(key): _plain_data(item) for key, item in value.items()}
+        return {key: item for key, item in items.items() if item is not None or value.get(key) is None}
+    if isinstance(value, (list, tuple)):
+        return [_plain_data(item) for item in value]
+    return None
+
+
+class ParentRecordCache:
+    """
+    Caches the records of parent streams for the duration of a sync, so that child streams iterating over the same parent don't read it
+    again. Only the fields the child streams need are kept, as tuples of values, grouped by parent stream slice.
+
+    The records are cached by the first child stream reading the parent, or while the parent itself is synced in full refresh when a child
+    stream expects it. Only complete reads of the parent are cached. Records are shared by child streams reading parent stream instances
+    configured alike, see parent_stream_key(), since another instance of a stream with the same name may be configured differently. Since
+    child streams pass their own state to the parent stream, records read with different states are cached separately.
+    """
+
+    def __init__(self, expected_projections: Optional[Iterable[Tuple[Stream, Set[Projection]]]] = None):
+        """
+        :param expected_projections: the parent stream instances expected by child streams, along with the projections of their records
+        """
+        # The keys of the parent stream instances by id, computed before the instances are read. The instances are kept alongside so that
+        # their id is not reused while the cache is in use
+        self._parent_stream_keys: Dict[int, Tuple[Stream, ParentStreamKey]] = {}
+        self._expected_projections: Dict[ParentStreamKey, Set[Projection]] = {}
+        self._entries: Dict[_EntryKey, _Entry] = {}
+        self._lock = threading.Lock()
+        for parent_stream, projections in expected_projections or ():
+            self._expected_projections.setdefault(self._parent_stream_key(parent_stream), set()).update(projections)
+
+    def _parent_stream_key(self, parent_stream: Stream) -> ParentStreamKey:
+        with self._lock:
+            _, key = self._parent_stream_keys.get(id(parent_stream), (None, None))
+            if key is None:
+                key = parent_stream_key(parent_stream)
+                self._parent_stream_keys[id(parent_stream)] = (parent_stream, key)
+            return key
+
+    def read(
+        self,
+        parent_stream: Stream,
+        projection: Projection,
+        stream_state: Optional[Mapping[str, Any]],
+        read_parent: Callable[[], Iterable[Tuple[Optional[Mapping[str, Any]], StreamData]]],
+    ) -> Iterator[Tuple[Optional[Mapping[str, Any]], ProjectedRecord]]:
+        """
+        Iterates over the records of the parent stream, reading it only if it is not cached yet
+
+        :param parent_stream: the parent stream instance
+        :param projection: the fields of the parent records to return
+        :param stream_state: the state the parent stream is read with
+        :param read_parent: reads the parent stream, returning each of its records along with its parent stream slice
+        :return: an iterator of (parent stream slice, projected record)
+        """
+        key = (self._parent_stream_key(parent_stream), tuple(projection), _state_key(stream_state))
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry is not None:
+            for parent_slice, records in entry:
+                for record in records:
+                    yield parent_slice, record
+            return
+
+        recorder = _Recorder([tuple(projection)])
+        for parent_slice, record in read_parent():
+            projected_record = recorder.add(parent_slice, record)
+            if projected_record is not None:
+                yield parent_slice, projected_record[0]
+        self._put(key, recorder.entries[0])
+
+    def record_parent_sync(self, stream: Stream) -> Optional["ParentSyncRecorder"]:
+        """
+        Caches the records of a parent stream while it is synced in full refresh
+
+        :param stream: the stream instance being synced, before it is read
+        :return: a recorder to give each record read to, or None if no child stream expects the records of a stream configured alike
+        """
+        parent_stream_key = self._parent_stream_key(stream)
+        projections = self._expected_projections.get(parent_stream_key)
+        if not projections:
+            return None
+        return ParentSyncRecorder(self, parent_stream_key, sorted(projections))
+
+    def _put(self, key: _EntryKey, entry: _Entry):
+        with self._lock:
+            self._entries.setdefault(key, entry)
+
+
+class _Recorder:
+    def __init__(self, projections: List[Projection]):
+        self._projections = projections
+        self.entries: List[_Entry] = [[] for _ in projections]
+
+    def add(self, parent_slice: Optional[Mapping[str, Any]], record: StreamData) -> Optional[List[ProjectedRecord]]:
+        if isinstance(record, AirbyteMessage):
+            if record.type != MessageType.RECORD:
+                return None
+            record = record.record.data
+        projected_records = [tuple(record.get(field) for field in projection) for projection in self._projections]
+        for entry, projected_record in zip(self.entries, projected_records):
+            # Records are read slice by slice, so a new slice starts whenever the slice differs from the one of the previous record
+            if not entry or entry[-1][0] is not parent_slice:
+                entry.append((parent_slice, []))
+            entry[-1][1].append(projected_record)
+        return projected_records
+
+
+class ParentSyncRecorder:
+    """
+    Records the records of a parent stream while it is synced, for the child streams expecting them
+    """
+
+    def __init__(self, cache: ParentRecordCache, parent_stream_key: ParentStreamKey, projections: List[Projection]):
+        self._cache = cache
+        self._parent_stream_key = parent_stream_key
+        self._recorder = _Recorder(projections)
+        self._projections = projections
+
+    def add(self, parent_slice: Optional[Mapping[str, Any]], record: StreamData):
+        """
+        :param parent_slice: the stream slice the record was read from
+        :param record: a record or message read from the stream
+        """
+        self._recorder.add(parent_slice, record)
+
+    def commit(self):
+        """
+        Caches the records once every slice of the stream has been read completely
+        """
+        for projection, entry in zip(self._projections, self._recorder.entries):
+            self._cache._put((self._parent_stream_key, projection, _state_key(None)), entry)
+
+
+def _state_key(stream_state: Optional[Mapping[str, Any]]) -> str:
+    return json.dumps(stream_state, sort_keys=True, default=str) if stream_state else ""
+
+
+@contextmanager
+def parent_record_cache_scope() -> Iterator[ParentRecordCache]:
+    """
+    Enables the parent record cache until the context is exited, e.g: for the duration of a sync
+    """
+    global _current_cache
+    previous_cache = _current_cache
+    with _expected_projections_lock:
+        expected_projections = [
+            (parent_stream_ref(), set(projections)) for parent_stream_ref, projections in _expected_projections.values()
+        ]
+    _current_cache = ParentRecordCache(
+        [(parent_stream, projections) for parent_stream, projections in expected_projections if parent_stream is not None]
+    )
+    try:
+        yield _current_cache
+    finally:
+        _current_cache = previous_cache
+
+
+def current_parent_record_cache() -> Optional[ParentRecordCache]:
+    """
+    :return: the cache of the sync in progress, or None if the parent records are not cached
+    """
+    return _current_cache
@@ -3,12 +3,25 @@
 #
 
 import datetime
+import json
+import math
 from typing import Any, Mapping
 
 from airbyte_cdk.models import AirbyteLogMessage, AirbyteMessage, AirbyteRecordMessage, AirbyteTraceMessage
 from airbyte_cdk.models import Type as MessageType
 from airbyte_cdk.sources.streams.core import StreamData
 from airbyte_cdk.sources.utils.transform import TransformConfig, TypeTransformer
+from pydantic.json import pydantic_encoder
+
+try:
+    import orjson
+except ImportError:  # orjson is an optional dependency installed with the `orjson` extra
+    orjson = None
+
+# Start of the RECORD messages serialized by airbyte_message_to_string, with the standard library or with orjson
+RECORD_MESSAGE_PREFIXES = ('{"type": "RECORD"', '{"type":"RECORD"')
+# Fields of an AirbyteRecordMessage which are serialized by the record fast path, in the order pydantic serializes them
+_RECORD_FIELDS = ("namespace", "stream", "data", "emitted_at")
 
 
 def stream_data_to_airbyte_message(
@@ -28,11 +41,50 @@ def stream_data_to_airbyte_message(
         # taken unless configured. See
         # docs/connector-development/cdk-python/schemas.md for details.
         transformer.transform(data, schema)  # type: ignore
-        message = AirbyteRecordMessage(stream=stream_name, data=data, emitted_at=now_millis)
-        return AirbyteMessage(type=MessageType.RECORD, record=message)
+        # The inputs are known to be valid so the models are built without pydantic validation, which copies the record data
+        message = AirbyteRecordMessage.construct(stream=stream_name, data=data, emitted_at=now_millis)
+        return AirbyteMessage.construct(type=MessageType.RECORD, record=message)
     elif isinstance(data_or_message, AirbyteTraceMessage):
         return AirbyteMessage(type=MessageType.TRACE, trace=data_or_message)
     elif isinstance(data_or_message, AirbyteLogMessage):
         return AirbyteMessage(type=MessageType.LOG, log=data_or_message)
     else:
         raise ValueError(f"Unexpected type for data_or_message: {type(data_or_message)}: {data_or_message}")
+
+
+def airbyte_message_to_string(message: AirbyteMessage) -> str:
+    """
+    Serializes an AirbyteMessage to the same JSON value as message.json(exclude_unset=True).
+
+    RECORD messages are serialized straight from their data instead of going through pydantic, which walks and copies the whole record.
+    If orjson is installed, it is used to encode them, without whitespace between the separators and without escaping non-ASCII
+    characters, so the text differs from the one of pydantic while decoding to the same value. Records holding NaN or infinite floats,
+    which orjson would turn into null, are encoded by the standard library like pydantic does. Other messages, and records carrying
+    fields outside of the protocol, are serialized by pydantic.
+    """
+    record = message.record
+    if message.type != MessageType.RECORD or record is None or not record.__fields_set__.issubset(_RECORD_FIELDS):
+        return message.json(exclude_unset=True)
+
+    record_dict = {field: getattr(record, field) for field in _RECORD_FIELDS if field in record.__fields_set__}
+    message_dict = {"type": MessageType.RECORD.value, "record": record_dict}
+    if orjson:
+        try:
+            serialized = orjson.dumps(message_dict, default=pydantic_encoder, option=orjson.OPT_NON_STR_KEYS)
+            # orjson encodes NaN and infinite floats as null, so only records with a null can hold some
+            if b"null" not in serialized or not _contains_non_finite_float(record_dict["data"]):
+                return serialized.decode("utf-8")
+        except TypeError:
+            # e.g: integers which do not fit in 64 bits. Let the standard library encode those
+            pass
+    return json.dumps(message_dict, default=pydantic_encoder)
+
+
+def _contains_non_finite_float(value: Any) -> bool:
+    if isinstance(value, float):
+        return not math.isfinite(value)
+    if isinstance(value, dict):
+        return any(_contains_non_finite_float(item) for item in value.values())
+    if isinstance(value, (list, tuple)):
+        return any(_contains_non_finite_float(item) for item in value)
+    return False
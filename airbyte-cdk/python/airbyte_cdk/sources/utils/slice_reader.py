@@ -0,0 +1,125 @@
+#
+# Copyright (c) 2022 Airbyte, Inc., all rights reserved.
+#
+
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
+from queue import Full, Queue
+from typing import Any, Callable, Deque, Iterable, Iterator, Mapping, Optional, Tuple
+
+from airbyte_cdk.sources.streams.core import StreamData
+from airbyte_cdk.sources.utils.throttling import StreamThrottle, current_throttle
+
+# Marker put on a slice's queue by its worker once every record of the slice has been read
+_SLICE_COMPLETE = object()
+
+
+class ConcurrentSliceReader:
+    """
+    Reads the slices of a stream on a pool of worker threads while handing their records back in slice order.
+
+    Up to max_concurrent_slices slices are in flight at any time. Each worker buffers the records of its slice in a bounded queue, so a
+    slice which is far ahead of the consumer blocks instead of holding its whole content in memory.
+
+    Alongside each slice, the reader tells whether state may be checkpointed once the records of that slice have been consumed. When
+    window_barrier is False, every slice is checkpointable because the consumer always finishes a contiguous prefix of slices. When
+    window_barrier is True, slices are read in windows of max_concurrent_slices and only the last slice of a window is checkpointable.
+    This is meant for streams which advance their state from within read_records, where the state observed after a slice can already
+    account for the slices still in flight.
+    """
+
+    def __init__(
+        self,
+        max_concurrent_slices: int,
+        read_slice: Callable[[Optional[Mapping[str, Any]]], Iterable[StreamData]],
+        window_barrier: bool = False,
+        buffer_size: int = 1000,
+    ):
+        """
+        :param max_concurrent_slices: maximum number of slices read at the same time
+        :param read_slice: function returning the records of a slice. It is called from worker threads
+        :param window_barrier: if True, wait for every in-flight slice to be consumed before reading further slices
+        :param buffer_size: maximum number of records buffered per in-flight slice
+        """
+        self._max_concurrent_slices = max_concurrent_slices
+        self._read_slice = read_slice
+        self._window_barrier = window_barrier
+        self._buffer_size = buffer_size
+
+    def read(
+        self, slices: Iterable[Optional[Mapping[str, Any]]]
+    ) -> Iterator[Tuple[Optional[Mapping[str, Any]], Iterator[StreamData], bool]]:
+        """
+        :param slices: the slices to read
+        :return: an iterator of (slice, records of the slice, whether state can be checkpointed after the slice) in slice order.
+        The records of a slice must be consumed before moving on to the next slice.
+        """
+        stop_reading = threading.Event()
+        slices_iterator = iter(slices)
+        in_flight: Deque[Tuple[Optional[Mapping[str, Any]], Queue]] = deque()
+        executor = ThreadPoolExecutor(max_workers=self._max_concurrent_slices, thread_name_prefix="slice_reader")
+        # The rate limits hit while reading the slices are accounted to the stream
+        throttle = current_throttle()
+
+        def submit_next_slice() -> bool:
+            try:
+                _slice = next(slices_iterator)
+            except StopIteration:
+                return False
+            records: Queue = Queue(maxsize=self._buffer_size)
+            in_flight.append((_slice, records))
+            executor.submit(self._read_into, _slice, records, stop_reading, throttle)
+            return True
+
+        try:
+            slices_exhausted = False
+            while True:
+                if not self._window_barrier or not in_flight:
+                    while not slices_exhausted and len(in_flight) < self._max_concurrent_slices:
+                        slices_exhausted = not submit_next_slice()
+                if not in_flight:
+                    return
+
+                _slice, records = in_flight.popleft()
+                # With a window barrier, only the last slice of a window is checkpointable since nothing else is in flight once it has
+                # been consumed. Otherwise, the consumer always finishes a contiguous prefix of the slices.
+                can_checkpoint = not self._window_barrier or not in_flight
+                yield _slice, self._drain(records), can_checkpoint
+        finally:
+            stop_reading.set()
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    def _read_into(
+        self, _slice: Optional[Mapping[str, Any]], records: Queue, stop_reading: threading.Event, throttle: Optional[StreamThrottle] = None
+    ):
+        try:
+            with throttle.activate() if throttle else nullcontext():
+                for record in self._read_slice(_slice):
+                    if not self._put(records, record, stop_reading):
+                        return
+        except Exception as e:
+            self._put(records, e, stop_reading)
+        else:
+            self._put(records, _SLICE_COMPLETE, stop_reading)
+
+    @staticmethod
+    def _put(records: Queue, item: Any, stop_reading: threading.Event) -> bool:
+        while not stop_reading.is_set():
+            try:
+                records.put(item, timeout=0.1)
+                return True
+            except Full:
+                continue
+        return False
+
+    @staticmethod
+    def _drain(records: Queue) -> Iterator[StreamData]:
+        while True:
+            item = records.get()
+            if item is _SLICE_COMPLETE:
+                return
+            if isinstance(item, Exception):
+                raise item
+            yield item
@@ -0,0 +1,267 @@
+#
+# Copyright (c) 2022 Airbyte, Inc., all rights reserved.
+#
+
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Callable, Generic, Iterable, Iterator, List, Optional, TypeVar
+
+# Waits shorter than this, e.g: the spacing of requests by a rate limiter, keep the turn of the stream since handing it over would
+# cost more than it saves
+MIN_YIELDING_WAIT_SECONDS = 1.0
+# How often a stream waiting for a turn checks whether the scheduler was stopped
+_STOP_CHECK_INTERVAL_SECONDS = 0.1
+
+T = TypeVar("T")
+
+_local = threading.local()
+
+
+@dataclass(frozen=True)
+class ThrottleMetrics:
+    """
+    Time a stream spent waiting for rate limits
+
+    Attributes:
+        waits (int): number of times the stream waited
+        throttled_seconds (float): total number of seconds the stream waited
+    """
+
+    waits: int = 0
+    throttled_seconds: float = 0.0
+
+    def __str__(self):
+        return f"{self.waits} waits, {self.throttled_seconds:.1f} seconds throttled"
+
+
+class ReadStopped(Exception):
+    """
+    Raised to a stream waiting for a turn of a ReadScheduler which was stopped, e.g: because another stream failed
+    """
+
+
+class ReadScheduler:
+    """
+    Bounds the number of streams read at the same time. A stream waiting for a rate limit hands its turn over to another stream until
+    the wait is over, so that a throttled endpoint does not hold up the streams reading other endpoints.
+    """
+
+    def __init__(self, max_active_streams: int, on_turn_handed_over: Optional[Callable[[], None]] = None):
+        """
+        :param max_active_streams: maximum number of streams reading, not counting the ones waiting for a rate limit
+        :param on_turn_handed_over: called whenever a stream waiting for a rate limit hands its turn over, e.g: to start reading another
+            stream
+        """
+        self._turns = threading.Semaphore(max_active_streams)
+        self._on_turn_handed_over = on_turn_handed_over
+        self._stopped = threading.Event()
+
+    def acquire(self) -> bool:
+        """
+        Waits for a turn, unless the scheduler is stopped in the meantime
+
+        :return: True if a turn was acquired, False if the scheduler was stopped
+        """
+        while not self._stopped.is_set():
+            if self._turns.acquire(timeout=_STOP_CHECK_INTERVAL_SECONDS):
+                if not self._stopped.is_set():
+                    return True
+                self._turns.release()
+        return False
+
+    def release(self):
+        self._turns.release()
+
+    def hand_over(self):
+        """
+        Releases the turn of a stream waiting for a rate limit, for another stream to take until the wait is over
+        """
+        self.release()
+        if self._on_turn_handed_over:
+            self._on_turn_handed_over()
+
+    def stop(self):
+        """
+        Stops giving turns out, e.g: once reading failed. Streams waiting for a turn get a ReadStopped exception
+        """
+        self._stopped.set()
+
+
+class ReaderPool(Generic[T]):
+    """
+    Worker threads reading streams one after another: max_workers of them, plus an extra one started whenever a stream waiting for a rate
+    limit hands its turn of the ReadScheduler over, which stops once the stream it took is read. There are therefore at most max_workers
+    worker threads, plus one per stream waiting for a rate limit.
+    """
+
+    def __init__(self, name: str, streams: Iterable[T], read_stream: Callable[[T], None], max_workers: int):
+        """
+        :param name: prefix of the names of the worker threads
+        :param streams: the streams to read, in order
+        :param read_stream: reads a stream, called on a worker thread
+        :param max_workers: the number of worker threads, not counting the extra ones
+        """
+        self._name = name
+        self._pending_streams = deque(streams)
+        self._read_stream = read_stream
+        self._max_workers = max_workers
+        self._lock = threading.Lock()
+        self._workers: List[threading.Thread] = []
+        self._running_workers = 0
+        self._stopped = threading.Event()
+
+    def start(self):
+        with self._lock:
+            for _ in range(min(self._max_workers, len(self._pending_streams))):
+                self._start_worker()
+
+    def start_extra_worker(self):
+        """
+        Starts an extra worker thread if streams are left to read, e.g: once a stream handed its turn over
+        """
+        with self._lock:
+            if self._pending_streams and not self._stopped.is_set():
+                self._start_worker()
+
+    def stop(self):
+        """
+        Stops taking streams to read, and waits for the worker threads to be done with the streams they took
+        """
+        self._stopped.set()
+        with self._lock:
+            workers = list(self._workers)
+        for worker in workers:
+            worker.join()
+
+    def _start_worker(self):
+        # Called with the lock held
+        self._running_workers += 1
+        worker = threading.Thread(target=self._work, name=f"{self._name}_{len(self._workers)}", daemon=True)
+        self._workers.append(worker)
+        worker.start()
+
+    def _work(self):
+        while True:
+            with self._lock:
+                if self._stopped.is_set() or not self._pending_streams:
+                    self._running_workers -= 1
+                    return
+                stream = self._pending_streams.popleft()
+            self._read_stream(stream)
+            with self._lock:
+                # Extra workers stop once their stream is read
+                if self._running_workers > self._max_workers:
+                    self._running_workers -= 1
+                    return
+
+
+class StreamThrottle:
+    """
+    Waits for the rate limits hit while reading a stream, recording the time spent waiting. When the stream is read by a ReadScheduler,
+    the stream hands its turn over to another stream while it waits.
+
+    Code waiting for a rate limit does not need a reference to the throttle: throttled_sleep waits on behalf of the throttle activated
+    on the current thread.
+    """
+
+    def __init__(self, stream_name: str, scheduler: Optional[ReadScheduler] = None):
+        """
+        :param stream_name: the name of the stream
+        :param scheduler: the scheduler the stream takes turns from, None if the stream does not share the source with other streams
+        """
+        self.stream_name = stream_name
+        self._scheduler = scheduler
+        self._lock = threading.Lock()
+        self._waits = 0
+        self._throttled_seconds = 0.0
+        # The thread holding the turn of the stream, which is the only one able to hand it over
+        self._turn_thread: Optional[int] = None
+
+    @property
+    def metrics(self) -> ThrottleMetrics:
+        with self._lock:
+            return ThrottleMetrics(waits=self._waits, throttled_seconds=self._throttled_seconds)
+
+    @contextmanager
+    def turn(self) -> Iterator["StreamThrottle"]:
+        """
+        Holds a turn of the scheduler on the current thread until the context is exited. Does nothing without a scheduler
+
+        :raises ReadStopped: if the scheduler is stopped before the turn is acquired
+        """
+        if self._scheduler is None:
+            yield self
+            return
+        self._acquire_turn()
+        try:
+            yield self
+        finally:
+            # The turn is not held anymore if the scheduler was stopped while the stream waited for a rate limit
+            if self._turn_thread is not None:
+                self._turn_thread = None
+                self._scheduler.release()
+
+    def _acquire_turn(self):
+        if not self._scheduler.acquire():
+            raise ReadStopped(f"Stopped reading the {self.stream_name} stream")
+        self._turn_thread = threading.get_ident()
+
+    @contextmanager
+    def activate(self) -> Iterator["StreamThrottle"]:
+        """
+        Makes throttled_sleep wait on behalf of this throttle on the current thread until the context is exited, e.g: on a thread
+        reading the stream or one of its slices
+        """
+        previous_throttle = getattr(_local, "throttle", None)
+        _local.throttle = self
+        try:
+            yield self
+        finally:
+            _local.throttle = previous_throttle
+
+    def wait(self, seconds: float):
+        """
+        Waits for the given number of seconds, handing the turn of the stream over if it is held by the current thread
+
+        :param seconds: the number of seconds to wait
+        """
+        if seconds <= 0:
+            return
+        with self._lock:
+            self._waits += 1
+            self._throttled_seconds += seconds
+        hand_turn_over = self._scheduler is not None and self._turn_thread == threading.get_ident() and seconds >= MIN_YIELDING_WAIT_SECONDS
+        if not hand_turn_over:
+            time.sleep(seconds)
+            return
+        self._turn_thread = None
+        self._scheduler.hand_over()
+        try:
+            time.sleep(seconds)
+        finally:
+            # The stream resumes once a turn is available again
+            self._acquire_turn()
+
+
+def current_throttle() -> Optional[StreamThrottle]:
+    """
+    :return: the throttle activated on the current thread, or None if the current thread is not reading a stream
+    """
+    return getattr(_local, "throttle", None)
+
+
+def throttled_sleep(seconds: float):
+    """
+    Waits for a rate limit on behalf of the stream read by the current thread, if any. Use it instead of time.sleep for waits caused by
+    rate limits, so that they are accounted for and let other streams progress.
+
+    :param seconds: the number of seconds to wait
+    """
+    throttle = current_throttle()
+    if throttle is not None:
+        throttle.wait(seconds)
+    elif seconds > 0:
+        time.sleep(seconds)
@@ -2,16 +2,31 @@
 # Copyright (c) 2022 Airbyte, Inc., all rights reserved.
 #
 
+import json
 import logging
+import threading
 from distutils.util import strtobool
 from enum import Flag, auto
-from typing import Any, Callable, Dict, Mapping, Optional
+from typing import Any, Callable, Dict, List, Mapping, Optional, Set, Union
 
-from jsonschema import Draft7Validator, ValidationError, validators
+from cachetools import LRUCache
+from jsonschema import Draft7Validator, RefResolutionError, RefResolver, ValidationError, validators
 
 json_to_python_simple = {"string": str, "number": float, "integer": int, "boolean": bool, "null": type(None)}
 json_to_python = json_to_python_simple | {"object": dict, "array": list}
 python_to_json = {v: k for k, v in json_to_python.items()}
+# Python types of the values default_convert returns as is, for each target jsonschema type
+_unconverted_python_types = {"string": {str}, "number": {float}, "integer": {int}, "boolean": {bool}, "array": {list, dict}}
+# Python types of the values which are always valid for each jsonschema type. Other values are checked with the jsonschema type checker
+_valid_python_types = {"string": {str}, "number": {int, float}, "integer": {int}, "boolean": {bool}, "null": {type(None)}} | {
+    "object": {dict},
+    "array": {list},
+}
+# Maximum number of normalization plans kept by a TypeTransformer. A transformer is usually used by a single stream and schema
+PLAN_CACHE_SIZE = 32
+
+# A step of a normalization plan. It normalizes and validates the value found at the given key path
+_Step = Callable[[Any, List[Union[str, int]]], None]
 
 logger = logging.getLogger("airbyte")
 
@@ -35,9 +50,18 @@ class TransformConfig(Flag):
     CustomSchemaNormalization = auto()
 
 
+class _UnsupportedSchema(Exception):
+    """The schema uses features which are not compiled into a normalization plan"""
+
+
 class TypeTransformer:
     """
     Class for transforming object before output.
+
+    Each schema is compiled once into a normalization plan: for every object and array of the schema, a flat list of the keys whose
+    values need to be converted or validated, along with the function doing it. Plans are cached by the transformer, so the cost of
+    transforming a record only depends on the fields it contains. Schemas using features the plans do not support, e.g: remote $ref
+    or $id, are traversed with the jsonschema validator instead.
     """
 
     _custom_normalizer: Optional[Callable[[Any, Dict[str, Any]], Any]] = None
@@ -57,6 +81,9 @@ class TypeTransformer:
             if key in ["type", "array", "$ref", "properties", "items"]
         }
         self._normalizer = validators.create(meta_schema=Draft7Validator.META_SCHEMA, validators=all_validators)
+        self._plans: LRUCache = LRUCache(maxsize=PLAN_CACHE_SIZE)
+        self._plans_by_identity: LRUCache = LRUCache(maxsize=PLAN_CACHE_SIZE)
+        self._plans_lock = threading.Lock()
 
     def registerCustomTransform(self, normalization_callback: Callable[[Any, Dict[str, Any]], Any]) -> Callable:
         """
@@ -70,6 +97,10 @@ class TypeTransformer:
         if TransformConfig.CustomSchemaNormalization not in self._config:
             raise Exception("Please set TransformConfig.CustomSchemaNormalization config before registering custom normalizer")
         self._custom_normalizer = normalization_callback
+        # Plans compiled so far do not call the custom normalizer
+        with self._plans_lock:
+            self._plans.clear()
+            self._plans_by_identity.clear()
         return normalization_callback
 
     def __normalize(self, original_item: Any, subschema: Dict[str, Any]) -> Any:
@@ -180,6 +211,13 @@ class TypeTransformer:
         """
         if TransformConfig.NoTransform in self._config:
             return
+        plan = self._get_plan(schema)
+        if plan is None:
+            self._transform_with_validator(record, schema)
+        else:
+            self._run_plan(plan, record, [])
+
+    def _transform_with_validator(self, record: Dict[str, Any], schema: Mapping[str, Any]):
         normalizer = self._normalizer(schema)
         for e in normalizer.iter_errors(record):
             """
@@ -188,9 +226,195 @@ class TypeTransformer:
             """
             logger.warning(self.get_error_message(e))
 
+    def _get_plan(self, schema: Mapping[str, Any]) -> Optional[List[_Step]]:
+        """
+        :return: the normalization plan of the schema, or None if the schema must be traversed with the jsonschema validator
+        """
+        # Streams usually pass the same schema object for every record. Schemas loaded again for every record are looked up by content
+        with self._plans_lock:
+            cached = self._plans_by_identity.get(id(schema))
+        if cached is not None and cached[0] is schema:
+            return cached[1]
+        try:
+            key = json.dumps(schema, sort_keys=True)
+        except (TypeError, ValueError):
+            key = None
+        with self._plans_lock:
+            if key in self._plans:
+                plan = self._plans[key]
+                self._plans_by_identity[id(schema)] = (schema, plan)
+                return plan
+        try:
+            plan = _PlanCompiler(self, schema).compile()
+        except (_UnsupportedSchema, RefResolutionError):
+            plan = None
+        with self._plans_lock:
+            if key is not None:
+                self._plans[key] = plan
+            # The schema is kept along with the plan so that its id cannot be reused by another object while it is cached
+            self._plans_by_identity[id(schema)] = (schema, plan)
+        return plan
+
+    @staticmethod
+    def _run_plan(plan: List[_Step], instance: Any, path: List[Union[str, int]]):
+        for step in plan:
+            step(instance, path)
+
+    def _compile_converter(self, subschema: Dict[str, Any]) -> Optional[Callable[[Any], Any]]:
+        """
+        :return: the function normalizing values of the subschema, or None if __normalize would return every value as is
+        """
+        if self._custom_normalizer:
+            return lambda value: self.__normalize(value, subschema)
+        if TransformConfig.DefaultSchemaNormalization not in self._config:
+            return None
+
+        target_type = subschema.get("type", [])
+        if isinstance(target_type, list):
+            nullable = "null" in target_type
+            target_type = [t for t in target_type if t != "null"]
+            if len(target_type) != 1:
+                return None
+            target_type = target_type[0]
+        else:
+            nullable = "null" in target_type
+        if target_type not in _unconverted_python_types:
+            return None
+        unconverted_types = _unconverted_python_types[target_type] | ({type(None)} if nullable else set())
+
+        def convert(value: Any) -> Any:
+            if type(value) in unconverted_types:
+                return value
+            return self.default_convert(value, subschema)
+
+        return convert
+
     def get_error_message(self, e: ValidationError) -> str:
         instance_json_type = python_to_json[type(e.instance)]
         key_path = "." + ".".join(map(str, e.path))
         return (
             f"Failed to transform value {repr(e.instance)} of type '{instance_json_type}' to '{e.validator_value}', key path: '{key_path}'"
         )
+
+
+class _PlanCompiler:
+    """
+    Compiles a schema into the normalization plan applying the same conversions, in the same order, as the jsonschema traversal of
+    TypeTransformer, and logging the same type validation warnings.
+    """
+
+    def __init__(self, transformer: TypeTransformer, schema: Mapping[str, Any]):
+        self._transformer = transformer
+        self._schema = schema
+        self._resolver = RefResolver.from_schema(schema, id_of=Draft7Validator.ID_OF)
+        # Plans by subschema id, so that recursive schemas are compiled once
+        self._plans: Dict[int, List[_Step]] = {}
+
+    def compile(self) -> List[_Step]:
+        return self._compile_subschema(self._schema)
+
+    def _resolve(self, subschema: Dict[str, Any]) -> Dict[str, Any]:
+        ref = subschema["$ref"]
+        if not isinstance(ref, str) or not ref.startswith("#"):
+            raise _UnsupportedSchema(f"Remote $ref {ref}")
+        _, resolved = self._resolver.resolve(ref)
+        return resolved
+
+    def _resolve_once(self, subschema: Dict[str, Any]) -> Dict[str, Any]:
+        # The value is normalized against its subschema with a single level of $ref resolved
+        if not isinstance(subschema, dict):
+            raise _UnsupportedSchema(f"Subschema {subschema}")
+        return self._resolve(subschema) if "$ref" in subschema else subschema
+
+    def _compile_subschema(self, subschema: Dict[str, Any]) -> List[_Step]:
+        if id(subschema) in self._plans:
+            return self._plans[id(subschema)]
+        if not isinstance(subschema, dict):
+            raise _UnsupportedSchema(f"Subschema {subschema}")
+        if subschema is not self._schema and "$id" in subschema:
+            raise _UnsupportedSchema("Nested $id")
+
+        plan: List[_Step] = []
+        self._plans[id(subschema)] = plan
+        if "$ref" in subschema:
+            # Other keywords are ignored next to $ref. The plan of the referenced schema might still be compiling if it is recursive
+            resolved_plan = self._compile_subschema(self._resolve(subschema))
+            if resolved_plan is not plan:
+                plan.append(lambda instance, path: self._transformer._run_plan(resolved_plan, instance, path))
+            return plan
+
+        for keyword, value in subschema.items():
+            if keyword == "type":
+                plan.append(self._compile_type(value))
+            elif keyword == "properties":
+                plan.append(self._compile_properties(value))
+            elif keyword == "items":
+                plan.append(self._compile_items(value))
+        # Steps which have nothing to do are left out of the plan
+        plan[:] = [step for step in plan if step is not None]
+        return plan
+
+    def _compile_type(self, types: Union[str, List[str]]) -> _Step:
+        type_list = [types] if isinstance(types, str) else types
+        if not isinstance(type_list, list) or any(t not in _valid_python_types for t in type_list):
+            raise _UnsupportedSchema(f"Type {types}")
+        valid_types: Set[type] = set().union(*(_valid_python_types[t] for t in type_list))
+        is_type = Draft7Validator.TYPE_CHECKER.is_type
+        transformer = self._transformer
+
+        def check_type(instance: Any, path: List[Union[str, int]]):
+            if type(instance) in valid_types or any(is_type(instance, t) for t in type_list):
+                return
+            error = ValidationError(
+                f"{instance!r} is not of type {types}", validator="type", validator_value=types, instance=instance, path=list(path)
+            )
+            logger.warning(transformer.get_error_message(error))
+
+        return check_type
+
+    def _compile_properties(self, properties: Mapping[str, Any]) -> Optional[_Step]:
+        if not isinstance(properties, dict):
+            raise _UnsupportedSchema(f"Properties {properties}")
+        converters = []
+        children = []
+        for key, subschema in properties.items():
+            converter = self._transformer._compile_converter(self._resolve_once(subschema))
+            if converter:
+                converters.append((key, converter))
+            child = self._compile_subschema(subschema)
+            children.append((key, child))
+        run_plan = self._transformer._run_plan
+
+        def normalize_properties(instance: Any, path: List[Union[str, int]]):
+            if not isinstance(instance, dict):
+                return
+            # Every property is normalized before being validated, as in the jsonschema traversal
+            for key, converter in converters:
+                if key in instance:
+                    instance[key] = converter(instance[key])
+            for key, child in children:
+                if child and key in instance:
+                    path.append(key)
+                    run_plan(child, instance[key], path)
+                    path.pop()
+
+        return normalize_properties
+
+    def _compile_items(self, items: Dict[str, Any]) -> Optional[_Step]:
+        converter = self._transformer._compile_converter(self._resolve_once(items))
+        child = self._compile_subschema(items)
+        run_plan = self._transformer._run_plan
+
+        def normalize_items(instance: Any, path: List[Union[str, int]]):
+            if not isinstance(instance, list):
+                return
+            if converter:
+                for index, item in enumerate(instance):
+                    instance[index] = converter(item)
+            if child:
+                for index, item in enumerate(instance):
+                    path.append(index)
+                    run_plan(child, item, path)
+                    path.pop()
+
+        return normalize_items
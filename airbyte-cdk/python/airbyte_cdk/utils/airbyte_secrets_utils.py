@@ -2,7 +2,8 @@
 # Copyright (c) 2022 Airbyte, Inc., all rights reserved.
 #
 
-from typing import Any, List, Mapping
+import re
+from typing import Any, List, Mapping, Optional, Pattern
 
 import dpath.util
 
@@ -54,19 +55,27 @@ def get_secrets(connection_specification: Mapping[str, Any], config: Mapping[str
 
 
 __SECRETS_FROM_CONFIG: List[str] = []
+# Matches any of the secrets. Longer secrets come first in the alternation so that the longest secret is matched at each position
+__SECRETS_PATTERN: Optional[Pattern[str]] = None
 
 
 def update_secrets(secrets: List[str]):
     """Update the list of secrets to be replaced"""
-    global __SECRETS_FROM_CONFIG
+    global __SECRETS_FROM_CONFIG, __SECRETS_PATTERN
     __SECRETS_FROM_CONFIG = secrets
+    __SECRETS_PATTERN = _compile_secrets_pattern(secrets)
+
+
+def _compile_secrets_pattern(secrets: List[str]) -> Optional[Pattern[str]]:
+    unique_secrets = {str(secret) for secret in secrets if secret}
+    if not unique_secrets:
+        return None
+    return re.compile("|".join(re.escape(secret) for secret in sorted(unique_secrets, key=len, reverse=True)))
 
 
 def filter_secrets(string: str) -> str:
-    """Filter secrets from a string by replacing them with ****"""
-    # TODO this should perform a maximal match for each secret. if "x" and "xk" are both secret values, and this method is called twice on
-    #  the input "xk", then depending on call order it might only obfuscate "*k". This is a bug.
-    for secret in __SECRETS_FROM_CONFIG:
-        if secret:
-            string = string.replace(str(secret), "****")
-    return string
+    """Filter secrets from a string by replacing them with ****. Where secrets overlap, the longest one is replaced"""
+    pattern = __SECRETS_PATTERN
+    if pattern is None:
+        return string
+    return pattern.sub("****", string)
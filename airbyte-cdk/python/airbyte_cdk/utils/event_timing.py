@@ -32,12 +32,17 @@ class EventTimer:
         self.count += 1
         self.stack.insert(0, self.events[name])
 
-    def finish_event(self):
+    def finish_event(self, name: Optional[str] = None):
         """
         Finish the current event and pop it from the stack.
+        If a name is given, finish that event instead, which allows events started by concurrent workers to finish out of order.
         """
 
-        if self.stack:
+        if name is not None and name in self.events and self.events[name] in self.stack:
+            event = self.events[name]
+            self.stack.remove(event)
+            event.finish()
+        elif name is None and self.stack:
             event = self.stack.pop(0)
             event.finish()
         else:
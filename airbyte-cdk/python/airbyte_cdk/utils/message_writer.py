@@ -0,0 +1,85 @@
+#
+# Copyright (c) 2022 Airbyte, Inc., all rights reserved.
+#
+
+import sys
+import threading
+import time
+from typing import List, Optional, TextIO
+
+
+class BufferedMessageWriter:
+    """
+    Writes serialized Airbyte messages to a text stream, one message per line, grouping them into large writes.
+
+    Buffered messages are written out once the buffer holds more than buffer_size characters, or once the oldest buffered message has
+    been waiting for flush_interval seconds. A message written with flush=True is written out immediately along with everything buffered
+    before it.
+
+    Use the writer as a context manager: while the context is entered, a background thread writes out the messages which waited for
+    flush_interval seconds even if no other message is written, e.g: while the source waits for a rate limit. The buffer is flushed on
+    exit. Outside of a context, the waiting time of the buffered messages is only checked when a message is written.
+    """
+
+    def __init__(self, stream: Optional[TextIO] = None, buffer_size: int = 64 * 1024, flush_interval: float = 1.0):
+        """
+        :param stream: the stream to write to. Defaults to sys.stdout
+        :param buffer_size: number of characters after which the buffer is written out
+        :param flush_interval: number of seconds after which buffered messages are written out
+        """
+        self._stream = stream or sys.stdout
+        self._buffer_size = buffer_size
+        self._flush_interval = flush_interval
+        self._buffer: List[str] = []
+        self._buffered_characters = 0
+        self._first_buffered_at = 0.0
+        self._lock = threading.Lock()
+        self._closed = threading.Event()
+        self._flusher: Optional[threading.Thread] = None
+
+    def write(self, message: str, flush: bool = False):
+        """
+        :param message: a serialized message, without trailing new line
+        :param flush: write the message and everything buffered before it out right away, e.g: for STATE messages
+        """
+        with self._lock:
+            if not self._buffer:
+                self._first_buffered_at = time.monotonic()
+            self._buffer.append(message)
+            self._buffer.append("\n")
+            self._buffered_characters += len(message) + 1
+            if flush or self._buffered_characters >= self._buffer_size or self._waited_for_flush_interval():
+                self._flush()
+
+    def flush(self):
+        with self._lock:
+            self._flush()
+
+    def _flush(self):
+        if self._buffer:
+            self._stream.write("".join(self._buffer))
+            self._buffer = []
+            self._buffered_characters = 0
+        self._stream.flush()
+
+    def _waited_for_flush_interval(self) -> bool:
+        return time.monotonic() - self._first_buffered_at >= self._flush_interval
+
+    def _flush_periodically(self):
+        # Wakes up at least once per flush interval, so that a message never waits much longer than that
+        while not self._closed.wait(self._flush_interval / 2):
+            with self._lock:
+                if self._buffer and self._waited_for_flush_interval():
+                    self._flush()
+
+    def __enter__(self) -> "BufferedMessageWriter":
+        self._closed.clear()
+        self._flusher = threading.Thread(target=self._flush_periodically, name="message_writer", daemon=True)
+        self._flusher.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self._closed.set()
+        self._flusher.join()
+        self._flusher = None
+        self.flush()
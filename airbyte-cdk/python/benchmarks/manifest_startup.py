@@ -0,0 +1,77 @@
+#
+# Copyright (c) 2022 Airbyte, Inc., all rights reserved.
+#
+
+"""
+Compares the time to create a ManifestDeclarativeSource from a manifest with many streams on a cold start, which resolves references
+and validates the manifest, against a warm start, which loads the resolved manifest from the manifest cache.
+"""
+
+import copy
+import tempfile
+import time
+
+from airbyte_cdk.sources.declarative.manifest_declarative_source import ManifestDeclarativeSource
+from airbyte_cdk.sources.declarative.parsers.manifest_cache import ManifestCache
+
+NUMBER_OF_STREAMS = [10, 50, 200]
+NUMBER_OF_STARTS = 5
+DEFINITIONS = {
+    "requester": {
+        "http_method": "GET",
+        "authenticator": {"type": "BearerAuthenticator", "api_token": "{{ config.api_key }}"},
+    },
+    "retriever": {
+        "requester": "*ref(definitions.requester)",
+        "record_selector": {"extractor": {"field_pointer": ["data"]}},
+        "paginator": {
+            "type": "DefaultPaginator",
+            "page_size": 100,
+            "page_size_option": {"inject_into": "request_parameter", "field_name": "limit"},
+            "page_token_option": {"inject_into": "request_parameter", "field_name": "cursor"},
+            "pagination_strategy": {"type": "CursorPagination", "cursor_value": "{{ response.next }}"},
+        },
+    },
+}
+
+
+def manifest(number_of_streams: int):
+    streams = [
+        {
+            "type": "DeclarativeStream",
+            "$options": {"name": f"stream_{index}", "primary_key": "id", "url_base": "https://api.example.com", "path": f"/stream_{index}"},
+            "retriever": "*ref(definitions.retriever)",
+        }
+        for index in range(number_of_streams)
+    ]
+    return {
+        "version": "version",
+        "definitions": DEFINITIONS,
+        "streams": streams,
+        "check": {"type": "CheckStream", "stream_names": ["stream_0"]},
+    }
+
+
+def start_milliseconds(source_manifest, manifest_cache) -> float:
+    # The manifest is copied beforehand since creating a source can modify it
+    manifests = [copy.deepcopy(source_manifest) for _ in range(NUMBER_OF_STARTS)]
+    started_at = time.perf_counter()
+    for source_manifest in manifests:
+        ManifestDeclarativeSource(source_config=source_manifest, manifest_cache=manifest_cache)
+    return (time.perf_counter() - started_at) / NUMBER_OF_STARTS * 1e3
+
+
+def main():
+    print(f"{'streams':<10}{'cold (ms)':>12}{'warm (ms)':>12}{'speedup':>10}")
+    for number_of_streams in NUMBER_OF_STREAMS:
+        source_manifest = manifest(number_of_streams)
+        with tempfile.TemporaryDirectory() as cache_dir:
+            cold_ms = start_milliseconds(source_manifest, None)
+            manifest_cache = ManifestCache(cache_dir)
+            ManifestDeclarativeSource(source_config=copy.deepcopy(source_manifest), manifest_cache=manifest_cache)
+            warm_ms = start_milliseconds(source_manifest, manifest_cache)
+        print(f"{number_of_streams:<10}{cold_ms:>12.1f}{warm_ms:>12.1f}{cold_ms / warm_ms:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+#
+# Copyright (c) 2022 Airbyte, Inc., all rights reserved.
+#
+
+"""
+Compares the throughput of TypeTransformer with compiled normalization plans against the jsonschema validator traversal it used for
+every record before. The traversal is still what the transformer falls back to for schemas plans do not support.
+"""
+
+import copy
+import time
+
+from airbyte_cdk.sources.utils.transform import TransformConfig, TypeTransformer
+
+NUMBER_OF_RECORDS = 20_000
+SCHEMA = {
+    "type": "object",
+    "properties": {
+        "id": {"type": "integer"},
+        "name": {"type": ["null", "string"]},
+        "price": {"type": "number"},
+        "active": {"type": "boolean"},
+        "created_at": {"type": "string", "format": "date-time"},
+        "tags": {"type": "array", "items": {"type": "string"}},
+        "address": {"$ref": "#/definitions/address"},
+        "line_items": {"type": "array", "items": {"$ref": "#/definitions/line_item"}},
+    },
+    "definitions": {
+        "address": {"type": ["null", "object"], "properties": {"city": {"type": "string"}, "zip": {"type": "string"}}},
+        "line_item": {"type": "object", "properties": {"sku": {"type": "string"}, "quantity": {"type": "integer"}}},
+    },
+}
+RECORDS = {
+    "already normalized": {
+        "id": 1,
+        "name": "name",
+        "price": 9.99,
+        "active": True,
+        "created_at": "2022-01-01T00:00:00Z",
+        "tags": ["a", "b"],
+        "address": {"city": "Paris", "zip": "75001"},
+        "line_items": [{"sku": "a", "quantity": 1}, {"sku": "b", "quantity": 2}],
+    },
+    "to convert": {
+        "id": "1",
+        "name": None,
+        "price": "9.99",
+        "active": "true",
+        "created_at": "2022-01-01T00:00:00Z",
+        "tags": ["a", 1],
+        "address": {"city": "Paris", "zip": 75001},
+        "line_items": [{"sku": "a", "quantity": "1"}, {"sku": 2, "quantity": "2"}],
+    },
+}
+
+
+def records_per_second(transform, record) -> float:
+    records = [copy.deepcopy(record) for _ in range(NUMBER_OF_RECORDS)]
+    start = time.perf_counter()
+    for r in records:
+        transform(r, SCHEMA)
+    return NUMBER_OF_RECORDS / (time.perf_counter() - start)
+
+
+def main():
+    transformer = TypeTransformer(TransformConfig.DefaultSchemaNormalization)
+    print(f"{'records':<20}{'before (rec/s)':>16}{'after (rec/s)':>16}{'speedup':>10}")
+    for name, record in RECORDS.items():
+        before_record, after_record = copy.deepcopy(record), copy.deepcopy(record)
+        transformer._transform_with_validator(before_record, SCHEMA)
+        transformer.transform(after_record, SCHEMA)
+        assert before_record == after_record
+        before = records_per_second(transformer._transform_with_validator, record)
+        after = records_per_second(transformer.transform, record)
+        print(f"{name:<20}{before:>16,.0f}{after:>16,.0f}{after / before:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -15,7 +15,7 @@ README = (HERE / "README.md").read_text()
 
 setup(
     name="airbyte-cdk",
-    version="0.15.0",
+    version="0.35.0",
     description="A framework for writing Airbyte Connectors.",
     long_description=README,
     long_description_content_type="text/markdown",
@@ -70,6 +70,13 @@ setup(
             "pytest-mock",
             "requests-mock",
             "pytest-httpserver",
+            "aiohttp~=3.8",
+        ],
+        "orjson": [
+            "orjson~=3.8",
+        ],
+        "async-http": [
+            "aiohttp~=3.8",
         ],
         "sphinx-docs": [
             "Sphinx~=4.2",
@@ -0,0 +1,124 @@
+#
+# Copyright (c) 2022 Airbyte, Inc., all rights reserved.
+#
+
+import io
+import json
+import os
+import threading
+
+import pytest
+from airbyte_cdk.destinations import MessageParser, RecordBatch, batch_records
+from airbyte_cdk.models import AirbyteMessage, AirbyteRecordMessage, AirbyteStateMessage, Type
+
+
+def _record(stream: str, data, **kwargs) -> AirbyteMessage:
+    return AirbyteMessage(type=Type.RECORD, record=AirbyteRecordMessage(stream=stream, data=data, emitted_at=1, **kwargs))
+
+
+def _state(data) -> AirbyteMessage:
+    return AirbyteMessage(type=Type.STATE, state=AirbyteStateMessage(data=data))
+
+
+MESSAGES = [
+    _record("s1", {"k": "v", "nested": {"n": [1, 2.5, None]}}),
+    _record("s2", {"k": 1}, namespace="public"),
+    _state({"s1": 1}),
+    _record("s1", {}),
+]
+
+
+@pytest.mark.parametrize("chunk_size", [1, 1024])
+def test_parse(chunk_size):
+    input_stream = io.StringIO("\n".join(message.json(exclude_unset=True) for message in MESSAGES))
+
+    messages = list(MessageParser(chunk_size=chunk_size).parse(input_stream))
+
+    assert messages == MESSAGES
+    # Records are not copied by pydantic
+    assert type(messages[0].record.data) is dict
+
+
+def test_parse_with_workers():
+    input_stream = io.StringIO("\n".join(message.json(exclude_unset=True) for message in MESSAGES * 10))
+
+    assert list(MessageParser(workers=2, chunk_size=256).parse(input_stream)) == MESSAGES * 10
+
+
+@pytest.mark.parametrize("workers", [0, 2])
+def test_parse_yields_state_while_input_stays_open(workers):
+    read_fd, write_fd = os.pipe()
+    with io.open(read_fd, encoding="utf-8") as input_stream, io.open(write_fd, "w", encoding="utf-8") as output_stream:
+        output_stream.write(MESSAGES[0].json(exclude_unset=True) + "\n" + MESSAGES[2].json(exclude_unset=True) + "\n")
+        output_stream.flush()
+        messages = MessageParser(workers=workers).parse(input_stream)
+        received = []
+        # The pipe stays open: the messages must be parsed without waiting for more input
+        reader = threading.Thread(target=lambda: received.extend([next(messages), next(messages)]), daemon=True)
+        reader.start()
+        reader.join(timeout=10)
+
+        assert received == [MESSAGES[0], MESSAGES[2]]
+        messages.close()
+
+
+@pytest.mark.parametrize(
+    "record, expected_messages",
+    [
+        pytest.param({"stream": "s1", "data": {}, "emitted_at": "1"}, [_record("s1", {})], id="coerced_record"),
+        pytest.param({"stream": "s1", "data": {}, "emitted_at": 1, "extra": 2}, [_record("s1", {}, extra=2)], id="extra_record_field"),
+        pytest.param({"stream": "s1", "emitted_at": 1}, [], id="missing_data"),
+        pytest.param({"stream": "s1", "data": {"big": 2**100}, "emitted_at": 1}, [_record("s1", {"big": 2**100})], id="big_integer"),
+    ],
+)
+def test_parse_validates_unexpected_records(record, expected_messages):
+    line = json.dumps({"type": "RECORD", "record": record})
+    assert list(MessageParser().parse(io.StringIO(line))) == expected_messages
+
+
+@pytest.mark.parametrize("line", ["not a message", "[1, 2]", "", '{"type": "UNKNOWN"}'])
+def test_parse_skips_invalid_messages(line):
+    assert list(MessageParser().parse(io.StringIO(line))) == []
+
+
+def test_batch_records():
+    messages = [
+        _record("s1", {"id": 1}),
+        _record("s2", {"id": 1}),
+        _record("s1", {"id": 2}),
+        _record("s1", {"id": 3}),
+        _state({"s1": 3}),
+        _record("s2", {"id": 2}),
+    ]
+
+    batches = list(batch_records(messages, batch_size=2))
+
+    assert batches == [
+        RecordBatch(stream="s1", records=[messages[0].record, messages[2].record]),
+        RecordBatch(stream="s2", records=[messages[1].record]),
+        RecordBatch(stream="s1", records=[messages[3].record]),
+        messages[4],
+        RecordBatch(stream="s2", records=[messages[5].record]),
+    ]
+
+
+def test_batch_records_per_namespace():
+    messages = [
+        _record("s1", {"id": 1}, namespace="n1"),
+        _record("s1", {"id": 1}, namespace="n2"),
+        _record("s1", {"id": 2}, namespace="n1"),
+        _record("s1", {"id": 1}),
+    ]
+
+    batches = list(batch_records(messages, batch_size=2))
+
+    assert batches == [
+        RecordBatch(stream="s1", records=[messages[0].record, messages[2].record], namespace="n1"),
+        RecordBatch(stream="s1", records=[messages[1].record], namespace="n2"),
+        RecordBatch(stream="s1", records=[messages[3].record]),
+    ]
+
+
+def test_batch_records_without_records():
+    assert list(batch_records([_state({"s1": 3})])) == [_state({"s1": 3})]
+    assert list(batch_records([])) == []
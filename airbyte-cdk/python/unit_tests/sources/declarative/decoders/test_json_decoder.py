@@ -4,7 +4,7 @@
 
 import pytest
 import requests
-from airbyte_cdk.sources.declarative.decoders.json_decoder import JsonDecoder
+from airbyte_cdk.sources.declarative.decoders.json_decoder import JsonDecoder, JsonlDecoder
 
 
 @pytest.mark.parametrize(
@@ -14,3 +14,42 @@ def test_json_decoder(requests_mock, response_body, expected_json):
     requests_mock.register_uri("GET", "https://airbyte.io/", text=response_body)
     response = requests.get("https://airbyte.io/")
     assert JsonDecoder(options={}).decode(response) == expected_json
+
+
+@pytest.mark.parametrize(
+    "response_body, field_pointer, expected_records, expected_json",
+    [
+        ("", ["data"], [], {}),
+        (
+            '{"data": [{"id": 1}, {"id": 2}], "next": "token"}',
+            ["data"],
+            [{"id": 1}, {"id": 2}],
+            {"data": [{"id": 1}, {"id": 2}], "next": "token"},
+        ),
+        ('{"next": "token", "data": {"id": 1}}', ["data"], [{"id": 1}], {"next": "token", "data": {"id": 1}}),
+        ('[{"id": 1}, {"id": 2}]', [], [{"id": 1}, {"id": 2}], [{"id": 1}, {"id": 2}]),
+    ],
+)
+def test_json_decoder_decodes_the_records_while_streaming_the_response(
+    requests_mock, response_body, field_pointer, expected_records, expected_json
+):
+    requests_mock.register_uri("GET", "https://airbyte.io/", text=response_body)
+    response = requests.get("https://airbyte.io/", stream=True)
+    decoder = JsonDecoder(options={}, stream_response=True)
+
+    assert decoder.is_stream_response()
+    assert list(decoder.decode_records(response, field_pointer)) == expected_records
+    # The response content is consumed, but the body can still be decoded, e.g: by a paginator
+    assert decoder.decode(response) == expected_json
+    assert JsonDecoder(options={}).decode(response) == expected_json
+    assert list(decoder.decode_records(response, field_pointer)) == expected_records
+
+
+def test_jsonl_decoder(requests_mock):
+    requests_mock.register_uri("GET", "https://airbyte.io/", text='{"id": 1, "data": {"a": 1}}\n\n{"id": 2, "data": {"a": 2}}\n')
+    response = requests.get("https://airbyte.io/", stream=True)
+    decoder = JsonlDecoder(options={})
+
+    assert decoder.is_stream_response()
+    assert list(decoder.decode_records(response, ["data"])) == [{"a": 1}, {"a": 2}]
+    assert decoder.decode(response) == [{"id": 1, "data": {"a": 1}}, {"id": 2, "data": {"a": 2}}]
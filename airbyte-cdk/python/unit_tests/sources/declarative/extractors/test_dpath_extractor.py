@@ -2,6 +2,7 @@
 # Copyright (c) 2022 Airbyte, Inc., all rights reserved.
 #
 
+import io
 import json
 
 import pytest
@@ -13,6 +14,7 @@ config = {"field": "record_array"}
 options = {"options_field": "record_array"}
 
 decoder = JsonDecoder(options={})
+stream_decoder = JsonDecoder(options={}, stream_response=True)
 
 
 @pytest.mark.parametrize(
@@ -26,18 +28,37 @@ decoder = JsonDecoder(options={})
         ("test_field_in_config", ["{{ config['field'] }}"], {"record_array": [{"id": 1}, {"id": 2}]}, [{"id": 1}, {"id": 2}]),
         ("test_field_in_options", ["{{ options['options_field'] }}"], {"record_array": [{"id": 1}, {"id": 2}]}, [{"id": 1}, {"id": 2}]),
         ("test_field_does_not_exist", ["record"], {"id": 1}, []),
+        ("test_wildcard", ["data", "*", "records"], {"data": {"a": {"records": [{"id": 1}]}}}, [{"id": 1}]),
     ],
 )
-def test_dpath_extractor(test_name, field_pointer, body, expected_records):
-    extractor = DpathExtractor(field_pointer=field_pointer, config=config, decoder=decoder, options=options)
+@pytest.mark.parametrize("response_decoder", [decoder, stream_decoder])
+def test_dpath_extractor(test_name, field_pointer, body, expected_records, response_decoder):
+    extractor = DpathExtractor(field_pointer=field_pointer, config=config, decoder=response_decoder, options=options)
 
-    response = create_response(body)
+    response = create_response(body) if response_decoder is decoder else create_stream_response(body)
     actual_records = extractor.extract_records(response)
 
     assert actual_records == expected_records
+    assert extractor.is_stream_response() == (response_decoder is stream_decoder)
+
+
+@pytest.mark.parametrize("response_decoder", [decoder, stream_decoder])
+def test_dpath_extractor_invalid_json(response_decoder):
+    extractor = DpathExtractor(field_pointer=["data"], config=config, decoder=response_decoder, options=options)
+
+    response = requests.Response()
+    response.raw = io.BytesIO(b'{"data": [{"id": 1}, {"id"')
+
+    assert extractor.extract_records(response) == []
 
 
 def create_response(body):
     response = requests.Response()
     response._content = json.dumps(body).encode("utf-8")
     return response
+
+
+def create_stream_response(body):
+    response = requests.Response()
+    response.raw = io.BytesIO(json.dumps(body).encode("utf-8"))
+    return response
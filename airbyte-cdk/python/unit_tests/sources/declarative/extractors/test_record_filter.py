@@ -39,6 +39,18 @@ from airbyte_cdk.sources.declarative.extractors.record_filter import RecordFilte
             [{"id": 1, "created_at": "06-06-21"}, {"id": 2, "created_at": "06-07-21"}, {"id": 3, "created_at": "06-08-21"}],
             [{"id": 3, "created_at": "06-08-21"}],
         ),
+        (
+            "test_membership_filter",
+            "{{ record['status'] in ['active', 'pending'] and record['id'] > 1 }}",
+            [{"id": 1, "status": "active"}, {"id": 2, "status": "pending"}, {"id": 3, "status": "deleted"}, {"id": 4}],
+            [{"id": 2, "status": "pending"}],
+        ),
+        (
+            "test_filter_not_compiled_to_native_python",
+            "{{ record['tags'] | length > 1 }}",
+            [{"id": 1, "tags": ["a"]}, {"id": 2, "tags": ["a", "b"]}],
+            [{"id": 2, "tags": ["a", "b"]}],
+        ),
     ],
 )
 def test_record_filter(test_name, filter_template, records, expected_records):
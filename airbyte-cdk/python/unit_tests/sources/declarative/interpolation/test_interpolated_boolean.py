@@ -39,3 +39,17 @@ config = {
 def test_interpolated_boolean(test_name, template, expected_result):
     interpolated_bool = InterpolatedBoolean(condition=template, options={"from_options": "come_find_me"})
     assert interpolated_bool.eval(config) == expected_result
+
+
+@pytest.mark.parametrize(
+    "test_name, template, expected_results",
+    [
+        ("test_compiled_condition", "{{ record['id'] > config['zero_value'] }}", [True, False, False]),
+        ("test_condition_evaluated_through_jinja", "{{ record['id'] }}", [True, False, False]),
+        ("test_boolean_condition", True, [True, True, True]),
+    ],
+)
+def test_interpolated_boolean_eval_batch(test_name, template, expected_results):
+    interpolated_bool = InterpolatedBoolean(condition=template, options={})
+    records = [{"id": 1}, {"id": 0}, {}]
+    assert interpolated_bool.eval_batch(config, "record", records) == expected_results
@@ -5,6 +5,7 @@
 import datetime
 
 import pytest
+from airbyte_cdk.sources.declarative.interpolation import jinja
 from airbyte_cdk.sources.declarative.interpolation.jinja import JinjaInterpolation
 
 interpolation = JinjaInterpolation()
@@ -78,3 +79,55 @@ def test_macros(test_name, s, expected_value):
     config = {}
     val = interpolation.eval(s, config)
     assert val == expected_value
+
+
+def test_template_is_compiled_once(mocker):
+    interpolation = JinjaInterpolation()
+    s = "{{ config['compiled_once'] }}"
+    from_string = mocker.spy(interpolation._environment, "from_string")
+
+    assert interpolation.eval(s, {"compiled_once": "first"}) == "first"
+    assert interpolation.eval(s, {"compiled_once": "second"}) == "second"
+    assert JinjaInterpolation().eval(s, {"compiled_once": "third"}) == "third"
+    assert from_string.call_count <= 1
+
+
+@pytest.mark.parametrize(
+    "test_name, s, expected_value",
+    [
+        ("test_static_string", "a static string", "a static string"),
+        ("test_static_number", "123", 123),
+        ("test_static_list", "[1, 2]", [1, 2]),
+        ("test_static_trailing_new_line", "value\n", "value"),
+        ("test_static_with_single_braces", "{not_a_template}", "{not_a_template}"),
+    ],
+)
+def test_static_values_are_folded(mocker, test_name, s, expected_value):
+    interpolation = JinjaInterpolation()
+    assert interpolation.eval(s, {}) == expected_value
+
+    from_string = mocker.spy(interpolation._environment, "from_string")
+    literal_eval = mocker.spy(jinja.ast, "literal_eval")
+    assert interpolation.eval(s, {}) == expected_value
+    assert not from_string.called
+    assert not literal_eval.called
+
+
+def test_folded_mutable_values_are_not_shared():
+    interpolation = JinjaInterpolation()
+    value = interpolation.eval("[1, 2, 3]", {})
+    value.append(4)
+
+    assert interpolation.eval("[1, 2, 3]", {}) == [1, 2, 3]
+
+
+def test_empty_static_value_evaluates_default():
+    assert interpolation.eval("", {"default": "value"}, default="{{ config['default'] }}") == "value"
+
+
+def test_template_cache_is_bounded(mocker):
+    mocker.patch.object(jinja, "_compiled_templates", jinja.LRUCache(maxsize=2))
+    for i in range(5):
+        assert interpolation.eval(f"{{{{ {i} }}}}", {}) == i
+
+    assert len(jinja._compiled_templates) == 2
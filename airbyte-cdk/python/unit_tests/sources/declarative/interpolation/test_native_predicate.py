@@ -0,0 +1,80 @@
+#
+# Copyright (c) 2022 Airbyte, Inc., all rights reserved.
+#
+
+import pytest
+from airbyte_cdk.sources.declarative.interpolation.interpolated_boolean import InterpolatedBoolean
+from airbyte_cdk.sources.declarative.interpolation.native_predicate import compile_predicate
+from jinja2 import Environment
+
+context = {
+    "config": {"start": 10, "statuses": ["active", "pending"]},
+    "options": {"name": "users"},
+    "record": {"id": 12, "status": "active", "nested": {"count": 0}, "tags": ["a", "b"], "deleted_at": None},
+    "stream_state": {"id": 11},
+}
+
+
+@pytest.mark.parametrize(
+    "test_name, condition, expected_result",
+    [
+        ("test_greater_than", "{{ record['id'] > stream_state['id'] }}", True),
+        ("test_lower_or_equal", "{{ record['id'] <= config['start'] }}", False),
+        ("test_equal_constant", "{{ record['status'] == 'active' }}", True),
+        ("test_not_equal_constant", "{{ record['status'] != 'active' }}", False),
+        ("test_attribute_lookup", "{{ record.nested.count == 0 }}", True),
+        ("test_in_list_literal", "{{ record['status'] in ['active', 'pending'] }}", True),
+        ("test_in_config", "{{ record['status'] in config['statuses'] }}", True),
+        ("test_not_in", "{{ 'c' not in record['tags'] }}", True),
+        ("test_in_tuple_with_lookup", "{{ record['id'] in (stream_state['id'], 12) }}", True),
+        ("test_none_comparison", "{{ record['deleted_at'] == None }}", True),
+        ("test_chained_comparison", "{{ stream_state['id'] < record['id'] < 20 }}", True),
+        ("test_failing_chained_comparison", "{{ stream_state['id'] < record['id'] < 12 }}", False),
+        ("test_and", "{{ record['id'] > 1 and record['status'] == 'active' }}", True),
+        ("test_or", "{{ record['id'] > 100 or record['status'] == 'active' }}", True),
+        ("test_not", "{{ not record['id'] > 100 }}", True),
+        ("test_not_value", "{{ not record['deleted_at'] }}", True),
+        ("test_options", "{{ options['name'] == 'users' }}", True),
+        ("test_missing_key_comparison", "{{ record['missing'] > 1 }}", False),
+        ("test_missing_key_equality", "{{ record['missing'] == 1 }}", False),
+        ("test_missing_key_inequality", "{{ record['missing'] != 1 }}", True),
+        ("test_missing_variable", "{{ next_page_token['id'] > 1 }}", False),
+        ("test_membership_in_missing_key", "{{ 'a' in record['missing'] }}", False),
+    ],
+)
+def test_compiled_predicate_matches_rendered_template(test_name, condition, expected_result):
+    predicate = compile_predicate(Environment(), condition)
+
+    assert predicate is not None
+    assert predicate(context) == expected_result
+    rendered = InterpolatedBoolean(condition=condition, options=context["options"]).eval(
+        context["config"], record=context["record"], stream_state=context["stream_state"]
+    )
+    assert rendered == expected_result
+
+
+@pytest.mark.parametrize(
+    "test_name, condition",
+    [
+        ("test_value_without_comparison", "{{ record['id'] }}"),
+        ("test_and_between_values", "{{ record['id'] and record['status'] }}"),
+        ("test_filter", "{{ record['tags'] | length > 1 }}"),
+        ("test_macro_call", "{{ record['id'] > max(1, 2) }}"),
+        ("test_arithmetic", "{{ record['id'] + 1 > 2 }}"),
+        ("test_test_expression", "{{ record['deleted_at'] is none }}"),
+        ("test_surrounding_text", "id: {{ record['id'] > 1 }}"),
+        ("test_several_expressions", "{{ record['id'] > 1 }}{{ record['id'] < 2 }}"),
+        ("test_statement", "{% if record['id'] > 1 %}True{% endif %}"),
+        ("test_static_string", "True"),
+        ("test_invalid_syntax", "{{ record['id'] > }}"),
+    ],
+)
+def test_unsupported_conditions_are_not_compiled(test_name, condition):
+    assert compile_predicate(Environment(), condition) is None
+
+
+def test_comparison_errors_are_raised():
+    predicate = compile_predicate(Environment(), "{{ record['deleted_at'] > 1 }}")
+
+    with pytest.raises(TypeError):
+        predicate(context)
@@ -0,0 +1,50 @@
+#
+# Copyright (c) 2022 Airbyte, Inc., all rights reserved.
+#
+
+import datetime
+
+from airbyte_cdk.sources.declarative.parsers.manifest_cache import ManifestCache
+
+MANIFEST = {"version": "version", "streams": [{"$ref": "*ref(definitions.stream)"}], "definitions": {"stream": {"name": "s"}}}
+RESOLVED_MANIFEST = {"version": "version", "streams": [{"name": "s"}], "definitions": {"stream": {"name": "s"}}}
+
+
+def test_get_returns_the_resolved_manifest_which_was_put(tmp_path):
+    cache = ManifestCache(str(tmp_path / "cache"))
+    key = cache.key(MANIFEST)
+
+    assert cache.get(key) is None
+    cache.put(key, RESOLVED_MANIFEST)
+
+    assert ManifestCache(str(tmp_path / "cache")).get(key) == RESOLVED_MANIFEST
+    assert [path.name for path in (tmp_path / "cache").iterdir()] == [f"{key}.json"]
+
+
+def test_key_depends_on_the_manifest_content_only():
+    cache = ManifestCache("unused")
+    reordered_manifest = dict(reversed(list(MANIFEST.items())))
+
+    assert cache.key(MANIFEST) == cache.key(reordered_manifest)
+    assert cache.key(MANIFEST) != cache.key({**MANIFEST, "version": "other"})
+
+
+def test_manifest_which_is_not_json_is_not_cached():
+    assert ManifestCache("unused").key({"start_date": datetime.date(2022, 1, 1)}) is None
+
+
+def test_resolved_manifest_which_does_not_round_trip_through_json_is_not_cached(tmp_path):
+    cache = ManifestCache(str(tmp_path))
+    key = cache.key(MANIFEST)
+
+    cache.put(key, {"request_parameters": {1: "value"}})
+
+    assert cache.get(key) is None
+
+
+def test_unreadable_entry_is_ignored(tmp_path):
+    cache = ManifestCache(str(tmp_path))
+    key = cache.key(MANIFEST)
+    (tmp_path / f"{key}.json").write_text('{"resolved_manifest": ')
+
+    assert cache.get(key) is None
@@ -8,6 +8,7 @@ import pytest as pytest
 import requests
 from airbyte_cdk.sources.declarative.interpolation.interpolated_string import InterpolatedString
 from airbyte_cdk.sources.declarative.requesters.http_requester import HttpMethod, HttpRequester
+from airbyte_cdk.sources.declarative.requesters.rate_limit import RateLimit
 
 
 def test_http_requester():
@@ -62,6 +63,26 @@ def test_http_requester():
     assert requester.get_request_body_json(stream_state={}, stream_slice=None, next_page_token=None) == request_body_json
     assert requester.interpret_response_status(requests.Response()) == response_status
     assert {} == requester.request_kwargs(stream_state={}, stream_slice=None, next_page_token=None)
+    assert requester.get_rate_limiter() is None
+
+
+def test_requesters_of_the_same_url_base_share_their_rate_limiter():
+    config = {"url": "https://test-rate-limit.airbyte.io"}
+
+    def create_requester(path):
+        return HttpRequester(
+            name=path,
+            url_base="{{ config['url'] }}",
+            path=path,
+            rate_limit=RateLimit(requests_per_second=4, config=config, options={}),
+            config=config,
+            options={},
+        )
+
+    requester = create_requester("users")
+    assert requester.get_rate_limiter().requests_per_second == 4
+    assert requester.get_rate_limiter() is requester.get_rate_limiter()
+    assert create_requester("groups").get_rate_limiter() is requester.get_rate_limiter()
 
 
 @pytest.mark.parametrize(
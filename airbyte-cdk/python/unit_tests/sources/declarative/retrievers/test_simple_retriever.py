@@ -15,6 +15,8 @@ from airbyte_cdk.sources.declarative.requesters.request_option import RequestOpt
 from airbyte_cdk.sources.declarative.requesters.requester import HttpMethod
 from airbyte_cdk.sources.declarative.retrievers.simple_retriever import SimpleRetriever
 from airbyte_cdk.sources.declarative.stream_slicers import DatetimeStreamSlicer
+from airbyte_cdk.sources.declarative.transformations import AddFields, RemoveFields
+from airbyte_cdk.sources.declarative.transformations.add_fields import AddedFieldDefinition
 from airbyte_cdk.sources.streams.http.auth import NoAuth
 from airbyte_cdk.sources.streams.http.http import HttpStream
 
@@ -40,6 +42,7 @@ def test_simple_retriever_full(mock_http_stream):
 
     record_selector = MagicMock()
     record_selector.select_records.return_value = records
+    record_selector.is_stream_response.return_value = False
 
     iterator = MagicMock()
     stream_slices = [{"date": "2022-01-01"}, {"date": "2022-01-02"}]
@@ -433,3 +436,76 @@ def test_path(test_name, requester_path, paginator_path, expected_path):
 
     actual_path = retriever.path(stream_state=None, stream_slice=None, next_page_token=None)
     assert expected_path == actual_path
+
+
+def test_read_records_emits_transformed_copies_of_the_page():
+    requester = MagicMock(use_cache=False)
+    requester.interpret_response_status.return_value = response_status.SUCCESS
+    record_selector = MagicMock()
+    record_selector.select_records.return_value = [{"id": 100, "secret": "s"}, {"id": 101}]
+    stream_slicer = MagicMock()
+    stream_slicer.get_stream_state.return_value = {"cursor": "t0"}
+    retriever = SimpleRetriever(
+        name="stream_name",
+        primary_key=primary_key,
+        requester=requester,
+        record_selector=record_selector,
+        stream_slicer=stream_slicer,
+        options={},
+        config={"shop": "in-n-out"},
+    )
+    retriever.transformations = [
+        RemoveFields(field_pointers=[["id"], ["secret"]], options={}),
+        AddFields(fields=[AddedFieldDefinition(path=["shop"], value="{{ config.shop }}-{{ stream_slice.slice }}", options={})], options={}),
+    ]
+    response = requests.Response()
+    response.request = requests.Request()
+    response.status_code = 200
+
+    def read_pages(records_generator_fn, stream_slice, stream_state):
+        yield from records_generator_fn(response.request, response, stream_state, stream_slice)
+
+    with patch.object(HttpStream, "_read_pages", side_effect=read_pages):
+        records = list(retriever.read_records(SyncMode.full_refresh, stream_slice={"slice": 1}))
+
+    assert records == [{"shop": "in-n-out-1"}, {"shop": "in-n-out-1"}]
+    # The cursor and the paginator are given the records as read
+    raw_records = [{"id": 100, "secret": "s"}, {"id": 101}]
+    assert retriever._last_records == raw_records
+    assert [c.kwargs["last_record"] for c in stream_slicer.update_cursor.call_args_list] == [*raw_records, raw_records[-1]]
+
+
+@pytest.mark.parametrize("is_stream_response, expected_kwargs", [(False, {"kwarg": "value"}), (True, {"kwarg": "value", "stream": True})])
+def test_request_kwargs_stream_the_response_when_the_record_selector_does(is_stream_response, expected_kwargs):
+    requester = MagicMock()
+    requester.request_kwargs.return_value = {"kwarg": "value"}
+    record_selector = MagicMock()
+    record_selector.is_stream_response.return_value = is_stream_response
+
+    retriever = SimpleRetriever(
+        name="stream_name",
+        primary_key=primary_key,
+        requester=requester,
+        paginator=MagicMock(),
+        record_selector=record_selector,
+        stream_slicer=MagicMock(),
+        options={},
+        config={},
+    )
+
+    assert retriever.request_kwargs(None, None, None) == expected_kwargs
+
+
+@pytest.mark.parametrize("max_prefetched_pages", [0, 2])
+def test_max_prefetched_pages(max_prefetched_pages):
+    retriever = SimpleRetriever(
+        name="stream_name",
+        primary_key=primary_key,
+        requester=MagicMock(),
+        record_selector=MagicMock(),
+        options={},
+        config={},
+        max_prefetched_pages=max_prefetched_pages,
+    )
+
+    assert retriever.max_prefetched_pages == max_prefetched_pages
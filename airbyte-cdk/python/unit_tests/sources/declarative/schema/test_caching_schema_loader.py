@@ -0,0 +1,45 @@
+#
+# Copyright (c) 2022 Airbyte, Inc., all rights reserved.
+#
+
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import MagicMock
+
+import pytest
+from airbyte_cdk.sources.declarative.schema import CachingSchemaLoader, SchemaCacheInfo
+
+
+def test_schema_is_loaded_once():
+    schema_loader = MagicMock()
+    schema_loader.get_json_schema.return_value = {"type": "object"}
+    caching_schema_loader = CachingSchemaLoader(schema_loader)
+
+    assert caching_schema_loader.cache_info() == SchemaCacheInfo(hits=0, misses=0)
+    schemas = [caching_schema_loader.get_json_schema() for _ in range(3)]
+
+    assert all(schema is schemas[0] for schema in schemas)
+    schema_loader.get_json_schema.assert_called_once()
+    assert caching_schema_loader.cache_info() == SchemaCacheInfo(hits=2, misses=1)
+
+
+def test_schema_is_loaded_once_by_concurrent_readers():
+    schema_loader = MagicMock()
+    schema_loader.get_json_schema.return_value = {"type": "object"}
+    caching_schema_loader = CachingSchemaLoader(schema_loader)
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        list(executor.map(lambda _: caching_schema_loader.get_json_schema(), range(100)))
+
+    schema_loader.get_json_schema.assert_called_once()
+    assert caching_schema_loader.cache_info().misses == 1
+
+
+def test_failed_load_is_not_cached():
+    schema_loader = MagicMock()
+    schema_loader.get_json_schema.side_effect = [IOError("Cannot find file"), {"type": "object"}]
+    caching_schema_loader = CachingSchemaLoader(schema_loader)
+
+    with pytest.raises(IOError):
+        caching_schema_loader.get_json_schema()
+    assert caching_schema_loader.get_json_schema() == {"type": "object"}
+    assert caching_schema_loader.cache_info() == SchemaCacheInfo(hits=0, misses=2)
@@ -9,6 +9,7 @@ from airbyte_cdk.models import SyncMode
 from airbyte_cdk.sources.declarative.requesters.request_option import RequestOption, RequestOptionType
 from airbyte_cdk.sources.declarative.stream_slicers.substream_slicer import ParentStreamConfig, SubstreamSlicer
 from airbyte_cdk.sources.streams.core import Stream
+from airbyte_cdk.sources.utils.parent_record_cache import parent_record_cache_scope
 
 parent_records = [{"id": 1, "data": "data1"}, {"id": 2, "data": "data2"}]
 more_records = [{"id": 10, "data": "data10", "slice": "second_parent"}, {"id": 20, "data": "data20", "slice": "second_parent"}]
@@ -26,6 +27,7 @@ class MockStream(Stream):
         self._slices = slices
         self._records = records
         self._name = name
+        self.read_count = 0
 
     @property
     def name(self) -> str:
@@ -49,6 +51,7 @@ class MockStream(Stream):
     ) -> Iterable[Mapping[str, Any]]:
         # The parent stream's records should always be read as full refresh
         assert sync_mode == SyncMode.full_refresh
+        self.read_count += 1
         if not stream_slice:
             yield from self._records
         else:
@@ -134,6 +137,24 @@ def test_substream_slicer(test_name, parent_stream_configs, expected_slices):
     assert slices == expected_slices
 
 
+def test_substream_slicers_share_parent_records_during_a_sync():
+    parent_stream = MockStream(parent_slices, all_parent_data, "parent_stream_shared_by_substream_slicers")
+    slicers = [
+        SubstreamSlicer(
+            parent_stream_configs=[ParentStreamConfig(stream=parent_stream, parent_key="id", stream_slice_field=field, options={})],
+            options={},
+        )
+        for field in ("first_child_id", "second_child_id")
+    ]
+
+    with parent_record_cache_scope():
+        slices = [list(slicer.stream_slices(SyncMode.full_refresh, stream_state=None)) for slicer in slicers]
+
+    assert slices[0] == [{"first_child_id": r["id"], "parent_slice": {"slice": r["slice"]}} for r in all_parent_data]
+    assert slices[1] == [{"second_child_id": r["id"], "parent_slice": {"slice": r["slice"]}} for r in all_parent_data]
+    assert parent_stream.read_count == len(parent_slices)
+
+
 @pytest.mark.parametrize(
     "test_name, stream_slice, expected_state",
     [
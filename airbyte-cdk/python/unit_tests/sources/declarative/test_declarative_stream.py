@@ -7,6 +7,7 @@ from unittest.mock import MagicMock, call
 
 from airbyte_cdk.models import AirbyteLogMessage, AirbyteTraceMessage, Level, SyncMode, TraceType
 from airbyte_cdk.sources.declarative.declarative_stream import DeclarativeStream
+from airbyte_cdk.sources.declarative.retrievers import SimpleRetriever
 from airbyte_cdk.sources.declarative.transformations import RecordTransformation
 
 
@@ -58,6 +59,9 @@ def test_declarative_stream():
 
     assert stream.name == name
     assert stream.get_json_schema() == json_schema
+    assert stream.get_json_schema() is stream.get_json_schema()
+    schema_loader.get_json_schema.assert_called_once()
+    assert stream.schema_cache_info() == (2, 1)
     assert stream.state == state
     input_slice = stream_slices[0]
     assert list(stream.read_records(SyncMode.full_refresh, cursor_field, input_slice, state)) == records
@@ -71,3 +75,25 @@ def test_declarative_stream():
             call(record, config=config, stream_slice=input_slice, stream_state=state) for record in records if isinstance(record, dict)
         ]
         transformation.transform.assert_has_calls(expected_calls, any_order=False)
+
+
+def test_transformations_are_applied_by_a_simple_retriever():
+    retriever = MagicMock(spec=SimpleRetriever)
+    retriever.transformations = []
+    records = [{"pk": 1234}, {"pk": 4567}]
+    retriever.read_records.return_value = records
+    transformation = MagicMock(spec=RecordTransformation)
+
+    stream = DeclarativeStream(
+        name="stream",
+        primary_key="pk",
+        schema_loader=MagicMock(),
+        retriever=retriever,
+        config={},
+        transformations=[transformation],
+        options={},
+    )
+
+    assert retriever.transformations == [transformation]
+    assert list(stream.read_records(SyncMode.full_refresh, [], {}, {})) == records
+    transformation.transform.assert_not_called()
@@ -28,6 +28,7 @@ from airbyte_cdk.sources.declarative.requesters.error_handlers.default_error_han
 from airbyte_cdk.sources.declarative.requesters.error_handlers.http_response_filter import HttpResponseFilter
 from airbyte_cdk.sources.declarative.requesters.http_requester import HttpRequester
 from airbyte_cdk.sources.declarative.requesters.paginators.default_paginator import DefaultPaginator
+from airbyte_cdk.sources.declarative.requesters.rate_limit import RateLimit
 from airbyte_cdk.sources.declarative.requesters.request_option import RequestOption, RequestOptionType
 from airbyte_cdk.sources.declarative.requesters.request_options.interpolated_request_options_provider import (
     InterpolatedRequestOptionsProvider,
@@ -41,6 +42,7 @@ from airbyte_cdk.sources.declarative.stream_slicers.list_stream_slicer import Li
 from airbyte_cdk.sources.declarative.transformations import AddFields, RemoveFields
 from airbyte_cdk.sources.declarative.transformations.add_fields import AddedFieldDefinition
 from airbyte_cdk.sources.declarative.yaml_declarative_source import YamlDeclarativeSource
+from airbyte_cdk.sources.streams.http.rate_limiter import shared_rate_limiter
 from dateutil.relativedelta import relativedelta
 from jsonschema import ValidationError
 
@@ -565,6 +567,29 @@ def test_create_requester(test_name, error_handler):
     assert component.name == "lists"
 
 
+def test_create_requester_with_rate_limit():
+    content = """
+  requester:
+    type: HttpRequester
+    path: "/v3/marketing/lists"
+    name: "lists"
+    url_base: "https://api.sendgrid.com"
+    rate_limit:
+      requests_per_second: 3
+      burst: 5
+      group: "test_create_requester_with_rate_limit"
+    """
+    config = resolver.preprocess_manifest(YamlDeclarativeSource._parse(content), {}, "")
+
+    factory.create_component(config["requester"], input_config, False)
+
+    component = factory.create_component(config["requester"], input_config)()
+    assert isinstance(component.rate_limit, RateLimit)
+    assert component.rate_limit.burst == 5
+    assert component.get_rate_limiter().requests_per_second == 3
+    assert component.get_rate_limiter() is shared_rate_limiter("test_create_requester_with_rate_limit", 1)
+
+
 def test_create_composite_error_handler():
     content = """
         error_handler:
@@ -5,12 +5,23 @@
 import json
 import logging
 import os
+import re
 import sys
 
 import pytest
 import yaml
+from airbyte_cdk.models import (
+    AirbyteStream,
+    ConfiguredAirbyteCatalog,
+    ConfiguredAirbyteStream,
+    DestinationSyncMode,
+    SyncMode,
+    Type,
+)
 from airbyte_cdk.sources.declarative.exceptions import InvalidConnectorDefinitionException
 from airbyte_cdk.sources.declarative.manifest_declarative_source import ManifestDeclarativeSource
+from airbyte_cdk.sources.declarative.parsers.manifest_cache import MANIFEST_CACHE_DIR_ENV_VAR, ManifestCache
+from airbyte_cdk.sources.declarative.parsers.manifest_reference_resolver import ManifestReferenceResolver
 from jsonschema.exceptions import ValidationError
 
 logger = logging.getLogger("airbyte")
@@ -465,6 +476,128 @@ class TestYamlDeclarativeSource:
             source.spec(logger)
 
 
+def _cacheable_manifest():
+    return {
+        "version": "version",
+        "definitions": {
+            "requester": {"url_base": "https://api.sendgrid.com", "path": "/v3/marketing/lists", "http_method": "GET"},
+        },
+        "streams": [
+            {
+                "type": "DeclarativeStream",
+                "$options": {"name": "lists", "primary_key": "id"},
+                "retriever": {
+                    "requester": "*ref(definitions.requester)",
+                    "record_selector": {"extractor": {"field_pointer": ["result"]}},
+                },
+            }
+        ],
+        "check": {"type": "CheckStream", "stream_names": ["lists"]},
+    }
+
+
+class TestManifestCache:
+    def test_warm_start_skips_reference_resolution_and_validation(self, tmp_path, mocker):
+        cache = ManifestCache(str(tmp_path))
+        cold_source = ManifestDeclarativeSource(source_config=_cacheable_manifest(), manifest_cache=cache)
+        assert not cold_source.loaded_from_manifest_cache
+
+        preprocess_manifest = mocker.spy(ManifestReferenceResolver, "preprocess_manifest")
+        validate_source = mocker.spy(ManifestDeclarativeSource, "_validate_source")
+        warm_source = ManifestDeclarativeSource(source_config=_cacheable_manifest(), manifest_cache=cache)
+
+        assert warm_source.loaded_from_manifest_cache
+        preprocess_manifest.assert_not_called()
+        validate_source.assert_not_called()
+        assert warm_source._source_config == cold_source._source_config
+        assert [stream.name for stream in warm_source.streams({})] == ["lists"]
+
+    def test_modified_manifest_misses_the_cache(self, tmp_path):
+        cache = ManifestCache(str(tmp_path))
+        ManifestDeclarativeSource(source_config=_cacheable_manifest(), manifest_cache=cache)
+
+        manifest = _cacheable_manifest()
+        manifest["definitions"]["requester"]["path"] = "/v3/marketing/contacts"
+        source = ManifestDeclarativeSource(source_config=manifest, manifest_cache=cache)
+
+        assert not source.loaded_from_manifest_cache
+        assert source.streams({})[0].retriever.requester.get_path(stream_state={}, stream_slice={}, next_page_token=None) == (
+            "v3/marketing/contacts"
+        )
+
+    def test_invalid_manifest_is_not_cached(self, tmp_path):
+        cache = ManifestCache(str(tmp_path))
+        manifest = _cacheable_manifest()
+        manifest["unknown_field"] = "value"
+        for _ in range(2):
+            with pytest.raises(InvalidConnectorDefinitionException):
+                ManifestDeclarativeSource(source_config=manifest, manifest_cache=cache)
+        assert list(tmp_path.iterdir()) == []
+
+    def test_cache_is_configured_from_the_environment(self, tmp_path, monkeypatch):
+        monkeypatch.setenv(MANIFEST_CACHE_DIR_ENV_VAR, str(tmp_path))
+        ManifestDeclarativeSource(source_config=_cacheable_manifest())
+        assert ManifestDeclarativeSource(source_config=_cacheable_manifest()).loaded_from_manifest_cache
+
+
+def _child_stream_of_parents(name):
+    return {
+        "type": "DeclarativeStream",
+        "$options": {"name": name, "primary_key": "id"},
+        "schema_loader": {"type": "InlineSchemaLoader", "schema": {}},
+        "retriever": {
+            "requester": {"url_base": "https://api.example.com", "path": "/parents/{{ stream_slice.parent_id }}/" + name},
+            "record_selector": {"extractor": {"field_pointer": ["data"]}},
+            "stream_slicer": {
+                "type": "SubstreamSlicer",
+                "parent_stream_configs": [{"stream": "*ref(definitions.parents)", "parent_key": "id", "stream_slice_field": "parent_id"}],
+            },
+        },
+    }
+
+
+@pytest.mark.parametrize("parent_selected", [True, False])
+def test_child_streams_read_the_records_of_their_parent_once(requests_mock, parent_selected):
+    # Each child stream gets its own instance of the parent stream
+    manifest = {
+        "version": "version",
+        "definitions": {
+            "parents": {
+                "type": "DeclarativeStream",
+                "$options": {"name": "parents", "primary_key": "id"},
+                "schema_loader": {"type": "InlineSchemaLoader", "schema": {}},
+                "retriever": {
+                    "requester": {"url_base": "https://api.example.com", "path": "/parents"},
+                    "record_selector": {"extractor": {"field_pointer": ["data"]}},
+                },
+            },
+        },
+        "streams": [
+            *(["*ref(definitions.parents)"] if parent_selected else []),
+            *[_child_stream_of_parents(name) for name in ("first_children", "second_children", "third_children")],
+        ],
+        "check": {"type": "CheckStream", "stream_names": ["first_children"]},
+    }
+    source = ManifestDeclarativeSource(source_config=manifest)
+    catalog = ConfiguredAirbyteCatalog(
+        streams=[
+            ConfiguredAirbyteStream(
+                stream=AirbyteStream(name=stream.name, json_schema={}, supported_sync_modes=[SyncMode.full_refresh]),
+                sync_mode=SyncMode.full_refresh,
+                destination_sync_mode=DestinationSyncMode.overwrite,
+            )
+            for stream in source.streams({})
+        ]
+    )
+    requests_mock.get(re.compile(r"https://api.example.com/parents/\d+/\w+"), json={"data": [{"id": 10}]})
+    parents = requests_mock.get("https://api.example.com/parents", json={"data": [{"id": 1}, {"id": 2}]})
+
+    records = [message.record for message in source.read(logger, {}, catalog) if message.type == Type.RECORD]
+
+    assert len(records) == (2 if parent_selected else 0) + 3 * 2
+    assert parents.call_count == 1
+
+
 def test_generate_schema():
     schema_str = ManifestDeclarativeSource.generate_schema()
     schema = json.loads(schema_str)
@@ -553,7 +686,8 @@ def test_generate_schema():
     assert {"$ref": "#/definitions/CursorPaginationStrategy"} in default_paginator["properties"]["pagination_strategy"]["anyOf"]
     assert {"$ref": "#/definitions/OffsetIncrement"} in default_paginator["properties"]["pagination_strategy"]["anyOf"]
     assert {"$ref": "#/definitions/PageIncrement"} in default_paginator["properties"]["pagination_strategy"]["anyOf"]
-    assert default_paginator["properties"]["decoder"]["$ref"] == "#/definitions/JsonDecoder"
+    assert {"$ref": "#/definitions/JsonDecoder"} in default_paginator["properties"]["decoder"]["anyOf"]
+    assert {"$ref": "#/definitions/JsonlDecoder"} in default_paginator["properties"]["decoder"]["anyOf"]
     assert {"$ref": "#/definitions/InterpolatedString"} in http_requester["properties"]["url_base"]["anyOf"]
     assert {"type": "string"} in http_requester["properties"]["path"]["anyOf"]
 
@@ -563,7 +697,7 @@ def test_generate_schema():
     assert {"type": "string"} in cursor_pagination_strategy["properties"]["cursor_value"]["anyOf"]
     assert {"$ref": "#/definitions/InterpolatedBoolean"} in cursor_pagination_strategy["properties"]["stop_condition"]["anyOf"]
     assert {"type": "string"} in cursor_pagination_strategy["properties"]["stop_condition"]["anyOf"]
-    assert cursor_pagination_strategy["properties"]["decoder"]["$ref"] == "#/definitions/JsonDecoder"
+    assert {"$ref": "#/definitions/JsonDecoder"} in cursor_pagination_strategy["properties"]["decoder"]["anyOf"]
 
     list_stream_slicer = schema["definitions"]["ListStreamSlicer"]["allOf"][1]
     assert {"slice_values", "cursor_field", "config"}.issubset(list_stream_slicer["required"])
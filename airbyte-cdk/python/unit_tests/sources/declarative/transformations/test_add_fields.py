@@ -3,8 +3,10 @@
 #
 
 from typing import Any, List, Mapping, Tuple
+from unittest.mock import patch
 
 import pytest
+from airbyte_cdk.sources.declarative.interpolation.interpolated_string import InterpolatedString
 from airbyte_cdk.sources.declarative.transformations import AddFields
 from airbyte_cdk.sources.declarative.transformations.add_fields import AddedFieldDefinition
 from airbyte_cdk.sources.declarative.types import FieldPointer
@@ -108,3 +110,33 @@ def test_add_fields(
 ):
     inputs = [AddedFieldDefinition(path=v[0], value=v[1], options={}) for v in field]
     assert AddFields(fields=inputs, options={"alas": "i live"}).transform(input_record, **kwargs) == expected
+
+
+def test_transform_records_evaluates_values_which_do_not_depend_on_the_record_once():
+    fields = [
+        AddedFieldDefinition(path=["shop"], value="{{ config.shop }}", options={}),
+        AddedFieldDefinition(path=["tags"], value="['a', 'b']", options={}),
+        AddedFieldDefinition(path=["nested", "id"], value="{{ record.id }}", options={}),
+        AddedFieldDefinition(path=["cursor"], value="{{ stream_state.cursor }}", options={}),
+    ]
+    transformation = AddFields(fields=fields, options={})
+    records = [{"id": 1}, {"id": 2}]
+
+    with patch.object(InterpolatedString, "eval", autospec=True, side_effect=InterpolatedString.eval) as eval_value:
+        transformed = transformation.transform_records(records, config={"shop": "in-n-out"}, stream_state={"cursor": "t0"})
+
+    assert transformed == [
+        {"id": 1, "shop": "in-n-out", "tags": ["a", "b"], "nested": {"id": 1}, "cursor": "t0"},
+        {"id": 2, "shop": "in-n-out", "tags": ["a", "b"], "nested": {"id": 2}, "cursor": "t0"},
+    ]
+    assert eval_value.call_count == 3 + len(records)
+    # Records don't share mutable values
+    assert transformed[0]["tags"] is not transformed[1]["tags"]
+
+
+def test_transform_records_sees_the_fields_added_before():
+    fields = [
+        AddedFieldDefinition(path=["k2"], value="{{ record.k }}", options={}),
+        AddedFieldDefinition(path=["k3"], value="{{ record.k2 }}", options={}),
+    ]
+    assert AddFields(fields=fields, options={}).transform_records([{"k": "v"}]) == [{"k": "v", "k2": "v", "k3": "v"}]
@@ -0,0 +1,98 @@
+#
+# Copyright (c) 2022 Airbyte, Inc., all rights reserved.
+#
+
+import copy
+
+import dpath.exceptions
+import dpath.util
+import pytest
+from airbyte_cdk.sources.declarative.transformations.field_path import CompiledFieldPath
+
+RECORD = {
+    "id": 1,
+    "name": "n",
+    "nested": {"id": 2, "deeper": {"id": 3, "other": "o"}},
+    "items": [{"id": 4, "v": "a"}, {"id": 5, "v": "b"}, {"id": 6}],
+    "values": [1, 2, 3],
+    "empty": {},
+    "null": None,
+    "str": "s",
+}
+
+
+@pytest.mark.parametrize(
+    "path",
+    [
+        pytest.param(["new"], id="new top level field"),
+        pytest.param(["id"], id="existing top level field"),
+        pytest.param(["nested", "id"], id="existing nested field"),
+        pytest.param(["a", "b", "c"], id="missing parents"),
+        pytest.param(["nested", "new", "c"], id="missing nested parents"),
+        pytest.param(["empty", "k"], id="empty parent"),
+        pytest.param(["values", 1], id="existing list element"),
+        pytest.param(["values", 5], id="list element out of range"),
+        pytest.param(["new_list", 2], id="missing list"),
+        pytest.param(["items", 0, "id"], id="field of a list element"),
+        pytest.param(["items", 4, "id"], id="field of a missing list element"),
+        pytest.param(["*"], id="glob characters are part of the key"),
+    ],
+)
+def test_set_behaves_like_dpath(path):
+    expected, actual = copy.deepcopy(RECORD), copy.deepcopy(RECORD)
+    dpath.util.new(expected, path, "value")
+    CompiledFieldPath(path).set(actual, "value")
+    assert actual == expected
+
+
+@pytest.mark.parametrize(
+    "path, expected_error",
+    [
+        pytest.param(["str", "k"], dpath.exceptions.PathNotFound, id="string parent"),
+        pytest.param(["null", "k"], dpath.exceptions.PathNotFound, id="null parent"),
+        pytest.param(["values", "k", "l"], TypeError, id="list parent with a key"),
+    ],
+)
+def test_set_raises_like_dpath(path, expected_error):
+    with pytest.raises(expected_error):
+        dpath.util.new(copy.deepcopy(RECORD), path, "value")
+    with pytest.raises(expected_error):
+        CompiledFieldPath(path).set(copy.deepcopy(RECORD), "value")
+
+
+@pytest.mark.parametrize(
+    "pointer",
+    [
+        pytest.param(["id"], id="top level field"),
+        pytest.param(["nested", "deeper", "id"], id="nested field"),
+        pytest.param(["nested", "deeper"], id="nested object"),
+        pytest.param(["values", 0], id="first list element"),
+        pytest.param(["values", "1"], id="list element as a string"),
+        pytest.param(["values", 2], id="last list element"),
+        pytest.param(["values", 3], id="list element out of range"),
+        pytest.param(["values", "01"], id="list index which is not canonical"),
+        pytest.param(["items", 1, "v"], id="field of a list element"),
+        pytest.param(["items", "*", "v"], id="field of every list element"),
+        pytest.param(["items", "*"], id="every list element"),
+        pytest.param(["values", "[01]"], id="list elements matching a pattern"),
+        pytest.param(["nested", "*", "id"], id="field of every nested object"),
+        pytest.param(["n*"], id="top level fields matching a pattern"),
+        pytest.param(["**", "id"], id="field at any depth"),
+        pytest.param(["str", "k"], id="field of a string"),
+        pytest.param(["missing", "k"], id="missing parent"),
+        pytest.param(["*", "missing"], id="missing field under a pattern"),
+    ],
+)
+def test_delete_behaves_like_dpath(pointer):
+    expected, actual = copy.deepcopy(RECORD), copy.deepcopy(RECORD)
+    try:
+        dpath.util.delete(expected, pointer)
+    except dpath.exceptions.PathNotFound:
+        pass
+    CompiledFieldPath(pointer).delete(actual)
+    assert actual == expected
+
+
+def test_equality():
+    assert CompiledFieldPath(["a", 0]) == CompiledFieldPath(("a", 0))
+    assert CompiledFieldPath(["a", 0]) != CompiledFieldPath(["a", "0"])
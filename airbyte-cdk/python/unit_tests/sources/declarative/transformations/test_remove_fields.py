@@ -46,3 +46,24 @@ from airbyte_cdk.sources.declarative.types import FieldPointer
 def test_remove_fields(input_record: Mapping[str, Any], field_pointers: List[FieldPointer], expected: Mapping[str, Any]):
     transformation = RemoveFields(field_pointers=field_pointers, options={})
     assert transformation.transform(input_record) == expected
+
+
+@pytest.mark.parametrize(
+    ["input_record", "field_pointers", "expected"],
+    [
+        pytest.param(
+            {"k1": [{"id": 1, "v": "v"}, {"id": 2}]}, [["k1", "*", "id"]], {"k1": [{"v": "v"}, {}]}, id="remove field from list elements"
+        ),
+        pytest.param({"k1": "v", "k2": "v", "l": "v"}, [["k*"]], {"l": "v"}, id="remove fields matching a pattern"),
+        pytest.param({"id": 1, ".": {"id": 2, "k": [{"id": 3}]}}, [["**", "id"]], {".": {"k": [{}]}}, id="remove field at any depth"),
+    ],
+)
+def test_remove_fields_with_globs(input_record: Mapping[str, Any], field_pointers: List[FieldPointer], expected: Mapping[str, Any]):
+    transformation = RemoveFields(field_pointers=field_pointers, options={})
+    assert transformation.transform(input_record) == expected
+
+
+def test_transform_records():
+    transformation = RemoveFields(field_pointers=[["k1"], ["k2", 0]], options={})
+    records = [{"k1": "v", "k2": [1, 2]}, {"k2": [1]}, {"k3": "v"}]
+    assert transformation.transform_records(records) == [{"k2": [None, 2]}, {"k2": []}, {"k3": "v"}]
@@ -0,0 +1,100 @@
+#
+# Copyright (c) 2022 Airbyte, Inc., all rights reserved.
+#
+
+import copy
+import socket
+
+import requests
+from airbyte_cdk.models import SyncMode
+from airbyte_cdk.sources.streams.http import ConnectionPoolMetrics, HttpConnectionPool, shared_connection_pool
+from airbyte_cdk.sources.streams.http.requests_native_auth import TokenAuthenticator
+from unit_tests.sources.streams.http.test_http import StubBasicReadHttpStream
+
+
+class PooledStream(StubBasicReadHttpStream):
+    def __init__(self, pool: HttpConnectionPool, url_base: str, **kwargs):
+        self._pool = pool
+        self.url_base = url_base
+        super().__init__(**kwargs)
+
+    @property
+    def connection_pool(self) -> HttpConnectionPool:
+        return self._pool
+
+
+def test_sessions_reuse_the_connections_of_the_pool(httpserver):
+    httpserver.expect_request("/").respond_with_json({})
+    pool = HttpConnectionPool()
+    sessions = [requests.Session(), requests.Session()]
+    for session in sessions:
+        pool.mount(session)
+
+    for session in sessions + sessions:
+        session.get(httpserver.url_for("/"))
+
+    assert pool.metrics == ConnectionPoolMetrics(requests=4, new_connections=1)
+    assert pool.metrics.reused_connections == 3
+
+
+def test_streams_share_connections_but_not_authentication(httpserver):
+    httpserver.expect_request("/", headers={"Authorization": "Bearer first"}).respond_with_json({})
+    httpserver.expect_request("/", headers={"Authorization": "Bearer second"}).respond_with_json({})
+    pool = HttpConnectionPool()
+    streams = [
+        PooledStream(pool, httpserver.url_for("/"), authenticator=TokenAuthenticator("first")),
+        PooledStream(pool, httpserver.url_for("/"), authenticator=TokenAuthenticator("second")),
+    ]
+
+    for stream in streams:
+        assert list(stream.read_records(sync_mode=SyncMode.full_refresh)) == [{"data": 1}]
+
+    httpserver.check_assertions()
+    assert pool.metrics == ConnectionPoolMetrics(requests=2, new_connections=1)
+
+
+def test_stream_without_connection_pool(httpserver):
+    httpserver.expect_request("/").respond_with_json({})
+    stream = PooledStream(None, httpserver.url_for("/"))
+
+    assert list(stream.read_records(sync_mode=SyncMode.full_refresh)) == [{"data": 1}]
+    assert type(stream._session.get_adapter(httpserver.url_for("/"))) is requests.adapters.HTTPAdapter
+
+
+def test_streams_do_not_use_a_pool_by_default():
+    stream = StubBasicReadHttpStream()
+
+    assert stream.connection_pool is None
+    assert type(stream._session.get_adapter("https://test_base_url.com")) is requests.adapters.HTTPAdapter
+
+
+def test_closing_a_session_keeps_the_connections_of_the_pool(httpserver):
+    httpserver.expect_request("/").respond_with_json({})
+    pool = HttpConnectionPool()
+    sessions = [requests.Session(), requests.Session()]
+    for session in sessions:
+        pool.mount(session)
+
+    sessions[0].get(httpserver.url_for("/"))
+    sessions[0].close()
+    sessions[1].get(httpserver.url_for("/"))
+    assert pool.metrics == ConnectionPoolMetrics(requests=2, new_connections=1)
+
+    pool.close()
+    sessions[1].get(httpserver.url_for("/"))
+    assert pool.metrics == ConnectionPoolMetrics(requests=3, new_connections=2)
+
+
+def test_copies_of_a_stream_share_the_pool():
+    stream = PooledStream(shared_connection_pool(), "https://test_base_url.com")
+
+    copied_stream = copy.deepcopy(stream)
+
+    assert copied_stream._session.get_adapter("https://test_base_url.com") is stream._session.get_adapter("https://test_base_url.com")
+
+
+def test_tcp_keepalive():
+    keepalive_option = (socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+
+    assert keepalive_option in HttpConnectionPool()._adapter.poolmanager.connection_pool_kw["socket_options"]
+    assert "socket_options" not in HttpConnectionPool(tcp_keepalive=False)._adapter.poolmanager.connection_pool_kw
@@ -4,18 +4,22 @@
 
 
 import json
+import threading
+import time
 from http import HTTPStatus
-from typing import Any, Iterable, Mapping, Optional
-from unittest.mock import ANY, MagicMock, patch
+from typing import Any, Iterable, Mapping, MutableMapping, Optional
+from unittest.mock import ANY, MagicMock, call, patch
 
 import pytest
 import requests
-from airbyte_cdk.models import SyncMode
+from airbyte_cdk.models import AirbyteLogMessage, AirbyteMessage, AirbyteRecordMessage, Level, SyncMode, Type
 from airbyte_cdk.sources.streams.http import HttpStream, HttpSubStream
 from airbyte_cdk.sources.streams.http.auth import NoAuth
 from airbyte_cdk.sources.streams.http.auth import TokenAuthenticator as HttpTokenAuthenticator
 from airbyte_cdk.sources.streams.http.exceptions import DefaultBackoffException, RequestBodyException, UserDefinedBackoffException
 from airbyte_cdk.sources.streams.http.requests_native_auth import TokenAuthenticator
+from airbyte_cdk.sources.utils.parent_record_cache import parent_record_cache_scope
+from airbyte_cdk.sources.utils.throttling import StreamThrottle, ThrottleMetrics
 
 
 class StubBasicReadHttpStream(HttpStream):
@@ -153,6 +157,24 @@ def test_stub_custom_backoff_http_stream(mocker):
     # TODO(davin): Figure out how to assert calls.
 
 
+def test_custom_backoff_waits_are_accounted_to_the_stream(mocker):
+    sleep_mock = mocker.patch("time.sleep")
+    stream = StubCustomBackoffHttpStream()
+    throttled_response = requests.Response()
+    throttled_response.status_code = HTTPStatus.TOO_MANY_REQUESTS
+    successful_response = requests.Response()
+    successful_response.status_code = HTTPStatus.OK
+    mocker.patch.object(requests.Session, "send", side_effect=[throttled_response, throttled_response, successful_response])
+    throttle = StreamThrottle(stream.name)
+
+    with throttle.activate():
+        list(stream.read_records(SyncMode.full_refresh))
+
+    # The backoff time plus one second to cover any fraction of second. The backoff library itself sleeps for 0 seconds between tries
+    assert [sleep for sleep in sleep_mock.call_args_list if sleep != call(0)] == [call(1.5), call(1.5)]
+    assert throttle.metrics == ThrottleMetrics(waits=2, throttled_seconds=3)
+
+
 @pytest.mark.parametrize("retries", [-20, -1, 0, 1, 2, 10])
 def test_stub_custom_backoff_http_stream_retries(mocker, retries):
     mocker.patch("time.sleep", lambda x: None)
@@ -371,6 +393,35 @@ class CacheHttpSubStream(HttpSubStream):
         return ""
 
 
+class ProjectedHttpSubStream(CacheHttpSubStream):
+    parent_record_fields = ["id"]
+
+
+def test_sub_streams_read_projected_parent_records_once_per_sync(mocker):
+    parent_stream = StubBasicReadHttpStream()
+    read_records = mocker.patch.object(parent_stream, "read_records", return_value=[{"id": 1, "name": "a"}, {"id": 2, "name": "b"}])
+    child_streams = [ProjectedHttpSubStream(parent=parent_stream), ProjectedHttpSubStream(parent=parent_stream)]
+    expected_slices = [{"parent": {"id": 1}}, {"parent": {"id": 2}}]
+
+    assert list(child_streams[0].stream_slices(sync_mode=SyncMode.full_refresh)) == expected_slices
+    with parent_record_cache_scope():
+        for child_stream in child_streams:
+            assert list(child_stream.stream_slices(sync_mode=SyncMode.full_refresh)) == expected_slices
+
+    assert read_records.call_count == 2
+
+
+def test_sub_stream_projects_parent_messages_without_cache(mocker):
+    parent_stream = StubBasicReadHttpStream()
+    log = AirbyteMessage(type=Type.LOG, log=AirbyteLogMessage(level=Level.INFO, message="log"))
+    record = AirbyteMessage(type=Type.RECORD, record=AirbyteRecordMessage(stream="parent", data={"id": 1, "name": "a"}, emitted_at=0))
+    mocker.patch.object(parent_stream, "read_records", return_value=[log, record])
+
+    slices = list(ProjectedHttpSubStream(parent=parent_stream).stream_slices(sync_mode=SyncMode.full_refresh))
+
+    assert slices == [{"parent": {"id": 1}}]
+
+
 def test_caching_filename():
     stream = CacheHttpStream()
     assert stream.cache_filename == f"{stream.name}.sqlite"
@@ -509,3 +560,96 @@ def test_default_get_error_display_message_handles_http_error(mocker):
 
     http_err_msg = stream.get_error_display_message(requests.HTTPError())
     assert http_err_msg == "my custom message"
+
+
+class CursorPaginatedStream(StubBasicReadHttpStream):
+    def __init__(self, max_prefetched_pages: int = 0, pages: int = 4, **kwargs):
+        super().__init__(**kwargs)
+        self._max_prefetched_pages = max_prefetched_pages
+        self._pages = pages
+
+    @property
+    def max_prefetched_pages(self) -> int:
+        return self._max_prefetched_pages
+
+    def request_params(self, next_page_token: Optional[Mapping[str, Any]] = None, **kwargs) -> MutableMapping[str, Any]:
+        return {"page": next_page_token["page"] if next_page_token else 0}
+
+    def next_page_token(self, response: requests.Response) -> Optional[Mapping[str, Any]]:
+        next_page = response.json()["next_page"]
+        return {"page": next_page} if next_page < self._pages else None
+
+    def parse_response(self, response: requests.Response, **kwargs) -> Iterable[Mapping]:
+        yield from response.json()["data"]
+
+
+def _register_pages(requests_mock, on_request=None):
+    def callback(request, context):
+        if on_request:
+            on_request(request)
+        page = int(request.qs["page"][0])
+        return {"data": [{"page": page, "id": 0}, {"page": page, "id": 1}], "next_page": page + 1}
+
+    requests_mock.register_uri("GET", "https://test_base_url.com/", json=callback)
+
+
+@pytest.mark.parametrize("max_prefetched_pages", [0, 1, 3])
+def test_prefetched_pages_are_read_in_order(requests_mock, max_prefetched_pages):
+    _register_pages(requests_mock)
+    stream = CursorPaginatedStream(max_prefetched_pages=max_prefetched_pages)
+
+    records = list(stream.read_records(SyncMode.full_refresh))
+
+    assert records == [{"page": page, "id": record_id} for page in range(4) for record_id in range(2)]
+    assert [request.qs["page"] for request in requests_mock.request_history] == [["0"], ["1"], ["2"], ["3"]]
+
+
+def test_next_page_is_fetched_while_the_current_page_is_emitted(requests_mock):
+    second_page_requested = threading.Event()
+    _register_pages(requests_mock, lambda request: request.qs["page"] == ["1"] and second_page_requested.set())
+    stream = CursorPaginatedStream(max_prefetched_pages=1)
+
+    records = iter(stream.read_records(SyncMode.full_refresh))
+
+    assert next(records) == {"page": 0, "id": 0}
+    assert second_page_requested.wait(timeout=5)
+    assert len(list(records)) == 7
+
+
+def test_prefetching_stops_when_the_queue_is_full(requests_mock):
+    requested_pages = []
+    _register_pages(requests_mock, lambda request: requested_pages.append(request.qs["page"][0]))
+    stream = CursorPaginatedStream(max_prefetched_pages=1, pages=10)
+
+    records = iter(stream.read_records(SyncMode.full_refresh))
+    next(records)
+    time.sleep(0.3)
+
+    # The first page is being emitted, the second one waits in the queue and the third one waits for room in the queue
+    assert requested_pages == ["0", "1", "2"]
+    records.close()
+
+
+def test_prefetching_thread_is_joined_when_reading_stops(requests_mock):
+    _register_pages(requests_mock)
+    stream = CursorPaginatedStream(max_prefetched_pages=1, pages=10)
+
+    records = iter(stream.read_records(SyncMode.full_refresh))
+    next(records)
+    records.close()
+
+    assert not [thread for thread in threading.enumerate() if thread.name == f"{stream.name}_page_prefetch"]
+
+
+def test_prefetching_errors_are_raised_by_the_reading_thread(requests_mock):
+    requests_mock.register_uri(
+        "GET",
+        "https://test_base_url.com/",
+        [{"json": {"data": [{"id": 0}], "next_page": 1}}, {"status_code": HTTPStatus.BAD_REQUEST, "json": {}}],
+    )
+    stream = CursorPaginatedStream(max_prefetched_pages=2)
+    records = iter(stream.read_records(SyncMode.full_refresh))
+
+    assert next(records) == {"id": 0}
+    with pytest.raises(requests.exceptions.HTTPError):
+        next(records)
@@ -0,0 +1,102 @@
+#
+# Copyright (c) 2022 Airbyte, Inc., all rights reserved.
+#
+
+import io
+import json
+
+import dpath.util
+import pytest
+import requests
+from airbyte_cdk.sources.streams.http.json_stream import JsonDocumentStream, extract_path, iter_json_records, iter_ndjson_records
+
+DOCUMENTS = [
+    ({"data": [{"id": 1, "name": 'a "quoted" é'}, {"id": 2.5e10}, [1, 2], "x", None, True, 12345678901234567890]}, ["data"]),
+    ({"meta": {"count": 2}, "data": {"records": [{"id": 1}, {"id": 2}]}, "next": [1, 2, 3]}, ["data", "records"]),
+    ({"data": [1.5, -2, 3e-05, 100, 0]}, ["data"]),
+    ({"data": [{"a": [1, 2]}, {"a": [3, 4]}]}, ["data", "1", "a"]),
+    ({"data": [{"a": [1, 2]}]}, ["data", "5", "a"]),
+    ([{"id": 1}, {"id": 2}], []),
+    ({"data": {"id": 1}}, ["data"]),
+    ({"data": []}, ["data"]),
+    ({"data": {}}, ["data"]),
+    ({"data": 0}, ["data"]),
+    ({"data": "value"}, ["data", "field"]),
+    ({"id": 1}, ["data"]),
+    ({"id": 1}, []),
+    ({}, []),
+    (42, []),
+]
+
+
+def _chunks(text, size):
+    return [text[i : i + size] for i in range(0, len(text), size)]
+
+
+def _dpath_records(document, path):
+    extracted = dpath.util.get(document, path, default=[]) if path else document
+    if isinstance(extracted, list):
+        return extracted
+    return [extracted] if extracted else []
+
+
+@pytest.mark.parametrize("document, path", DOCUMENTS)
+@pytest.mark.parametrize("indent", [None, 2])
+@pytest.mark.parametrize("chunk_size", [1, 3, 7, 1024])
+def test_json_document_stream_extracts_the_records_like_dpath(document, path, indent, chunk_size):
+    text = json.dumps(document, indent=indent, ensure_ascii=False)
+
+    document_stream = JsonDocumentStream(_chunks(text, chunk_size), path, keep_records=True)
+
+    assert list(document_stream) == _dpath_records(document, path)
+    assert document_stream.document == document
+    assert extract_path(document, path) == _dpath_records(document, path)
+
+
+def test_json_document_stream_does_not_keep_the_records_by_default():
+    document_stream = JsonDocumentStream(['{"data": [{"id": 1}, {"id": 2}], "next": "token"}'], ["data"])
+
+    assert list(document_stream) == [{"id": 1}, {"id": 2}]
+    assert document_stream.document == {"data": [], "next": "token"}
+
+
+def test_json_document_stream_yields_the_records_before_the_end_of_the_document():
+    def chunks():
+        yield '{"data": [{"id": 1}, '
+        raise AssertionError("The first record should be yielded before the rest of the document is read")
+
+    assert next(iter(JsonDocumentStream(chunks(), ["data"]))) == {"id": 1}
+
+
+def test_json_document_stream_empty_document():
+    document_stream = JsonDocumentStream(["", "  \n"], ["data"])
+
+    assert list(document_stream) == []
+    assert document_stream.document is None
+
+
+@pytest.mark.parametrize("text", ['{"data": [1, 2', '{"data": [1 2]}', '{"data": [1]} extra', '{"data" [1]}', "[1,]"])
+@pytest.mark.parametrize("chunk_size", [1, 1024])
+def test_json_document_stream_invalid_json(text, chunk_size):
+    with pytest.raises(json.JSONDecodeError):
+        list(JsonDocumentStream(_chunks(text, chunk_size), ["data"]))
+
+
+def _response(body: bytes) -> requests.Response:
+    response = requests.Response()
+    response.raw = io.BytesIO(body)
+    response.encoding = "utf-8"
+    return response
+
+
+def test_iter_json_records():
+    body = json.dumps({"data": [{"name": "é" * 10}, {"name": "ü"}]}, ensure_ascii=False).encode("utf-8")
+
+    # Multi-byte characters are split across chunks
+    assert list(iter_json_records(_response(body), ["data"], chunk_size=3)) == [{"name": "é" * 10}, {"name": "ü"}]
+
+
+def test_iter_ndjson_records():
+    body = b'{"id": 1}\n\n{"id": 2}\r\n{"id": 3}'
+
+    assert list(iter_ndjson_records(_response(body), chunk_size=4)) == [{"id": 1}, {"id": 2}, {"id": 3}]
@@ -0,0 +1,164 @@
+#
+# Copyright (c) 2022 Airbyte, Inc., all rights reserved.
+#
+
+import time
+from typing import List
+
+import pytest
+import requests
+from airbyte_cdk.models import SyncMode
+from airbyte_cdk.sources.streams.http import TokenBucketRateLimiter, shared_rate_limiter
+from unit_tests.sources.streams.http.test_http import StubBasicReadHttpStream
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+        self.sleeps: List[float] = []
+
+    def __call__(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+def _limiter(clock: FakeClock, requests_per_second: float = 2, burst: int = 1) -> TokenBucketRateLimiter:
+    return TokenBucketRateLimiter(requests_per_second, burst=burst, clock=clock, sleep=clock.sleep)
+
+
+def _response(headers) -> requests.Response:
+    response = requests.Response()
+    response.headers.update(headers)
+    return response
+
+
+def test_requests_are_spaced_at_the_rate():
+    clock = FakeClock()
+    limiter = _limiter(clock, requests_per_second=2)
+
+    for _ in range(4):
+        limiter.acquire()
+
+    assert clock.sleeps == [0.5, 0.5, 0.5]
+
+
+def test_burst_is_sent_at_once_after_being_idle():
+    clock = FakeClock()
+    limiter = _limiter(clock, requests_per_second=2, burst=3)
+    clock.now += 10
+
+    for _ in range(4):
+        limiter.acquire()
+
+    assert clock.sleeps == [0.5]
+
+
+def test_concurrent_requests_reserve_successive_tokens():
+    clock = FakeClock()
+    limiter = _limiter(clock, requests_per_second=4)
+    waits = []
+    # The sleeps are not applied to the clock, as if every request was waiting in its own thread
+    limiter._sleep = waits.append
+
+    for _ in range(3):
+        limiter.acquire()
+
+    assert waits == [0.25, 0.5]
+
+
+def test_retry_after_pauses_requests():
+    clock = FakeClock()
+    limiter = _limiter(clock, requests_per_second=10)
+
+    limiter.update_from_response(_response({"Retry-After": "3"}))
+    limiter.acquire()
+    limiter.acquire()
+
+    assert clock.sleeps == [3.0, 0.1]
+
+
+def test_retry_after_as_http_date():
+    clock = FakeClock()
+    limiter = _limiter(clock, requests_per_second=10)
+    retry_at = time.strftime("%a, %d %b %Y %H:%M:%S GMT", time.gmtime(time.time() + 60))
+
+    limiter.update_from_response(_response({"Retry-After": retry_at}))
+    limiter.acquire()
+
+    assert clock.sleeps and 55 < clock.sleeps[0] <= 60
+
+
+@pytest.mark.parametrize(
+    "headers, expected_rate",
+    [
+        pytest.param({"X-RateLimit-Remaining": "10", "X-RateLimit-Reset": "20"}, 0.5, id="remaining_requests_spread_until_reset"),
+        pytest.param({"RateLimit-Remaining": "10", "RateLimit-Reset": "20"}, 0.5, id="standard_headers"),
+        pytest.param({"X-RateLimit-Remaining": "1000", "X-RateLimit-Reset": "1"}, 5, id="rate_never_exceeds_the_maximum"),
+        pytest.param({"X-RateLimit-Remaining": "10"}, 5, id="missing_reset"),
+        pytest.param({"X-RateLimit-Remaining": "many", "X-RateLimit-Reset": "20"}, 5, id="invalid_header"),
+    ],
+)
+def test_rate_adapts_to_the_rate_limit_headers(headers, expected_rate):
+    limiter = _limiter(FakeClock(), requests_per_second=5)
+
+    limiter.update_from_response(_response(headers))
+
+    assert limiter.requests_per_second == expected_rate
+
+
+def test_reset_as_epoch_timestamp():
+    limiter = _limiter(FakeClock(), requests_per_second=5)
+
+    limiter.update_from_response(_response({"X-RateLimit-Remaining": "10", "X-RateLimit-Reset": str(int(time.time()) + 100)}))
+
+    assert 0.1 <= limiter.requests_per_second < 0.11
+
+
+def test_exhausted_rate_limit_pauses_until_reset():
+    clock = FakeClock()
+    limiter = _limiter(clock, requests_per_second=5)
+
+    limiter.update_from_response(_response({"X-RateLimit-Remaining": "0", "X-RateLimit-Reset": "30"}))
+    limiter.acquire()
+
+    assert clock.sleeps == [30.0]
+    assert limiter.requests_per_second == 5
+
+
+def test_invalid_rate():
+    with pytest.raises(ValueError):
+        TokenBucketRateLimiter(0)
+
+
+def test_shared_rate_limiter_is_created_once_per_group():
+    limiter = shared_rate_limiter("test_shared_rate_limiter", 5)
+
+    assert shared_rate_limiter("test_shared_rate_limiter", 10) is limiter
+    assert limiter.requests_per_second == 5
+    assert shared_rate_limiter("test_shared_rate_limiter_other_group", 5) is not limiter
+
+
+class RateLimitedStream(StubBasicReadHttpStream):
+    def __init__(self, limiter: TokenBucketRateLimiter, **kwargs):
+        super().__init__(**kwargs)
+        self._limiter = limiter
+
+    @property
+    def rate_limiter(self) -> TokenBucketRateLimiter:
+        return self._limiter
+
+
+def test_http_stream_waits_for_the_rate_limiter(requests_mock):
+    clock = FakeClock()
+    limiter = _limiter(clock, requests_per_second=10)
+    requests_mock.get(StubBasicReadHttpStream.url_base, headers={"Retry-After": "2"})
+    streams = [RateLimitedStream(limiter), RateLimitedStream(limiter)]
+
+    for stream in streams:
+        assert list(stream.read_records(sync_mode=SyncMode.full_refresh)) == [{"data": 1}]
+
+    # The second stream waits for the pause requested by the response to the first one
+    assert clock.sleeps == [2.0]
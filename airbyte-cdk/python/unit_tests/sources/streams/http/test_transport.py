@@ -0,0 +1,180 @@
+#
+# Copyright (c) 2022 Airbyte, Inc., all rights reserved.
+#
+
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Iterable, List, Mapping, Optional
+
+import pytest
+import requests
+from airbyte_cdk.models import SyncMode
+from airbyte_cdk.sources.streams.http import HttpStream, HttpTransport, RequestsTransport
+
+PAGE_SIZE = 2
+URL_BASE = "https://test_base_url.com/"
+
+
+class ThreadPoolTransport(HttpTransport):
+    """Sends requests concurrently, keeping track of the requests sent"""
+
+    def __init__(self, session: requests.Session):
+        self._session = session
+        self._executor = ThreadPoolExecutor(max_workers=4)
+        self.sent_offsets: List[int] = []
+
+    @property
+    def supports_concurrent_requests(self) -> bool:
+        return True
+
+    def submit(self, request: requests.PreparedRequest, request_kwargs: Mapping[str, Any]) -> Future:
+        self.sent_offsets.append(int(requests.utils.urlparse(request.url).query.split("=")[1]))
+        return self._executor.submit(self._session.send, request, **request_kwargs)
+
+
+class OffsetPaginatedStream(HttpStream):
+    url_base = URL_BASE
+    primary_key = "id"
+    retry_factor = 0
+
+    def __init__(self, max_pipelined_requests: int = 3, predicted_increment: int = PAGE_SIZE, **kwargs):
+        super().__init__(**kwargs)
+        self._max_pipelined_requests = max_pipelined_requests
+        self._predicted_increment = predicted_increment
+
+    @property
+    def max_pipelined_requests(self) -> int:
+        return self._max_pipelined_requests
+
+    def create_transport(self) -> HttpTransport:
+        return ThreadPoolTransport(self._session)
+
+    def path(self, **kwargs) -> str:
+        return "records"
+
+    def request_params(self, next_page_token: Optional[Mapping[str, Any]] = None, **kwargs) -> Mapping[str, Any]:
+        return {"offset": (next_page_token or {}).get("offset", 0)}
+
+    def next_page_token(self, response: requests.Response) -> Optional[Mapping[str, Any]]:
+        records = response.json()
+        if len(records) < PAGE_SIZE:
+            return None
+        offset = int(requests.utils.urlparse(response.request.url).query.split("=")[1])
+        return {"offset": offset + PAGE_SIZE}
+
+    def predict_next_page_token(self, next_page_token: Optional[Mapping[str, Any]]) -> Optional[Mapping[str, Any]]:
+        return {"offset": (next_page_token or {}).get("offset", 0) + self._predicted_increment}
+
+    def parse_response(self, response: requests.Response, **kwargs) -> Iterable[Mapping]:
+        yield from response.json()
+
+
+def _mock_records(requests_mock, number_of_records: int):
+    records = [{"id": i} for i in range(number_of_records)]
+    for offset in range(0, number_of_records + 10 * PAGE_SIZE, PAGE_SIZE):
+        requests_mock.get(f"{URL_BASE}records?offset={offset}", json=records[offset : offset + PAGE_SIZE])
+    return records
+
+
+def test_requests_transport_sends_with_session(mocker):
+    session = requests.Session()
+    response = requests.Response()
+    mocker.patch.object(session, "send", return_value=response)
+    request = requests.Request("GET", URL_BASE).prepare()
+    transport = RequestsTransport(session)
+
+    assert transport.send(request, {"timeout": 1}) is response
+    assert transport.submit(request, {}).result() is response
+    session.send.assert_any_call(request, timeout=1)
+    assert not transport.supports_concurrent_requests
+
+
+def test_requests_transport_submit_returns_failed_future(mocker):
+    session = requests.Session()
+    mocker.patch.object(session, "send", side_effect=requests.exceptions.ConnectionError())
+    future = RequestsTransport(session).submit(requests.Request("GET", URL_BASE).prepare(), {})
+
+    with pytest.raises(requests.exceptions.ConnectionError):
+        future.result()
+
+
+@pytest.mark.parametrize(
+    "max_pipelined_requests, predicted_increment, expected_sent_offsets",
+    [
+        pytest.param(1, PAGE_SIZE, [0, 2, 4, 6], id="pipelining_disabled"),
+        pytest.param(3, PAGE_SIZE, [0, 2, 4, 6, 8, 10], id="offset_pagination"),
+        pytest.param(3, 3 * PAGE_SIZE, [0, 6, 12, 2, 8, 14, 4, 10, 16, 6, 12, 18], id="wrong_prediction"),
+    ],
+)
+def test_pipelined_pages(requests_mock, max_pipelined_requests, predicted_increment, expected_sent_offsets):
+    records = _mock_records(requests_mock, 7)
+    stream = OffsetPaginatedStream(max_pipelined_requests=max_pipelined_requests, predicted_increment=predicted_increment)
+
+    assert list(stream.read_records(sync_mode=SyncMode.full_refresh)) == records
+    assert stream.transport.sent_offsets == expected_sent_offsets
+    assert not stream._pipelined_responses
+
+
+def test_pipelined_pages_are_retried(requests_mock):
+    records = _mock_records(requests_mock, 5)
+    requests_mock.get(f"{URL_BASE}records?offset=2", [{"status_code": 500}, {"json": records[2:4]}])
+    stream = OffsetPaginatedStream()
+
+    assert list(stream.read_records(sync_mode=SyncMode.full_refresh)) == records
+    assert [request.url for request in requests_mock.request_history].count(f"{URL_BASE}records?offset=2") == 2
+
+
+def test_pipelined_requests_are_discarded_when_reading_stops(requests_mock):
+    _mock_records(requests_mock, 10)
+    stream = OffsetPaginatedStream()
+
+    records = stream.read_records(sync_mode=SyncMode.full_refresh)
+    assert next(records) == {"id": 0}
+    records.close()
+
+    assert not stream._pipelined_responses
+
+
+class TestAiohttpTransport:
+    aiohttp = pytest.importorskip("aiohttp")
+
+    @pytest.fixture
+    def transport(self):
+        from airbyte_cdk.sources.streams.http import AiohttpTransport
+
+        transport = AiohttpTransport(limit_per_host=2)
+        yield transport
+        transport.close()
+
+    def test_send(self, httpserver, transport):
+        httpserver.expect_request("/records", method="POST", json={"a": 1}, headers={"X-Key": "k"}).respond_with_json(
+            [{"id": 1}], headers={"X-Rate": "10"}
+        )
+        request = requests.Request("POST", httpserver.url_for("/records"), json={"a": 1}, headers={"X-Key": "k"}).prepare()
+
+        response = transport.send(request, {"timeout": 5})
+
+        assert response.status_code == 200
+        assert response.json() == [{"id": 1}]
+        assert list(response.iter_content(chunk_size=4))
+        assert response.headers["x-rate"] == "10"
+        assert response.request is request
+        assert transport.supports_concurrent_requests
+
+    def test_connection_errors_are_raised_as_requests_exceptions(self, transport):
+        request = requests.Request("GET", "http://localhost:1/").prepare()
+
+        with pytest.raises(requests.exceptions.ConnectionError):
+            transport.send(request, {})
+
+    def test_pipelined_stream(self, httpserver, transport):
+        records = [{"id": i} for i in range(5)]
+        for offset in range(0, 12, PAGE_SIZE):
+            httpserver.expect_request("/records", query_string=f"offset={offset}").respond_with_json(records[offset : offset + PAGE_SIZE])
+
+        class AiohttpOffsetPaginatedStream(OffsetPaginatedStream):
+            url_base = httpserver.url_for("/")
+
+            def create_transport(self) -> HttpTransport:
+                return transport
+
+        assert list(AiohttpOffsetPaginatedStream().read_records(sync_mode=SyncMode.full_refresh)) == records
@@ -4,8 +4,9 @@
 
 import copy
 import logging
+import threading
 from collections import defaultdict
-from typing import Any, Callable, Dict, Iterable, List, Mapping, MutableMapping, Optional, Tuple, Union
+from typing import Any, Callable, Dict, Iterable, List, Mapping, MutableMapping, Optional, Set, Tuple, Union
 from unittest.mock import call
 
 import pytest
@@ -32,7 +33,10 @@ from airbyte_cdk.models import (
 from airbyte_cdk.sources import AbstractSource
 from airbyte_cdk.sources.connector_state_manager import ConnectorStateManager
 from airbyte_cdk.sources.streams import IncrementalMixin, Stream
+from airbyte_cdk.sources.utils import throttling
+from airbyte_cdk.sources.utils.parent_record_cache import current_parent_record_cache, expect_parent_records
 from airbyte_cdk.sources.utils.record_helper import stream_data_to_airbyte_message
+from airbyte_cdk.sources.utils.throttling import throttled_sleep
 from airbyte_cdk.utils.traced_exception import AirbyteTracedException
 
 logger = logging.getLogger("airbyte")
@@ -44,10 +48,12 @@ class MockSource(AbstractSource):
         check_lambda: Callable[[], Tuple[bool, Optional[Any]]] = None,
         streams: List[Stream] = None,
         per_stream: bool = True,
+        max_concurrent_streams: int = 1,
     ):
         self._streams = streams
         self.check_lambda = check_lambda
         self.per_stream = per_stream
+        self._max_concurrent_streams = max_concurrent_streams
 
     def check_connection(self, logger: logging.Logger, config: Mapping[str, Any]) -> Tuple[bool, Optional[Any]]:
         if self.check_lambda:
@@ -63,6 +69,10 @@ class MockSource(AbstractSource):
     def per_stream_state_enabled(self) -> bool:
         return self.per_stream
 
+    @property
+    def max_concurrent_streams(self) -> int:
+        return self._max_concurrent_streams
+
 
 class StreamNoStateMethod(Stream):
     name = "managers"
@@ -331,6 +341,318 @@ def test_valid_full_refresh_read_with_slices(mocker):
     assert expected == messages
 
 
+class MockChildStream(MockStream):
+    def __init__(self, parent: Stream, name: str):
+        super().__init__(name=name)
+        self.parent = parent
+        expect_parent_records(parent, ("id",))
+
+    def stream_slices(self, **kwargs) -> Iterable[Optional[Mapping[str, Any]]]:
+        def read_parent():
+            for parent_slice in self.parent.stream_slices(sync_mode=SyncMode.full_refresh):
+                for record in self.parent.read_records(sync_mode=SyncMode.full_refresh, stream_slice=parent_slice):
+                    yield parent_slice, record
+
+        for _, (parent_id,) in current_parent_record_cache().read(self.parent, ("id",), None, read_parent):
+            yield {"parent_id": parent_id}
+
+    def read_records(self, stream_slice: Mapping[str, Any] = None, **kwargs) -> Iterable[Mapping[str, Any]]:
+        yield {"id": stream_slice["parent_id"] * 10}
+
+
+@pytest.mark.parametrize(
+    "parent_selected",
+    [
+        pytest.param(True, id="parent_records_cached_while_the_parent_syncs"),
+        pytest.param(False, id="parent_records_cached_by_the_first_child"),
+    ],
+)
+def test_parent_records_are_read_once_per_sync(mocker, parent_selected):
+    parent_slices = [{"page": 1}, {"page": 2}]
+    parent = MockStream(
+        [({"sync_mode": SyncMode.full_refresh, "stream_slice": s}, [{"id": s["page"]}]) for s in parent_slices], name="parent_of_children"
+    )
+    read_records = mocker.spy(parent, "read_records")
+    mocker.patch.object(MockStream, "get_json_schema", return_value={})
+    mocker.patch.object(parent, "stream_slices", return_value=parent_slices)
+    children = [MockChildStream(parent, "first_child"), MockChildStream(parent, "second_child")]
+    streams = ([parent] if parent_selected else []) + children
+
+    src = MockSource(streams=streams)
+    catalog = ConfiguredAirbyteCatalog(streams=[_configured_stream(stream, SyncMode.full_refresh) for stream in streams])
+    messages = _fix_emitted_at(list(src.read(logger, {}, catalog)))
+
+    children_records = [{"id": 10}, {"id": 20}]
+    expected_parent_records = _as_records("parent_of_children", [{"id": 1}, {"id": 2}]) if parent_selected else []
+    assert messages == expected_parent_records + _as_records("first_child", children_records) + _as_records(
+        "second_child", children_records
+    )
+    # One read per parent slice
+    assert read_records.call_count == 2
+
+
+def test_parent_records_synced_by_another_instance_are_not_reused(mocker):
+    mocker.patch.object(MockStream, "get_json_schema", return_value={})
+    synced_parent = MockStream([({"sync_mode": SyncMode.full_refresh}, [{"id": 1}])], name="parent_of_child")
+    # e.g: the same stream read with other request parameters
+    child_parent = MockStream([({"sync_mode": SyncMode.full_refresh}, [{"id": 2}])], name="parent_of_child")
+    child = MockChildStream(child_parent, "child")
+
+    src = MockSource(streams=[synced_parent, child])
+    catalog = ConfiguredAirbyteCatalog(streams=[_configured_stream(stream, SyncMode.full_refresh) for stream in [synced_parent, child]])
+    messages = _fix_emitted_at(list(src.read(logger, {}, catalog)))
+
+    assert messages == _as_records("parent_of_child", [{"id": 1}]) + _as_records("child", [{"id": 20}])
+
+
+def test_read_logs_the_time_streams_waited_for_rate_limits(mocker, caplog):
+    def throttled_output():
+        yield {"k": 1}
+        throttled_sleep(30)
+        yield {"k": 2}
+
+    s1 = MockStream([({"sync_mode": SyncMode.full_refresh}, throttled_output())], name="s1")
+    s2 = MockStream([({"sync_mode": SyncMode.full_refresh}, [{"k": 1}])], name="s2")
+    mocker.patch.object(MockStream, "get_json_schema", return_value={})
+    sleep_mock = mocker.patch.object(throttling.time, "sleep")
+    src = MockSource(streams=[s1, s2])
+    catalog = ConfiguredAirbyteCatalog(
+        streams=[_configured_stream(s1, SyncMode.full_refresh), _configured_stream(s2, SyncMode.full_refresh)]
+    )
+
+    with caplog.at_level(logging.INFO, logger="airbyte"):
+        messages = list(src.read(logger, {}, catalog))
+
+    assert len(messages) == 3
+    sleep_mock.assert_called_once_with(30)
+    throttle_logs = [record.message for record in caplog.records if "waited for rate limits" in record.message]
+    assert throttle_logs == ["The s1 stream waited for rate limits: 1 waits, 30.0 seconds throttled"]
+
+
+def test_concurrent_full_refresh_read_keeps_per_stream_order(mocker):
+    """Tests that reading streams concurrently outputs every record and keeps the order of the records within each stream"""
+    stream_output = [{"k": i} for i in range(50)]
+    streams = [MockStream([({"sync_mode": SyncMode.full_refresh}, stream_output)], name=f"s{i}") for i in range(4)]
+
+    mocker.patch.object(MockStream, "get_json_schema", return_value={})
+
+    src = MockSource(streams=streams, max_concurrent_streams=3)
+    catalog = ConfiguredAirbyteCatalog(streams=[_configured_stream(s, SyncMode.full_refresh) for s in streams])
+
+    messages = _fix_emitted_at(list(src.read(logger, {}, catalog)))
+
+    assert len(messages) == len(streams) * len(stream_output)
+    for stream in streams:
+        assert [m for m in messages if m.record.stream == stream.name] == _as_records(stream.name, stream_output)
+
+
+def test_concurrent_incremental_read_emits_state_after_stream_records(mocker):
+    """Tests that each stream's STATE message follows all of its records when streams are read concurrently"""
+    stream_output = [{"k1": "v1"}, {"k2": "v2"}]
+    s1 = MockStream([({"sync_mode": SyncMode.incremental, "stream_state": {}}, stream_output)], name="s1")
+    s2 = MockStream([({"sync_mode": SyncMode.incremental, "stream_state": {}}, stream_output)], name="s2")
+    state = {"cursor": "value"}
+    mocker.patch.object(MockStream, "get_updated_state", return_value=state)
+    mocker.patch.object(MockStream, "supports_incremental", return_value=True)
+    mocker.patch.object(MockStream, "get_json_schema", return_value={})
+
+    src = MockSource(streams=[s1, s2], max_concurrent_streams=2)
+    catalog = ConfiguredAirbyteCatalog(streams=[_configured_stream(s1, SyncMode.incremental), _configured_stream(s2, SyncMode.incremental)])
+
+    messages = _fix_emitted_at(list(src.read(logger, {}, catalog, state={})))
+
+    for stream_name in ["s1", "s2"]:
+        stream_messages = [
+            m
+            for m in messages
+            if (m.type == Type.RECORD and m.record.stream == stream_name)
+            or (m.type == Type.STATE and m.state.stream.stream_descriptor.name == stream_name)
+        ]
+        assert [m.type for m in stream_messages] == [Type.RECORD, Type.RECORD, Type.STATE]
+        assert stream_messages[-1].state.stream.stream_state == AirbyteStateBlob.parse_obj(state)
+
+
+def test_concurrent_read_stream_with_error_gets_display_message(mocker):
+    s1 = MockStream([({"sync_mode": SyncMode.full_refresh}, [{"k": "v"}])], name="s1")
+    s2 = MockStream(name="s2")
+
+    mocker.patch.object(MockStream, "get_json_schema", return_value={})
+    mocker.patch.object(MockStream, "get_error_display_message", return_value="my message")
+
+    src = MockSource(streams=[s1, s2], max_concurrent_streams=2)
+    catalog = ConfiguredAirbyteCatalog(
+        streams=[_configured_stream(s1, SyncMode.full_refresh), _configured_stream(s2, SyncMode.full_refresh)]
+    )
+
+    with pytest.raises(AirbyteTracedException, match="No mocked output supplied") as exc:
+        list(src.read(logger, {}, catalog))
+    assert exc.value.message == "my message"
+
+
+def test_concurrent_read_does_not_start_streams_waiting_for_a_turn_after_a_failure(mocker):
+    failed = threading.Event()
+
+    def busy_output():
+        # Holds a turn while the other stream fails
+        failed.wait(timeout=5)
+        yield {"k": "v"}
+
+    busy_stream = MockStream([({"sync_mode": SyncMode.full_refresh}, busy_output())], name="s0")
+    failing_stream = MockStream(name="s1")
+    waiting_streams = [MockStream([({"sync_mode": SyncMode.full_refresh}, [{"k": "v"}])], name=f"s{i}") for i in (2, 3)]
+    streams = [busy_stream, failing_stream, *waiting_streams]
+    mocker.patch.object(MockStream, "get_json_schema", return_value={})
+    mocker.patch.object(MockStream, "get_error_display_message", side_effect=lambda e: failed.set())
+    read_records = mocker.spy(MockStream, "read_records")
+
+    src = MockSource(streams=streams, max_concurrent_streams=2)
+    catalog = ConfiguredAirbyteCatalog(streams=[_configured_stream(s, SyncMode.full_refresh) for s in streams])
+
+    with pytest.raises(Exception, match="No mocked output supplied"):
+        list(src.read(logger, {}, catalog))
+    assert sorted(c.args[0].name for c in read_records.call_args_list) == ["s0", "s1"]
+
+
+class ThreadRecordingStream(MockStream):
+    def __init__(self, *args, threads: Set[str], **kwargs):
+        super().__init__(*args, **kwargs)
+        self.threads = threads
+
+    def read_records(self, **kwargs) -> Iterable[Mapping[str, Any]]:
+        self.threads.add(threading.current_thread().name)
+        yield from super().read_records(**kwargs)
+
+
+def test_concurrent_read_uses_max_concurrent_streams_worker_threads(mocker):
+    threads = set()
+    streams = [
+        ThreadRecordingStream([({"sync_mode": SyncMode.full_refresh}, [{"k": i}])], name=f"s{i}", threads=threads) for i in range(10)
+    ]
+    mocker.patch.object(MockStream, "get_json_schema", return_value={})
+
+    src = MockSource(streams=streams, max_concurrent_streams=2)
+    catalog = ConfiguredAirbyteCatalog(streams=[_configured_stream(s, SyncMode.full_refresh) for s in streams])
+    messages = list(src.read(logger, {}, catalog))
+
+    assert len(messages) == len(streams)
+    assert 1 <= len(threads) <= 2
+
+
+def test_concurrent_read_reads_another_stream_while_a_stream_waits_for_a_rate_limit(mocker):
+    third_stream_read = threading.Event()
+
+    def sleep(seconds):
+        # The throttled stream only resumes once the third stream was read by an extra worker thread
+        assert third_stream_read.wait(timeout=5)
+
+    def throttled_output():
+        yield {"k": 1}
+        throttled_sleep(30)
+        yield {"k": 2}
+
+    def busy_output():
+        # Holds the other turn until the third stream was read
+        assert third_stream_read.wait(timeout=5)
+        yield {"k": 1}
+
+    def third_output():
+        third_stream_read.set()
+        yield {"k": 1}
+
+    streams = [
+        MockStream([({"sync_mode": SyncMode.full_refresh}, output)], name=f"s{i}")
+        for i, output in enumerate([throttled_output(), busy_output(), third_output()])
+    ]
+    mocker.patch.object(MockStream, "get_json_schema", return_value={})
+    mocker.patch.object(throttling.time, "sleep", side_effect=sleep)
+
+    src = MockSource(streams=streams, max_concurrent_streams=2)
+    catalog = ConfiguredAirbyteCatalog(streams=[_configured_stream(s, SyncMode.full_refresh) for s in streams])
+    messages = _fix_emitted_at(list(src.read(logger, {}, catalog)))
+
+    assert sorted((m.record.stream, m.record.data["k"]) for m in messages) == [("s0", 1), ("s0", 2), ("s1", 1), ("s2", 1)]
+
+
+@pytest.mark.parametrize(
+    "stream_class, expected_states",
+    [
+        pytest.param(MockStream, 3, id="test_stream_without_state_checkpoints_after_every_slice"),
+        pytest.param(MockStreamWithState, 2, id="test_stream_with_state_checkpoints_after_every_window"),
+    ],
+)
+def test_incremental_read_with_concurrent_slices(mocker, stream_class, expected_states):
+    """Tests that slices read concurrently emit their records in slice order and only checkpoint over completed slices"""
+    slices = [{"1": "1"}, {"2": "2"}, {"3": "3"}]
+    stream = stream_class([({"sync_mode": SyncMode.incremental, "stream_slice": s, "stream_state": {}}, [s, s]) for s in slices], name="s1")
+    state = {"cursor": "value"}
+    mocker.patch.object(stream_class, "get_updated_state", return_value={})
+    mocker.patch.object(stream_class, "supports_incremental", return_value=True)
+    mocker.patch.object(stream_class, "get_json_schema", return_value={})
+    mocker.patch.object(stream_class, "stream_slices", return_value=slices)
+    mocker.patch.object(stream_class, "max_concurrent_slices", new_callable=mocker.PropertyMock, return_value=2)
+    mocker.patch.object(stream_class, "state_checkpoint_interval", new_callable=mocker.PropertyMock, return_value=1)
+    if stream_class is MockStreamWithState:
+        mocker.patch.object(stream_class, "state", new_callable=mocker.PropertyMock, return_value=state)
+
+    src = MockSource(streams=[stream])
+    catalog = ConfiguredAirbyteCatalog(streams=[_configured_stream(stream, SyncMode.incremental)])
+
+    messages = _fix_emitted_at(list(src.read(logger, {}, catalog, state={})))
+
+    assert [m.record.data for m in messages if m.type == Type.RECORD] == [s for s in slices for _ in range(2)]
+    assert len([m for m in messages if m.type == Type.STATE]) == expected_states
+    assert messages[-1].type == Type.STATE
+
+
+class MockStreamWithUnsortedCursor(MockStream):
+    cursor_field = "cursor"
+
+    def get_updated_state(self, current_stream_state: MutableMapping[str, Any], latest_record: Mapping[str, Any]):
+        current_stream_state["cursor"] = max(current_stream_state.get("cursor", 0), latest_record["cursor"])
+        return current_stream_state
+
+
+def test_incremental_read_checkpoints_up_to_the_watermark_of_unsorted_records(mocker):
+    """Tests that a stream whose records are out of order by at most max_records_out_of_order checkpoints state during a slice,
+    without ever moving it past records which were not read yet"""
+    stream_output = [{"cursor": cursor} for cursor in [2, 1, 4, 3, 5]]
+    stream = MockStreamWithUnsortedCursor([({"sync_mode": SyncMode.incremental, "stream_state": {}}, stream_output)], name="s1")
+    mocker.patch.object(MockStreamWithUnsortedCursor, "supports_incremental", return_value=True)
+    mocker.patch.object(MockStreamWithUnsortedCursor, "get_json_schema", return_value={})
+    mocker.patch.object(MockStreamWithUnsortedCursor, "state_checkpoint_interval", new_callable=mocker.PropertyMock, return_value=2)
+    mocker.patch.object(MockStreamWithUnsortedCursor, "max_records_out_of_order", new_callable=mocker.PropertyMock, return_value=1)
+
+    src = MockSource(streams=[stream])
+    catalog = ConfiguredAirbyteCatalog(streams=[_configured_stream(stream, SyncMode.incremental)])
+
+    messages = _fix_emitted_at(list(src.read(logger, {}, catalog, state=[])))
+
+    assert messages == [
+        _as_record("s1", {"cursor": 2}),
+        _as_record("s1", {"cursor": 1}),
+        _as_state({"s1": {"cursor": 1}}, "s1", {"cursor": 1}),
+        _as_record("s1", {"cursor": 4}),
+        _as_record("s1", {"cursor": 3}),
+        _as_state({"s1": {"cursor": 3}}, "s1", {"cursor": 3}),
+        _as_record("s1", {"cursor": 5}),
+        _as_state({"s1": {"cursor": 5}}, "s1", {"cursor": 5}),
+    ]
+
+
+def test_incremental_read_fails_with_max_records_out_of_order_but_no_cursor_field(mocker):
+    stream = MockStreamWithUnsortedCursor([({"sync_mode": SyncMode.incremental, "stream_state": {}}, [{"cursor": 1}])], name="s1")
+    mocker.patch.object(MockStreamWithUnsortedCursor, "cursor_field", [])
+    mocker.patch.object(MockStreamWithUnsortedCursor, "supports_incremental", return_value=True)
+    mocker.patch.object(MockStreamWithUnsortedCursor, "get_json_schema", return_value={})
+    mocker.patch.object(MockStreamWithUnsortedCursor, "max_records_out_of_order", new_callable=mocker.PropertyMock, return_value=1)
+
+    src = MockSource(streams=[stream])
+    catalog = ConfiguredAirbyteCatalog(streams=[_configured_stream(stream, SyncMode.incremental)])
+
+    with pytest.raises(Exception, match="max_records_out_of_order but has no cursor field"):
+        list(src.read(logger, {}, catalog, state=[]))
+
+
 class TestIncrementalRead:
     @pytest.mark.parametrize(
         "use_legacy",
@@ -0,0 +1,60 @@
+#
+# Copyright (c) 2022 Airbyte, Inc., all rights reserved.
+#
+
+import random
+
+import pytest
+from airbyte_cdk.sources.utils.cursor_watermark import CursorWatermark
+
+
+def _max_cursor(stream_state, record):
+    stream_state["cursor"] = max(stream_state.get("cursor", 0), record["cursor"] or 0)
+    return stream_state
+
+
+def _shuffle_locally(values, max_records_out_of_order, seed):
+    """Swaps records which are at most max_records_out_of_order records apart"""
+    rng = random.Random(seed)
+    values = list(values)
+    for start in range(0, len(values), max_records_out_of_order + 1):
+        window = values[start : start + max_records_out_of_order + 1]
+        rng.shuffle(window)
+        values[start : start + max_records_out_of_order + 1] = window
+    return values
+
+
+@pytest.mark.parametrize("max_records_out_of_order", [0, 1, 5, 20])
+@pytest.mark.parametrize("seed", range(5))
+def test_state_never_passes_a_record_left_to_read(max_records_out_of_order, seed):
+    cursors = _shuffle_locally(range(1, 201), max_records_out_of_order, seed)
+    watermark = CursorWatermark(max_records_out_of_order, "cursor", _max_cursor, {"cursor": 0})
+
+    previous_cursor = 0
+    for position, cursor in enumerate(cursors):
+        watermark.add({"cursor": cursor})
+        state_cursor = watermark.state["cursor"]
+        assert state_cursor >= previous_cursor
+        assert all(state_cursor <= remaining for remaining in cursors[position + 1 :])
+        previous_cursor = state_cursor
+    # Every record but the max_records_out_of_order latest ones is settled
+    assert watermark.state["cursor"] == 200 - max_records_out_of_order
+
+
+def test_state_is_copied():
+    stream_state = {"cursor": 0}
+    watermark = CursorWatermark(0, "cursor", _max_cursor, stream_state)
+
+    watermark.add({"cursor": 3})
+
+    assert watermark.state == {"cursor": 3}
+    assert stream_state == {"cursor": 0}
+
+
+def test_nested_cursor_and_records_without_cursor():
+    watermark = CursorWatermark(1, ["data", "updated_at"], lambda state, record: {"records": state["records"] + [record]}, {"records": []})
+
+    for record in [{"data": {"updated_at": 2}}, {"data": {}}, {"data": {"updated_at": 1}}, {"data": {"updated_at": 3}}]:
+        watermark.add(record)
+
+    assert watermark.state == {"records": [{"data": {}}, {"data": {"updated_at": 1}}, {"data": {"updated_at": 2}}]}
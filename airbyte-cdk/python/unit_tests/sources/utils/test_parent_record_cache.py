@@ -0,0 +1,173 @@
+#
+# Copyright (c) 2022 Airbyte, Inc., all rights reserved.
+#
+
+import pytest
+from airbyte_cdk.models import AirbyteLogMessage, AirbyteMessage, AirbyteRecordMessage, Level, Type
+from airbyte_cdk.sources.utils.parent_record_cache import (
+    ParentRecordCache,
+    current_parent_record_cache,
+    expect_parent_records,
+    parent_record_cache_scope,
+    parent_stream_key,
+)
+
+SLICES = [{"page": 1}, {"page": 2}]
+RECORDS = [(SLICES[0], {"id": 1, "name": "a"}), (SLICES[0], {"id": 2, "name": "b"}), (SLICES[1], {"id": 3, "name": "c"})]
+EXPECTED = [(SLICES[0], (1,)), (SLICES[0], (2,)), (SLICES[1], (3,))]
+
+
+class ParentStream:
+    """Stands for a parent stream instance, which the cache identifies by its name and configuration"""
+
+    name = "parent"
+
+    def __init__(self, **config):
+        self.config = config
+
+
+PARENT = ParentStream()
+
+
+class CountingParent:
+    def __init__(self, records=RECORDS):
+        self.records = records
+        self.reads = 0
+
+    def __call__(self):
+        self.reads += 1
+        yield from self.records
+
+
+def test_parent_is_read_once():
+    cache = ParentRecordCache()
+    read_parent = CountingParent()
+
+    assert list(cache.read(PARENT, ("id",), None, read_parent)) == EXPECTED
+    assert list(cache.read(PARENT, ("id",), {}, read_parent)) == EXPECTED
+    assert read_parent.reads == 1
+
+
+def test_projections_and_states_are_cached_separately():
+    cache = ParentRecordCache()
+    read_parent = CountingParent()
+
+    list(cache.read(PARENT, ("id",), None, read_parent))
+    assert list(cache.read(PARENT, ("id", "name"), None, read_parent))[0] == (SLICES[0], (1, "a"))
+    assert list(cache.read(PARENT, ("id",), {"updated_at": 1}, read_parent)) == EXPECTED
+    assert read_parent.reads == 3
+
+
+def test_incomplete_read_is_not_cached():
+    cache = ParentRecordCache()
+    read_parent = CountingParent()
+
+    records = cache.read(PARENT, ("id",), None, read_parent)
+    next(records)
+    records.close()
+
+    assert list(cache.read(PARENT, ("id",), None, read_parent)) == EXPECTED
+    assert read_parent.reads == 2
+
+
+def test_messages_which_are_not_records_are_skipped():
+    log = AirbyteMessage(type=Type.LOG, log=AirbyteLogMessage(level=Level.INFO, message="log"))
+    record = AirbyteMessage(type=Type.RECORD, record=AirbyteRecordMessage(stream="parent", data={"id": 4}, emitted_at=0))
+    read_parent = CountingParent([(None, log), (None, record)])
+
+    assert list(ParentRecordCache().read(PARENT, ("id",), None, read_parent)) == [(None, (4,))]
+
+
+@pytest.mark.parametrize(
+    "commit, expected_reads", [pytest.param(True, 0, id="complete_sync"), pytest.param(False, 1, id="incomplete_sync")]
+)
+def test_records_are_cached_while_the_parent_syncs(commit, expected_reads):
+    cache = ParentRecordCache([(PARENT, {("id",), ("name",)})])
+    read_parent = CountingParent()
+
+    recorder = cache.record_parent_sync(PARENT)
+    for parent_slice, record in RECORDS:
+        recorder.add(parent_slice, record)
+    if commit:
+        recorder.commit()
+
+    assert list(cache.read(PARENT, ("id",), None, read_parent)) == EXPECTED
+    assert read_parent.reads == expected_reads
+
+
+def test_records_of_unexpected_streams_are_not_recorded():
+    # Another instance of a stream with the same name may be configured differently
+    assert ParentRecordCache([(PARENT, {("id",)})]).record_parent_sync(ParentStream(start_date="2022-01-01")) is None
+
+
+def test_records_of_a_parent_stream_configured_alike_are_recorded():
+    # e.g: the parent stream built for each child stream of a declarative source
+    assert ParentRecordCache([(ParentStream(start_date="2022-01-01"), {("id",)})]).record_parent_sync(ParentStream(start_date="2022-01-01"))
+
+
+def test_instances_of_a_parent_stream_configured_alike_share_their_records():
+    cache = ParentRecordCache()
+    read_parent = CountingParent()
+
+    for _ in range(3):
+        assert list(cache.read(ParentStream(start_date="2022-01-01"), ("id",), None, read_parent)) == EXPECTED
+    assert read_parent.reads == 1
+
+
+def test_instances_of_a_parent_stream_configured_differently_are_cached_separately():
+    cache = ParentRecordCache()
+    read_parent = CountingParent()
+    read_other_parent = CountingParent(RECORDS[:1])
+
+    assert list(cache.read(PARENT, ("id",), None, read_parent)) == EXPECTED
+    assert list(cache.read(ParentStream(start_date="2022-01-01"), ("id",), None, read_other_parent)) == EXPECTED[:1]
+    assert read_parent.reads == read_other_parent.reads == 1
+
+
+class HttpParentStream(ParentStream):
+    url_base = "https://api.example.com/"
+
+    def __init__(self, path="parents", authenticator=None, **config):
+        super().__init__(**config)
+        self._path = path
+        self.authenticator = authenticator
+
+    def path(self, stream_slice=None, **kwargs):
+        return self._path.format(**(stream_slice or {}))
+
+    def request_params(self, **kwargs):
+        return {"per_page": 100}
+
+    def request_headers(self, **kwargs):
+        return {}
+
+
+class Authenticator:
+    def __init__(self, token):
+        self._token = token
+
+
+def test_parent_stream_key():
+    assert parent_stream_key(HttpParentStream()) == parent_stream_key(HttpParentStream())
+    assert parent_stream_key(HttpParentStream()) != parent_stream_key(HttpParentStream(path="archived_parents"))
+    assert parent_stream_key(HttpParentStream()) != parent_stream_key(HttpParentStream(start_date="2022-01-01"))
+    assert parent_stream_key(HttpParentStream(authenticator=Authenticator("a"))) != parent_stream_key(
+        HttpParentStream(authenticator=Authenticator("b"))
+    )
+    # The first request of a substream can't be built without a stream slice
+    substream = HttpParentStream(path="parents/{parent_id}/children")
+    assert parent_stream_key(substream) == parent_stream_key(substream)
+    assert parent_stream_key(substream) != parent_stream_key(HttpParentStream(path="parents/{parent_id}/children"))
+
+
+def test_scope():
+    parent_stream = ParentStream()
+    expect_parent_records(parent_stream, ("id",))
+    assert current_parent_record_cache() is None
+
+    with parent_record_cache_scope() as cache:
+        assert current_parent_record_cache() is cache
+        assert cache.record_parent_sync(parent_stream) is not None
+        assert cache.record_parent_sync(ParentStream(start_date="2022-01-01")) is None
+
+    assert current_parent_record_cache() is None
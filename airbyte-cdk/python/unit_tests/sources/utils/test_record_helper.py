@@ -2,6 +2,9 @@
 # Copyright (c) 2022 Airbyte, Inc., all rights reserved.
 #
 
+import datetime
+import json
+from decimal import Decimal
 from unittest.mock import MagicMock
 
 import pytest
@@ -16,7 +19,8 @@ from airbyte_cdk.models import (
     TraceType,
 )
 from airbyte_cdk.models import Type as MessageType
-from airbyte_cdk.sources.utils.record_helper import stream_data_to_airbyte_message
+from airbyte_cdk.sources.utils import record_helper
+from airbyte_cdk.sources.utils.record_helper import airbyte_message_to_string, stream_data_to_airbyte_message
 
 NOW = 1234567
 STREAM_NAME = "my_stream"
@@ -83,3 +87,61 @@ def test_state_message_to_message(test_name, data):
     schema = {}
     with pytest.raises(ValueError):
         stream_data_to_airbyte_message(STREAM_NAME, data, transformer, schema)
+
+
+@pytest.mark.parametrize(
+    "message",
+    [
+        pytest.param(
+            stream_data_to_airbyte_message(STREAM_NAME, {"id": 0, "nested": {"list": [1, "a", None]}, "float": 1.5}),
+            id="test_record_from_stream_data",
+        ),
+        pytest.param(
+            AirbyteMessage(
+                type=MessageType.RECORD, record=AirbyteRecordMessage(namespace="ns", stream=STREAM_NAME, data={"id": 0}, emitted_at=NOW)
+            ),
+            id="test_record_with_namespace",
+        ),
+        pytest.param(
+            AirbyteMessage(
+                type=MessageType.RECORD, record=AirbyteRecordMessage(stream=STREAM_NAME, data={"id": 0}, emitted_at=NOW, extra=1)
+            ),
+            id="test_record_with_extra_field",
+        ),
+        pytest.param(
+            AirbyteMessage(type=MessageType.LOG, log=AirbyteLogMessage(level=Level.INFO, message="a log message")),
+            id="test_log_message",
+        ),
+    ],
+)
+@pytest.mark.parametrize("use_orjson", [pytest.param(True, id="orjson"), pytest.param(False, id="json")])
+def test_airbyte_message_to_string_matches_pydantic_serialization(mocker, message, use_orjson):
+    if not use_orjson:
+        mocker.patch.object(record_helper, "orjson", None)
+    elif record_helper.orjson is None:
+        pytest.skip("orjson is not installed")
+
+    serialized = airbyte_message_to_string(message)
+
+    assert json.loads(serialized) == json.loads(message.json(exclude_unset=True))
+    if not use_orjson:
+        assert serialized == message.json(exclude_unset=True)
+
+
+def test_airbyte_message_to_string_encodes_non_json_types(mocker):
+    data = {"decimal": Decimal("1.5"), "date": datetime.date(2022, 1, 1), "big_int": 2**70}
+    message = stream_data_to_airbyte_message(STREAM_NAME, data)
+
+    assert json.loads(airbyte_message_to_string(message)) == json.loads(message.json(exclude_unset=True))
+
+
+@pytest.mark.parametrize("value", [float("nan"), float("inf"), -float("inf")])
+@pytest.mark.parametrize("use_orjson", [pytest.param(True, id="orjson"), pytest.param(False, id="json")])
+def test_airbyte_message_to_string_keeps_non_finite_floats(mocker, value, use_orjson):
+    if not use_orjson:
+        mocker.patch.object(record_helper, "orjson", None)
+    elif record_helper.orjson is None:
+        pytest.skip("orjson is not installed")
+    message = stream_data_to_airbyte_message(STREAM_NAME, {"a": None, "nested": {"b": [1.5, value]}})
+
+    assert airbyte_message_to_string(message) == message.json(exclude_unset=True)
@@ -0,0 +1,75 @@
+#
+# Copyright (c) 2022 Airbyte, Inc., all rights reserved.
+#
+
+import random
+import time
+
+import pytest
+from airbyte_cdk.sources.utils.slice_reader import ConcurrentSliceReader
+
+
+def _read_slice(stream_slice):
+    # Later slices are faster to read so that they complete before the earlier ones
+    for i in range(5):
+        time.sleep(random.uniform(0, 0.002) / (stream_slice["id"] + 1))
+        yield {"slice": stream_slice["id"], "record": i}
+
+
+def test_records_are_returned_in_slice_order():
+    slices = [{"id": i} for i in range(20)]
+    reader = ConcurrentSliceReader(max_concurrent_slices=4, read_slice=_read_slice, buffer_size=2)
+
+    records = []
+    for _slice, slice_records, can_checkpoint in reader.read(slices):
+        assert can_checkpoint
+        records.extend(slice_records)
+
+    assert records == [{"slice": s, "record": i} for s in range(20) for i in range(5)]
+
+
+@pytest.mark.parametrize(
+    "number_of_slices, max_concurrent_slices, expected_checkpoints",
+    [
+        pytest.param(7, 3, [False, False, True, False, False, True, True], id="test_last_window_is_partial"),
+        pytest.param(4, 2, [False, True, False, True], id="test_full_windows"),
+        pytest.param(2, 5, [False, True], id="test_single_window"),
+    ],
+)
+def test_window_barrier_only_checkpoints_at_the_end_of_a_window(number_of_slices, max_concurrent_slices, expected_checkpoints):
+    slices = [{"id": i} for i in range(number_of_slices)]
+    reader = ConcurrentSliceReader(max_concurrent_slices=max_concurrent_slices, read_slice=_read_slice, window_barrier=True)
+
+    checkpoints = []
+    for _slice, slice_records, can_checkpoint in reader.read(slices):
+        list(slice_records)
+        checkpoints.append(can_checkpoint)
+
+    assert checkpoints == expected_checkpoints
+
+
+def test_slice_error_is_raised_once_previous_slices_are_consumed():
+    def read_slice(stream_slice):
+        if stream_slice["id"] == 2:
+            raise RuntimeError("failed slice")
+        yield stream_slice
+
+    reader = ConcurrentSliceReader(max_concurrent_slices=3, read_slice=read_slice)
+    consumed = []
+    with pytest.raises(RuntimeError, match="failed slice"):
+        for _slice, slice_records, _ in reader.read([{"id": i} for i in range(5)]):
+            consumed.extend(slice_records)
+
+    assert consumed == [{"id": 0}, {"id": 1}]
+
+
+def test_closing_the_reader_stops_the_workers():
+    def read_slice(stream_slice):
+        while True:
+            yield stream_slice
+
+    reader = ConcurrentSliceReader(max_concurrent_slices=2, read_slice=read_slice, buffer_size=1)
+    slices_iterator = reader.read([{"id": i} for i in range(10)])
+    _, records, _ = next(slices_iterator)
+    assert next(records) == {"id": 0}
+    slices_iterator.close()
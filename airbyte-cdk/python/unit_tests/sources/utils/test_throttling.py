@@ -0,0 +1,133 @@
+#
+# Copyright (c) 2022 Airbyte, Inc., all rights reserved.
+#
+
+import threading
+
+import pytest
+from airbyte_cdk.sources.utils import throttling
+from airbyte_cdk.sources.utils.throttling import (
+    ReadScheduler,
+    ReadStopped,
+    StreamThrottle,
+    ThrottleMetrics,
+    current_throttle,
+    throttled_sleep,
+)
+
+
+@pytest.fixture
+def sleeps(mocker):
+    sleeps = []
+    mocker.patch.object(throttling.time, "sleep", side_effect=sleeps.append)
+    return sleeps
+
+
+def test_throttled_sleep_without_throttle(sleeps):
+    throttled_sleep(2)
+    throttled_sleep(0)
+
+    assert sleeps == [2]
+
+
+def test_throttled_sleep_is_accounted_to_the_active_throttle(sleeps):
+    throttle = StreamThrottle("stream")
+    other_throttle = StreamThrottle("other_stream")
+
+    with throttle.activate():
+        throttled_sleep(2)
+        with other_throttle.activate():
+            throttled_sleep(1)
+        assert current_throttle() is throttle
+        throttled_sleep(0.5)
+        throttled_sleep(0)
+    assert current_throttle() is None
+
+    assert sleeps == [2, 1, 0.5]
+    assert throttle.metrics == ThrottleMetrics(waits=2, throttled_seconds=2.5)
+    assert other_throttle.metrics == ThrottleMetrics(waits=1, throttled_seconds=1)
+    assert str(throttle.metrics) == "2 waits, 2.5 seconds throttled"
+
+
+def _run_in_thread(target) -> threading.Thread:
+    thread = threading.Thread(target=target, daemon=True)
+    thread.start()
+    return thread
+
+
+def test_throttled_stream_hands_its_turn_over(mocker):
+    scheduler = ReadScheduler(max_active_streams=1)
+    throttled_stream_sleeping = threading.Event()
+    other_stream_read = threading.Event()
+
+    def sleep(seconds):
+        throttled_stream_sleeping.set()
+        # The throttled stream only resumes once the other stream was read
+        assert other_stream_read.wait(timeout=5)
+
+    mocker.patch.object(throttling.time, "sleep", side_effect=sleep)
+    throttle = StreamThrottle("throttled_stream", scheduler)
+
+    def read_throttled_stream():
+        with throttle.turn(), throttle.activate():
+            throttled_sleep(60)
+
+    def read_other_stream():
+        with StreamThrottle("other_stream", scheduler).turn():
+            other_stream_read.set()
+
+    throttled_thread = _run_in_thread(read_throttled_stream)
+    assert throttled_stream_sleeping.wait(timeout=5)
+    _run_in_thread(read_other_stream).join(timeout=5)
+    throttled_thread.join(timeout=5)
+
+    assert other_stream_read.is_set()
+    assert not throttled_thread.is_alive()
+    assert throttle.metrics == ThrottleMetrics(waits=1, throttled_seconds=60)
+
+
+@pytest.mark.parametrize(
+    "seconds, on_turn_thread",
+    [
+        pytest.param(0.1, True, id="test_short_waits_keep_the_turn"),
+        pytest.param(60, False, id="test_waits_of_other_threads_of_the_stream_keep_the_turn"),
+    ],
+)
+def test_stream_keeps_its_turn(sleeps, seconds, on_turn_thread):
+    scheduler = ReadScheduler(max_active_streams=1)
+    throttle = StreamThrottle("stream", scheduler)
+
+    with throttle.turn():
+        if on_turn_thread:
+            with throttle.activate():
+                throttled_sleep(seconds)
+        else:
+            # e.g: a thread reading a slice of the stream
+            _run_in_thread(lambda: throttle.wait(seconds)).join(timeout=5)
+        other_stream_thread = _run_in_thread(scheduler.acquire)
+        other_stream_thread.join(timeout=0.1)
+        assert other_stream_thread.is_alive()
+
+    other_stream_thread.join(timeout=5)
+    assert not other_stream_thread.is_alive()
+    assert sleeps == [seconds]
+
+
+def test_streams_waiting_for_a_turn_give_up_once_the_scheduler_is_stopped():
+    scheduler = ReadScheduler(max_active_streams=1)
+    stopped_reads = []
+
+    def read_waiting_stream():
+        try:
+            with StreamThrottle("waiting_stream", scheduler).turn():
+                pytest.fail("The stream got a turn of a stopped scheduler")
+        except ReadStopped as e:
+            stopped_reads.append(e)
+
+    with StreamThrottle("stream", scheduler).turn():
+        waiting_thread = _run_in_thread(read_waiting_stream)
+        scheduler.stop()
+        waiting_thread.join(timeout=5)
+
+    assert len(stopped_reads) == 1
+    assert not scheduler.acquire()
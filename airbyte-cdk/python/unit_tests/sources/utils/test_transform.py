@@ -5,6 +5,7 @@
 import json
 
 import pytest
+from airbyte_cdk.sources.utils import transform
 from airbyte_cdk.sources.utils.transform import TransformConfig, TypeTransformer
 
 SIMPLE_SCHEMA = {"type": "object", "properties": {"value": {"type": "string"}}}
@@ -264,3 +265,58 @@ def test_custom_transform_with_default_normalization():
     obj = {"value": 12}
     s.transformer.transform(obj, SIMPLE_SCHEMA)
     assert obj == {"value": "transformed"}
+
+
+def test_plan_is_compiled_once_per_schema(mocker):
+    t = TypeTransformer(TransformConfig.DefaultSchemaNormalization)
+    compile_plan = mocker.spy(transform._PlanCompiler, "compile")
+
+    for value in range(3):
+        t.transform({"value": value}, SIMPLE_SCHEMA)
+    # Schemas loaded again for every record are found by content
+    t.transform({"value": 3}, json.loads(json.dumps(SIMPLE_SCHEMA)))
+
+    assert compile_plan.call_count == 1
+
+
+def test_recursive_schema():
+    schema = {
+        "type": "object",
+        "properties": {"node": {"$ref": "#/definitions/node"}},
+        "definitions": {
+            "node": {
+                "type": "object",
+                "properties": {"value": {"type": "integer"}, "children": {"type": "array", "items": {"$ref": "#/definitions/node"}}},
+            }
+        },
+    }
+    record = {"node": {"value": "1", "children": [{"value": "2", "children": [{"value": 3.0}]}, {"value": "4"}]}}
+
+    TypeTransformer(TransformConfig.DefaultSchemaNormalization).transform(record, schema)
+
+    assert record == {"node": {"value": 1, "children": [{"value": 2, "children": [{"value": 3}]}, {"value": 4}]}}
+    assert type(record["node"]["children"][0]["children"][0]["value"]) == int
+
+
+@pytest.mark.parametrize(
+    "schema",
+    [
+        pytest.param({"type": "object", "properties": {"value": {"$ref": "http://example.com/schema.json"}}}, id="remote_ref"),
+        pytest.param({"type": "object", "properties": {"value": {"$id": "#nested", "type": "string"}}}, id="nested_id"),
+        pytest.param({"type": "object", "properties": {"value": {"type": "date"}}}, id="unknown_type"),
+    ],
+)
+def test_unsupported_schemas_are_not_compiled(schema):
+    t = TypeTransformer(TransformConfig.DefaultSchemaNormalization)
+    assert t._get_plan(schema) is None
+
+
+def test_custom_transform_registered_after_plan_is_compiled():
+    t = TypeTransformer(TransformConfig.CustomSchemaNormalization | TransformConfig.DefaultSchemaNormalization)
+    obj = {"value": 12}
+    t.transform(obj, SIMPLE_SCHEMA)
+    assert obj == {"value": "12"}
+
+    t.registerCustomTransform(lambda instance, schema: instance + "!")
+    t.transform(obj, SIMPLE_SCHEMA)
+    assert obj == {"value": "12!"}
@@ -53,3 +53,15 @@ def test_double_finish_is_safely_ignored():
         timer.finish_event()
         timer.finish_event()
         assert timer.count == 1
+
+
+def test_finish_event_by_name_out_of_order():
+    with create_timer("Source Counter") as timer:
+        timer.start_event("first_event")
+        timer.start_event("second_event")
+        timer.finish_event("first_event")
+        assert timer.events["first_event"].end is not None
+        assert timer.events["second_event"].end is None
+        timer.finish_event()
+        assert timer.events["second_event"].end is not None
+        assert timer.stack == []
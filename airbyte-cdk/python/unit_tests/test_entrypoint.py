@@ -16,6 +16,7 @@ from airbyte_cdk.models import (
     AirbyteConnectionStatus,
     AirbyteMessage,
     AirbyteRecordMessage,
+    AirbyteStateMessage,
     AirbyteStream,
     ConnectorSpecification,
     Status,
@@ -23,6 +24,7 @@ from airbyte_cdk.models import (
     Type,
 )
 from airbyte_cdk.sources import Source
+from airbyte_cdk.sources.utils import record_helper
 
 
 class MockSource(Source):
@@ -189,6 +191,8 @@ def test_run_read(entrypoint: AirbyteEntrypoint, mocker, spec_mock, config_mock)
     mocker.patch.object(MockSource, "read_state", return_value={})
     mocker.patch.object(MockSource, "read_catalog", return_value={})
     mocker.patch.object(MockSource, "read", return_value=[AirbyteMessage(record=expected, type=Type.RECORD)])
+    # orjson encodes records without whitespace, so compare against the standard library output
+    mocker.patch.object(record_helper, "orjson", None)
     assert [_wrap_message(expected)] == list(entrypoint.run(parsed_args))
     assert spec_mock.called
 
@@ -196,3 +200,17 @@ def test_run_read(entrypoint: AirbyteEntrypoint, mocker, spec_mock, config_mock)
 def test_invalid_command(entrypoint: AirbyteEntrypoint, mocker, config_mock):
     with pytest.raises(Exception):
         list(entrypoint.run(Namespace(command="invalid", config="conf")))
+
+
+def test_launch_writes_every_message(mocker, capsys, spec_mock, config_mock):
+    record = AirbyteMessage(record=AirbyteRecordMessage(stream="stream", data={"data": "stuff"}, emitted_at=1), type=Type.RECORD)
+    state = AirbyteMessage(type=Type.STATE, state=AirbyteStateMessage(data={"cursor": 1}))
+    mocker.patch.object(MockSource, "read_state", return_value={})
+    mocker.patch.object(MockSource, "read_catalog", return_value={})
+    mocker.patch.object(MockSource, "read", return_value=[record, record, state, record])
+    mocker.patch.object(record_helper, "orjson", None)
+
+    entrypoint_module.launch(MockSource(), ["read", "--config", "config_path", "--catalog", "catalog_path"])
+
+    expected = [record.json(exclude_unset=True)] * 2 + [state.json(exclude_unset=True), record.json(exclude_unset=True)]
+    assert capsys.readouterr().out.splitlines() == expected
@@ -0,0 +1,81 @@
+#
+# Copyright (c) 2022 Airbyte, Inc., all rights reserved.
+#
+
+import io
+import time
+from unittest.mock import MagicMock
+
+from airbyte_cdk.utils import message_writer
+from airbyte_cdk.utils.message_writer import BufferedMessageWriter
+
+
+def test_messages_are_buffered_until_flushed():
+    stream = io.StringIO()
+    writer = BufferedMessageWriter(stream, buffer_size=1000, flush_interval=60)
+
+    writer.write("first")
+    writer.write("second")
+    assert stream.getvalue() == ""
+
+    writer.flush()
+    assert stream.getvalue() == "first\nsecond\n"
+
+
+def test_buffer_is_written_out_once_full():
+    stream = MagicMock()
+    writer = BufferedMessageWriter(stream, buffer_size=10, flush_interval=60)
+
+    writer.write("1234")
+    assert not stream.write.called
+    writer.write("5678")
+
+    stream.write.assert_called_once_with("1234\n5678\n")
+
+
+def test_write_with_flush_writes_out_preceding_messages():
+    stream = io.StringIO()
+    writer = BufferedMessageWriter(stream, buffer_size=1000, flush_interval=60)
+
+    writer.write("record")
+    writer.write("state", flush=True)
+
+    assert stream.getvalue() == "record\nstate\n"
+
+
+def test_buffer_is_written_out_after_flush_interval(mocker):
+    stream = io.StringIO()
+    monotonic = mocker.patch.object(message_writer.time, "monotonic", return_value=100.0)
+    writer = BufferedMessageWriter(stream, buffer_size=1000, flush_interval=1.0)
+
+    writer.write("first")
+    monotonic.return_value = 100.5
+    writer.write("second")
+    assert stream.getvalue() == ""
+
+    monotonic.return_value = 101.0
+    writer.write("third")
+    assert stream.getvalue() == "first\nsecond\nthird\n"
+
+
+def test_buffer_is_flushed_on_exit_even_on_error():
+    stream = io.StringIO()
+    try:
+        with BufferedMessageWriter(stream, buffer_size=1000, flush_interval=60) as writer:
+            writer.write("record")
+            raise ValueError("failed read")
+    except ValueError:
+        pass
+
+    assert stream.getvalue() == "record\n"
+
+
+def test_buffer_is_written_out_after_flush_interval_without_further_writes():
+    stream = io.StringIO()
+    with BufferedMessageWriter(stream, buffer_size=1000, flush_interval=0.1) as writer:
+        writer.write("record")
+        # e.g: the source waits for a rate limit before reading the next record
+        deadline = time.monotonic() + 5
+        while not stream.getvalue() and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert stream.getvalue() == "record\n"
@@ -121,3 +121,20 @@ def test_secret_filtering():
     update_secrets([SECRET_STRING_VALUE, SECRET_STRING_2_VALUE])
     filtered = filter_secrets(sensitive_str)
     assert filtered == f"**** {NOT_SECRET_VALUE} **** ****"
+
+
+@pytest.mark.parametrize(
+    "secrets, sensitive_str, expected",
+    [
+        pytest.param(["x", "xk"], "xk", "****", id="longest_secret_is_replaced_first"),
+        pytest.param(["xk", "x"], "xk x", "**** ****", id="secret_order_does_not_matter"),
+        pytest.param(["ab", "bc"], "abc", "****c", id="leftmost_overlapping_secret_is_replaced"),
+        pytest.param(["a.c", "(d)"], "abc a.c (d) d", "abc **** **** d", id="regex_characters_are_escaped"),
+        pytest.param([1234], "pin: 1234", "pin: ****", id="non_string_secret"),
+        pytest.param(["****", "*"], "a*b", "a****b", id="replacement_is_not_filtered_again"),
+    ],
+)
+def test_secret_filtering_maximal_match(secrets, sensitive_str, expected):
+    update_secrets(secrets)
+    assert filter_secrets(sensitive_str) == expected
+    update_secrets([])
@@ -0,0 +1,154 @@
+#
+# Copyright (c) 2022 Airbyte, Inc., all rights reserved.
+#
+
+import queue
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Deque, Iterator, List, Mapping, Optional, Union
+
+from .formats.abstract_file_parser import AbstractFileParser
+from .storagefile import StorageFile
+
+
+class _PrefetchedFile:
+    """
+    A file registered for prefetching. Once started, a background thread downloads and parses the file, handing its records over in
+    batches through a bounded queue, so that the records of a file waiting for its turn never take more than a few batches of memory.
+    """
+
+    def __init__(self, storage_file: StorageFile, max_buffered_batches: int, batch_size: int):
+        self.storage_file = storage_file
+        self._batch_size = batch_size
+        # Batches of records, followed by None once the file was read completely, or by the exception which stopped the read
+        self._batches: "queue.Queue[Union[List[Mapping[str, Any]], BaseException, None]]" = queue.Queue(maxsize=max_buffered_batches)
+        self._stopped = threading.Event()
+        self.started = False
+
+    def start(self, executor: ThreadPoolExecutor, file_reader: AbstractFileParser) -> None:
+        self.started = True
+        executor.submit(self._read, file_reader)
+
+    def stop(self) -> None:
+        """
+        Stops the background read, e.g: when the records of the file are not needed anymore
+        """
+        self._stopped.set()
+
+    def records(self) -> Iterator[Mapping[str, Any]]:
+        """
+        Yields the records of the file in order, raising the error of the background read if any
+        """
+        try:
+            while True:
+                batch = self._batches.get()
+                if batch is None:
+                    return
+                if isinstance(batch, BaseException):
+                    raise batch
+                yield from batch
+        finally:
+            self.stop()
+
+    def _put(self, item: Union[List[Mapping[str, Any]], BaseException, None]) -> bool:
+        # Waits for room in the queue, unless reading stops in the meantime
+        while not self._stopped.is_set():
+            try:
+                self._batches.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                pass
+        return False
+
+    def _read(self, file_reader: AbstractFileParser) -> None:
+        if self._stopped.is_set():
+            return
+        try:
+            batch: List[Mapping[str, Any]] = []
+            with self.storage_file.open(file_reader.is_binary) as f:
+                for record in file_reader.stream_records(f, self.storage_file.file_info):
+                    batch.append(record)
+                    if len(batch) >= self._batch_size:
+                        if not self._put(batch):
+                            return
+                        batch = []
+            if batch and not self._put(batch):
+                return
+            self._put(None)
+        except BaseException as e:
+            self._put(e)
+
+
+class FilePrefetcher:
+    """
+    Downloads and parses upcoming files on background threads while the records of the current file are emitted, so that the latency of
+    each file overlaps with the reading of the previous ones.
+
+    Files are registered in the order their records are emitted. Reading a file starts reading the next max_prefetched_files registered
+    files in the background. Records are still emitted file by file, in order, and an error reading a prefetched file is only raised once
+    every file before it has been emitted, so a cursor never moves past a file whose records were not all emitted.
+    """
+
+    def __init__(self, max_prefetched_files: int, max_buffered_batches: int = 10, batch_size: int = 1000):
+        """
+        :param max_prefetched_files: maximum number of files read in the background, ahead of the file being emitted
+        :param max_buffered_batches: maximum number of batches of records held in memory for each prefetched file
+        :param batch_size: number of records handed over at once by the background threads
+        """
+        self._max_prefetched_files = max_prefetched_files
+        self._max_buffered_batches = max_buffered_batches
+        self._batch_size = batch_size
+        self._upcoming: Deque[_PrefetchedFile] = deque()
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    def add(self, storage_file: StorageFile) -> None:
+        """
+        Registers the next file whose records will be emitted
+
+        :param storage_file: the file
+        """
+        self._upcoming.append(_PrefetchedFile(storage_file, self._max_buffered_batches, self._batch_size))
+
+    def read(self, storage_file: StorageFile, file_reader: AbstractFileParser) -> Iterator[Mapping[str, Any]]:
+        """
+        Yields the records of a file, using the ones read in the background if it was prefetched, and starts prefetching the files
+        registered after it. A file which was not registered is read directly.
+
+        :param storage_file: the file to read
+        :param file_reader: the parser of the file format
+        """
+        current = self._take(storage_file)
+        for upcoming in list(self._upcoming)[: self._max_prefetched_files]:
+            if not upcoming.started:
+                upcoming.start(self._get_executor(), file_reader)
+
+        if current is not None and current.started:
+            yield from current.records()
+        else:
+            with storage_file.open(file_reader.is_binary) as f:
+                yield from file_reader.stream_records(f, storage_file.file_info)
+
+    def close(self) -> None:
+        """
+        Stops reading the files which were prefetched but not emitted
+        """
+        while self._upcoming:
+            self._upcoming.popleft().stop()
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def _take(self, storage_file: StorageFile) -> Optional[_PrefetchedFile]:
+        if not any(upcoming.storage_file is storage_file for upcoming in self._upcoming):
+            return None
+        # Files registered before this one are not going to be read anymore
+        while self._upcoming[0].storage_file is not storage_file:
+            self._upcoming.popleft().stop()
+        return self._upcoming.popleft()
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            # The file being emitted may still be read in the background along with the prefetched ones
+            self._executor = ThreadPoolExecutor(max_workers=self._max_prefetched_files + 1, thread_name_prefix="file_prefetcher")
+        return self._executor
@@ -2,8 +2,9 @@
 # Copyright (c) 2022 Airbyte, Inc., all rights reserved.
 #
 
+import hashlib
 from abc import ABC, abstractmethod
-from typing import Any, BinaryIO, Iterator, Mapping, TextIO, Union
+from typing import Any, BinaryIO, Iterable, Iterator, Mapping, Optional, TextIO, Union
 
 import pyarrow as pa
 from airbyte_cdk.logger import AirbyteLogger
@@ -26,16 +27,19 @@ class AbstractFileParser(ABC):
         "null": ("large_string",),
     }
 
-    def __init__(self, format: dict, master_schema: dict = None):
+    def __init__(self, format: dict, master_schema: dict = None, selected_columns: Optional[Iterable[str]] = None):
         """
         :param format: file format specific mapping as described in spec.json
         :param master_schema: superset schema determined from all files, might be unused for some formats, defaults to None
+        :param selected_columns: columns selected in the configured catalog, formats able to read a subset of the columns only read these,
+            defaults to None to read every column
         """
         self._format = format
         self._master_schema = (
             master_schema
             # this may need to be used differently by some formats, pyarrow allows extra columns in csv schema
         )
+        self._selected_columns = set(selected_columns) if selected_columns is not None else None
 
     @property
     @abstractmethod
@@ -55,6 +59,19 @@ class AbstractFileParser(ABC):
         :return: mapping of {columns:datatypes} where datatypes are JsonSchema types
         """
 
+    def get_header_fingerprint(self, file: Union[TextIO, BinaryIO], file_info: FileInfo) -> str:
+        """
+        Override this with format-specific logic to identify the header of file, e.g: the schema stored in its metadata.
+        Files with the same header are assumed to share their schema when inferring the schema from distinct headers only.
+        By default, this is a hash of the first line of the file
+
+        :param file: file-like object (opened via StorageFile)
+        :param file_info: file metadata
+        :return: a string equal for every file with the same header
+        """
+        line = file.readline()
+        return hashlib.md5(line if isinstance(line, bytes) else line.encode()).hexdigest()
+
     @abstractmethod
     def stream_records(self, file: Union[TextIO, BinaryIO], file_info: FileInfo) -> Iterator[Mapping[str, Any]]:
         """
@@ -2,6 +2,8 @@
 # Copyright (c) 2022 Airbyte, Inc., all rights reserved.
 #
 
+import hashlib
+import json
 from typing import Any, BinaryIO, Iterator, Mapping, TextIO, Union
 
 import fastavro
@@ -80,6 +82,15 @@ class AvroParser(AbstractFileParser):
         schema_dict = self._parse_data_type(data_type_mapping, avro_schema)
         return schema_dict
 
+    def get_header_fingerprint(self, file: Union[TextIO, BinaryIO], file_info: FileInfo) -> str:
+        """Return a hash of the writer schema stored in the header of the file
+        :param file: file-like object (opened via StorageFile)
+        :param file_info: file metadata
+        :return: a string equal for every file with the same writer schema
+        """
+        avro_schema = self._get_avro_schema(file)
+        return hashlib.md5(json.dumps(avro_schema, sort_keys=True).encode()).hexdigest()
+
     def stream_records(self, file: Union[TextIO, BinaryIO], file_info: FileInfo) -> Iterator[Mapping[str, Any]]:
         """Stream the data using a generator
         :param file: file-like object (opened via StorageFile)
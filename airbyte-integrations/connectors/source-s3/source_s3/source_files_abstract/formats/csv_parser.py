@@ -4,6 +4,7 @@
 
 import codecs
 import csv
+import hashlib
 import json
 import tempfile
 from typing import Any, BinaryIO, Callable, Iterator, Mapping, Optional, TextIO, Tuple, Union
@@ -180,11 +181,35 @@ class CsvParser(AbstractFileParser):
         field_names = next(reader)
         return {field_name.strip(): pyarrow.string() for field_name in field_names}
 
+    @wrap_exception((ValueError,))
+    def get_header_fingerprint(self, file: Union[TextIO, BinaryIO], file_info: FileInfo) -> str:
+        """
+        Returns a hash of the column names the file is read with: the column_names of the advanced options when they are set,
+        otherwise the header line following the skip_rows first rows, or only its number of columns with autogenerate_column_names.
+        """
+        read_options = self._read_options()
+        column_names = read_options.get("column_names")
+        if not column_names:
+            for _ in range(read_options.get("skip_rows", 0)):
+                file.readline()
+            header = file.readline().decode(self.format.encoding, errors="replace")
+            reader = csv.reader(
+                [header],
+                delimiter=self.format.delimiter,
+                quotechar=self.format.quote_char,
+                doublequote=self.format.double_quote,
+                escapechar=self.format.escape_char,
+            )
+            column_names = next(reader, [])
+            if read_options.get("autogenerate_column_names"):
+                column_names = [f"f{i}" for i in range(len(column_names))]
+        return hashlib.md5(json.dumps(list(column_names)).encode()).hexdigest()
+
     @wrap_exception((ValueError,))
     def stream_records(self, file: Union[TextIO, BinaryIO], file_info: FileInfo) -> Iterator[Mapping[str, Any]]:
         """
         https://arrow.apache.org/docs/python/generated/pyarrow.csv.open_csv.html
-        PyArrow returns lists of values for each column so we zip() these up into records which we then yield
+        PyArrow reads the file in batches of columns, which are turned into records a whole batch at a time
         """
         streaming_reader = pa_csv.open_csv(
             file,
@@ -199,12 +224,5 @@ class CsvParser(AbstractFileParser):
             except StopIteration:
                 still_reading = False
             else:
-                batch_dict = batch.to_pydict()
-                batch_columns = [col_info.name for col_info in batch.schema]
-                # this gives us a list of lists where each nested list holds ordered values for a single column
-                # e.g. [ [1,2,3], ["a", "b", "c"], [True, True, False] ]
-                columnwise_record_values = [batch_dict[column] for column in batch_columns]
-                # we zip this to get row-by-row, e.g. [ [1, "a", True], [2, "b", True], [3, "c", False] ]
-                for record_values in zip(*columnwise_record_values):
-                    # create our record of {col: value, col: value} by dict comprehension, iterating through all cols in batch_columns
-                    yield {batch_columns[i]: record_values[i] for i in range(len(batch_columns))}
+                # e.g. columns [ [1,2,3], ["a", "b", "c"] ] give [ {"id": 1, "name": "a"}, {"id": 2, "name": "b"}, {"id": 3, "name": "c"} ]
+                yield from batch.to_pylist()
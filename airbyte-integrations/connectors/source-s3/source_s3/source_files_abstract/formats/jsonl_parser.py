@@ -2,8 +2,11 @@
 # Copyright (c) 2022 Airbyte, Inc., all rights reserved.
 #
 
-
-from typing import Any, BinaryIO, Iterator, Mapping, TextIO, Union
+import hashlib
+import io
+import json
+import tempfile
+from typing import Any, BinaryIO, Dict, Iterator, Mapping, Optional, TextIO, Union
 
 import pyarrow as pa
 from pyarrow import json as pa_json
@@ -53,25 +56,32 @@ class JsonlParser(AbstractFileParser):
         """
         return {**{"block_size": self.format.block_size, "use_threads": True}}
 
-    def _parse_options(self, json_schema: Mapping[str, Any] = None) -> Mapping[str, str]:
+    def _parse_options(self, json_schema: Mapping[str, Any] = None, nested_types: Mapping[str, pa.DataType] = None) -> Mapping[str, str]:
         """
         https://arrow.apache.org/docs/python/generated/pyarrow.json.ParseOptions.html
         build ParseOptions object like: pa.json.ParseOptions(**self._parse_options())
         :param json_schema: if this is passed in, pyarrow will attempt to enforce this schema on read, defaults to None
+        :param nested_types: pyarrow types of the object and array columns, which json_schema doesn't describe, defaults to None
         """
         parse_options = {
             "newlines_in_values": self.format.newlines_in_values,
             "unexpected_field_behavior": self.format.unexpected_field_behavior,
         }
+        explicit_schema = dict(nested_types or {})
         if json_schema:
             schema = self.json_schema_to_pyarrow_schema(json_schema)
-            schema = pa.schema({field: type_ for field, type_ in schema.items() if type_ not in self.NON_SCALAR_TYPES.values()})
-            parse_options["explicit_schema"] = schema
+            explicit_schema.update({field: type_ for field, type_ in schema.items() if type_ not in self.NON_SCALAR_TYPES.values()})
+        if explicit_schema:
+            parse_options["explicit_schema"] = pa.schema(explicit_schema)
         return parse_options
 
-    def _read_table(self, file: Union[TextIO, BinaryIO], json_schema: Mapping[str, Any] = None) -> pa.Table:
+    def _read_table(
+        self, file: Union[TextIO, BinaryIO], json_schema: Mapping[str, Any] = None, nested_types: Mapping[str, pa.DataType] = None
+    ) -> pa.Table:
         return pa_json.read_json(
-            file, pa.json.ReadOptions(**self._read_options()), pa.json.ParseOptions(**self._parse_options(json_schema))
+            file,
+            pa.json.ReadOptions(**self._read_options()),
+            pa.json.ParseOptions(**self._parse_options(json_schema, nested_types)),
         )
 
     def get_inferred_schema(self, file: Union[TextIO, BinaryIO], file_info: FileInfo) -> Mapping[str, Any]:
@@ -94,10 +104,113 @@ class JsonlParser(AbstractFileParser):
         schema_dict = {field.name: field_type_to_str(field.type) for field in table.schema}
         return self.json_schema_to_pyarrow_schema(schema_dict, reverse=True)
 
+    def get_header_fingerprint(self, file: Union[TextIO, BinaryIO], file_info: FileInfo) -> str:
+        """
+        JSONL files have no header line, their columns are the keys of the records, so this is a hash of the sorted keys of the first record.
+        When values can contain newlines, lines are joined until they make up a whole record.
+        """
+        record, text = {}, b""
+        for line in file:
+            if not text and not line.strip():
+                continue
+            text += line
+            try:
+                record = json.loads(text)
+            except ValueError:
+                if self.format.newlines_in_values:
+                    continue
+                raise
+            break
+        keys = sorted(record) if isinstance(record, dict) else []
+        return hashlib.md5(json.dumps(keys).encode()).hexdigest()
+
+    @staticmethod
+    def _read_line_blocks(file: BinaryIO, block_size: int) -> Iterator[bytes]:
+        """
+        Reads the file in blocks of about block_size bytes, each made of whole lines
+        """
+        remainder = b""
+        while True:
+            chunk = file.read(block_size)
+            if not chunk:
+                break
+            block, newline, remainder = (remainder + chunk).rpartition(b"\n")
+            if newline:
+                yield block + newline
+        if remainder.strip():
+            yield remainder
+
+    @classmethod
+    def _merge_nested_types(cls, type_: pa.DataType, other_type: pa.DataType) -> pa.DataType:
+        """
+        Merges the types of a column inferred from two blocks of a file, like pyarrow does across the blocks of a whole file:
+        the fields of objects are merged, integers are promoted to floats, and a type wins over null
+        """
+        if type_ == other_type or pa.types.is_null(other_type):
+            return type_
+        if pa.types.is_null(type_):
+            return other_type
+        if pa.types.is_struct(type_) and pa.types.is_struct(other_type):
+            fields = {field.name: field.type for field in type_}
+            for field in other_type:
+                fields[field.name] = cls._merge_nested_types(fields[field.name], field.type) if field.name in fields else field.type
+            return pa.struct(fields)
+        if pa.types.is_list(type_) and pa.types.is_list(other_type):
+            return pa.list_(cls._merge_nested_types(type_.value_type, other_type.value_type))
+        if pa.types.is_integer(type_) and pa.types.is_floating(other_type):
+            return other_type
+        # conflicting types fail to be read like they do when the whole file is parsed at once
+        return type_
+
+    def _may_have_nested_columns(self) -> bool:
+        """
+        Whether records may have object or array columns: those of the master schema, and any column outside of it if its type is inferred
+        """
+        if not self._master_schema or self.format.unexpected_field_behavior == "infer":
+            return True
+        return any(datatype in ("object", "array") for datatype in self._master_schema.values())
+
+    def _spool_line_blocks(self, file: BinaryIO, spool: BinaryIO) -> Dict[str, pa.DataType]:
+        """
+        Copies the file to the spool and infers the types of its object and array columns across all of its blocks
+        :return: pyarrow types of the object and array columns of the file
+        """
+        nested_types: Dict[str, pa.DataType] = {}
+        for block in self._read_line_blocks(file, self.format.block_size):
+            spool.write(block)
+            for field in self._read_table(io.BytesIO(block), self._master_schema).schema:
+                if pa.types.is_struct(field.type) or pa.types.is_list(field.type):
+                    nested_types[field.name] = self._merge_nested_types(nested_types.get(field.name, pa.null()), field.type)
+        spool.seek(0)
+        return nested_types
+
+    def _stream_block_records(
+        self, file: BinaryIO, nested_types: Optional[Mapping[str, pa.DataType]] = None
+    ) -> Iterator[Mapping[str, Any]]:
+        read_blocks = 0
+        for block in self._read_line_blocks(file, self.format.block_size):
+            read_blocks += 1
+            for batch in self._read_table(io.BytesIO(block), self._master_schema, nested_types).to_batches():
+                yield from batch.to_pylist()
+        if not read_blocks:
+            # an empty file fails to be read like it does when the whole file is parsed at once
+            self._read_table(io.BytesIO(b""), self._master_schema)
+
     def stream_records(self, file: Union[TextIO, BinaryIO], file_info: FileInfo) -> Iterator[Mapping[str, Any]]:
         """
         https://arrow.apache.org/docs/python/generated/pyarrow.json.read_json.html
-
+        Records are parsed block by block, so that only a block of the file is held in memory at once, unless values can contain
+        newlines, in which case the lines of a record are only known once the whole file is parsed.
+        The keys of objects are inferred per block though, so when records may have object or array columns, the file is first copied to a
+        temporary file while their types are inferred across all of its blocks, then its blocks are parsed with these types. This way,
+        objects have the same keys whatever the block size, like when the whole file is parsed at once.
         """
-        table = self._read_table(file, self._master_schema)
-        yield from table.to_pylist()
+        if self.format.newlines_in_values:
+            yield from self._read_table(file, self._master_schema).to_pylist()
+            return
+        if not self._may_have_nested_columns():
+            yield from self._stream_block_records(file)
+            return
+        with tempfile.TemporaryFile() as spool:
+            nested_types = self._spool_line_blocks(file, spool)
+            yield from self._stream_block_records(spool, nested_types)
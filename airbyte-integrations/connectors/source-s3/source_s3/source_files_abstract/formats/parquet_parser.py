@@ -2,8 +2,12 @@
 # Copyright (c) 2022 Airbyte, Inc., all rights reserved.
 #
 
-from typing import Any, BinaryIO, Iterator, List, Mapping, TextIO, Tuple, Union
+import hashlib
+import json
+from typing import Any, BinaryIO, Callable, Iterator, List, Mapping, Optional, TextIO, Tuple, Union
 
+import pyarrow as pa
+import pyarrow.compute as pc
 import pyarrow.parquet as pq
 from airbyte_cdk.models import FailureType
 from pyarrow.parquet import ParquetFile
@@ -28,6 +32,25 @@ PARQUET_TYPES = {
     "time": ("string", ["INT32", "INT64", "INT96"], lambda v: v.isoformat()),
 }
 
+# Operators of the row filters
+# operator: (function computing whether the values of a column match, function telling whether no value within [min, max] can match)
+FILTER_OPERATORS: Mapping[str, Tuple[Callable[[pa.Array, Any], pa.Array], Callable[[Any, Any, Any], bool]]] = {
+    "=": (pc.equal, lambda low, high, value: value < low or value > high),
+    "!=": (pc.not_equal, lambda low, high, value: low == high == value),
+    "<": (pc.less, lambda low, high, value: low >= value),
+    "<=": (pc.less_equal, lambda low, high, value: low > value),
+    ">": (pc.greater, lambda low, high, value: high <= value),
+    ">=": (pc.greater_equal, lambda low, high, value: high < value),
+    "in": (
+        lambda column, values: pc.is_in(column, value_set=values),
+        lambda low, high, values: all(value < low or value > high for value in values),
+    ),
+    "not in": (
+        lambda column, values: pc.invert(pc.is_in(column, value_set=values)),
+        lambda low, high, values: low == high and low in values,
+    ),
+}
+
 
 class ParquetParser(AbstractFileParser):
     """Apache Parquet is a free and open-source column-oriented data storage format of the Apache Hadoop ecosystem.
@@ -49,6 +72,88 @@ class ParquetParser(AbstractFileParser):
     def _select_options(self, *names: List[str]) -> dict:
         return {name: self._format[name] for name in names}
 
+    def _validate_config(self, config: Mapping[str, Any]):
+        if config.get("format", {}).get("filetype") == "parquet":
+            self._row_filters()
+
+    def _row_filters(self) -> List[Tuple[str, str, Any]]:
+        """
+        :return: the (column, operator, value) conditions of the filters option
+        """
+        if not self._format.get("filters"):
+            return []
+        try:
+            filters = json.loads(self._format["filters"])
+        except json.JSONDecodeError as e:
+            raise ValueError(f"Row filters are not valid JSON: {e}") from e
+        if not isinstance(filters, list):
+            raise ValueError("Row filters should be a list of [column, operator, value] conditions")
+        for condition in filters:
+            if not isinstance(condition, list) or len(condition) != 3 or not isinstance(condition[0], str):
+                raise ValueError(f"Row filter {condition} should be a [column, operator, value] condition")
+            if condition[1] not in FILTER_OPERATORS and condition[1] != "==":
+                raise ValueError(f"Row filter {condition} has an unknown operator, available operators: {list(FILTER_OPERATORS)}")
+            if condition[1] in ("in", "not in") and not isinstance(condition[2], list):
+                raise ValueError(f"Row filter {condition} should have a list of values")
+        return [(column, "=" if operator == "==" else operator, value) for column, operator, value in filters]
+
+    @staticmethod
+    def _typed_row_filters(
+        reader: ParquetFile, file_info: FileInfo, row_filters: List[Tuple[str, str, Any]]
+    ) -> Optional[List[Tuple[str, str, Any]]]:
+        """
+        Converts the values of the filters to the types of the columns of the file
+
+        :return: the filters with Arrow values, or None if a filtered column is missing from the file so that no row can match
+        """
+        typed_filters = []
+        for column, operator, value in row_filters:
+            if column not in reader.schema_arrow.names:
+                return None
+            type_ = reader.schema_arrow.field(column).type
+            try:
+                typed_value = pa.array(value).cast(type_) if operator in ("in", "not in") else pa.scalar(value).cast(type_)
+            except (pa.ArrowInvalid, pa.ArrowNotImplementedError) as e:
+                raise S3Exception(
+                    file_info,
+                    str(e),
+                    f"The value of the row filter on {column} can't be compared with the {type_} values of the column.",
+                    FailureType.config_error,
+                ) from e
+            typed_filters.append((column, operator, typed_value))
+        return typed_filters
+
+    @staticmethod
+    def _skip_row_group(row_group: pq.RowGroupMetaData, typed_filters: List[Tuple[str, str, Any]]) -> bool:
+        """
+        :return: whether the statistics of the row group show that none of its rows match the filters
+        """
+        column_statistics = {row_group.column(i).path_in_schema: row_group.column(i).statistics for i in range(row_group.num_columns)}
+        for column, operator, value in typed_filters:
+            # nested columns don't have statistics of their own
+            statistics = column_statistics.get(column)
+            if statistics is None or not statistics.has_min_max:
+                continue
+            try:
+                python_value = value.to_pylist() if isinstance(value, pa.Array) else value.as_py()
+                if FILTER_OPERATORS[operator][1](statistics.min, statistics.max, python_value):
+                    return True
+            except TypeError:
+                # the statistics can't be compared with the value, e.g: for some logical types
+                continue
+        return False
+
+    @staticmethod
+    def _filter_batch(batch: pa.RecordBatch, typed_filters: List[Tuple[str, str, Any]]) -> pa.RecordBatch:
+        if not typed_filters:
+            return batch
+        mask = None
+        for column, operator, value in typed_filters:
+            matches = FILTER_OPERATORS[operator][0](batch.column(column), value)
+            mask = matches if mask is None else pc.and_kleene(mask, matches)
+        # rows whose filtered values are null don't match
+        return batch.filter(mask)
+
     def _init_reader(self, file: Union[TextIO, BinaryIO]) -> ParquetFile:
         """Generates a new parquet reader
         Doc: https://arrow.apache.org/docs/python/generated/pyarrow.parquet.ParquetFile.html
@@ -88,6 +193,27 @@ class ParquetParser(AbstractFileParser):
             return func(field_value) if func else field_value
         raise TypeError(f"unsupported field type: {logical_type}, value: {field_value}")
 
+    @classmethod
+    def convert_field_column(cls, logical_type: str, column: pa.Array) -> pa.Array:
+        """
+        Converts a whole column to JSON compatible values, like convert_field_data() does for each value.
+        Dates, and timestamps and times without fractional seconds, are formatted by Arrow compute kernels.
+        Other values are converted one by one, since isoformat() only prints the fractional seconds of the values which have some.
+        """
+        if logical_type in PARQUET_TYPES and PARQUET_TYPES[logical_type][2] is None:
+            return column
+        try:
+            if pa.types.is_date(column.type):
+                return column.cast(pa.string())
+            if pa.types.is_timestamp(column.type) and column.type.tz is None:
+                # the cast fails if any value has fractional seconds
+                return pc.strftime(column.cast(pa.timestamp("s")), format="%Y-%m-%dT%H:%M:%S")
+            if pa.types.is_time(column.type):
+                return column.cast(pa.time32("s")).cast(pa.string())
+        except pa.ArrowInvalid:
+            pass
+        return pa.array([cls.convert_field_data(logical_type, value) for value in column.to_pylist()], pa.string())
+
     def get_inferred_schema(self, file: Union[TextIO, BinaryIO], file_info: FileInfo) -> dict:
         """
         https://arrow.apache.org/docs/python/parquet.html#finer-grained-reading-and-writing
@@ -103,6 +229,13 @@ class ParquetParser(AbstractFileParser):
             raise S3Exception(file_info, "empty Parquet file", "The .parquet file is empty!", FailureType.config_error)
         return schema_dict
 
+    def get_header_fingerprint(self, file: Union[TextIO, BinaryIO], file_info: FileInfo) -> str:
+        """
+        The schema is stored in the metadata of the file, so files with the same stored schema have the same inferred schema
+        """
+        reader = self._init_reader(file)
+        return hashlib.md5(str(reader.schema_arrow).encode()).hexdigest()
+
     def stream_records(self, file: Union[TextIO, BinaryIO], file_info: FileInfo) -> Iterator[Mapping[str, Any]]:
         """
         https://arrow.apache.org/docs/python/generated/pyarrow.parquet.ParquetFile.html
@@ -121,25 +254,44 @@ class ParquetParser(AbstractFileParser):
             # pyarrow can parse empty parquet files but a connector can't generate dynamic schema
             raise S3Exception(file_info, "empty Parquet file", "The .parquet file is empty!", FailureType.config_error)
 
-        args = self._select_options("columns", "batch_size")  # type: ignore[arg-type]
+        typed_filters = self._typed_row_filters(reader, file_info, self._row_filters())
+        if typed_filters is None:
+            self.logger.info(f"skipping {file_info.key} as it doesn't have every filtered column")
+            return
+
+        # only the emitted columns and the filtered ones are read
+        # sometimes the batch file has more columns than master_schema declares, like:
+        # master schema: ['number', 'name', 'flag', 'delta'],
+        # batch_file_schema: ['number', 'name', 'flag', 'delta', 'EXTRA_COL_NAME'].
+        # we need to check wether batch_file_schema == master_schema and reject extra columns, otherwise "KeyError" raises.
+        output_columns = [
+            column
+            for column in reader.schema_arrow.names
+            if column in self._master_schema
+            and (not self._format["columns"] or column in self._format["columns"])
+            and (self._selected_columns is None or column in self._selected_columns)
+        ]
+        args = self._select_options("batch_size")  # type: ignore[arg-type]
+        args["columns"] = list(dict.fromkeys(output_columns + [column for column, _, _ in typed_filters]))
         self.logger.debug(f"Found the {reader.num_row_groups} Parquet groups")
 
         # load batches per page
+        skipped_row_groups = 0
         for num_row_group in range(reader.num_row_groups):
+            if typed_filters and self._skip_row_group(reader.metadata.row_group(num_row_group), typed_filters):
+                skipped_row_groups += 1
+                continue
             args["row_groups"] = [num_row_group]
             for batch in reader.iter_batches(**args):
-                # this gives us a dist of lists where each nested list holds ordered values for a single column
-                # {'number': [1.0, 2.0, 3.0], 'name': ['foo', None, 'bar'], 'flag': [True, False, True], 'delta': [-1.0, 2.5, 0.1]}
-                batch_dict = batch.to_pydict()
-                # sometimes the batch file has more columns than master_schema declares, like:
-                # master schema: ['number', 'name', 'flag', 'delta'],
-                # batch_file_schema: ['number', 'name', 'flag', 'delta', 'EXTRA_COL_NAME'].
-                # we need to check wether batch_file_schema == master_schema and reject extra columns, otherwise "KeyError" raises.
-                batch_columns = [column for column in batch_dict.keys() if column in self._master_schema]
-                columnwise_record_values = [batch_dict[column] for column in batch_columns if column in self._master_schema]
-                # we zip this to get row-by-row
-                for record_values in zip(*columnwise_record_values):
-                    yield {
-                        batch_columns[i]: self.convert_field_data(logical_types[batch_columns[i]], record_values[i])
-                        for i in range(len(batch_columns))
-                    }
+                batch = self._filter_batch(batch, typed_filters)
+                batch_columns = [column for column in batch.schema.names if column in output_columns]
+                # values are converted column by column while the batch is still in Arrow format, then turned into records at once
+                batch = pa.RecordBatch.from_arrays(
+                    [self.convert_field_column(logical_types[column], batch.column(column)) for column in batch_columns],
+                    names=batch_columns,
+                )
+                yield from batch.to_pylist()
+        if skipped_row_groups:
+            self.logger.info(
+                f"skipped {skipped_row_groups} of {reader.num_row_groups} row groups of {file_info.key} using their statistics"
+            )
@@ -36,3 +36,11 @@ class ParquetFormat(BaseModel):
         "By default every group column will be loaded fully to memory. "
         "This option can help avoid out-of-memory errors if your data is particularly wide.",
     )
+    filters: Optional[str] = Field(
+        default=None,
+        title="Row Filters",
+        description="Only sync the rows matching all of these conditions, as a JSON list of [column, operator, value] conditions, "
+        'e.g: [["year", ">=", 2022], ["country", "in", ["FR", "DE"]]]. The operators are =, !=, <, <=, >, >=, in and not in. '
+        "Row groups whose statistics show that none of their rows match are not read. "
+        "Leave it empty to sync all rows.",
+    )
@@ -0,0 +1,95 @@
+#
+# Copyright (c) 2022 Airbyte, Inc., all rights reserved.
+#
+
+import json
+import os
+import threading
+from typing import Any, Dict, Mapping, Optional
+
+from airbyte_cdk.logger import AirbyteLogger
+
+from .file_info import FileInfo
+
+LOGGER = AirbyteLogger()
+
+
+class SchemaCache:
+    """
+    Schemas inferred from files, keyed by the version of each file: its ETag, or its last modified date if the ETag is unknown.
+    A file which was not modified since its schema was inferred is never inferred again.
+
+    The schemas are kept for the lifetime of the process, and in a JSON file if a path is given, so that syncs running on a persistent
+    volume reuse the schemas inferred by the previous ones.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        """
+        :param path: JSON file the schemas are loaded from and saved to, defaults to None to only keep them in memory
+        """
+        self._path = path
+        self._lock = threading.Lock()
+        self._schemas: Dict[str, Dict[str, Any]] = {}
+        self._modified = False
+        if path and os.path.exists(path):
+            try:
+                with open(path) as f:
+                    self._schemas = json.load(f)
+            except (OSError, ValueError) as e:
+                LOGGER.warn(f"Ignoring the schema cache at {path} as it could not be loaded: {e!r}")
+
+    @staticmethod
+    def _cache_key(file_info: FileInfo, file_format: Mapping[str, Any]) -> str:
+        # the schema inferred from a file depends on the format options, e.g: the delimiter or whether datatypes are inferred
+        version = file_info.etag or file_info.last_modified.isoformat()
+        return json.dumps([file_info.key, version, file_format], sort_keys=True, default=str)
+
+    def get(self, file_info: FileInfo, file_format: Mapping[str, Any]) -> Optional[Dict[str, Any]]:
+        """
+        :param file_info: the file
+        :param file_format: file format specific mapping as described in spec.json
+        :return: the schema inferred from this version of the file with this format, or None if it wasn't inferred yet
+        """
+        with self._lock:
+            return self._schemas.get(self._cache_key(file_info, file_format))
+
+    def put(self, file_info: FileInfo, file_format: Mapping[str, Any], schema: Mapping[str, Any]) -> None:
+        """
+        :param file_info: the file
+        :param file_format: file format specific mapping as described in spec.json
+        :param schema: the schema inferred from this version of the file with this format
+        """
+        with self._lock:
+            self._schemas[self._cache_key(file_info, file_format)] = dict(schema)
+            self._modified = True
+
+    def save(self) -> None:
+        """
+        Writes the schemas to the JSON file, if any and if new schemas were inferred
+        """
+        with self._lock:
+            if not self._path or not self._modified:
+                return
+            try:
+                temporary_path = f"{self._path}.tmp"
+                with open(temporary_path, "w") as f:
+                    json.dump(self._schemas, f)
+                os.replace(temporary_path, self._path)
+                self._modified = False
+            except OSError as e:
+                LOGGER.warn(f"Could not save the schema cache to {self._path}: {e!r}")
+
+
+_schema_caches: Dict[Optional[str], SchemaCache] = {}
+_schema_caches_lock = threading.Lock()
+
+
+def shared_schema_cache(path: Optional[str] = None) -> SchemaCache:
+    """
+    :param path: JSON file the schemas are kept in, defaults to None to only keep them in memory
+    :return: the schema cache of the process using this path
+    """
+    with _schema_caches_lock:
+        if path not in _schema_caches:
+            _schema_caches[path] = SchemaCache(path)
+        return _schema_caches[path]
@@ -2,12 +2,13 @@
 # Copyright (c) 2022 Airbyte, Inc., all rights reserved.
 #
 
+import logging
 from abc import ABC, abstractmethod
 from traceback import format_exc
-from typing import Any, List, Mapping, Optional, Tuple
+from typing import Any, Iterator, List, Mapping, MutableMapping, Optional, Tuple, Union
 
 from airbyte_cdk.logger import AirbyteLogger
-from airbyte_cdk.models import ConnectorSpecification
+from airbyte_cdk.models import AirbyteMessage, AirbyteStateMessage, ConfiguredAirbyteCatalog, ConnectorSpecification
 from airbyte_cdk.models.airbyte_protocol import DestinationSyncMode
 from airbyte_cdk.sources import AbstractSource
 from airbyte_cdk.sources.streams import Stream
@@ -22,6 +23,9 @@ from wcmatch.glob import GLOBSTAR, SPLIT, globmatch
 
 
 class SourceFilesAbstract(AbstractSource, ABC):
+    # columns selected in the configured catalog of the sync, by stream name
+    _selected_columns: Mapping[str, List[str]] = {}
+
     @property
     @abstractmethod
     def stream_class(self) -> type:
@@ -81,7 +85,27 @@ class SourceFilesAbstract(AbstractSource, ABC):
         :param config: The user-provided configuration as specified by the source's spec.
         :return: A list of the streams in this source connector.
         """
-        return [self.stream_class(**config)]
+        stream = self.stream_class(**config)
+        stream.selected_columns = self._selected_columns.get(stream.name)
+        return [stream]
+
+    def read(
+        self,
+        logger: logging.Logger,
+        config: Mapping[str, Any],
+        catalog: ConfiguredAirbyteCatalog,
+        state: Union[List[AirbyteStateMessage], MutableMapping[str, Any]] = None,
+    ) -> Iterator[AirbyteMessage]:
+        """
+        Passes the columns selected in the configured catalog down to the streams, which pack the other columns into
+        _ab_additional_properties, or don't read them at all if _ab_additional_properties isn't selected
+        """
+        self._selected_columns = {
+            configured_stream.stream.name: list(configured_stream.stream.json_schema["properties"])
+            for configured_stream in catalog.streams
+            if configured_stream.stream.json_schema.get("properties")
+        }
+        yield from super().read(logger, config, catalog, state)
 
     def spec(self, *args: Any, **kwargs: Any) -> ConnectorSpecification:
         """
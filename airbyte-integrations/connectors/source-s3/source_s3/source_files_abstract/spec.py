@@ -5,7 +5,8 @@
 
 import json
 import re
-from typing import Any, Dict, Union
+from enum import Enum
+from typing import Any, Dict, Optional, Union
 
 from jsonschema import RefResolver
 from pydantic import BaseModel, Field
@@ -43,6 +44,12 @@ from .formats.parquet_spec import ParquetFormat
 #     provider: S3Provider = Field(...)  # leave this as Field(...), just change type to relevant class
 
 
+class SchemaInferenceStrategyEnum(str, Enum):
+    all_files = "all_files"
+    newest_files = "newest_files"
+    distinct_headers = "distinct_headers"
+
+
 class SourceFilesAbstractSpec(BaseModel):
     dataset: str = Field(
         pattern=r"^([A-Za-z0-9-_]+)$",
@@ -77,6 +84,36 @@ class SourceFilesAbstractSpec(BaseModel):
         order=30,
     )
 
+    schema_inference_strategy: SchemaInferenceStrategyEnum = Field(
+        title="Schema Inference Strategy",
+        default="all_files",
+        description="Which files the schema is inferred from when it is not provided. <strong>all_files</strong> infers it from every "
+        "file. <strong>newest_files</strong> infers it from the most recently modified files only, see Schema Inference Sample Size. "
+        "<strong>distinct_headers</strong> infers it from the most recently modified file of each distinct header only: the column "
+        "names of CSV files, the keys of the first record of JSONL files, the stored schema of Parquet and Avro files. Sampling speeds up the discovery of buckets with many "
+        "files, but columns only present in files left out of the sample end up in _ab_additional_properties.",
+        examples=["all_files", "newest_files", "distinct_headers"],
+        order=40,
+    )
+
+    schema_inference_sample_size: int = Field(
+        title="Schema Inference Sample Size",
+        default=10,
+        ge=1,
+        description="The number of most recently modified files the schema is inferred from with the newest_files strategy.",
+        order=50,
+    )
+
+    schema_cache_path: Optional[str] = Field(
+        title="Schema Cache Path",
+        default=None,
+        description="Optionally, a JSON file the schema inferred from each file is kept in across syncs, so that files which were not "
+        "modified since are not inferred again. It must be on a volume which outlives the connector, otherwise the schemas are only "
+        "kept for the duration of a sync.",
+        examples=["/tmp/source_s3_schemas.json"],
+        order=60,
+    )
+
     @staticmethod
     def change_format_to_oneOf(schema: dict) -> dict:
         props_to_change = ["format"]
@@ -5,11 +5,13 @@
 
 import json
 from abc import ABC, abstractmethod
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from copy import deepcopy
 from datetime import datetime, timedelta
 from functools import lru_cache
 from traceback import format_exc
-from typing import Any, Dict, Iterable, Iterator, List, Mapping, MutableMapping, Optional, Union
+from typing import Any, Deque, Dict, Iterable, Iterator, List, Mapping, MutableMapping, Optional, Tuple, Union
 
 from airbyte_cdk.logger import AirbyteLogger
 from airbyte_cdk.models import FailureType
@@ -19,11 +21,13 @@ from wcmatch.glob import GLOBSTAR, SPLIT, globmatch
 
 from ..exceptions import S3Exception
 from .file_info import FileInfo
+from .file_prefetcher import FilePrefetcher
 from .formats.abstract_file_parser import AbstractFileParser
 from .formats.avro_parser import AvroParser
 from .formats.csv_parser import CsvParser
 from .formats.jsonl_parser import JsonlParser
 from .formats.parquet_parser import ParquetParser
+from .schema_cache import SchemaCache, shared_schema_cache
 from .storagefile import StorageFile
 
 JSON_TYPES = ["string", "number", "integer", "object", "array", "boolean", "null"]
@@ -31,6 +35,12 @@ JSON_TYPES = ["string", "number", "integer", "object", "array", "boolean", "null
 LOGGER = AirbyteLogger()
 
 
+@lru_cache(maxsize=1024)
+def _parse_datetime(value: str, format_string: str) -> datetime:
+    """records of the same file share their last modified value, so parsing it once is enough"""
+    return datetime.strptime(value, format_string)
+
+
 class ConfigurationError(Exception):
     """Client mis-configured"""
 
@@ -52,23 +62,48 @@ class FileStream(Stream, ABC):
     ab_file_name_col = "_ab_source_file_url"
     airbyte_columns = [ab_additional_col, ab_last_mod_col, ab_file_name_col]
     datetime_format_string = "%Y-%m-%dT%H:%M:%S%z"
+    # number of files downloaded and parsed in the background while the records of the current file are emitted, 0 to read files one
+    # at a time
+    max_prefetched_files = 4
+    # number of files whose schema is inferred at the same time
+    schema_inference_workers = 8
 
-    def __init__(self, dataset: str, provider: dict, format: dict, path_pattern: str, schema: str = None):
+    def __init__(
+        self,
+        dataset: str,
+        provider: dict,
+        format: dict,
+        path_pattern: str,
+        schema: str = None,
+        schema_inference_strategy: str = "all_files",
+        schema_inference_sample_size: int = 10,
+        schema_cache_path: Optional[str] = None,
+    ):
         """
         :param dataset: table name for this stream
         :param provider: provider specific mapping as described in spec.json
         :param format: file format specific mapping as described in spec.json
         :param path_pattern: glob-style pattern for file-matching (https://facelessuser.github.io/wcmatch/glob/)
         :param schema: JSON-syntax user provided schema, defaults to None
+        :param schema_inference_strategy: which files the schema is inferred from: all_files, newest_files or distinct_headers
+        :param schema_inference_sample_size: number of files the schema is inferred from with the newest_files strategy
+        :param schema_cache_path: JSON file keeping the schemas inferred from each file across syncs, defaults to None to only keep
+            them for the lifetime of the process
         """
         self.dataset = dataset
         self._path_pattern = path_pattern
         self._provider = provider
         self._format = format
+        self._schema_inference_strategy = schema_inference_strategy
+        self._schema_inference_sample_size = schema_inference_sample_size
+        self._schema_cache_path = schema_cache_path
         self._schema: Dict[str, Any] = {}
         if schema:
             self._schema = self._parse_user_input_schema(schema)
         self.master_schema: Dict[str, Any] = None
+        self._file_prefetcher: Optional[FilePrefetcher] = None
+        # columns selected in the configured catalog, None if every column is selected
+        self.selected_columns: Optional[List[str]] = None
         LOGGER.info(f"initialised stream with format: {format}")
 
     @staticmethod
@@ -208,6 +243,8 @@ class FileStream(Stream, ABC):
             we need to determine the superset of schemas across all relevant files.
         This method iterates through get_time_ordered_file_infos() obtaining the inferred schema (process implemented per file format),
             to build up this superset schema (master_schema).
+        Schemas are inferred from several files at a time, from a sample of the files depending on the schema inference strategy,
+            and are cached per version of each file so that unchanged files aren't inferred again (see _infer_schemas()).
         This runs datatype checks to Warn or Error if we find incompatible schemas (e.g. same column is 'date' in one file but 'float' in another).
         This caches the master_schema after first run in order to avoid repeated compute and network calls to infer schema on all files.
 
@@ -216,23 +253,22 @@ class FileStream(Stream, ABC):
         :raises RuntimeError: if we find datatype mismatches between files or between a file and schema state (provided or from previous inc. batch)
         :return: A dict of the JSON schema representing this stream.
         """
-        # TODO: could implement a (user-beware) 'lazy' mode that skips schema checking to improve performance
         # TODO: could utilise min_datetime to add a start_date parameter in spec for user
         if self.master_schema is None:
             master_schema = deepcopy(self._schema)
 
             file_reader = self.fileformatparser_class(self._format)
 
-            processed_files = []
-            for file_info in self.get_time_ordered_file_infos():
-                # skip this file if it's earlier than min_datetime
-                if (min_datetime is not None) and (file_info.last_modified < min_datetime):
-                    continue
+            # skip files earlier than min_datetime
+            file_infos = [
+                file_info
+                for file_info in self.get_time_ordered_file_infos()
+                if (min_datetime is None) or (file_info.last_modified >= min_datetime)
+            ]
 
-                storagefile = self.storagefile_class(file_info, self._provider)
-                with storagefile.open(file_reader.is_binary) as f:
-                    this_schema = file_reader.get_inferred_schema(f, file_info)
-                    processed_files.append(file_info)
+            processed_files = []
+            for file_info, this_schema in self._infer_schemas(file_reader, file_infos):
+                processed_files.append(file_info)
 
                 if this_schema == master_schema:
                     continue  # exact schema match so go to next file
@@ -279,6 +315,68 @@ class FileStream(Stream, ABC):
 
         return self.master_schema
 
+    def _infer_schemas(self, file_reader: AbstractFileParser, file_infos: List[FileInfo]) -> Iterator[Tuple[FileInfo, Dict[str, Any]]]:
+        """
+        Yields (file_info, inferred schema) for the files sampled by _sample_schema_file_infos(), in time-ascending order.
+        Up to schema_inference_workers files are opened and inferred at the same time.
+        The schema of a file is taken from the schema cache if this version of the file (same ETag or last_modified) was already inferred.
+        """
+        schema_cache = shared_schema_cache(self._schema_cache_path)
+
+        def infer_schema(file_info: FileInfo) -> Dict[str, Any]:
+            schema = schema_cache.get(file_info, self._format)
+            if schema is None:
+                storagefile = self.storagefile_class(file_info, self._provider)
+                with storagefile.open(file_reader.is_binary) as f:
+                    schema = file_reader.get_inferred_schema(f, file_info)
+                schema_cache.put(file_info, self._format, schema)
+            return schema
+
+        file_infos = self._sample_schema_file_infos(file_reader, file_infos, schema_cache)
+        executor = ThreadPoolExecutor(max_workers=self.schema_inference_workers, thread_name_prefix="schema_inference")
+        try:
+            # map() returns the schemas in the order of the files, whichever file is inferred first
+            yield from zip(file_infos, executor.map(infer_schema, file_infos))
+        finally:
+            # if a schema mismatch is raised, the files which weren't inferred yet are not needed anymore
+            executor.shutdown(wait=False, cancel_futures=True)
+            schema_cache.save()
+
+    def _sample_schema_file_infos(
+        self, file_reader: AbstractFileParser, file_infos: List[FileInfo], schema_cache: SchemaCache
+    ) -> List[FileInfo]:
+        """
+        Selects the files the schema is inferred from according to the schema inference strategy:
+            - all_files: every file
+            - newest_files: the schema_inference_sample_size most recently modified files
+            - distinct_headers: the most recently modified file of each distinct header (see AbstractFileParser.get_header_fingerprint()).
+              Files whose schema is already cached are always selected since they don't need to be opened.
+
+        :param file_infos: files in time-ascending order
+        :return: the selected files, in time-ascending order
+        """
+        if self._schema_inference_strategy == "newest_files":
+            return file_infos[-self._schema_inference_sample_size :]
+        if self._schema_inference_strategy != "distinct_headers":
+            return file_infos
+
+        uncached_file_infos = [file_info for file_info in file_infos if schema_cache.get(file_info, self._format) is None]
+
+        def get_header_fingerprint(file_info: FileInfo) -> str:
+            storagefile = self.storagefile_class(file_info, self._provider)
+            with storagefile.open(file_reader.is_binary) as f:
+                return file_reader.get_header_fingerprint(f, file_info)
+
+        with ThreadPoolExecutor(max_workers=self.schema_inference_workers, thread_name_prefix="schema_inference") as executor:
+            fingerprints = list(executor.map(get_header_fingerprint, uncached_file_infos))
+        # files are in time-ascending order, so the last file of each fingerprint is the most recently modified one
+        newest_file_by_fingerprint = {fingerprint: file_info.key for file_info, fingerprint in zip(uncached_file_infos, fingerprints)}
+        selected_keys = set(newest_file_by_fingerprint.values())
+        uncached_keys = {file_info.key for file_info in uncached_file_infos}
+        sampled = [file_info for file_info in file_infos if file_info.key in selected_keys or file_info.key not in uncached_keys]
+        LOGGER.info(f"inferring the schema from {len(sampled)} of {len(file_infos)} files with distinct headers")
+        return sampled
+
     def stream_slices(
         self, sync_mode: SyncMode, cursor_field: List[str] = None, stream_state: Mapping[str, Any] = None
     ) -> Iterable[Optional[Dict[str, Any]]]:
@@ -289,12 +387,57 @@ class FileStream(Stream, ABC):
         In incremental mode, a stream slice may have more than one file so we mirror that format here.
         Incremental stream_slices are implemented in the IncrementalFileStream child class.
         """
+        yield from self._prefetching_slices(
+            {"files": [{"storage_file": self.storagefile_class(file_info, self._provider)}]}
+            for file_info in self.get_time_ordered_file_infos()
+        )
 
-        # TODO: this could be optimised via concurrent reads, however we'd lose chronology and need to deal with knock-ons of that
-        # we could do this concurrently both full and incremental by running batches in parallel
-        # and then incrementing the cursor per each complete batch
-        for file_info in self.get_time_ordered_file_infos():
-            yield {"files": [{"storage_file": self.storagefile_class(file_info, self._provider)}]}
+    def _prefetching_slices(self, stream_slices: Iterable[Optional[Dict[str, Any]]]) -> Iterator[Optional[Dict[str, Any]]]:
+        """
+        Yields the stream_slices while registering the files of the upcoming ones with a FilePrefetcher, so that _read_from_slice()
+        reads up to max_prefetched_files of them in the background while the records of the current slice are emitted.
+        Slices are still read one after the other and their records are emitted in order,
+        so the cursor only moves past files whose records were all emitted.
+        """
+        if self.max_prefetched_files <= 0:
+            yield from stream_slices
+            return
+
+        prefetcher = FilePrefetcher(self.max_prefetched_files)
+        self._file_prefetcher = prefetcher
+        # slices whose files are registered with the prefetcher but which weren't yielded yet, and the number of their files
+        pending_slices: Deque[Optional[Dict[str, Any]]] = deque()
+        pending_files = 0
+        try:
+            for stream_slice in stream_slices:
+                pending_slices.append(stream_slice)
+                for file_item in stream_slice["files"] if stream_slice else []:
+                    prefetcher.add(file_item["storage_file"])
+                    pending_files += 1
+                # a slice is yielded once enough of the files after it are registered to be prefetched while it is read
+                while pending_slices and pending_files - self._count_slice_files(pending_slices[0]) >= self.max_prefetched_files:
+                    pending_files -= self._count_slice_files(pending_slices[0])
+                    yield pending_slices.popleft()
+            yield from pending_slices
+        finally:
+            prefetcher.close()
+            self._file_prefetcher = None
+
+    @staticmethod
+    def _count_slice_files(stream_slice: Optional[Mapping[str, Any]]) -> int:
+        return len(stream_slice["files"]) if stream_slice else 0
+
+    def _read_columns(self) -> Optional[List[str]]:
+        """
+        Columns outside of the configured catalog, i.e: deselected or added to the files after the catalog was discovered, are packed into
+        _ab_additional_properties like the columns outside of the schema, see _read_from_slice(). So formats able to read a subset of the
+        columns of a file, like Parquet, only read the selected columns if _ab_additional_properties isn't selected.
+
+        :return: the columns to read, None to read every column
+        """
+        if self.selected_columns is None or self.ab_additional_col in self.selected_columns:
+            return None
+        return self.selected_columns
 
     def _match_target_schema(self, record: Dict[str, Any], target_columns: List) -> Dict[str, Any]:
         """
@@ -346,22 +489,33 @@ class FileStream(Stream, ABC):
         Records are mutated on the fly using _match_target_schema() and _add_extra_fields_from_map() to achieve desired final schema.
         Since this is called per stream_slice, this method works for both full_refresh and incremental.
         """
+        # columns outside of the configured catalog end up in _ab_additional_properties, rather than being dropped
+        target_columns = [
+            column
+            for column in self._get_schema_map()
+            if self.selected_columns is None or column in self.selected_columns or column in self.airbyte_columns
+        ]
         for file_item in stream_slice["files"]:
             storage_file: StorageFile = file_item["storage_file"]
-            with storage_file.open(file_reader.is_binary) as f:
-                # TODO: make this more efficient than mutating every record one-by-one as they stream
-                for record in file_reader.stream_records(f, storage_file.file_info):
-                    schema_matched_record = self._match_target_schema(record, list(self._get_schema_map().keys()))
-                    complete_record = self._add_extra_fields_from_map(
-                        schema_matched_record,
-                        {
-                            self.ab_last_mod_col: datetime.strftime(storage_file.last_modified, self.datetime_format_string),
-                            self.ab_file_name_col: storage_file.url,
-                        },
-                    )
-                    yield complete_record
+            extra_map = {
+                self.ab_last_mod_col: datetime.strftime(storage_file.last_modified, self.datetime_format_string),
+                self.ab_file_name_col: storage_file.url,
+            }
+            for record in self._stream_file_records(file_reader, storage_file):
+                schema_matched_record = self._match_target_schema(record, target_columns)
+                yield self._add_extra_fields_from_map(schema_matched_record, extra_map)
         LOGGER.info("finished reading a stream slice")
 
+    def _stream_file_records(self, file_reader: AbstractFileParser, storage_file: StorageFile) -> Iterator[Mapping[str, Any]]:
+        """
+        Yields the records of a file, read in the background by the FilePrefetcher of the current stream_slices() if any
+        """
+        if self._file_prefetcher is not None:
+            yield from self._file_prefetcher.read(storage_file, file_reader)
+        else:
+            with storage_file.open(file_reader.is_binary) as f:
+                yield from file_reader.stream_records(f, storage_file.file_info)
+
     def read_records(
         self,
         sync_mode: SyncMode,
@@ -373,7 +527,7 @@ class FileStream(Stream, ABC):
         The heavy lifting sits in _read_from_slice() which is full refresh / incremental agnostic
         """
         if stream_slice:
-            file_reader = self.fileformatparser_class(self._format, self._get_master_schema())
+            file_reader = self.fileformatparser_class(self._format, self._get_master_schema(), self._read_columns())
             yield from self._read_from_slice(file_reader, stream_slice)
 
 
@@ -384,6 +538,12 @@ class IncrementalFileStream(FileStream, ABC):
     sync_all_files_always = False
     max_history_size = 1000000000
 
+    def __init__(self, *args: Any, **kwargs: Any):
+        super().__init__(*args, **kwargs)
+        # the state returned by the last call to get_updated_state() and the (file url, cursor value) of the record it was updated with
+        self._last_updated_state: Optional[Mapping[str, Any]] = None
+        self._last_updated_file: Optional[Tuple[Any, Any]] = None
+
     @property
     def cursor_field(self) -> str:
         """
@@ -401,14 +561,14 @@ class IncrementalFileStream(FileStream, ABC):
     def _get_datetime_from_stream_state(self, stream_state: Mapping[str, Any] = None) -> datetime:
         """if no state, we default to 1970-01-01 in order to pick up all files present."""
         if stream_state is not None and self.cursor_field in stream_state.keys():
-            return datetime.strptime(stream_state[self.cursor_field], self.datetime_format_string)
+            return _parse_datetime(stream_state[self.cursor_field], self.datetime_format_string)
         else:
-            return datetime.strptime("1970-01-01T00:00:00+0000", self.datetime_format_string)
+            return _parse_datetime("1970-01-01T00:00:00+0000", self.datetime_format_string)
 
     def get_updated_history(self, current_stream_state, latest_record_datetime, latest_record, current_parsed_datetime, state_date):
         """
         History is dict which basically groups files by their modified_at date.
-        After reading each record we add its file to the history set if it wasn't already there.
+        After reading each file we add it to the history set if it wasn't already there.
         Then we drop from the history set any entries whose key is less than now - buffer_days
         """
 
@@ -418,17 +578,18 @@ class IncrementalFileStream(FileStream, ABC):
 
         # add record to history if record modified date in range delta start from state
         if latest_record_datetime.date() + timedelta(days=self.buffer_days) >= state_date:
-            history_item = set(history.setdefault(file_modification_date, set()))
+            # history loaded from a state message holds lists, they are converted once rather than copied for every file
+            history_item = history.get(file_modification_date)
+            if not isinstance(history_item, set):
+                history_item = set(history_item or ())
+                history[file_modification_date] = history_item
             history_item.add(latest_record[self.ab_file_name_col])
-            history[file_modification_date] = history_item
 
         # reset history to new date state
         if current_parsed_datetime.date() != state_date:
-            history = {
-                date: history[date]
-                for date in history
-                if datetime.strptime(date, "%Y-%m-%d").date() + timedelta(days=self.buffer_days) >= state_date
-            }
+            # dates formatted as %Y-%m-%d sort chronologically, so they are compared without being parsed
+            oldest_date = (state_date - timedelta(days=self.buffer_days)).strftime("%Y-%m-%d")
+            history = {date: history[date] for date in history if date >= oldest_date}
 
         return history
 
@@ -450,27 +611,37 @@ class IncrementalFileStream(FileStream, ABC):
         In the case where current_stream_state is null, we default to 1970-01-01 in order to pick up all files present.
         We also save the schema into the state here so that we can use it on future incremental batches, allowing for additional/missing columns.
 
+        State is tracked per file: every record of a file has the same cursor value and file url, so once the first record of a file
+        updated the state, the following records of the file leave it unchanged and it is returned as is.
+
         :param current_stream_state: The stream's current state object
         :param latest_record: The latest record extracted from the stream
         :return: An updated state object
         """
+        record_file = (latest_record.get(self.ab_file_name_col), latest_record.get(self.cursor_field))
+        if current_stream_state is not None and current_stream_state is self._last_updated_state and record_file == self._last_updated_file:
+            return current_stream_state
+
         state_dict: Dict[str, Any] = {}
         current_parsed_datetime = self._get_datetime_from_stream_state(current_stream_state)
-        latest_record_datetime = datetime.strptime(
+        latest_record_datetime = _parse_datetime(
             latest_record.get(self.cursor_field, "1970-01-01T00:00:00+0000"), self.datetime_format_string
         )
-        state_dict[self.cursor_field] = datetime.strftime(max(current_parsed_datetime, latest_record_datetime), self.datetime_format_string)
+        state_datetime = max(current_parsed_datetime, latest_record_datetime)
+        state_dict[self.cursor_field] = datetime.strftime(state_datetime, self.datetime_format_string)
 
         state_dict["schema"] = self._get_schema_map()
 
-        state_date = self._get_datetime_from_stream_state(state_dict).date()
+        state_date = state_datetime.date()
 
         if not self.sync_all_files_always:
             state_dict["history"] = self.get_updated_history(
                 current_stream_state, latest_record_datetime, latest_record, current_parsed_datetime, state_date
             )
 
-        return self.size_history_balancer(state_dict)
+        state_dict = self.size_history_balancer(state_dict)
+        self._last_updated_state, self._last_updated_file = state_dict, record_file
+        return state_dict
 
     def need_to_skip_file(self, stream_state, file_info):
         """
@@ -503,7 +674,7 @@ class IncrementalFileStream(FileStream, ABC):
 
         Slight nuance: as we iterate through get_time_ordered_file_infos(),
         we yield the stream_slice containing file(s) up to and Excluding the file on the current iteration.
-        The stream_slice is then cleared (if we yielded it) and this iteration's file appended to the (next) stream_slice
+        The stream_slice is then replaced (if we yielded it) and this iteration's file appended to the (next) stream_slice
         """
         if sync_mode == SyncMode.full_refresh:
             yield from super().stream_slices(sync_mode=sync_mode, cursor_field=cursor_field, stream_state=stream_state)
@@ -514,29 +685,37 @@ class IncrementalFileStream(FileStream, ABC):
             if self._schema == {} and stream_state is not None and "schema" in stream_state.keys():
                 self._schema = stream_state["schema"]
 
-            # logic here is to bundle all files with exact same last modified timestamp together in each slice
-            prev_file_last_mod: datetime = None  # init variable to hold previous iterations last modified
-            grouped_files_by_time: List[Dict[str, Any]] = []
-            for file_info in self.get_time_ordered_file_infos():
-                if self.need_to_skip_file(stream_state, file_info):
-                    continue
-
-                # check if this file belongs in the next slice, if so yield the current slice before this file
-                if (prev_file_last_mod is not None) and (file_info.last_modified != prev_file_last_mod):
-                    yield {"files": grouped_files_by_time}
-                    grouped_files_by_time.clear()
-
-                # now we either have an empty stream_slice or a stream_slice that this file shares a last modified with, so append it
-                grouped_files_by_time.append({"storage_file": self.storagefile_class(file_info, self._provider)})
-                # update our prev_file_last_mod to the current one for next iteration
-                prev_file_last_mod = file_info.last_modified
-
-            # now yield the final stream_slice. This is required because our loop only yields the slice previous to its current iteration.
-            if len(grouped_files_by_time) > 0:
+            yield from self._prefetching_slices(self._incremental_slices(stream_state))
+
+    def _incremental_slices(self, stream_state: Mapping[str, Any] = None) -> Iterator[Optional[Dict[str, Any]]]:
+        if stream_state and stream_state.get("history"):
+            # history loaded from a state message holds lists, which would be scanned for every file otherwise
+            stream_state = {**stream_state, "history": {date: set(keys) for date, keys in stream_state["history"].items()}}
+
+        # logic here is to bundle all files with exact same last modified timestamp together in each slice
+        prev_file_last_mod: datetime = None  # init variable to hold previous iterations last modified
+        grouped_files_by_time: List[Dict[str, Any]] = []
+        for file_info in self.get_time_ordered_file_infos():
+            if self.need_to_skip_file(stream_state, file_info):
+                continue
+
+            # check if this file belongs in the next slice, if so yield the current slice before this file
+            if (prev_file_last_mod is not None) and (file_info.last_modified != prev_file_last_mod):
                 yield {"files": grouped_files_by_time}
-            else:
-                # in case we have no files
-                yield None
+                # slices are held back while the files after them are prefetched, so the next slice needs a list of its own
+                grouped_files_by_time = []
+
+            # now we either have an empty stream_slice or a stream_slice that this file shares a last modified with, so append it
+            grouped_files_by_time.append({"storage_file": self.storagefile_class(file_info, self._provider)})
+            # update our prev_file_last_mod to the current one for next iteration
+            prev_file_last_mod = file_info.last_modified
+
+        # now yield the final stream_slice. This is required because our loop only yields the slice previous to its current iteration.
+        if len(grouped_files_by_time) > 0:
+            yield {"files": grouped_files_by_time}
+        else:
+            # in case we have no files
+            yield None
 
     def read_records(
         self,
@@ -557,6 +736,6 @@ class IncrementalFileStream(FileStream, ABC):
             else:
 
                 file_reader = self.fileformatparser_class(
-                    self._format, self._get_master_schema(self._get_datetime_from_stream_state(stream_state))
+                    self._format, self._get_master_schema(self._get_datetime_from_stream_state(stream_state)), self._read_columns()
                 )
                 yield from self._read_from_slice(file_reader, stream_slice)
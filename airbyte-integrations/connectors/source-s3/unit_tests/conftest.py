@@ -15,6 +15,7 @@ from netifaces import AF_INET, ifaddresses, interfaces
 from pytest import fixture
 from requests.exceptions import ConnectionError  # noqa
 from source_s3 import SourceS3
+from source_s3.source_files_abstract import schema_cache
 
 logger = AirbyteLogger()
 
@@ -35,6 +36,12 @@ def pytest_sessionfinish(session: Any, exitstatus: Any) -> None:
     shutil.rmtree(TMP_FOLDER, ignore_errors=True)
 
 
+@fixture(autouse=True)
+def clear_schema_caches() -> None:
+    """schemas cached for the files of a test must not be reused by the next ones"""
+    schema_cache._schema_caches.clear()
+
+
 @fixture(name="config")
 def config_fixture(tmp_path):
     config_file = tmp_path / "config.json"
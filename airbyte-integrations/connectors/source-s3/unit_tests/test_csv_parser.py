@@ -2,6 +2,7 @@
 # Copyright (c) 2022 Airbyte, Inc., all rights reserved.
 #
 
+import io
 import json
 import os
 import random
@@ -387,6 +388,23 @@ class TestCsvParser(AbstractTestParser):
             },
         }
 
+    @pytest.mark.parametrize(
+        "advanced_options, first_file, second_file, same_header",
+        [
+            ("{}", b"id,name\n1,a\n", b"id,name\n2,b\n", True),
+            ("{}", b"id,name\n1,a\n", b"name,id\nb,2\n", False),
+            ('{"skip_rows": 1}', b"# exported on monday\nid,name\n1,a\n", b"# exported on tuesday\nid,name\n2,b\n", True),
+            ('{"column_names": ["id", "name"]}', b"1,a\n", b"2,b\n", True),
+            ('{"autogenerate_column_names": true}', b"1,a\n", b"2,b\n", True),
+            ('{"autogenerate_column_names": true}', b"1,a\n", b"2,b,c\n", False),
+        ],
+    )
+    def test_header_fingerprint_follows_the_read_options(self, advanced_options, first_file, second_file, same_header) -> None:
+        parser = CsvParser(format={"filetype": self.filetype, "advanced_options": advanced_options})
+        first_fingerprint = parser.get_header_fingerprint(io.BytesIO(first_file), None)
+        second_fingerprint = parser.get_header_fingerprint(io.BytesIO(second_file), None)
+        assert (first_fingerprint == second_fingerprint) == same_header
+
     @memory_limit(20)
     @pytest.mark.order(1)
     def test_big_file(self) -> None:
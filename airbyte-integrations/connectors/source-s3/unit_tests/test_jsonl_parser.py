@@ -2,10 +2,12 @@
 # Copyright (c) 2022 Airbyte, Inc., all rights reserved.
 #
 
+import io
 import os
 from pathlib import Path
 from typing import Any, Mapping
 
+import pytest
 from source_s3.source_files_abstract.formats.jsonl_parser import JsonlParser
 
 from .abstract_test_parser import AbstractTestParser
@@ -177,3 +179,48 @@ class TestJsonlParser(AbstractTestParser):
                 "fails": [],
             },
         }
+
+    @pytest.mark.parametrize("unexpected_field_behavior", ["infer", "ignore"])
+    @pytest.mark.parametrize("block_size", [32, 64, 1024])
+    def test_stream_records_in_blocks(self, block_size, unexpected_field_behavior):
+        parser = JsonlParser(
+            format={"filetype": "jsonl", "block_size": block_size, "unexpected_field_behavior": unexpected_field_behavior},
+            master_schema={"id": "integer", "name": "string"},
+        )
+        file = io.BytesIO(b'{"id": 1, "name": "a"}\n\n{"id": 2, "name": "b"}\n{"id": 3, "name": "c"}')
+        records = list(parser.stream_records(file, None))
+        assert records == [{"id": 1, "name": "a"}, {"id": 2, "name": "b"}, {"id": 3, "name": "c"}]
+
+    @pytest.mark.parametrize("block_size", [64, 128, 1024])
+    def test_stream_records_objects_have_the_same_keys_whatever_the_block_size(self, block_size):
+        parser = JsonlParser(
+            format={"filetype": "jsonl", "block_size": block_size}, master_schema={"id": "integer", "meta": "object", "tags": "array"}
+        )
+        file = io.BytesIO(
+            b'{"id": 1, "meta": {"a": 1}, "tags": [{"x": 1}]}\n'
+            b'{"id": 2, "meta": {"a": 2}, "tags": []}\n'
+            b'{"id": 3, "meta": {"b": "s", "c": {"d": 1}}, "tags": [{"y": "z"}]}\n'
+            b'{"id": 4, "meta": {"a": 1.5}}\n'
+        )
+        records = list(parser.stream_records(file, None))
+        assert records == [
+            {"id": 1, "meta": {"a": 1.0, "b": None, "c": None}, "tags": [{"x": 1, "y": None}]},
+            {"id": 2, "meta": {"a": 2.0, "b": None, "c": None}, "tags": []},
+            {"id": 3, "meta": {"a": None, "b": "s", "c": {"d": 1}}, "tags": [{"x": None, "y": "z"}]},
+            {"id": 4, "meta": {"a": 1.5, "b": None, "c": None}, "tags": None},
+        ]
+
+    @pytest.mark.parametrize(
+        "first_file, second_file, newlines_in_values, same_header",
+        [
+            (b'{"id": 1, "name": "a"}\n', b'{"id": 2, "name": "b"}\n', False, True),
+            (b'{"id": 1, "name": "a"}\n', b'\n{"name": "b", "id": 2}\n{"id": 3}\n', False, True),
+            (b'{"id": 1, "name": "a"}\n', b'{"id": 2}\n{"id": 3, "name": "c"}\n', False, False),
+            (b'{"id": 1,\n "name": "a\\nb"}\n', b'{"name": "c", "id": 2}\n', True, True),
+        ],
+    )
+    def test_header_fingerprint_is_the_keys_of_the_first_record(self, first_file, second_file, newlines_in_values, same_header):
+        parser = JsonlParser(format={"filetype": "jsonl", "newlines_in_values": newlines_in_values})
+        first_fingerprint = parser.get_header_fingerprint(io.BytesIO(first_file), None)
+        second_fingerprint = parser.get_header_fingerprint(io.BytesIO(second_file), None)
+        assert (first_fingerprint == second_fingerprint) == same_header
@@ -4,16 +4,21 @@
 
 import bz2
 import copy
+import datetime
 import gzip
+import json
 import os
 import shutil
 from pathlib import Path
 from typing import Any, List, Mapping
+from unittest.mock import patch
 
 import pandas as pd
 import pyarrow as pa
 import pyarrow.parquet as pq
 import pytest
+from source_s3.exceptions import S3Exception
+from source_s3.source_files_abstract.file_info import FileInfo
 from source_s3.source_files_abstract.formats.parquet_parser import PARQUET_TYPES, ParquetParser
 
 from .abstract_test_parser import AbstractTestParser
@@ -251,3 +256,76 @@ class TestParquetParser(AbstractTestParser):
     def test_convert_field_data(self):
         with pytest.raises(TypeError):
             ParquetParser.convert_field_data(logical_type="", field_value="")
+
+    @pytest.mark.parametrize(
+        "logical_type,values",
+        [
+            ("date", [datetime.date(2022, 1, 31), None]),
+            ("timestamp", [datetime.datetime(2022, 1, 31, 12, 30, 15), None]),
+            ("timestamp", [datetime.datetime(2022, 1, 31, 12, 30, 15, 123456), datetime.datetime(2022, 1, 31)]),
+            ("time", [datetime.time(12, 30, 15), None]),
+            ("time", [datetime.time(12, 30, 15, 500), datetime.time(1, 2, 3)]),
+            ("string", ["foo", None]),
+        ],
+    )
+    def test_convert_field_column(self, logical_type, values):
+        column = ParquetParser.convert_field_column(logical_type, pa.array(values))
+        assert column.to_pylist() == [ParquetParser.convert_field_data(logical_type, value) for value in values]
+
+    @staticmethod
+    def read_filtered_records(filters: List[Any], selected_columns: List[str] = None):
+        """Reads a file of 3 row groups with id ranges 0-9, 10-19 and 20-29, returning the records and the row groups read"""
+        filename = os.path.join(TMP_FOLDER, "filtered.parquet")
+        table = pa.table({"id": list(range(30)), "name": [f"name_{i}" for i in range(30)], "score": [i / 2 for i in range(30)]})
+        pq.write_table(table, filename, row_group_size=10)
+        parser = ParquetParser(
+            format={"filetype": "parquet", "filters": json.dumps(filters) if filters else None},
+            master_schema={"id": "integer", "name": "string", "score": "number"},
+            selected_columns=selected_columns,
+        )
+        read_row_groups = []
+        iter_batches = pq.ParquetFile.iter_batches
+
+        def spy_iter_batches(reader, **kwargs):
+            read_row_groups.extend(kwargs["row_groups"])
+            return iter_batches(reader, **kwargs)
+
+        with patch.object(pq.ParquetFile, "iter_batches", spy_iter_batches), open(filename, "rb") as f:
+            records = list(parser.stream_records(f, FileInfo(key=filename, size=0, last_modified=datetime.datetime.now())))
+        return records, read_row_groups
+
+    @pytest.mark.parametrize(
+        "filters,expected_ids,expected_row_groups",
+        [
+            (None, list(range(30)), [0, 1, 2]),
+            ([["id", ">=", 25]], [25, 26, 27, 28, 29], [2]),
+            ([["id", ">", 9], ["id", "<", 12]], [10, 11], [1]),
+            ([["id", "==", 15]], [15], [1]),
+            ([["id", "in", [3, 28]]], [3, 28], [0, 2]),
+            ([["id", "not in", [3]], ["score", "<=", 2]], [0, 1, 2, 4], [0]),
+            # strings are ordered lexicographically, "name_12" is between "name_0" and "name_9"
+            ([["name", "=", "name_12"]], [12], [0, 1]),
+            ([["id", "<", 0]], [], []),
+            ([["missing", "=", 1]], [], []),
+        ],
+    )
+    def test_row_filters(self, filters, expected_ids, expected_row_groups):
+        records, read_row_groups = self.read_filtered_records(filters)
+        assert [record["id"] for record in records] == expected_ids
+        assert read_row_groups == expected_row_groups
+
+    def test_selected_columns(self):
+        records, _ = self.read_filtered_records([["score", ">", 14]], selected_columns=["id", "_ab_source_file_url"])
+        assert records == [{"id": 29}]
+
+    @pytest.mark.parametrize(
+        "filters",
+        ["not json", json.dumps({"id": 1}), json.dumps([["id", 1]]), json.dumps([["id", "~", 1]]), json.dumps([["id", "in", 1]])],
+    )
+    def test_invalid_row_filters(self, filters):
+        with pytest.raises(ValueError):
+            ParquetParser(format={"filetype": "parquet", "filters": filters})._validate_config({"format": {"filetype": "parquet"}})
+
+    def test_row_filter_value_of_another_type(self):
+        with pytest.raises(S3Exception):
+            self.read_filtered_records([["id", "=", "not a number"]])
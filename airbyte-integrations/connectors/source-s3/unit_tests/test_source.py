@@ -7,7 +7,8 @@ from unittest.mock import MagicMock, patch
 
 import pytest
 from airbyte_cdk.logger import AirbyteLogger
-from airbyte_cdk.models import ConnectorSpecification
+from airbyte_cdk.models import ConfiguredAirbyteCatalog, ConnectorSpecification
+from airbyte_cdk.sources import AbstractSource
 from source_s3 import SourceS3
 from source_s3.source_files_abstract.spec import SourceFilesAbstractSpec
 
@@ -96,6 +97,30 @@ def test_streams(config):
     assert len(instance.streams(config)) == 1
 
 
+def test_streams_keep_the_inferred_schemas_in_the_schema_cache_path(config, tmp_path):
+    schema_cache_path = str(tmp_path / "schemas.json")
+    stream = SourceS3().streams({**config, "schema_cache_path": schema_cache_path})[0]
+    assert stream._schema_cache_path == schema_cache_path
+
+
+def test_read_passes_selected_columns_to_streams(config):
+    instance = SourceS3()
+    catalog = ConfiguredAirbyteCatalog.parse_obj(
+        {
+            "streams": [
+                {
+                    "stream": {"name": config["dataset"], "json_schema": {"properties": {"id": {}, "name": {}}}, "supported_sync_modes": ["full_refresh"]},
+                    "sync_mode": "full_refresh",
+                    "destination_sync_mode": "overwrite",
+                }
+            ]
+        }
+    )
+    with patch.object(AbstractSource, "read", lambda self, logger, config, catalog, state: iter(self.streams(config))):
+        streams = list(instance.read(logger, config, catalog))
+    assert streams[0].selected_columns == ["id", "name"]
+
+
 def test_spec():
     spec = SourceS3().spec()
 
@@ -2,15 +2,21 @@
 # Copyright (c) 2022 Airbyte, Inc., all rights reserved.
 #
 
-from datetime import datetime
-from typing import Any, Dict, List, Mapping
+import io
+import json
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterator, List, Mapping
 from unittest.mock import MagicMock, patch
 
 import pytest
 from airbyte_cdk import AirbyteLogger
 from airbyte_cdk.models import SyncMode
 from source_s3.exceptions import S3Exception
+from source_s3.source_files_abstract import schema_cache
 from source_s3.source_files_abstract.file_info import FileInfo
+from source_s3.source_files_abstract.formats.abstract_file_parser import AbstractFileParser
 from source_s3.source_files_abstract.storagefile import StorageFile
 from source_s3.source_files_abstract.stream import IncrementalFileStream
 from source_s3.stream import IncrementalFileStreamS3
@@ -20,6 +26,70 @@ from .abstract_test_parser import create_by_local_file, memory_limit
 LOGGER = AirbyteLogger()
 
 
+class InMemoryStorageFile(StorageFile):
+    """Serves the lines of provider["files"][key], recording in provider["opened"] the keys of the files opened"""
+
+    @contextmanager
+    def open(self, binary: bool) -> Iterator[io.StringIO]:
+        self._provider["opened"].append(self.url)
+        content = self._provider["files"][self.url]
+        if isinstance(content, Exception):
+            raise content
+        yield io.StringIO("\n".join(content))
+
+
+def in_memory_stream(files: Mapping[str, Any], file_infos: List[FileInfo], max_prefetched_files: int) -> IncrementalFileStreamS3:
+    stream_instance = IncrementalFileStreamS3(
+        dataset="dummy", provider={"files": files, "opened": []}, format={"filetype": "csv"}, path_pattern="**"
+    )
+    stream_instance.max_prefetched_files = max_prefetched_files
+    stream_instance.get_time_ordered_file_infos = MagicMock(return_value=file_infos)
+    stream_instance._get_master_schema = MagicMock(return_value={"value": "string"})
+    parser = MagicMock(is_binary=False)
+    parser.stream_records.side_effect = lambda f, file_info: ({"value": line} for line in f.read().splitlines())
+    stream_instance.fileformatparser_map["csv"] = MagicMock(return_value=parser)
+    return stream_instance
+
+
+def schema_inference_stream(
+    schemas: Mapping[str, Mapping[str, str]], etags: Mapping[str, str] = None, **kwargs: Any
+) -> IncrementalFileStreamS3:
+    """The first line of each file is its schema, so files with the same schema have the same header"""
+    file_infos = [
+        FileInfo(key=key, size=1, last_modified=datetime(2022, 1, 1 + i, tzinfo=timezone.utc), etag=(etags or {}).get(key))
+        for i, key in enumerate(schemas)
+    ]
+    stream_instance = IncrementalFileStreamS3(
+        dataset="dummy",
+        provider={"files": {key: [json.dumps(schema)] for key, schema in schemas.items()}, "opened": []},
+        format={"filetype": "csv"},
+        path_pattern="**",
+        **kwargs,
+    )
+    stream_instance.get_time_ordered_file_infos = MagicMock(return_value=file_infos)
+    parser = MagicMock(is_binary=False)
+    parser.inferred = []
+
+    def get_inferred_schema(f, file_info):
+        # files inferred first are the slowest, to check that schemas are still merged in the order of the files
+        time.sleep(0.002 * (len(schemas) - len(parser.inferred)))
+        parser.inferred.append(file_info.key)
+        return json.loads(f.readline())
+
+    parser.get_inferred_schema.side_effect = get_inferred_schema
+    parser.get_header_fingerprint.side_effect = lambda f, file_info: AbstractFileParser.get_header_fingerprint(parser, f, file_info)
+    stream_instance.fileformatparser_map["csv"] = MagicMock(return_value=parser)
+    stream_instance.parser = parser
+    return stream_instance
+
+
+def read_stream(stream_instance: IncrementalFileStreamS3, sync_mode: SyncMode) -> List[Mapping[str, Any]]:
+    records = []
+    for stream_slice in stream_instance.stream_slices(sync_mode=sync_mode):
+        records.extend(stream_instance.read_records(sync_mode=sync_mode, stream_slice=stream_slice))
+    return records
+
+
 def mock_big_size_object():
     mock = MagicMock()
     mock.__sizeof__.return_value = 1000000001
@@ -633,6 +703,7 @@ class TestIncrementalFileStream:
         ),
     )
     @patch("source_s3.stream.IncrementalFileStreamS3.storagefile_class", MagicMock())
+    @patch.object(IncrementalFileStreamS3, "schema_inference_workers", 1)
     def test_master_schema(
         self, capsys, user_schema, min_datetime, ordered_file_infos, file_schemas, expected_schema, log_expected, error_expected
     ):
@@ -720,3 +791,168 @@ class TestIncrementalFileStream:
             },
             "type": "object",
         }
+
+    @pytest.mark.parametrize("sync_mode", [SyncMode.full_refresh, SyncMode.incremental])
+    @pytest.mark.parametrize("max_prefetched_files", [0, 1, 3])
+    @patch.object(IncrementalFileStreamS3, "storagefile_class", InMemoryStorageFile)
+    @patch.object(IncrementalFileStreamS3, "fileformatparser_map", {})
+    def test_read_prefetched_files_in_order(self, sync_mode, max_prefetched_files):
+        files = {f"file_{i}": [f"{i}_{j}" for j in range(2500)] for i in range(6)}
+        # files 1 and 2 share a last modified date, so they are read in the same incremental slice
+        days = [1, 2, 2, 3, 4, 5]
+        file_infos = [FileInfo(key=key, size=1, last_modified=datetime(2022, 1, day, tzinfo=timezone.utc)) for key, day in zip(files, days)]
+        stream_instance = in_memory_stream(files, file_infos, max_prefetched_files)
+
+        records = read_stream(stream_instance, sync_mode)
+
+        assert [record["value"] for record in records] == [line for lines in files.values() for line in lines]
+        assert [record["_ab_source_file_url"] for record in records] == [key for key, lines in files.items() for _ in lines]
+        assert sorted(stream_instance._provider["opened"]) == sorted(files)
+
+    @pytest.mark.parametrize(
+        "selected_columns, expected_read_columns, expected_record",
+        (
+            (None, None, {"value": "a", "added_after_discover": "b", "_ab_additional_properties": {}}),
+            (
+                ["value", "_ab_additional_properties"],
+                None,
+                {"value": "a", "_ab_additional_properties": {"added_after_discover": "b"}},
+            ),
+            (["value"], ["value"], {"value": "a", "_ab_additional_properties": {}}),
+        ),
+    )
+    @patch.object(IncrementalFileStreamS3, "storagefile_class", InMemoryStorageFile)
+    @patch.object(IncrementalFileStreamS3, "fileformatparser_map", {})
+    def test_read_columns_added_after_discover(self, selected_columns, expected_read_columns, expected_record):
+        file_infos = [FileInfo(key="file", size=1, last_modified=datetime(2022, 1, 1, tzinfo=timezone.utc))]
+        stream_instance = in_memory_stream({"file": ["a"]}, file_infos, max_prefetched_files=0)
+        stream_instance._get_master_schema.return_value = {"value": "string", "added_after_discover": "string"}
+        stream_instance.selected_columns = selected_columns
+        parser_class = stream_instance.fileformatparser_map["csv"]
+
+        def stream_records(f, file_info):
+            read_columns = parser_class.call_args[0][2]
+            record = {"value": f.read(), "added_after_discover": "b"}
+            return iter([{column: value for column, value in record.items() if read_columns is None or column in read_columns}])
+
+        parser_class.return_value.stream_records.side_effect = stream_records
+
+        records = read_stream(stream_instance, SyncMode.full_refresh)
+
+        assert parser_class.call_args[0][2] == expected_read_columns
+        assert [{key: value for key, value in record.items() if not key.startswith("_ab_source")} for record in records] == [
+            expected_record
+        ]
+
+    @patch.object(IncrementalFileStreamS3, "storagefile_class", InMemoryStorageFile)
+    @patch.object(IncrementalFileStreamS3, "fileformatparser_map", {})
+    def test_prefetch_upcoming_files_while_reading_a_slice(self):
+        files = {f"file_{i}": [f"{i}"] for i in range(5)}
+        file_infos = [FileInfo(key=key, size=1, last_modified=datetime(2022, 1, 1 + i, tzinfo=timezone.utc)) for i, key in enumerate(files)]
+        stream_instance = in_memory_stream(files, file_infos, max_prefetched_files=2)
+
+        slices = stream_instance.stream_slices(sync_mode=SyncMode.incremental)
+        first_records = stream_instance.read_records(sync_mode=SyncMode.incremental, stream_slice=next(slices))
+        assert next(first_records)["value"] == "0"
+
+        deadline = time.monotonic() + 5
+        while len(stream_instance._provider["opened"]) < 3 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        # the 2 files after the one being read are read in the background, not the ones after them
+        assert sorted(stream_instance._provider["opened"]) == ["file_0", "file_1", "file_2"]
+
+        for stream_slice in slices:
+            list(stream_instance.read_records(sync_mode=SyncMode.incremental, stream_slice=stream_slice))
+        assert sorted(stream_instance._provider["opened"]) == sorted(files)
+        assert stream_instance._file_prefetcher is None
+
+    @patch.object(IncrementalFileStreamS3, "storagefile_class", InMemoryStorageFile)
+    @patch.object(IncrementalFileStreamS3, "fileformatparser_map", {})
+    def test_prefetched_file_error_is_raised_after_previous_files_are_read(self):
+        files = {"file_0": ["a", "b"], "file_1": ["c"], "file_2": ConnectionError("broken file"), "file_3": ["d"]}
+        file_infos = [FileInfo(key=key, size=1, last_modified=datetime(2022, 1, 1 + i, tzinfo=timezone.utc)) for i, key in enumerate(files)]
+        stream_instance = in_memory_stream(files, file_infos, max_prefetched_files=3)
+
+        records = []
+        with pytest.raises(ConnectionError, match="broken file"):
+            for stream_slice in stream_instance.stream_slices(sync_mode=SyncMode.incremental):
+                for record in stream_instance.read_records(sync_mode=SyncMode.incremental, stream_slice=stream_slice):
+                    records.append(record)
+                    stream_instance.state = stream_instance.get_updated_state(getattr(stream_instance, "state", {}), record)
+
+        assert [record["value"] for record in records] == ["a", "b", "c"]
+        # the cursor only moved up to the last file fully read
+        assert stream_instance.state["_ab_source_file_last_modified"] == "2022-01-02T00:00:00+0000"
+
+    @patch.object(IncrementalFileStreamS3, "storagefile_class", InMemoryStorageFile)
+    @patch.object(IncrementalFileStreamS3, "fileformatparser_map", {})
+    def test_master_schema_is_merged_in_file_order(self):
+        schemas = {f"file_{i}": {f"column_{i}": "integer", "shared": "integer" if i < 10 else "string"} for i in range(20)}
+        stream_instance = schema_inference_stream(schemas)
+
+        master_schema = stream_instance._get_master_schema()
+
+        assert list(master_schema) == ["column_0", "shared"] + [f"column_{i}" for i in range(1, 20)]
+        assert master_schema["shared"] == "string"
+        assert sorted(stream_instance.parser.inferred) == sorted(schemas)
+
+    @pytest.mark.parametrize(
+        ("strategy", "expected_inferred_files", "expected_schema"),
+        (
+            ("all_files", ["a_1", "b_1", "a_2", "a_3"], {"a": "string", "b": "integer"}),
+            ("newest_files", ["a_2", "a_3"], {"a": "string"}),
+            ("distinct_headers", ["b_1", "a_3"], {"b": "integer", "a": "string"}),
+        ),
+    )
+    @patch.object(IncrementalFileStreamS3, "storagefile_class", InMemoryStorageFile)
+    @patch.object(IncrementalFileStreamS3, "fileformatparser_map", {})
+    def test_master_schema_sampling(self, strategy, expected_inferred_files, expected_schema):
+        schemas = {"a_1": {"a": "string"}, "b_1": {"b": "integer"}, "a_2": {"a": "string"}, "a_3": {"a": "string"}}
+        stream_instance = schema_inference_stream(schemas, schema_inference_strategy=strategy, schema_inference_sample_size=2)
+
+        assert stream_instance._get_master_schema() == expected_schema
+        assert sorted(stream_instance.parser.inferred) == sorted(expected_inferred_files)
+
+    @patch.object(IncrementalFileStreamS3, "storagefile_class", InMemoryStorageFile)
+    @patch.object(IncrementalFileStreamS3, "fileformatparser_map", {})
+    def test_master_schema_is_not_inferred_again_for_unchanged_files(self, tmp_path):
+        schemas = {"first": {"a": "string"}, "second": {"b": "integer"}, "third": {"c": "boolean"}}
+        etags = {key: f'"{key}_v1"' for key in schemas}
+        schema_cache_path = str(tmp_path / "schemas.json")
+        first_sync = schema_inference_stream(schemas, etags, schema_cache_path=schema_cache_path)
+        assert first_sync._get_master_schema() == {"a": "string", "b": "integer", "c": "boolean"}
+        assert sorted(first_sync.parser.inferred) == ["first", "second", "third"]
+
+        # a new process only loads the schemas saved by the previous sync
+        schema_cache._schema_caches.clear()
+        schemas["second"] = {"b": "number"}
+        etags["second"] = '"second_v2"'
+        next_sync = schema_inference_stream(schemas, etags, schema_cache_path=schema_cache_path)
+        assert next_sync._get_master_schema() == {"a": "string", "b": "number", "c": "boolean"}
+        assert next_sync.parser.inferred == ["second"]
+
+    @patch("source_s3.source_files_abstract.stream.IncrementalFileStream.__abstractmethods__", set())
+    def test_get_updated_state_once_per_file(self):
+        fs = IncrementalFileStream(dataset="dummy", provider={}, format={"filetype": "csv"}, path_pattern="**")
+        fs._get_schema_map = MagicMock(return_value={"column": "string"})
+        # history of a state message holds lists
+        state = {
+            "_ab_source_file_last_modified": "2022-07-01T10:00:00+0000",
+            "history": {"2022-06-20": ["too_old.csv"], "2022-07-01": ["old.csv"]},
+        }
+        files = [("old.csv", "2022-07-01T10:00:00+0000"), ("a.csv", "2022-07-02T10:00:00+0000"), ("b.csv", "2022-07-05T08:00:00+0000")]
+
+        for url, last_modified in files:
+            file_state = fs.get_updated_state(state, {"_ab_source_file_url": url, "_ab_source_file_last_modified": last_modified, "id": 0})
+            for record_id in range(1, 100):
+                record = {"_ab_source_file_url": url, "_ab_source_file_last_modified": last_modified, "id": record_id}
+                assert fs.get_updated_state(file_state, record) is file_state
+            state = file_state
+
+        assert fs._get_schema_map.call_count == len(files)
+        assert state == {
+            "_ab_source_file_last_modified": "2022-07-05T08:00:00+0000",
+            "schema": {"column": "string"},
+            # dates older than buffer_days before the cursor are dropped
+            "history": {"2022-07-02": {"a.csv"}, "2022-07-05": {"b.csv"}},
+        }